@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy.backend import backend_manager as bm
+from fealpy.backend import BackendManager
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        后端分发开销测试: 比较原始的 `bm.xxx` 分发方式 (每次调用都经过
+        `__getattr__` 与线程局部变量查找)、按线程缓存的分发表, 以及用
+        `bm.bind` 预先绑定函数三种方式的单次调用开销, 并给出小规模组装与
+        共轭梯度迭代在前两种分发方式下的计算时间
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy")
+
+parser.add_argument('--ncalls',
+        default=1000000, type=int,
+        help="单次调用开销测试的调用次数, 默认为 1000000")
+
+parser.add_argument('--nx',
+        default=8, type=int,
+        help="组装测试的网格剖分段数, 默认为 8")
+
+parser.add_argument('--nassembly',
+        default=200, type=int,
+        help="组装测试的重复次数, 默认为 200")
+
+parser.add_argument('--ncg',
+        default=200, type=int,
+        help="共轭梯度法的迭代步数, 默认为 200")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator
+from fealpy.solver import cg
+
+
+def legacy_getattr(self, item):
+    return getattr(self.get_current_backend("GET_ATTR: " + item), item)
+
+
+class LegacyDispatch():
+    """在上下文中恢复原始的分发方式"""
+    def __enter__(self):
+        self._saved = (BackendManager.__getattribute__, BackendManager.__getattr__)
+        BackendManager.__getattribute__ = object.__getattribute__
+        BackendManager.__getattr__ = legacy_getattr
+
+    def __exit__(self, *exc):
+        BackendManager.__getattribute__, BackendManager.__getattr__ = self._saved
+
+
+def per_call(func):
+    start = time.perf_counter()
+    for _ in range(args.ncalls):
+        func()
+    return (time.perf_counter() - start) / args.ncalls * 1e9
+
+
+def lookup():
+    return bm.sqrt
+
+
+x = bm.ones(4, dtype=bm.float64)
+sqrt, = bm.bind('sqrt')
+
+def dispatch_call():
+    return bm.sqrt(x)
+
+def bound_call():
+    return sqrt(x)
+
+def direct_lookup():
+    return sqrt
+
+
+mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=args.nx, ny=args.nx)
+space = LagrangeFESpace(mesh, p=1)
+
+def assembly():
+    start = time.perf_counter()
+    for _ in range(args.nassembly):
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(q=3))
+        bform.assembly()
+    return time.perf_counter() - start
+
+cg_space = LagrangeFESpace(TriangleMesh.from_box([0, 1, 0, 1], nx=32, ny=32), p=1)
+bform = BilinearForm(cg_space)
+bform.add_integrator(ScalarDiffusionIntegrator(q=3))
+bform.add_integrator(ScalarMassIntegrator(q=3))
+A = bform.assembly()
+b = bm.ones(cg_space.number_of_global_dofs(), dtype=bm.float64)
+
+def solve():
+    start = time.perf_counter()
+    cg(A, b, atol=0.0, rtol=0.0, maxit=args.ncg)
+    return time.perf_counter() - start
+
+
+print(f"backend: {bm.backend_name}")
+with LegacyDispatch():
+    legacy_lookup = per_call(lookup)
+    legacy_call = per_call(dispatch_call)
+    legacy_assembly = assembly()
+    legacy_cg = solve()
+
+cached_lookup = per_call(lookup)
+cached_call = per_call(dispatch_call)
+cached_assembly = assembly()
+cached_cg = solve()
+bound_lookup = per_call(direct_lookup)
+bound_sqrt = per_call(bound_call)
+
+print(f"{'':>22} {'legacy':>10} {'cached':>10} {'bind':>10}")
+print(f"{'lookup (ns)':>22} {legacy_lookup:10.1f} {cached_lookup:10.1f} {bound_lookup:10.1f}")
+print(f"{'sqrt call (ns)':>22} {legacy_call:10.1f} {cached_call:10.1f} {bound_sqrt:10.1f}")
+print(f"{'assembly x' + str(args.nassembly) + ' (s)':>22} {legacy_assembly:10.4f} {cached_assembly:10.4f}")
+print(f"{'cg ' + str(args.ncg) + ' iters (s)':>22} {legacy_cg:10.4f} {cached_cg:10.4f}")
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        FDTD 时间推进测试: 比较 EMFDTDSim 的默认引擎与原位更新引擎
+        (engine='fast') 在 PEC 与 UPML 边界条件下每秒更新的网格单元数,
+        以及用 MemmapRecorder 将快照写入磁盘时的计算时间. UPML 系数只在第一次
+        运行时计算并缓存, 其计算时间单独给出, 不计入时间推进
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy")
+
+parser.add_argument('--dim',
+        default=3, type=int,
+        help="问题的维数, 默认为 3")
+
+parser.add_argument('--n',
+        default=48, type=int,
+        help="每个方向的网格剖分段数, 默认为 48")
+
+parser.add_argument('--NT',
+        default=60, type=int,
+        help="时间步数, 默认为 60")
+
+parser.add_argument('--step',
+        default=None, type=int,
+        help="保存快照的时间步间隔, 默认为 NT + 1, 即只保存初始时刻")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import UniformMesh2d, UniformMesh3d
+from fealpy.cem import EMFDTDSim
+from fealpy.cem.fdtd_recorder import MemmapRecorder
+
+n, dim = args.n, args.dim
+step = args.NT + 1 if args.step is None else args.step
+
+
+def make_sim(bc):
+    h = 1 / n
+    if dim == 2:
+        mesh = UniformMesh2d((0, n, 0, n), h=(h, h))
+    else:
+        mesh = UniformMesh3d((0, n, 0, n, 0, n), h=(h, h, h))
+    sim = EMFDTDSim(mesh, NT=args.NT, R=0.5)
+    if bc == 'UPML':
+        sim.boundary('UPML', m=4, ng=max(n // 8, 2))
+    sim.set_source([0.5] * dim, 'sine', params={'amplitude': 1.0, 'frequency': 0, 'PPW': 16})
+    return sim
+
+
+def setup(bc):
+    sim = make_sim(bc)
+    start = time.perf_counter()
+    if bc == 'UPML':
+        sim.upml_coefficients()
+    return sim, time.perf_counter() - start
+
+
+def timing(bc, **kwargs):
+    sim, _ = setup(bc)
+    start = time.perf_counter()
+    # NOTE: the default 3D UPML engine prints every time step.
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.run(step=step, **kwargs)
+    return time.perf_counter() - start
+
+
+cells = n ** dim * args.NT
+print(f"backend: {bm.backend_name}, dim: {dim}, n: {n}, NT: {args.NT}, step: {step}")
+print(f"UPML coefficients: {setup('UPML')[1]:.4f} s")
+print(f"{'':>6} {'engine':>8} {'time (s)':>10} {'Mcells/s':>10}")
+for bc in ('PEC', 'UPML'):
+    results = [('default', timing(bc)), ('fast', timing(bc, engine='fast'))]
+    with tempfile.TemporaryDirectory() as directory:
+        results.append(('memmap', timing(bc, engine='fast', recorder=MemmapRecorder(directory))))
+    for engine, t in results:
+        print(f"{bc:>6} {engine:>8} {t:10.4f} {cells / t / 1e6:10.2f}")
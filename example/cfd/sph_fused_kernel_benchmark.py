@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        SPH 融合粒子对核函数测试: 在热传导算例的粒子分布上, 比较逐项计算的
+        EquationSolver + ProcessingTechnology 与 FusedSPHKernel (粒子对数据一次
+        取出, 密度/壁面/加速度三遍融合计算, 复用累加数组) 每个时间步的计算时间,
+        以粒子更新数每秒 (particle-updates/s) 给出
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy")
+
+parser.add_argument('--dx',
+        default=0.0025, type=float,
+        help="粒子间距, 默认为 0.0025")
+
+parser.add_argument('--steps',
+        default=5, type=int,
+        help="计时的时间步数, 默认为 5")
+
+parser.add_argument('--compile',
+        default=False, action='store_true',
+        help="在 jax 与 pytorch 后端上编译融合核函数, 默认不编译")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh.node_mesh import NodeMesh
+from fealpy.cfd.simulation.sph.particle_kernel_function_new import QuinticKernel
+from fealpy.cfd.simulation.sph.equation_solver import EquationSolver
+from fealpy.cfd.simulation.sph.processing_technology import ProcessingTechnology
+from fealpy.cfd.simulation.sph.fused_kernel import FusedSPHKernel
+
+dx = args.dx
+dt = 0.00045454545454545455
+box_size = bm.array([1.0, 0.2 + dx*3*2], dtype=bm.float64)
+mesh = NodeMesh.from_heat_transfer_domain(dx=dx, dy=dx)
+# pytorch 后端下部分物理量为 float32, 统一为 float64
+state0 = {k: bm.astype(v, bm.float64) if k not in ("tag", "dx") else v
+          for k, v in mesh.nodedata.items()}
+state0["kappa"] = bm.full_like(state0["rho"], 7.313)
+state0["Cp"] = bm.full_like(state0["rho"], 305.27)
+NN = state0["position"].shape[0]
+
+# 邻近粒子对与核函数值在两种算法之间共用, 不计入时间
+kernel = QuinticKernel(h=dx, dim=2)
+r = state0["position"]
+L = bm.to_numpy(box_size)
+pairs = cKDTree(bm.to_numpy(r) % L, boxsize=L).query_pairs(3*dx, output_type='ndarray')
+self_node = bm.tensor(np.concatenate([pairs[:, 0], pairs[:, 1]]))
+neighbors = bm.tensor(np.concatenate([pairs[:, 1], pairs[:, 0]]))
+dr = r[neighbors] - r[self_node]
+dr = dr - box_size * bm.round(dr / box_size)
+dist = bm.sqrt(bm.sum(dr**2, axis=1))
+w = kernel.value(dist)
+grad_w_norm = kernel.grad_value(dist)
+grad_w = grad_w_norm[:, None] * dr / (dist[:, None] + bm.finfo(float).eps)
+g_ext = ProcessingTechnology.external_acceleration(r, box_size, dx=dx)
+
+
+def reference_step(state):
+    """fealpy/cfd/example/sph/heat_transfer.py 中的一步"""
+    solver = EquationSolver()
+    fluid_mask = state["tag"] == 0
+    rho = bm.where(fluid_mask, solver.mass_equation_solve(0, state, neighbors, w), state["rho"])
+    p = solver.state_equation("tait_eos", state, rho=rho, X=5.0)
+    pb = solver.state_equation("tait_eos", state, rho=bm.zeros_like(p), X=5.0)
+    p, rho, mv, tv, T = ProcessingTechnology.enforce_wall_boundary(
+            state, p, g_ext, neighbors, self_node, w, dr, with_temperature=True)
+    state["rho"], state["mv"], state["tv"] = rho, mv, tv
+    state["T"] = T + dt * state["dTdt"]
+    state["dTdt"] = solver.heat_equation_solve(0, state, dr, dist, neighbors, self_node, grad_w)
+    state["dmvdt"] = solver.momentum_equation_solve(0, state, neighbors, self_node,
+                                                    dr, dist, grad_w_norm, p) + g_ext
+    state["p"] = p
+    state["dtvdt"] = solver.momentum_equation_solve(1, state, neighbors, self_node,
+                                                    dr, dist, grad_w_norm, pb)
+    return state
+
+
+fused = FusedSPHKernel(compile=args.compile)
+def fused_step(state):
+    fused.set_pairs(state, neighbors, self_node, dr, dist, w, grad_w_norm)
+    return fused.forward(state, g_ext, dt, with_temperature=True)
+
+
+def run(step):
+    state = step(dict(state0))    # 预热 (编译, 分配累加数组)
+    t0 = time.perf_counter()
+    for _ in range(args.steps):
+        state = step(dict(state0))
+    return (time.perf_counter() - t0) / args.steps, state
+
+t_ref, ref = run(reference_step)
+t_fused, state = run(fused_step)
+error = max(float(bm.max(bm.abs(state[k] - ref[k])) / (bm.max(bm.abs(ref[k])) + 1e-300))
+            for k in ["rho", "p", "mv", "tv", "T", "dTdt", "dmvdt", "dtvdt"])
+
+print(f"backend = {args.backend}, compile = {fused.compiled}, "
+      f"粒子数 {NN}, 粒子对数 {self_node.shape[0]}")
+print(f"{'method':<10} {'step (s)':>9} {'updates/s':>11}")
+print(f"{'reference':<10} {t_ref:9.4f} {NN/t_ref:11.3e}")
+print(f"{'fused':<10} {t_fused:9.4f} {NN/t_fused:11.3e}")
+print(f"speedup {t_ref/t_fused:.2f}, 最大相对误差 {error:.1e}")
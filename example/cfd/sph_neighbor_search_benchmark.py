@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+import numpy as np
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        SPH 邻近搜索测试: 在单位正方形内带扰动的规则粒子分布上, 比较 bm.query_point
+        (scipy KDTree) 与后端无关的网格链表 CellList 的搜索时间, 并给出带 Verlet
+        缓冲层 (skin) 的 NeighborList 在粒子移动若干步时的重建次数与每步时间
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy")
+
+parser.add_argument('--n',
+        default=1000, type=int,
+        help="每个方向的粒子数, 粒子总数为 n^2, 默认为 1000")
+
+parser.add_argument('--steps',
+        default=20, type=int,
+        help="NeighborList 测试的时间步数, 默认为 20")
+
+parser.add_argument('--skin',
+        default=0.5, type=float,
+        help="Verlet 缓冲层厚度与粒子间距之比, 默认为 0.5")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import CellList, NeighborList
+
+n = args.n
+dx = 1.0 / n
+h = 3 * dx
+rng = np.random.default_rng(0)
+g = (np.arange(n) + 0.5) * dx
+x = np.stack(np.meshgrid(g, g, indexing='ij'), axis=-1).reshape(-1, 2)
+x = np.clip(x + 0.05 * dx * rng.normal(size=x.shape), 0, 1 - 1e-12)
+box_size = bm.tensor([1.0, 1.0], dtype=bm.float64)
+x = bm.tensor(x, dtype=bm.float64)
+
+print(f"{'periodic':<9} {'N':>9} {'pairs':>10} {'kdtree (s)':>11} {'cells (s)':>10} {'speedup':>8}")
+for periodic in [False, True]:
+    t0 = time.perf_counter()
+    node_self, neighbors = bm.query_point(x, x, h, box_size, True, [periodic] * 3)
+    t1 = time.perf_counter()
+    crow, col = CellList(h, box_size=box_size, periodic=periodic).build(x).query()
+    t2 = time.perf_counter()
+    assert len(neighbors) == col.shape[0]
+    print(f"{str(periodic):<9} {x.shape[0]:9d} {col.shape[0]:10d} {t1 - t0:11.2f} "
+          f"{t2 - t1:10.2f} {(t1 - t0)/(t2 - t1):8.1f}")
+
+# 粒子随 Taylor-Green 涡速度场移动, 每步最大位移 0.05*dx, 位移超过 skin/2 时才重建
+def velocity(p):
+    u = bm.sin(2*bm.pi*p[:, 0]) * bm.cos(2*bm.pi*p[:, 1])
+    v = -bm.cos(2*bm.pi*p[:, 0]) * bm.sin(2*bm.pi*p[:, 1])
+    return bm.stack([u, v], axis=-1)
+
+for skin in [0.0, args.skin * dx]:
+    nl = NeighborList(h, skin=skin, box_size=box_size, periodic=True)
+    y = x
+    t0 = time.perf_counter()
+    for step in range(args.steps):
+        y = y + 0.05 * dx * velocity(y)
+        crow, col = nl.update(y)
+    t1 = time.perf_counter()
+    print(f"NeighborList skin = {skin/dx:.2f} dx: {args.steps} 步, 重建 {nl.num_builds} 次, "
+          f"每步 {(t1 - t0)/args.steps:.2f} s")
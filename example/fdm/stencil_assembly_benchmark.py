@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        结构网格差分算子组装测试: 在二维与三维均匀网格上, 比较逐个相加稀疏矩阵
+        (A += csr_matrix(...)) 的原始组装方式与 StencilOperator 一次写入 CSR
+        数组的组装时间, 以及组装矩阵的乘法与无矩阵 (matrix-free) 作用的时间
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy")
+
+parser.add_argument('--ns2d',
+        default=512, type=int,
+        help="二维网格每个方向的剖分段数, 默认为 512")
+
+parser.add_argument('--ns3d',
+        default=64, type=int,
+        help="三维网格每个方向的剖分段数, 默认为 64")
+
+parser.add_argument('--repeat',
+        default=5, type=int,
+        help="每项测试的重复次数, 取最小值, 默认为 5")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import UniformMesh
+from fealpy.sparse import csr_matrix
+from fealpy.fdm import DiffusionOperator
+
+
+def legacy_assembly(mesh, D):
+    """原始的组装方式: 每个偏移量生成一个 csr 矩阵并相加"""
+    GD = mesh.geo_dimension()
+    h = mesh.h
+    c = D * (1.0 / h**2)
+    NN = mesh.number_of_nodes()
+    K = mesh.linear_index_map('node')
+    I = K.ravel()
+    A = csr_matrix((bm.full((NN,), 2 * bm.sum(c.diagonal()), dtype=mesh.ftype), (I, I)),
+                   shape=(NN, NN))
+    full = (slice(None),) * GD
+    for i in range(GD):
+        s1 = full[:i] + (slice(1, None),) + full[i+1:]
+        s2 = full[:i] + (slice(None, -1),) + full[i+1:]
+        I1, I2 = K[s1].ravel(), K[s2].ravel()
+        v = bm.full((I1.shape[0],), -c[i, i], dtype=mesh.ftype)
+        A += csr_matrix((v, (I1, I2)), shape=(NN, NN))
+        A += csr_matrix((v, (I2, I1)), shape=(NN, NN))
+        for j in range(i+1, GD):
+            coeff = (D[i, j] + D[j, i]) / (4*h[i]*h[j])
+            for si, sj, sign in [(1, 1, 1), (-1, 1, -1), (1, -1, -1), (-1, -1, 1)]:
+                rows = list(full)
+                cols = list(full)
+                rows[i], cols[i] = (slice(None, -1), slice(1, None))[::si]
+                rows[j], cols[j] = (slice(None, -1), slice(1, None))[::sj]
+                R, C = K[tuple(rows)].ravel(), K[tuple(cols)].ravel()
+                A += csr_matrix((sign * coeff * bm.ones(R.shape[0], dtype=mesh.ftype), (R, C)),
+                                shape=(NN, NN))
+    return A
+
+
+def timeit(fun):
+    best = float('inf')
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        result = fun()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+cases = [
+    ('2D', [0, 1, 0, 1], [0, args.ns2d] * 2,
+     bm.tensor([[1.0, 0.25], [0.25, 2.0]], dtype=bm.float64)),
+    ('3D', [0, 1] * 3, [0, args.ns3d] * 3,
+     bm.tensor([[1.0, 0.25, 0.0], [0.25, 2.0, 0.1], [0.0, 0.1, 3.0]], dtype=bm.float64)),
+]
+
+print(f"{'case':<6} {'NN':>9} {'nnz':>9} {'legacy (s)':>11} {'to_csr (s)':>11} "
+      f"{'to_dia (s)':>11} {'A@u (ms)':>9} {'op@u (ms)':>10} {'error':>9}")
+for name, domain, extent, D in cases:
+    mesh = UniformMesh(domain, extent)
+    NN = mesh.number_of_nodes()
+    op = DiffusionOperator(mesh, D)
+
+    t_legacy, A0 = timeit(lambda: legacy_assembly(mesh, D))
+    t_csr, A = timeit(lambda: op.assembly())
+    t_dia, _ = timeit(lambda: op.stencil().to_dia())
+
+    u = bm.random.rand(NN)
+    t_spmv, r0 = timeit(lambda: A @ u)
+    S = op.stencil()
+    t_free, r1 = timeit(lambda: S @ u)
+    error = bm.max(bm.abs((A0 - A).toarray() if NN <= 5000 else r0 - A0 @ u))
+    error = max(float(error), float(bm.max(bm.abs(r1 - r0))))
+
+    print(f"{name:<6} {NN:9d} {int(A.nnz):9d} {t_legacy:11.4f} {t_csr:11.4f} "
+          f"{t_dia:11.4f} {t_spmv*1e3:9.2f} {t_free*1e3:10.2f} {error:9.1e}")
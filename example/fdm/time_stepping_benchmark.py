@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        有限差分时间推进测试: 在二维与三维均匀网格上求解热方程, 比较每步重新
+        组装并求解线性系统的原始方式、LinearTimeStepper 预先分解的 LU 求解器,
+        以及基于离散正弦变换的 DST 求解器每秒推进的时间步数; 显式格式比较组装
+        矩阵与无矩阵 (matrix-free) 的 Laplace 算子
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy")
+
+parser.add_argument('--ns2d',
+        default=128, type=int,
+        help="二维网格每个方向的剖分段数, 默认为 128")
+
+parser.add_argument('--ns3d',
+        default=24, type=int,
+        help="三维网格每个方向的剖分段数, 默认为 24")
+
+parser.add_argument('--nt',
+        default=20, type=int,
+        help="每种方法推进的时间步数, 默认为 20")
+
+parser.add_argument('--scheme',
+        default='cn', type=str,
+        help="隐式差分格式, 'backward' 或 'cn', 默认为 'cn'")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import UniformMesh
+from fealpy.sparse import spdiags
+from fealpy.solver import spsolve
+from fealpy.fdm import LaplaceOperator, DirichletBC, LinearTimeStepper
+
+
+class HeatData:
+    """u = exp(-t) prod_i sin(pi x_i) 在单位正方形/立方体上"""
+    def __init__(self, GD):
+        self.GD = GD
+
+    def solution(self, p, t):
+        return bm.exp(-t) * bm.prod(bm.sin(bm.pi * p), axis=-1)
+
+    def source(self, p, t):
+        return (self.GD * bm.pi**2 - 1) * self.solution(p, t)
+
+    def dirichlet(self, p, t):
+        return self.solution(p, t)
+
+
+def legacy_step(mesh, A, uh, t, tau, theta, pde):
+    """原始方式: 每步重新组装 S, 施加边界条件并从头求解"""
+    NN = A.shape[0]
+    I = spdiags(bm.ones(NN, dtype=mesh.ftype), 0, NN, NN)
+    F = mesh.interpolate(lambda p: pde.source(p, t), etype='node').reshape(-1)
+    S = I + theta*tau*A
+    b = (I - (1 - theta)*tau*A)@uh + tau*F
+    S, b = DirichletBC(mesh, lambda p: pde.dirichlet(p, t)).apply(S, b)
+    return spsolve(S, b, solver='scipy')
+
+
+def steps_per_second(step, u0, nt):
+    uh = u0
+    start = time.perf_counter()
+    for n in range(1, nt + 1):
+        uh = step(uh, n)
+    return nt / (time.perf_counter() - start), uh
+
+
+print(f"backend: {bm.backend_name}, scheme: {args.scheme}, nt: {args.nt}")
+print(f"{'grid':>12} {'method':>18} {'steps/s':>10} {'max diff':>10}")
+theta = {'backward': 1.0, 'cn': 0.5}[args.scheme]
+for GD, ns in ((2, args.ns2d), (3, args.ns3d)):
+    pde = HeatData(GD)
+    mesh = UniformMesh([0, 1] * GD, [0, ns] * GD)
+    A = LaplaceOperator(mesh).assembly()
+    node = mesh.entity('node')
+    u0 = pde.solution(node, 0.0)
+    tau = 1.0 / ns
+    grid = 'x'.join([str(ns)] * GD)
+
+    rate, ref = steps_per_second(lambda u, n: legacy_step(mesh, A, u, n*tau, tau, theta, pde), u0, args.nt)
+    results = [('legacy', rate, 0.0)]
+    for solver in ('lu', 'dst'):
+        stepper = LinearTimeStepper(mesh, LaplaceOperator(mesh), scheme=args.scheme, solver=solver)
+        stepper.system(tau)  # 分解只在第一步计算一次, 不计入推进时间
+        rate, uh = steps_per_second(
+                lambda u, n: stepper.step(u, n*tau, tau, pde.source, pde.dirichlet), u0, args.nt)
+        results.append((solver, rate, float(bm.max(bm.abs(uh - ref)))))
+
+    # 显式格式的稳定性要求 tau <= h^2 / (2 GD)
+    tau_e = 0.5 / (GD * ns**2)
+    for name, op in (('forward sparse', A), ('forward free', LaplaceOperator(mesh))):
+        stepper = LinearTimeStepper(mesh, op, scheme='forward')
+        rate, uh = steps_per_second(
+                lambda u, n: stepper.step(u, n*tau_e, tau_e, pde.source, pde.dirichlet), u0, args.nt)
+        results.append((name, rate, float('nan')))
+
+    for name, rate, diff in results:
+        print(f"{grid:>12} {name:>18} {rate:10.1f} {diff:10.2e}")
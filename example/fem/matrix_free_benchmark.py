@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        无矩阵 (matrix-free) 算子性能测试: 在四边形/六面体网格上比较
+        组装稀疏矩阵后做矩阵向量乘, 与和分解 (sum factorization) 无矩阵作用的计算时间
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch, jax 等")
+
+parser.add_argument('--mesh',
+        default='quadrangle', type=str,
+        help="网格类型, 可选 quadrangle, hexahedron, 默认为 quadrangle")
+
+parser.add_argument('--n',
+        default=32, type=int,
+        help="每个方向的剖分段数, 默认为 32")
+
+parser.add_argument('--p',
+        default=4, type=int,
+        help="拉格朗日有限元空间的次数, 默认为 4 次")
+
+parser.add_argument('--nrep',
+        default=10, type=int,
+        help="矩阵向量乘重复次数, 默认为 10")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import QuadrangleMesh, HexahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    out = func(*args)
+    return out, time.perf_counter() - start
+
+
+n = args.n
+if args.mesh == 'quadrangle':
+    mesh = QuadrangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+else:
+    mesh = HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=n, ny=n, nz=n)
+
+space = LagrangeFESpace(mesh, p=args.p)
+bform = BilinearForm(space)
+bform.add_integrator(ScalarDiffusionIntegrator())
+bform.add_integrator(ScalarMassIntegrator())
+gdof = space.number_of_global_dofs()
+x = bm.random.rand(gdof)
+
+A, t_asm = timeit(bform.assembly)
+op, t_setup = timeit(bform.matrix_free)
+
+start = time.perf_counter()
+for _ in range(args.nrep):
+    y0 = A @ x
+t_spmv = (time.perf_counter() - start) / args.nrep
+
+start = time.perf_counter()
+for _ in range(args.nrep):
+    y1 = op @ x
+t_mf = (time.perf_counter() - start) / args.nrep
+
+print(f"NDof: {gdof}, NC: {mesh.number_of_cells()}, p: {args.p}")
+print(f"assembled  : setup {t_asm:.4f}s, apply {t_spmv:.6f}s, nnz {A.nnz}")
+print(f"matrix-free: setup {t_setup:.4f}s, apply {t_mf:.6f}s")
+print(f"max error  : {bm.max(bm.abs(y0 - y1)):.3e}")
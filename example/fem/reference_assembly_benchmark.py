@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        参考单元张量组装性能测试: 在三角形/四面体网格上比较默认的数值积分组装
+        与参考单元张量 (method='reference') 组装单元矩阵的计算时间
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch, jax 等")
+
+parser.add_argument('--mesh',
+        default='triangle', type=str,
+        help="网格类型, 可选 triangle, tetrahedron, 默认为 triangle")
+
+parser.add_argument('--n',
+        default=64, type=int,
+        help="每个方向的剖分段数, 默认为 64")
+
+parser.add_argument('--p',
+        default=2, type=int,
+        help="拉格朗日有限元空间的次数, 默认为 2 次")
+
+parser.add_argument('--nrep',
+        default=5, type=int,
+        help="重复次数, 默认为 5")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.material import LinearElasticMaterial
+from fealpy.fem import (
+    ScalarDiffusionIntegrator, ScalarMassIntegrator, ScalarConvectionIntegrator,
+    ScalarSourceIntegrator, LinearElasticityIntegrator
+)
+from fealpy.decorator import cartesian
+
+
+def timeit(make):
+    """Average time of assembling element matrices with fresh integrators."""
+    start = time.perf_counter()
+    for _ in range(args.nrep):
+        out = make().assembly(space)
+    return out, (time.perf_counter() - start) / args.nrep
+
+
+n = args.n
+if args.mesh == 'triangle':
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+else:
+    mesh = TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=n, ny=n, nz=n)
+
+GD = mesh.geo_dimension()
+velocity = bm.arange(1, GD+1, dtype=bm.float64)
+
+@cartesian
+def velocity_func(p):
+    return bm.broadcast_to(velocity, p.shape)
+
+scalar_space = LagrangeFESpace(mesh, p=args.p)
+material = LinearElasticMaterial('material', elastic_modulus=1.0, poisson_ratio=0.3,
+                                 hypo='3D' if GD == 3 else 'plane_strain')
+cases = {
+    'diffusion': (ScalarDiffusionIntegrator, (2.0, ), (2.0, )),
+    'mass': (ScalarMassIntegrator, (2.0, ), (2.0, )),
+    'convection': (ScalarConvectionIntegrator, (velocity_func, ), (velocity, )),
+    'source': (ScalarSourceIntegrator, (1.0, ), (1.0, )),
+    'elasticity': (LinearElasticityIntegrator, (material, ), (material, )),
+}
+
+print(f"NC: {mesh.number_of_cells()}, p: {args.p}")
+print(f"{'integrator':>12s} {'default':>10s} {'reference':>10s} {'speedup':>8s} {'max error':>10s}")
+
+for name, (Integrator, default_args, reference_args) in cases.items():
+    if name == 'elasticity':
+        space = TensorFunctionSpace(scalar_space, (GD, -1))
+    else:
+        space = scalar_space
+    # The first call computes (or loads) the reference tensor.
+    Integrator(*reference_args, method='reference').assembly(space)
+    A0, t0 = timeit(lambda: Integrator(*default_args))
+    A1, t1 = timeit(lambda: Integrator(*reference_args, method='reference'))
+    error = bm.max(bm.abs(A0 - A1))
+    print(f"{name:>12s} {t0:10.4f} {t1:10.4f} {t0/t1:8.2f} {error:10.3e}")
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        导入时间测试: 在新的 Python 进程中执行常用的导入语句, 统计导入时间,
+        常驻内存的增量, 加载的模块数目以及被加载的重量级依赖 (torch, matplotlib,
+        sympy, vtk, mpi4py 等)
+        """)
+
+parser.add_argument('--repeat',
+        default=5, type=int,
+        help="每条导入语句的重复次数, 取中位数, 默认为 5")
+
+parser.add_argument('--importtime',
+        default=None, type=str,
+        help="给出一条导入语句, 用 -X importtime 列出其中最耗时的模块")
+
+parser.add_argument('--top',
+        default=20, type=int,
+        help="--importtime 列出的模块个数, 默认为 20")
+
+args = parser.parse_args()
+
+STATEMENTS = [
+    "import fealpy",
+    "from fealpy.backend import backend_manager as bm; bm.set_backend('numpy')",
+    "import fealpy.mesh",
+    "from fealpy.mesh import TriangleMesh",
+    "from fealpy.functionspace import LagrangeFESpace",
+    "from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, DirichletBC",
+    "import fealpy.solver",
+]
+
+HEAVY_MODULES = ('torch', 'jax', 'matplotlib', 'sympy', 'scipy', 'scipy.spatial',
+                 'vtk', 'mpi4py', 'tqdm')
+
+SCRIPT = """
+import json, resource, sys, time
+m0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+{statement}
+t1 = time.perf_counter()
+m1 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'time': t1 - t0, 'memory': (m1 - m0) / 1024, 'modules': list(sys.modules)}}))
+"""
+
+
+def run(statement):
+    result = subprocess.run([sys.executable, '-c', SCRIPT.format(statement=statement)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if args.importtime is not None:
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', args.importtime],
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    print(f"{'cumulative (ms)':>16} {'self (ms)':>10}  module")
+    for cumulative_us, self_us, name in rows[:args.top]:
+        print(f"{cumulative_us/1000:16.1f} {self_us/1000:10.1f}  {name}")
+    sys.exit(0)
+
+print(f"{'statement':<76} {'time (s)':>9} {'RSS (MB)':>9} {'modules':>8}  heavy")
+for statement in STATEMENTS:
+    data = [run(statement) for _ in range(args.repeat)]
+    time = statistics.median(d['time'] for d in data)
+    memory = statistics.median(d['memory'] for d in data)
+    modules = data[-1]['modules']
+    heavy = [m for m in HEAVY_MODULES if m in modules]
+    print(f"{statement:<76} {time:9.3f} {memory:9.1f} {len(modules):8d}  {' '.join(heavy)}")
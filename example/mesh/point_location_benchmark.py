@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        点定位性能测试: 在三角形、四边形、四面体和六面体网格上建立均匀网格桶索引,
+        批量查找随机点所在的单元及其局部坐标, 统计索引建立、查询、节点移动后的
+        更新时间, 并检查局部坐标映射回的点与查询点的误差
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch 等")
+
+parser.add_argument('--npoints',
+        default=1000000, type=int,
+        help="查询点的个数, 默认为 10^6")
+
+parser.add_argument('--n2d',
+        default=300, type=int,
+        help="二维网格每个方向的剖分段数, 默认为 300")
+
+parser.add_argument('--n3d',
+        default=30, type=int,
+        help="三维网格每个方向的剖分段数, 默认为 30")
+
+parser.add_argument('--perturb',
+        default=0.2, type=float,
+        help="内部节点随机扰动的幅度 (相对于网格尺寸), 默认为 0.2")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import TriangleMesh, QuadrangleMesh, TetrahedronMesh, HexahedronMesh
+
+
+def perturb(mesh, n, scale, rng):
+    node = bm.to_numpy(mesh.node).copy()
+    inner = ((node > 1e-10) & (node < 1 - 1e-10)).all(axis=1)
+    node[inner] += scale/n * rng.uniform(-1, 1, (inner.sum(), node.shape[1]))
+    return bm.tensor(node, dtype=bm.float64)
+
+
+import numpy as np
+rng = np.random.default_rng(0)
+meshes = [
+    (TriangleMesh, args.n2d, 2),
+    (QuadrangleMesh, args.n2d, 2),
+    (TetrahedronMesh, args.n3d, 3),
+    (HexahedronMesh, args.n3d, 3),
+]
+
+print(f"{'mesh':>16s} {'NC':>9s} {'build':>8s} {'locate':>8s} {'Mpts/s':>8s}"
+      f" {'update':>8s} {'rebuilt':>7s} {'found':>7s} {'error':>9s}")
+for Mesh, n, GD in meshes:
+    mesh = Mesh.from_box([0, 1]*GD, *([n]*GD))
+    mesh.node = perturb(mesh, n, args.perturb, rng)
+    points = bm.tensor(rng.uniform(0, 1, (args.npoints, GD)), dtype=bm.float64)
+
+    start = time.perf_counter()
+    locator = mesh.point_locator()
+    t_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cidx, bc = locator.locate(points)
+    t_locate = time.perf_counter() - start
+
+    found = cidx >= 0
+    error = bm.max(bm.abs(locator.bc_to_point(cidx[found], bc[found]) - points[found]))
+
+    # 节点小幅移动后只更新几何量, 不重建桶
+    mesh.node = mesh.node + 0.01/n * bm.tensor(rng.uniform(-1, 1, mesh.node.shape))
+    start = time.perf_counter()
+    rebuilt = locator.update()
+    t_update = time.perf_counter() - start
+
+    print(f"{Mesh.__name__:>16s} {mesh.number_of_cells():9d} {t_build:8.3f} {t_locate:8.3f}"
+          f" {args.npoints/t_locate/1e6:8.2f} {t_update:8.3f} {rebuilt!s:>7s}"
+          f" {float(bm.mean(bm.astype(found, bm.float64))):7.4f} {float(error):9.2e}")
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        网格拓扑构造性能测试: 比较 flocc 中基于多列 lexsort 的排序与将排序后的
+        顶点元组压缩为 64 位整数键的单键排序, 在三角形、四面体和六面体网格上
+        构造面和边的时间, 并检查两者给出的编号是否一致
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch, jax 等")
+
+parser.add_argument('--n2d',
+        default=1000, type=int,
+        help="二维三角形网格每个方向的剖分段数, 默认为 1000")
+
+parser.add_argument('--n3d',
+        default=60, type=int,
+        help="三维四面体和六面体网格每个方向的剖分段数, 默认为 60")
+
+parser.add_argument('--nrep',
+        default=3, type=int,
+        help="重复次数, 默认为 3")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, HexahedronMesh
+from fealpy.mesh.utils import flocc
+
+
+def timeit(array, method):
+    start = time.perf_counter()
+    for _ in range(args.nrep):
+        out = flocc(array, method=method)
+    return out, (time.perf_counter() - start) / args.nrep
+
+
+meshes = {
+    'triangle': TriangleMesh.from_box([0, 1, 0, 1], nx=args.n2d, ny=args.n2d),
+    'tetrahedron': TetrahedronMesh.from_box([0, 1]*3, nx=args.n3d, ny=args.n3d, nz=args.n3d),
+    'hexahedron': HexahedronMesh.from_box([0, 1]*3, nx=args.n3d, ny=args.n3d, nz=args.n3d),
+}
+
+print(f"{'mesh':>12s} {'entity':>6s} {'rows':>10s} {'lexsort':>9s} {'key':>9s} {'speedup':>8s} {'same':>5s}")
+for name, mesh in meshes.items():
+    entities = {'face': mesh.total_face()}
+    if mesh.TD == 3:
+        entities['edge'] = mesh.total_edge()
+    for ename, total in entities.items():
+        array = bm.sort(total, axis=1)
+        out0, t0 = timeit(array, 'lexsort')
+        out1, t1 = timeit(array, 'key')
+        same = all(bool(bm.all(a == b)) for a, b in zip(out0, out1))
+        print(f"{name:>12s} {ename:>6s} {array.shape[0]:10d} {t0:9.4f} {t1:9.4f}"
+              f" {t0/t1:8.2f} {same!s:>5s}")
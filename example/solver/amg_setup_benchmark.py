@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+import argparse
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        代数多重网格 (AMG) setup 性能测试: 比较经典 Ruge-Stuben 粗化 (逐点循环)
+        与向量化的 PMIS/HMIS 粗化、直接/经典插值、光滑聚集的 setup 时间分解、
+        算子复杂度与 CG 迭代次数
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy, AMG setup 目前只支持 numpy")
+
+parser.add_argument('--n',
+        default=256, type=int,
+        help="单位正方形每个方向的剖分段数, 默认为 256")
+
+parser.add_argument('--p',
+        default=1, type=int,
+        help="拉格朗日有限元空间的次数, 默认为 1 次")
+
+parser.add_argument('--theta',
+        default=0.25, type=float,
+        help="C/F 划分类方法的强连接阈值, 默认为 0.25")
+
+parser.add_argument('--sa-theta',
+        default=0.08, type=float,
+        help="光滑聚集的强连接阈值, 默认为 0.08")
+
+parser.add_argument('--methods',
+        default='rs-direct,pmis-direct,hmis-direct,hmis-classical,sa', type=str,
+        help="逗号分隔的 粗化-插值 组合, 默认比较全部方法")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy import logger
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, LinearForm, ScalarDiffusionIntegrator, ScalarSourceIntegrator
+from fealpy.fem import DirichletBC
+from fealpy.solver import GAMGSolver
+
+logger.setLevel('WARNING')
+
+mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=args.n, ny=args.n)
+space = LagrangeFESpace(mesh, p=args.p)
+bform = BilinearForm(space)
+bform.add_integrator(ScalarDiffusionIntegrator())
+lform = LinearForm(space)
+lform.add_integrator(ScalarSourceIntegrator(1.0))
+A, F = bform.assembly(), lform.assembly()
+A, F = DirichletBC(space, gd=lambda p: bm.zeros(p.shape[:-1])).apply(A, F)
+A = A.tocsr()
+
+print(f"NDof: {A.shape[0]}, nnz: {A.nnz}")
+print(f"{'method':>15s} {'strength':>9s} {'splitting':>9s} {'interp':>9s} {'galerkin':>9s}"
+      f" {'total':>9s} {'levels':>6s} {'complexity':>10s} {'iters':>6s}")
+
+for method in args.methods.split(','):
+    ctype, _, itype = method.partition('-')
+    theta = args.sa_theta if ctype == 'sa' else args.theta
+    solver = GAMGSolver(theta=theta, ctype=ctype, itype=itype or 'direct',
+                        isolver='CG', rtol=1e-8, atol=1e-12)
+    solver.setup(A)
+    timing = solver.setup_timing
+    complexity = sum(a.nnz for a in solver.A) / A.nnz
+    x, info = solver.solve(F)
+    niter = info.get('niter', '-') if isinstance(info, dict) else '-'
+    print(f"{method:>15s} {timing['strength']:9.4f} {timing['splitting']:9.4f}"
+          f" {timing['interpolation']:9.4f} {timing['galerkin']:9.4f} {timing['total']:9.4f}"
+          f" {len(solver.A):6d} {complexity:10.3f} {niter!s:>6s}")
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        Stokes 鞍点问题的块预条件子测试: 在 Taylor-Hood (P2-P1) 元离散上, 保持
+        BlockForm 的各子块分离, 用 AMG 近似速度块的逆, 用压力质量矩阵或最小二乘
+        交换子 (LSC) 近似 Schur 补, 比较块对角 + MINRES 与块上三角 + GMRES 的
+        迭代次数和求解时间随网格加密的变化
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy, AMG 目前只支持 numpy")
+
+parser.add_argument('--n',
+        default=8, type=int,
+        help="初始网格每个方向的剖分段数, 默认为 8")
+
+parser.add_argument('--maxit',
+        default=4, type=int,
+        help="网格加密次数, 默认为 4")
+
+parser.add_argument('--rtol',
+        default=1e-8, type=float,
+        help="Krylov 方法的相对误差, 默认为 1e-8")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+import numpy as np
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.fem import (
+    BilinearForm, BlockForm, ScalarDiffusionIntegrator, ScalarMassIntegrator,
+    PressWorkIntegrator
+)
+from fealpy.sparse import csr_matrix
+from fealpy.solver import (
+    gmres, minres, BlockOperator, BlockDiagonalPreconditioner,
+    BlockTriangularPreconditioner, PressureMassSchur, LSCSchur, block_inverse
+)
+
+
+def to_csr(S):
+    return csr_matrix((bm.tensor(S.data), bm.tensor(S.indices), bm.tensor(S.indptr)),
+                      shape=S.shape)
+
+
+def stokes_system(n):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    pspace = LagrangeFESpace(mesh, p=1)
+    uspace = TensorFunctionSpace(LagrangeFESpace(mesh, p=2), (2, -1))
+
+    A00 = BilinearForm(uspace)
+    A00.add_integrator(ScalarDiffusionIntegrator())
+    A01 = BilinearForm((pspace, uspace))
+    A01.add_integrator(PressWorkIntegrator(coef=-1))
+    op = BlockOperator.from_blockform(BlockForm([[A00, A01], [A01.T, None]]))
+
+    # 速度的齐次 Dirichlet 边界条件: 去掉边界自由度对应的行和列
+    inner = np.nonzero(~bm.to_numpy(uspace.is_boundary_dof()))[0]
+    F = op.block(0, 0).to_scipy()[inner][:, inner]
+    Bt = op.block(0, 1).to_scipy()[inner]
+    op = BlockOperator([[to_csr(F), to_csr(Bt)], [to_csr(Bt.T.tocsr()), None]])
+
+    pm = BilinearForm(pspace)
+    pm.add_integrator(ScalarMassIntegrator())
+    return op, pm.assembly(format='csr')
+
+
+print(f"{'NDof':>8} {'setup':>8} {'PMM-MINRES':>14} {'PMM-GMRES':>14} {'LSC-GMRES':>14}")
+n = args.n
+for i in range(args.maxit):
+    op, Mp = stokes_system(n)
+    nu = op.row_offsets[1]
+    rng = np.random.default_rng(0)
+    b = bm.concatenate([bm.tensor(rng.random(nu)), bm.zeros(op.shape[0] - nu)])
+
+    start = time.perf_counter()
+    Ainv = block_inverse(op.block(0, 0), 'amg')
+    t_setup = time.perf_counter() - start
+
+    cases = [
+        (minres, BlockDiagonalPreconditioner(op, [Ainv, PressureMassSchur(Mp)]), {}),
+        (gmres, BlockTriangularPreconditioner(op, [Ainv, PressureMassSchur(Mp, scale=-1.0)]),
+         {'restart': 50}),
+        (gmres, BlockTriangularPreconditioner(op, [Ainv, LSCSchur(op.block(0, 0), op.block(1, 0))]),
+         {'restart': 50}),
+    ]
+    line = f"{op.shape[0]:>8d} {t_setup:>8.3f}"
+    for solver, P, kwargs in cases:
+        start = time.perf_counter()
+        x, info = solver(op, b, M=P, rtol=args.rtol, atol=1e-14, **kwargs)
+        t = time.perf_counter() - start
+        line += f" {info['niter']:>5d} {t:>8.3f}"
+    print(line)
+    n *= 2
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from scipy.sparse import csr_matrix
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        稀疏矩阵乘法 (SpGEMM) 性能测试: 在不同规模的 Poisson 刚度矩阵上,
+        比较向量化 SpGEMM 引擎与 scipy 的 A @ A 计算时间
+        """)
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch, jax 等")
+
+parser.add_argument('--maxit',
+        default=5, type=int,
+        help="网格加密次数, 默认为 5")
+
+parser.add_argument('--p',
+        default=1, type=int,
+        help="拉格朗日有限元空间的次数, 默认为 1 次")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator
+from fealpy.sparse._spspmm import spgemm_symbolic, spgemm_numeric
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    out = func(*args)
+    return out, time.perf_counter() - start
+
+
+mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=16, ny=16)
+
+print(f"{'NDof':>10} {'nnz(A@A)':>12} {'scipy':>10} {'symbolic':>10} "
+      f"{'numeric':>10} {'engine':>10} {'ratio':>8}")
+
+for i in range(args.maxit):
+    space = LagrangeFESpace(mesh, p=args.p)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=args.p+2))
+    A = bform.assembly(format='csr')
+    crow, col, values, shape = A.crow, A.col, A.values, A.sparse_shape
+
+    S = csr_matrix((bm.to_numpy(values), bm.to_numpy(col), bm.to_numpy(crow)), shape=shape)
+    _, t_scipy = timeit(S.__matmul__, S)
+    pattern, t_sym = timeit(spgemm_symbolic, crow, col, shape, crow, col, shape)
+    _, t_num = timeit(spgemm_numeric, pattern, values, values)
+    t_engine = t_sym + t_num
+
+    print(f"{shape[0]:>10d} {pattern.nnz:>12d} {t_scipy:>10.4f} {t_sym:>10.4f} "
+          f"{t_num:>10.4f} {t_engine:>10.4f} {t_engine/t_scipy:>8.2f}")
+
+    mesh.uniform_refine()
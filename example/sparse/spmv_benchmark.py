@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        稀疏矩阵向量乘法 (SpMV/SpMM) 性能测试: 在不同规模的 Poisson 刚度矩阵上,
+        比较单线程 scipy 核函数、按非零元均衡分块的多线程核函数, 以及只存储上三角
+        部分的对称格式在不同线程数下的计算时间
+        """)
+
+parser.add_argument('--maxit',
+        default=5, type=int,
+        help="网格加密次数, 默认为 5")
+
+parser.add_argument('--p',
+        default=1, type=int,
+        help="拉格朗日有限元空间的次数, 默认为 1 次")
+
+parser.add_argument('--threads',
+        default=[1, 2, 4, 8], type=int, nargs='+',
+        help="测试的线程数, 默认为 1 2 4 8")
+
+parser.add_argument('--nvec',
+        default=1, type=int,
+        help="右端向量的个数, 大于 1 时测试多向量乘法, 默认为 1")
+
+parser.add_argument('--repeat',
+        default=20, type=int,
+        help="每个测试的重复次数, 默认为 20")
+
+args = parser.parse_args()
+bm.set_backend('numpy')
+
+import numpy as np
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator
+from fealpy.sparse import SymmetricCSR, set_num_threads
+from fealpy.sparse._parallel_spmv import parallel_csr_spmm, nnz_balanced_partition
+
+
+def timeit(func, *inputs):
+    func(*inputs)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        func(*inputs)
+    return (time.perf_counter() - start) / args.repeat
+
+
+mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=32, ny=32)
+
+header = f"{'NDof':>10} {'nnz':>10} {'serial':>10}"
+for n in args.threads:
+    header += f" {'csr-'+str(n):>10} {'sym-'+str(n):>10}"
+print(header)
+
+for i in range(args.maxit):
+    space = LagrangeFESpace(mesh, p=args.p)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=args.p+2))
+    A = bform.assembly(format='csr')
+    crow, col, values, shape = A.crow, A.col, A.values, A.sparse_shape
+    xshape = (shape[1],) if args.nvec == 1 else (shape[1], args.nvec)
+    x = np.random.default_rng(0).random(xshape)
+
+    line = f"{shape[0]:>10d} {A.nnz:>10d}"
+    line += f" {timeit(bm.csr_spmm, crow, col, values, shape, x):>10.5f}"
+    for n in args.threads:
+        set_num_threads(n)
+        bounds = nnz_balanced_partition(crow, n)
+        t_csr = timeit(lambda v: parallel_csr_spmm(crow, col, values, shape, v,
+                                                   bounds=bounds), x)
+        S = SymmetricCSR(crow, col, values, shape, nthreads=n)
+        t_sym = timeit(S.matmul, x)
+        line += f" {t_csr:>10.5f} {t_sym:>10.5f}"
+    print(line)
+
+    mesh.uniform_refine()
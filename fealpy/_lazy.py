@@ -0,0 +1,50 @@
+"""Lazy attributes of the FEALPy subpackages.
+
+A subpackage registers the public names it provides together with the
+submodule defining each of them, and imports nothing else up front:
+
+    __getattr__, __dir__, __all__ = attach(__name__, {
+        'TriangleMesh': '.triangle_mesh',
+        'SourceIntegrator': '.cell_source_integrator:CellSourceIntegrator',
+    })
+
+The submodule is imported the first time one of its names is accessed, so that
+`import fealpy.mesh` does not import every mesh type together with the optional
+dependencies used by some of them (matplotlib, vtk, mpi4py, ...).
+"""
+import importlib
+import sys
+from typing import Dict, Callable, List, Tuple, Any
+
+
+def attach(package: str, registry: Dict[str, str]
+           ) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """Build the module level `__getattr__`, `__dir__` and `__all__` of a package.
+
+    Parameters:
+        package (str): the `__name__` of the package.
+        registry (Dict[str, str]): maps the public names to the submodules
+            defining them, relative to the package. A name exported under an
+            alias is written as '.module:name_in_module'.
+
+    Returns:
+        Tuple: the `__getattr__` and `__dir__` functions and the `__all__` list.
+    """
+    __all__ = sorted(registry)
+
+    def __getattr__(name: str) -> Any:
+        target = registry.get(name, None)
+        if target is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        module_name, _, attr = target.partition(':')
+        module = importlib.import_module(module_name, package)
+        value = getattr(module, attr or name)
+        # NOTE: cache the attribute in the package, so `__getattr__` is only
+        # called once per name.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(__all__) | set(sys.modules[package].__dict__))
+
+    return __getattr__, __dir__, __all__
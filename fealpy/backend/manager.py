@@ -1,13 +1,29 @@
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Any, Tuple
 import importlib
 import threading
+import weakref
 
 from ..import logger
 from .base import BackendProxy
 
+_EMPTY: Dict[str, Any] = {}
+# NOTE: The thread-local storage of every manager is also registered here by
+# the id of the manager, so that the fast path in `__getattribute__` does not
+# read any attribute of the manager. torch.compile can not trace such a read
+# inside `__getattribute__`, nor `object.__getattribute__(self, item)`, while
+# `super().__getattribute__(item)` is traced as a plain attribute lookup.
+_LOCALS: Dict[int, threading.local] = {}
+
 
 class BackendManager():
+    """Dispatch attribute access to the backend of the current thread.
+
+    Every backend owns a table of the attributes resolved so far. The table of
+    the current backend is kept in the thread-local storage, so that `bm.xxx`
+    costs two dictionary lookups once `xxx` has been accessed.
+    The tables are cleared when an attribute is set through the manager.
+    """
     # _instance = None
 
     # def __new__(cls, *, default_backend: str):
@@ -17,14 +33,20 @@ class BackendManager():
 
     def __init__(self, *, default_backend: Optional[str]=None):
         self._backends: Dict[str, BackendProxy] = {}
-        self._THREAD_LOCAL = threading.local()
+        local = threading.local()
+        _LOCALS[id(self)] = local
+        self._THREAD_LOCAL = local
         self._default_backend_name = default_backend
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        weakref.finalize(self, _LOCALS.pop, id(self), None)
 
     def set_backend(self, name: str) -> None:
         """Set the current backend."""
         if name not in self._backends:
             self.load_backend(name)
-        self._THREAD_LOCAL.__dict__['backend'] = self._backends[name]
+        local = self._THREAD_LOCAL.__dict__
+        local['backend'] = self._backends[name]
+        local['table'] = self._tables[name]
 
     def load_backend(self, name: str) -> None:
         """Load a backend by name."""
@@ -42,6 +64,7 @@ class BackendManager():
             # Backend proxy instances are singletons as there is no need to load twice.
             backend = BackendProxy._available_backends[name]()
             self._backends[name] = backend
+            self._tables[name] = {}
         else:
             raise RuntimeError(f"Failed to load backend '{name}'.")
 
@@ -60,13 +83,42 @@ class BackendManager():
                         "get backend properties and methods after executing set_backend()")
         return self._THREAD_LOCAL.__dict__['backend']
 
+    def bind(self, *names: str) -> Tuple[Any, ...]:
+        """Resolve attributes of the current backend once.
+
+        Functions called in tight loops can be bound before the loop:
+
+            dot, sqrt = bm.bind('dot', 'sqrt')
+
+        The result belongs to the backend of the calling thread, and must be
+        bound again after `set_backend`.
+        """
+        return tuple(self._resolve(name) for name in names)
+
+    def _resolve(self, item: str):
+        backend = self.get_current_backend("GET_ATTR: " + item)
+        value = getattr(backend, item)
+        self._THREAD_LOCAL.__dict__['table'][item] = value
+        return value
+
+    def __getattribute__(self, item):
+        # NOTE: Fast path. Attributes already resolved by the backend of the
+        # current thread are returned without the failed lookup on the manager
+        # that precedes every call to `__getattr__`.
+        table = _LOCALS[id(self)].__dict__.get('table', _EMPTY)
+        if item in table:
+            return table[item]
+        return super().__getattribute__(item)
+
     def __getattr__(self, item):
         """Redirct attribute access to the current backend."""
-        return getattr(self.get_current_backend("GET_ATTR: " + item), item)
+        return self._resolve(item)
 
     def __setattr__(self, key, value):
         """Redirct attribute access to the current backend."""
-        if key in {'_backends', '_THREAD_LOCAL', '_default_backend_name'}:
+        if key in {'_backends', '_THREAD_LOCAL', '_default_backend_name', '_tables'}:
             super().__setattr__(key, value)
         else:
             setattr(self.get_current_backend("SET_ATTR: " + key), key, value)
+            for table in self._tables.values():
+                table.clear()
@@ -64,6 +64,7 @@ class BackendManager():
     def set_backend(self, name: str) -> None: ... # instance method
     def load_backend(self, name: str) -> None: ... # instance method
     def get_current_backend(self) -> BackendProxy: ... # instance method
+    def bind(self, *names: str) -> Tuple[Any, ...]: ... # instance method
 
     ### constants ###
 
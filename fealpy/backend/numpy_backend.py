@@ -7,9 +7,7 @@ from itertools import combinations_with_replacement
 
 import numpy as np
 from numpy.typing import NDArray
-from scipy.spatial import KDTree
 from numpy.linalg import det
-from scipy.sparse._sparsetools import coo_matvec, csr_matvec, csr_matvecs, coo_tocsr
 
 from .base import (
     ModuleProxy, BackendProxy,
@@ -155,6 +153,7 @@ class NumPyBackend(BackendProxy, backend_name='numpy'):
     ### Sparse Functions ###
     @staticmethod
     def coo_spmm(indices, values, shape, other):
+        from scipy.sparse._sparsetools import coo_matvec
         nnz = values.shape[-1]
         row = indices[0]
         col = indices[1]
@@ -179,6 +178,7 @@ class NumPyBackend(BackendProxy, backend_name='numpy'):
 
     @staticmethod
     def csr_spmm(crow, col, values, shape, other):
+        from scipy.sparse._sparsetools import csr_matvec, csr_matvecs
         M, N = shape
 
         if values.ndim == 1:
@@ -208,6 +208,7 @@ class NumPyBackend(BackendProxy, backend_name='numpy'):
 
     @staticmethod
     def coo_tocsr(indices, values, shape):
+        from scipy.sparse._sparsetools import coo_tocsr
         M, N = shape
         idx_dtype = indices.dtype
         major, minor = indices
@@ -221,6 +222,7 @@ class NumPyBackend(BackendProxy, backend_name='numpy'):
 
     @staticmethod
     def query_point(x, y, h, box_size, mask_self=True, periodic=[True, True, True]):
+        from scipy.spatial import KDTree
         if not isinstance(periodic, list) or len(periodic) != 3 or not all(isinstance(p, bool) for p in periodic):
             raise TypeError("periodic type is：[bool, bool, bool]")
         def map_points(a, b, r, positions):
@@ -3,7 +3,6 @@ from typing import Union, Optional, Tuple, Any
 from itertools import combinations_with_replacement
 from functools import reduce, partial
 from math import factorial, prod
-from scipy.spatial import KDTree
 
 try:
     import torch
@@ -554,6 +553,7 @@ class PyTorchBackend(BackendProxy, backend_name='pytorch'):
 
     @staticmethod
     def query_point(x, y, h, box_size, mask_self=True, periodic=[True, True, True]):
+        from scipy.spatial import KDTree
         if not isinstance(periodic, list) or len(periodic) != 3 or not all(isinstance(p, bool) for p in periodic):
             raise TypeError("periodic type is：[bool, bool, bool]")
         def map_points(a, b, r, positions):
@@ -8,6 +8,56 @@ from ..backend import backend_manager as bm
 
 import warnings
 
+from .fdtd_recorder import FieldRecorder
+
+
+def _diff(a, axis, out):
+    """out <- forward difference of `a` along `axis`."""
+    hi = [slice(None)] * a.ndim
+    lo = [slice(None)] * a.ndim
+    hi[axis] = slice(1, None)
+    lo[axis] = slice(None, -1)
+    return bm.subtract(a[tuple(hi)], a[tuple(lo)], out=out)
+
+
+def _curl_2d(Hx, Hy, out):
+    """out <- dHy/dx - dHx/dy at the interior nodes."""
+    bm.subtract(Hy[1:, 1:-1], Hy[:-1, 1:-1], out=out)
+    bm.subtract(out, Hx[1:-1, 1:], out=out)
+    return bm.add(out, Hx[1:-1, :-1], out=out)
+
+
+def _interior_3d(F):
+    """Views of the edge components without their tangential boundary layers."""
+    return {'x': F['x'][:, 1:-1, 1:-1],
+            'y': F['y'][1:-1, :, 1:-1],
+            'z': F['z'][1:-1, 1:-1, :]}
+
+
+def _curl_e_3d(E, out, tmp):
+    """out <- curl E on the faces, `tmp` is scratch shaped like `out`."""
+    _diff(E['z'], 1, out['x']); _diff(E['y'], 2, tmp['x'])
+    _diff(E['x'], 2, out['y']); _diff(E['z'], 0, tmp['y'])
+    _diff(E['y'], 0, out['z']); _diff(E['x'], 1, tmp['z'])
+    for c in 'xyz':
+        bm.subtract(out[c], tmp[c], out=out[c])
+    return out
+
+
+def _curl_h_3d(H, out, tmp):
+    """out <- curl H on the interior edges, `tmp` is scratch shaped like `out`."""
+    Hx, Hy, Hz = H['x'], H['y'], H['z']
+    bm.subtract(Hz[:, 1:, 1:-1], Hz[:, :-1, 1:-1], out=out['x'])
+    bm.subtract(Hy[:, 1:-1, 1:], Hy[:, 1:-1, :-1], out=tmp['x'])
+    bm.subtract(Hx[1:-1, :, 1:], Hx[1:-1, :, :-1], out=out['y'])
+    bm.subtract(Hz[1:, :, 1:-1], Hz[:-1, :, 1:-1], out=tmp['y'])
+    bm.subtract(Hy[1:, 1:-1, :], Hy[:-1, 1:-1, :], out=out['z'])
+    bm.subtract(Hx[1:-1, 1:, :], Hx[1:-1, :-1, :], out=tmp['z'])
+    for c in 'xyz':
+        bm.subtract(out[c], tmp[c], out=out[c])
+    return out
+
+
 class EMFDTDSim:
     # electromagnetics FDTD method simulation
     def __init__(self, mesh, NT=200, R=None, permittivity=1, permeability=1,dt=None,device=None):
@@ -474,8 +524,11 @@ class EMFDTDSim:
             else:
                 continue  # unknown type
 
-            # Find grid index and inject
-            idx = self.node_location(bm.asarray(src['position'], device=self.device))
+            # Find grid index (cached with the grid it was located on) and inject
+            key = (self.mesh.nx, self.mesh.ny, getattr(self.mesh, 'nz', 0), float(self.h))
+            if src.get('_index', (None,))[0] != key:
+                src['_index'] = (key, self.node_location(bm.asarray(src['position'], device=self.device)))
+            idx = src['_index'][1]
             if self.dim == 2:
                 Ez[idx] += source_value * inv_eta0
             else:
@@ -650,17 +703,47 @@ class EMFDTDSim:
             ('PEC',  2): self._update_2d_pec,
             ('PEC',  3): self._update_3d_pec,
         }
+        self._fast_update_methods = {
+            ('UPML', 2): self._fast_update_2d_upml,
+            ('UPML', 3): self._fast_update_3d_upml,
+            ('PEC',  2): self._fast_update_2d_pec,
+            ('PEC',  3): self._fast_update_3d_pec,
+        }
 
-    def run(self, time=None, step=1):
+    def run(self, time=None, step=1, *, engine='default', recorder=None):
+        """
+        Run the time loop and store every `step`-th frame in `self.E` and `self.H`.
 
+        Args:
+            time (int, optional): number of time steps, defaults to `self.NT`.
+            step (int): interval between two stored frames.
+            engine (str): 'default' or 'fast'. The 'fast' engine updates the
+                fields in place with `out=` kernels and preallocated buffers,
+                swaps the (previous, current) buffers of the UPML auxiliary
+                fields instead of copying them, and hands the frames to
+                `recorder`. It requires a backend with `out=` support
+                (numpy, pytorch).
+            recorder (FieldRecorder, optional): where the 'fast' engine stores
+                the frames, e.g. `MemmapRecorder(path)` to stream them to disk.
+                Defaults to an in-memory `FieldRecorder`.
+        """
         self.apply_objects()
         self.get_perm_matrix()
         time = self.NT if time is None else time
+        if engine == 'default':
+            methods = self._update_methods
+        elif engine == 'fast':
+            methods = self._fast_update_methods
+        else:
+            raise ValueError(f"Unknown engine '{engine}', expected 'default' or 'fast'")
         try:
-            fn = self._update_methods[(self.boundary_condition, self.dim)]
+            fn = methods[(self.boundary_condition, self.dim)]
         except KeyError:
             raise ValueError(f"Unsupported BC/dim: {self.boundary_condition}/{self.dim}")
-        fn(time, step)
+        if engine == 'fast':
+            fn(time, step, FieldRecorder() if recorder is None else recorder)
+        else:
+            fn(time, step)
 
     # ------- 公共辅助 -------
 
@@ -696,7 +779,26 @@ class EMFDTDSim:
         
         return sigma_func
 
-    def _update_2d_upml(self,time=None,step = 1):
+    def upml_coefficients(self):
+        """
+        Return the UPML update coefficients of the current dimension.
+
+        The coefficients only depend on the PML parameters and the grid, so they
+        are cached and reused by later runs until one of them changes.
+        """
+        mesh = self.mesh
+        key = (self.dim, self.m, self.ng, float(self.R), float(self.h),
+               mesh.nx, mesh.ny, getattr(mesh, 'nz', 0), str(self.device))
+        cache = getattr(self, '_upml_cache', None)
+        if cache is None or cache[0] != key:
+            if self.dim == 2:
+                coef = self._upml_coefficients_2d()
+            else:
+                coef = self._upml_coefficients_3d()
+            self._upml_cache = (key, coef)
+        return self._upml_cache[1]
+
+    def _upml_coefficients_2d(self):
 
         R=self.R
         h=self.h
@@ -733,9 +835,15 @@ class EMFDTDSim:
         c11 = (2 - sy0[1:-1, 1:-1] * R * h) / (2 + sy0[1:-1, 1:-1] * R * h)
         c12 = 2 / (2 + sy0[1:-1, 1:-1] * R * h)
 
+        return c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12
+
+    def _update_2d_upml(self,time=None,step = 1):
+
+        c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12 = self.upml_coefficients()
+
         for n in range(time+1):
             if n == 0:
-                num=(time + 1)//step
+                num=time//step + 1
 
                 E_comps = ['z']
                 H_comps = ['x', 'y']
@@ -775,7 +883,7 @@ class EMFDTDSim:
         self.H['y'] = H_data['y']
 
 
-    def _update_3d_upml(self,time,step):
+    def _upml_coefficients_3d(self):
 
         m=self.m
         ng=self.ng
@@ -852,10 +960,18 @@ class EMFDTDSim:
         c29 = (2 + sz5[1:-1, 1:-1, :] * R * h) / (2 + sx5[1:-1, 1:-1, :] * R * h)
         c30 = (2 - sz5[1:-1, 1:-1, :] * R * h) / (2 + sx5[1:-1, 1:-1, :] * R * h)
 
+        return (c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12, c13, c14, c15,
+                c16, c17, c18, c19, c20, c21, c22, c23, c24, c25, c26, c27, c28, c29, c30)
+
+    def _update_3d_upml(self,time,step):
+
+        (c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12, c13, c14, c15,
+         c16, c17, c18, c19, c20, c21, c22, c23, c24, c25, c26, c27, c28, c29, c30) = self.upml_coefficients()
+
         for n in range(time+1):
             
             if n == 0:
-                num=(time + 1)//step
+                num=time//step + 1
                 comps = ['x', 'y', 'z']
 
                 E, E_data = self._init_fields_dict('E', comps, num_frames=num)
@@ -908,7 +1024,7 @@ class EMFDTDSim:
         for n in range(time+1):
 
             if n == 0:
-                num=(time + 1)//step
+                num=time//step + 1
                 E_comps = ['z']
                 H_comps = ['x', 'y']
                 E, E_data = self._init_fields_dict('E', E_comps, num_frames=num,axis_type=None)
@@ -939,7 +1055,7 @@ class EMFDTDSim:
 
         for n in range(time+1):
             if n == 0:
-                num = (time + 1)//step
+                num = time//step + 1
                 comps = ['x', 'y', 'z']
 
                 E, E_data = self._init_fields_dict('E', comps, num_frames=num,axis_type=None)
@@ -982,6 +1098,228 @@ class EMFDTDSim:
             self.E[c] = E_data[c]*self.eta0
             self.H[c] = H_data[c]  
 
+#################################### 原位更新引擎 #############################################
+
+    def _fast_init_fields(self, field, comps, pair=False):
+        """Independent field buffers for the fast engine, (prev, curr) if `pair`."""
+        fields, _ = self._init_fields_dict(field, comps, num_frames=0, axis_type=None)
+        fields = {c: bm.copy(v) for c, v in fields.items()}
+        if pair:
+            return {c: [v, bm.copy(v)] for c, v in fields.items()}
+        return fields
+
+    def _fast_open(self, recorder, E, H, time, step):
+        shapes = {f'E_{c}': tuple(v.shape) for c, v in E.items()}
+        shapes.update({f'H_{c}': tuple(v.shape) for c, v in H.items()})
+        any_field = next(iter(E.values()))
+        recorder.open(shapes, time // step + 1, dtype=any_field.dtype, device=self.device)
+        self._fast_record(recorder, 0, step, E, H)
+
+    def _fast_record(self, recorder, n, step, E, H):
+        if n % step == 0:
+            idx = n // step
+            for c, v in E.items():
+                recorder.write(f'E_{c}', idx, v, scale=self.eta0)
+            for c, v in H.items():
+                recorder.write(f'H_{c}', idx, v)
+
+    def _fast_close(self, recorder, E, H):
+        data = recorder.close()
+        for c in E:
+            self.E[c] = data[f'E_{c}']
+        for c in H:
+            self.H[c] = data[f'H_{c}']
+
+    def _fast_update_2d_pec(self, time, step, recorder):
+        R = self.R
+        E = self._fast_init_fields('E', ['z'])
+        H = self._fast_init_fields('H', ['x', 'y'])
+        Ez, Hx, Hy = E['z'], H['x'], H['y']
+        Ez_in = Ez[1:-1, 1:-1]
+
+        ax = R * self.inverse_permeability_x
+        ay = R * self.inverse_permeability_y
+        az = R * self.inverse_permittivity_z[1:-1, 1:-1]
+        tx, ty, tz = bm.empty_like(Hx), bm.empty_like(Hy), bm.empty_like(Ez_in)
+
+        self._fast_open(recorder, E, H, time, step)
+        for n in range(1, time + 1):
+            bm.multiply(_diff(Ez, 1, tx), ax, out=tx)
+            bm.subtract(Hx, tx, out=Hx)
+            bm.multiply(_diff(Ez, 0, ty), ay, out=ty)
+            bm.add(Hy, ty, out=Hy)
+
+            _curl_2d(Hx, Hy, tz)
+            bm.multiply(tz, az, out=tz)
+            bm.add(Ez_in, tz, out=Ez_in)
+
+            self.apply_sources(n, Ez=Ez)
+            self._fast_record(recorder, n, step, E, H)
+        self._fast_close(recorder, E, H)
+
+    def _fast_update_2d_upml(self, time, step, recorder):
+        c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12 = self.upml_coefficients()
+        E = self._fast_init_fields('E', ['z'])
+        H = self._fast_init_fields('H', ['x', 'y'])
+        D = self._fast_init_fields('E', ['z'], pair=True)
+        B = self._fast_init_fields('H', ['x', 'y'], pair=True)
+        Ez, Hx, Hy = E['z'], H['x'], H['y']
+        Ez_in = Ez[1:-1, 1:-1]
+
+        # Coefficients combined with the material parameters once per run.
+        a5, a6 = self.inverse_permeability_x * c5, self.inverse_permeability_x * c6
+        a7, a8 = self.inverse_permeability_y * c7, self.inverse_permeability_y * c8
+        a12 = c12 * self.inverse_permittivity_z[1:-1, 1:-1]
+        tx, ty, tz = bm.empty_like(Hx), bm.empty_like(Hy), bm.empty_like(Ez_in)
+        sx, sy = bm.empty_like(Hx), bm.empty_like(Hy)
+
+        self._fast_open(recorder, E, H, time, step)
+        for n in range(1, time + 1):
+            (Bx0, Bx1), (By0, By1), (Dz0, Dz1) = B['x'], B['y'], D['z']
+            Dz0_in, Dz1_in = Dz0[1:-1, 1:-1], Dz1[1:-1, 1:-1]
+
+            # B = c1 B - c2 dEz/dy, B = c3 B + c4 dEz/dx
+            bm.multiply(_diff(Ez, 1, tx), c2, out=tx)
+            bm.multiply(Bx0, c1, out=Bx1)
+            bm.subtract(Bx1, tx, out=Bx1)
+            bm.multiply(_diff(Ez, 0, ty), c4, out=ty)
+            bm.multiply(By0, c3, out=By1)
+            bm.add(By1, ty, out=By1)
+
+            # H += mu^-1 (c5 B1 - c6 B0)
+            bm.multiply(Bx1, a5, out=tx)
+            bm.multiply(Bx0, a6, out=sx)
+            bm.add(Hx, bm.subtract(tx, sx, out=tx), out=Hx)
+            bm.multiply(By1, a7, out=ty)
+            bm.multiply(By0, a8, out=sy)
+            bm.add(Hy, bm.subtract(ty, sy, out=ty), out=Hy)
+
+            # D = c9 D + c10 curl H
+            bm.multiply(_curl_2d(Hx, Hy, tz), c10, out=tz)
+            bm.multiply(Dz0_in, c9, out=Dz1_in)
+            bm.add(Dz1_in, tz, out=Dz1_in)
+
+            # E = c11 E + c12 eps^-1 (D1 - D0)
+            bm.multiply(bm.subtract(Dz1_in, Dz0_in, out=tz), a12, out=tz)
+            bm.multiply(Ez_in, c11, out=Ez_in)
+            bm.add(Ez_in, tz, out=Ez_in)
+
+            self.apply_sources(n, Ez=Ez)
+
+            # NOTE: the current buffers become the previous ones; the interior
+            # of the old ones is overwritten by the next step, and their
+            # boundary values are never updated.
+            for F in (B['x'], B['y'], D['z']):
+                F.reverse()
+            self._fast_record(recorder, n, step, E, H)
+        self._fast_close(recorder, E, H)
+
+    def _fast_update_3d_pec(self, time, step, recorder):
+        R = self.R
+        comps = ['x', 'y', 'z']
+        E = self._fast_init_fields('E', comps)
+        H = self._fast_init_fields('H', comps)
+        E_in = _interior_3d(E)
+
+        aH = {'x': R * self.inverse_permeability_x,
+              'y': R * self.inverse_permeability_y,
+              'z': R * self.inverse_permeability_z}
+        aE = {c: R * v for c, v in _interior_3d({
+              'x': self.inverse_permittivity_x,
+              'y': self.inverse_permittivity_y,
+              'z': self.inverse_permittivity_z}).items()}
+        tH = {c: bm.empty_like(H[c]) for c in comps}
+        sH = {c: bm.empty_like(H[c]) for c in comps}
+        tE = {c: bm.empty_like(E_in[c]) for c in comps}
+        sE = {c: bm.empty_like(E_in[c]) for c in comps}
+
+        self._fast_open(recorder, E, H, time, step)
+        for n in range(1, time + 1):
+            _curl_e_3d(E, tH, sH)
+            for c in comps:
+                bm.multiply(tH[c], aH[c], out=tH[c])
+                bm.subtract(H[c], tH[c], out=H[c])
+
+            _curl_h_3d(H, tE, sE)
+            for c in comps:
+                bm.multiply(tE[c], aE[c], out=tE[c])
+                bm.add(E_in[c], tE[c], out=E_in[c])
+
+            self.apply_sources(n, E['x'], E['y'], E['z'])
+            self._fast_record(recorder, n, step, E, H)
+        self._fast_close(recorder, E, H)
+
+    def _fast_update_3d_upml(self, time, step, recorder):
+        c = self.upml_coefficients()
+        comps = ['x', 'y', 'z']
+        E = self._fast_init_fields('E', comps, pair=True)
+        H = self._fast_init_fields('H', comps, pair=True)
+        D = self._fast_init_fields('E', comps, pair=True)
+        B = self._fast_init_fields('H', comps, pair=True)
+
+        ipH = {'x': self.inverse_permeability_x,
+               'y': self.inverse_permeability_y,
+               'z': self.inverse_permeability_z}
+        ipE = _interior_3d({'x': self.inverse_permittivity_x,
+                            'y': self.inverse_permittivity_y,
+                            'z': self.inverse_permittivity_z})
+        # (B0, -curl E), (H0, B1, B0), (D0, curl H), (E0, D1, D0) coefficients
+        cB = {k: (c[2*i], c[2*i+1]) for i, k in enumerate(comps)}
+        cH = {k: (c[6+3*i], ipH[k] * c[7+3*i], ipH[k] * c[8+3*i]) for i, k in enumerate(comps)}
+        cD = {k: (c[15+2*i], c[16+2*i]) for i, k in enumerate(comps)}
+        cE = {k: (c[21+3*i], ipE[k] * c[22+3*i], ipE[k] * c[23+3*i]) for i, k in enumerate(comps)}
+
+        tH = {k: bm.empty_like(H[k][0]) for k in comps}
+        sH = {k: bm.empty_like(H[k][0]) for k in comps}
+        E_shape = _interior_3d({k: E[k][0] for k in comps})
+        tE = {k: bm.empty_like(E_shape[k]) for k in comps}
+        sE = {k: bm.empty_like(E_shape[k]) for k in comps}
+
+        current = lambda F: {k: F[k][1] for k in comps}
+        self._fast_open(recorder, current(E), current(H), time, step)
+        for n in range(1, time + 1):
+            E0 = {k: E[k][0] for k in comps}
+            H1 = current(H)
+
+            _curl_e_3d(E0, tH, sH)
+            for k in comps:
+                (B0, B1), (H0, _), (c0, c1) = B[k], H[k], cB[k]
+                bm.multiply(tH[k], c1, out=tH[k])
+                bm.multiply(B0, c0, out=B1)
+                bm.subtract(B1, tH[k], out=B1)
+                # H1 = c H0 + mu^-1 (c' B1 - c'' B0)
+                h0, h1, h2 = cH[k]
+                bm.multiply(H0, h0, out=H1[k])
+                bm.add(H1[k], bm.multiply(B1, h1, out=tH[k]), out=H1[k])
+                bm.subtract(H1[k], bm.multiply(B0, h2, out=tH[k]), out=H1[k])
+
+            _curl_h_3d(H1, tE, sE)
+            D0_in = _interior_3d({k: D[k][0] for k in comps})
+            D1_in = _interior_3d({k: D[k][1] for k in comps})
+            E0_in = _interior_3d(E0)
+            E1_in = _interior_3d(current(E))
+            for k in comps:
+                d0, d1 = cD[k]
+                bm.multiply(tE[k], d1, out=tE[k])
+                bm.multiply(D0_in[k], d0, out=D1_in[k])
+                bm.add(D1_in[k], tE[k], out=D1_in[k])
+                # E1 = c E0 + eps^-1 (c' D1 - c'' D0)
+                e0, e1, e2 = cE[k]
+                bm.multiply(E0_in[k], e0, out=E1_in[k])
+                bm.add(E1_in[k], bm.multiply(D1_in[k], e1, out=tE[k]), out=E1_in[k])
+                bm.subtract(E1_in[k], bm.multiply(D0_in[k], e2, out=tE[k]), out=E1_in[k])
+
+            E1 = current(E)
+            self.apply_sources(n, E1['x'], E1['y'], E1['z'])
+            # NOTE: the sources may touch the boundary values, which are not
+            # recomputed, so they are also added to the buffers reused next.
+            self.apply_sources(n, E0['x'], E0['y'], E0['z'])
+            self._fast_record(recorder, n, step, E1, H1)
+            for F in (E, H, D, B):
+                for k in comps:
+                    F[k].reverse()
+        self._fast_close(recorder, E1, H1)
+
 #################################### 可视化 #############################################
  
     def show_animation(self,
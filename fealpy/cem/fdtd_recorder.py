@@ -0,0 +1,88 @@
+"""Snapshot recorders of the FDTD fields.
+
+A recorder receives every `step`-th frame of the field components during an
+EMFDTDSim run. `FieldRecorder` keeps them in memory, which is what the default
+engine does. `MemmapRecorder` writes them to `.npy` files on disk through
+memory maps, so the history of large 3D domains and long runs does not need to
+fit in RAM: only the pages of the frames being written stay resident.
+"""
+import os
+from typing import Dict, Tuple, Optional, Any
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+
+class FieldRecorder():
+    """Keep the snapshots in backend arrays of shape (num_frames, ...)."""
+    def __init__(self) -> None:
+        self.data: Dict[str, Any] = {}
+
+    def open(self, shapes: Dict[str, Tuple[int, ...]], num_frames: int,
+             dtype=None, device=None) -> None:
+        """Allocate the storage of every component, e.g. shapes = {'E_z': (nx+1, ny+1)}."""
+        self.data = {name: bm.zeros((num_frames,) + tuple(shape), dtype=dtype, device=device)
+                     for name, shape in shapes.items()}
+
+    def write(self, name: str, index: int, value: TensorLike,
+              scale: Optional[float]=None) -> None:
+        """Store `value` (multiplied by `scale`) as the frame `index` of `name`."""
+        self.data[name][index] = value if scale is None else value * scale
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the recording and return the snapshots of every component."""
+        return self.data
+
+
+class MemmapRecorder(FieldRecorder):
+    """Stream the snapshots to `<directory>/<name>.npy` files.
+
+    Parameters:
+        directory (str): output directory, created if it does not exist.
+        flush_every (int, optional): flush the maps to disk every `flush_every`
+            frames. Defaults to 16.
+
+    The files are standard `.npy` arrays; after the run, `close` returns
+    read-only memory maps of them, and `numpy.load(path, mmap_mode='r')` reopens
+    them later. Backend tensors are moved to the host frame by frame.
+    """
+    def __init__(self, directory: str, flush_every: int=16) -> None:
+        super().__init__()
+        self.directory = directory
+        self.flush_every = max(int(flush_every), 1)
+        self.paths: Dict[str, str] = {}
+        self._written = 0
+
+    def open(self, shapes: Dict[str, Tuple[int, ...]], num_frames: int,
+             dtype=None, device=None) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        np_dtype = np.float64 if dtype is None else np.dtype(str(dtype).split('.')[-1])
+        self.data = {}
+        self.paths = {}
+        for name, shape in shapes.items():
+            path = os.path.join(self.directory, f"{name}.npy")
+            self.paths[name] = path
+            self.data[name] = np.lib.format.open_memmap(
+                path, mode='w+', dtype=np_dtype, shape=(num_frames,) + tuple(shape))
+        self._written = 0
+
+    def write(self, name: str, index: int, value: TensorLike,
+              scale: Optional[float]=None) -> None:
+        frame = self.data[name][index]
+        value = bm.to_numpy(value)
+        if scale is None:
+            frame[...] = value
+        else:
+            np.multiply(value, scale, out=frame)
+        self._written += 1
+        if self._written % (self.flush_every * len(self.data)) == 0:
+            for mm in self.data.values():
+                mm.flush()
+
+    def close(self) -> Dict[str, Any]:
+        for mm in self.data.values():
+            mm.flush()
+        self.data = {name: np.load(path, mmap_mode='r') for name, path in self.paths.items()}
+        return self.data
@@ -4,6 +4,7 @@ from fealpy.mesh.node_mesh import NodeMesh, Space
 from fealpy.cfd.simulation.sph.sph_base import SPHQueryKernel, Kernel
 from fealpy.cfd.simulation.sph.equation_solver import EquationSolver
 from fealpy.cfd.simulation.sph.processing_technology import ProcessingTechnology
+from fealpy.cfd.simulation.sph.fused_kernel import FusedSPHKernel
 from fealpy.cfd.simulation.utils import VTKWriter
 
 dx = 0.02
@@ -11,6 +12,7 @@ dt = 0.00045454545454545455
 h = dx
 box_size = bm.array([1.0, 0.2 + dx*3*2], dtype=bm.float64) #模拟区域
 path = "./"
+use_fused = False  # 使用 FusedSPHKernel 融合计算每步的粒子对项
 
 mesh = NodeMesh.from_heat_transfer_domain(dx=dx,dy=dx)
 solver = EquationSolver()
@@ -40,6 +42,7 @@ grad_w, grad_w_norm = sph_query.compute_kernel_gradient(self_node, neighbors)
 
 mesh.nodedata["p"] = solver.state_equation("tait_eos", mesh.nodedata, X=5.0)
 mesh.nodedata = tech.boundary_conditions(mesh.nodedata, box_size, dx=dx)
+fused = FusedSPHKernel()
 
 for i in range(1000):
     print("i:", i)
@@ -62,28 +65,32 @@ for i in range(1000):
     grad_w, grad_w_norm = sph_query.compute_kernel_gradient(self_node, neighbors)
 
     g_ext = tech.external_acceleration(mesh.nodedata["position"], box_size, dx=dx)
-    wall_mask = bm.where(bm.isin(mesh.nodedata["tag"], bm.array([1, 3])), 1.0, 0.0)
-    fluid_mask = bm.where(mesh.nodedata["tag"] == 0, 1.0, 0.0) > 0.5
-    rho_summation = solver.mass_equation_solve(0, mesh.nodedata, neighbors, w)
-    rho = bm.where(fluid_mask, rho_summation, mesh.nodedata["rho"])
+    if use_fused:
+        fused.set_pairs(mesh.nodedata, neighbors, self_node, dr, dist, w, grad_w_norm)
+        mesh.nodedata = fused.forward(mesh.nodedata, g_ext, dt, with_temperature=True)
+    else:
+        wall_mask = bm.where(bm.isin(mesh.nodedata["tag"], bm.array([1, 3])), 1.0, 0.0)
+        fluid_mask = bm.where(mesh.nodedata["tag"] == 0, 1.0, 0.0) > 0.5
+        rho_summation = solver.mass_equation_solve(0, mesh.nodedata, neighbors, w)
+        rho = bm.where(fluid_mask, rho_summation, mesh.nodedata["rho"])
     
-    p = solver.state_equation("tait_eos", mesh.nodedata, rho=rho, X=5.0)
-    pb = solver.state_equation("tait_eos", mesh.nodedata, rho=bm.zeros_like(p), X=5.0)
-    p, rho, mv, tv, T = tech.enforce_wall_boundary(mesh.nodedata, p, g_ext, neighbors, self_node, w, dr, with_temperature=True)
-    mesh.nodedata["rho"] = rho
-    mesh.nodedata["mv"] = mv
-    mesh.nodedata["tv"] = tv
+        p = solver.state_equation("tait_eos", mesh.nodedata, rho=rho, X=5.0)
+        pb = solver.state_equation("tait_eos", mesh.nodedata, rho=bm.zeros_like(p), X=5.0)
+        p, rho, mv, tv, T = tech.enforce_wall_boundary(mesh.nodedata, p, g_ext, neighbors, self_node, w, dr, with_temperature=True)
+        mesh.nodedata["rho"] = rho
+        mesh.nodedata["mv"] = mv
+        mesh.nodedata["tv"] = tv
     
-    T += dt * mesh.nodedata["dTdt"]
-    mesh.nodedata["T"] = T
-    mesh.nodedata["dTdt"] = solver.heat_equation_solve(0, mesh.nodedata, dr, dist, neighbors, self_node, grad_w)
+        T += dt * mesh.nodedata["dTdt"]
+        mesh.nodedata["T"] = T
+        mesh.nodedata["dTdt"] = solver.heat_equation_solve(0, mesh.nodedata, dr, dist, neighbors, self_node, grad_w)
     
-    mesh.nodedata["dmvdt"] = solver.momentum_equation_solve(0,\
-        mesh.nodedata, neighbors, self_node, dr, dist, grad_w_norm, p)
-    mesh.nodedata["dmvdt"] = mesh.nodedata["dmvdt"] + g_ext
-    mesh.nodedata["p"] = p
-    mesh.nodedata["dtvdt"] = solver.momentum_equation_solve(1,\
-        mesh.nodedata, neighbors, self_node, dr, dist, grad_w_norm, pb)
+        mesh.nodedata["dmvdt"] = solver.momentum_equation_solve(0,\
+            mesh.nodedata, neighbors, self_node, dr, dist, grad_w_norm, p)
+        mesh.nodedata["dmvdt"] = mesh.nodedata["dmvdt"] + g_ext
+        mesh.nodedata["p"] = p
+        mesh.nodedata["dtvdt"] = solver.momentum_equation_solve(1,\
+            mesh.nodedata, neighbors, self_node, dr, dist, grad_w_norm, pb)
     mesh.nodedata = tech.boundary_conditions(mesh.nodedata, box_size, dx=dx)
 
     #zfname = path + 'test_'+ str(i+1).zfill(10) + '.vtk'
@@ -0,0 +1,233 @@
+from fealpy.backend import backend_manager as bm
+
+EPS = bm.finfo(float).eps
+
+def _take(S, index):
+    """Gather the columns `index` of the particle fields S of shape (K, N)"""
+    if bm.backend_name == 'pytorch':
+        return S[:, index]
+    # numpy 的 take 比花式索引快, 邻居编号无序时快两倍以上
+    return bm.take(S, index, axis=1)
+
+def _dot(a, b):
+    """Row-wise dot product of fields of shape (GD, P)"""
+    # 逐分量相加, 避免沿短的第 0 轴做规约
+    result = a[0] * b[0]
+    for d in range(1, a.shape[0]):
+        result = result + a[d] * b[d]
+    return result
+
+class FusedSPHKernel:
+    """Fused per-step SPH pair kernels over a persistent pair buffer.
+
+    `EquationSolver` and `ProcessingTechnology` gather every particle field
+    again for each physics term and scatter each term into a fresh
+    `zeros_like` array. Here the pair data of a step are gathered once, the
+    terms that can be evaluated together share one pass and one scatter, and
+    the scatters go into accumulators that are kept between the steps:
+
+    1. density summation;
+    2. wall extrapolation of velocity, pressure and temperature;
+    3. momentum, transport velocity and heat contributions.
+
+    The pair convention follows `EquationSolver`: `i` receives the
+    contribution of its neighbor `j` and `dr = r_i - r_j`, i.e. `i` is the
+    `neighbors` and `j` the `self_node` returned by `SPHQueryKernel.find_node`.
+
+    With `compile=True` the pair passes are compiled with `bm.compile` on the
+    jax and pytorch backends, and the pair buffer is padded to a capacity that
+    only grows, so the compiled functions see a fixed shape between the
+    neighbor list rebuilds. The option has no effect on the numpy backend.
+    """
+    def __init__(self, c0=10.0, rho0=1.0, gamma=1.0, X=5.0, p0=100.0,
+                 compile=False, growth=1.25):
+        self.c0 = c0              # 声速
+        self.rho0 = rho0          # 参考密度
+        self.gamma = gamma
+        self.X = X                # 背景压力
+        self.p0 = p0              # 壁面粒子由压力反算密度的参考压力
+        self.growth = growth
+        self.capacity = 0
+        self.num_pairs = 0
+        self.buffer = {}
+        self._accumulators = {}
+
+        self.compiled = compile and bm.backend_name in ('jax', 'pytorch')
+        self._wall_rows = self.wall_rows
+        self._force_rows = self.force_rows
+        if self.compiled:
+            if bm.backend_name == 'jax':
+                options = {'static_argnames': ('with_temperature',)}
+            else:
+                options = {'dynamic': True}
+            self._wall_rows = bm.compile(self.wall_rows, **options)
+            self._force_rows = bm.compile(self.force_rows, **options)
+
+    def set_pairs(self, state, i, j, dr, dist, w, grad_w_norm):
+        """Fill the pair buffer of the current step"""
+        P = i.shape[0]
+        self.num_pairs = P
+        buf = self.buffer
+        buf["i"], buf["j"], buf["w"] = i, j, w
+        # 位移按分量连续存放, 形状为 (GD, P)
+        buf["dr"] = bm.stack([dr[:, d] for d in range(dr.shape[1])], axis=0)
+        # 动量与输运速度共用 grad_w / r, 热传导用 (dr . grad_w) / r^2
+        buf["c"] = grad_w_norm / (dist + EPS)
+        buf["F"] = buf["c"] * _dot(buf["dr"], buf["dr"]) / (dist * dist + EPS)
+        buf["wf"] = w * (state["tag"][j] == 0)
+
+        if self.compiled:
+            if P > self.capacity:
+                self.capacity = int(P * self.growth) + 1
+            n = self.capacity - P
+            for key in ("i", "j", "dr", "w", "c", "F", "wf"):
+                # 补齐的粒子对权重为 0, 不影响求和结果
+                x = buf[key]
+                pad = bm.zeros(x.shape[:-1] + (n,), dtype=x.dtype)
+                buf[key] = bm.concatenate([x, pad], axis=-1)
+        return self
+
+    def _accumulator(self, name, shape, dtype):
+        acc = self._accumulators.get(name)
+        if (bm.backend_name == 'jax') or (acc is None) or (acc.shape != shape):
+            acc = bm.zeros(shape, dtype=dtype)
+            self._accumulators[name] = acc
+            return acc
+        return bm.set_at(acc, ..., 0)
+
+    def _scatter(self, name, rows, N):
+        """Sum the rows of a pass onto the receiving particles"""
+        i = self.buffer["i"]
+        acc = self._accumulator(name, rows.shape[:-1] + (N,), rows.dtype)
+        if bm.backend_name == 'numpy':
+            # 一维连续数组上的 np.add.at 比二维的快数倍
+            for k in range(rows.shape[0]):
+                bm.index_add(acc[k], i, rows[k])
+            return acc
+        return bm.index_add(acc, i, rows, axis=-1)
+
+    def tait_eos(self, rho):
+        """Equation of state update pressure"""
+        return self.gamma * self.c0**2 * ((rho / self.rho0)**self.gamma - 1) / self.rho0 + self.X
+
+    def tait_eos_p2rho(self, p):
+        """Calculate density by pressure"""
+        return self.rho0 * ((p + self.p0 - self.X) / self.p0) ** (1 / self.gamma)
+
+    def density(self, state):
+        """Density summation"""
+        N = state["mass"].shape[0]
+        acc = self._scatter("rho", self.buffer["w"][None, :], N)
+        return state["mass"] * acc[0]
+
+    @staticmethod
+    def wall_rows(j, dr, wf, rho, p, mv, tv, T=None, with_temperature=False):
+        """Pair rows of the wall extrapolation: wf, wf*mv, wf*tv, wf*p, wf*rho*dr, wf*T"""
+        fields = [*mv.T, *tv.T, p, rho] + ([T] if with_temperature else [])
+        S = _take(bm.stack(fields, axis=0), j)
+        GD = dr.shape[0]
+        rows = [wf[None, :], wf * S[:2*GD+1], (wf * S[2*GD+1]) * dr]
+        if with_temperature:
+            rows.append(wf[None, :] * S[2*GD+2:])
+        return bm.concatenate(rows, axis=0)
+
+    def wall_boundary(self, state, p, g_ext, with_temperature=False):
+        """Enforce wall boundary conditions, same as `ProcessingTechnology.enforce_wall_boundary`"""
+        buf = self.buffer
+        tag = state["tag"]
+        N, GD = state["mv"].shape
+        T = state["T"] if with_temperature else None
+        rows = self._wall_rows(buf["j"], buf["dr"], buf["wf"], state["rho"], p,
+                               state["mv"], state["tv"], T, with_temperature=with_temperature)
+        acc = self._scatter("wall", rows, N)
+
+        scale = 1.0 / (acc[0] + EPS)
+        mask_bc = (tag == 1) | (tag == 3)
+        mv = bm.where(mask_bc[:, None], 2 * state["mv"] - acc[1:1+GD].T * scale[:, None], state["mv"])
+        tv = bm.where(mask_bc[:, None], 2 * state["tv"] - acc[1+GD:1+2*GD].T * scale[:, None], state["tv"])
+
+        p_wall_ext = bm.sum(g_ext * acc[2+2*GD:2+3*GD].T, axis=1)
+        p = bm.where(mask_bc, (acc[1+2*GD] + p_wall_ext) * scale, p)
+        rho = self.tait_eos_p2rho(p)
+
+        if with_temperature:
+            T = bm.where((tag == 1) | (tag == 2), acc[2+3*GD] * scale, state["T"])
+        else:
+            T = state["T"] if "T" in state else None
+        return p, rho, mv, tv, T
+
+    @staticmethod
+    def force_rows(i, j, dr, c, F, mass, rho, p, pb, eta, mv, tv,
+                   T=None, kappa=None, Cp=None, with_temperature=False):
+        """Pair rows of the momentum, transport velocity and heat terms"""
+        GD = dr.shape[0]
+        # 先在粒子上计算, 按 (K, N) 排列后每侧只取一次值
+        fields = [(mass / rho)**2, rho, p, eta, pb, mass,
+                  *(rho * mv.T), *(tv - mv).T, *mv.T]
+        if with_temperature:
+            fields += [T, kappa, Cp]
+        S = bm.stack(fields, axis=0)
+        Si, Sj = _take(S, i), _take(S, j)
+        V_i, rho_i, p_i, eta_i, pb_i, m_i = Si[:6]
+        V_j, rho_j, p_j, eta_j, _, m_j = Sj[:6]
+        q_i, dv_i, mv_i = Si[6:6+GD], Si[6+GD:6+2*GD], Si[6+2*GD:6+3*GD]
+        q_j, dv_j, mv_j = Sj[6:6+GD], Sj[6+GD:6+2*GD], Sj[6+2*GD:6+3*GD]
+
+        cv = (V_i + V_j) / m_i * c
+        eta_ij = 2 * eta_i * eta_j / (eta_i + eta_j + EPS)
+        p_ij = (rho_j * p_i + rho_i * p_j) / (rho_i + rho_j)
+
+        # (A_i + A_j)/2 . dr, 其中 A = rho * mv (x) (tv - mv)
+        b = 0.5 * (q_i * _dot(dv_i, dr) + q_j * _dot(dv_j, dr))
+        rows = [cv * (-p_ij * dr + b + eta_ij * (mv_i - mv_j)), (cv * pb_i) * dr]
+
+        if with_temperature:
+            T_i, kappa_i, Cp_i = Si[6+3*GD:]
+            T_j, kappa_j, _ = Sj[6+3*GD:]
+            k = kappa_i * kappa_j / (kappa_i + kappa_j)
+            heat = 4 * m_j * k * (T_i - T_j) * F / (Cp_i * rho_i * rho_j)
+            rows.append(heat[None, :])
+        return bm.concatenate(rows, axis=0)
+
+    def accelerations(self, state, p, pb, with_temperature=False):
+        """Momentum and transport velocity accelerations and temperature derivative"""
+        buf = self.buffer
+        N, GD = state["mv"].shape
+        if with_temperature:
+            heat = (state["T"], state["kappa"], state["Cp"])
+        else:
+            heat = (None, None, None)
+        rows = self._force_rows(buf["i"], buf["j"], buf["dr"], buf["c"], buf["F"],
+                                state["mass"], state["rho"], p, pb, state["eta"],
+                                state["mv"], state["tv"], *heat, with_temperature=with_temperature)
+        acc = self._scatter("force", rows, N)
+        dmvdt = bm.stack([acc[k] for k in range(GD)], axis=-1)
+        dtvdt = bm.stack([acc[GD+k] for k in range(GD)], axis=-1)
+        dTdt = bm.copy(acc[2*GD]) if with_temperature else None
+        return dmvdt, dtvdt, dTdt
+
+    def forward(self, state, g_ext, dt, with_temperature=False):
+        """One step of the fluid model on the pairs of `set_pairs`
+
+        Density summation for the fluid particles, Tait pressure, wall
+        extrapolation and the accelerations, in the order of the heat transfer
+        example.
+        """
+        fluid = state["tag"] == 0
+        rho = bm.where(fluid, self.density(state), state["rho"])
+        p = self.tait_eos(rho)
+        pb = self.tait_eos(bm.zeros_like(p))
+        p, rho, mv, tv, T = self.wall_boundary(state, p, g_ext, with_temperature)
+        state["rho"] = rho
+        state["mv"] = mv
+        state["tv"] = tv
+
+        if with_temperature:
+            state["T"] = T + dt * state["dTdt"]
+        dmvdt, dtvdt, dTdt = self.accelerations(state, p, pb, with_temperature)
+        if with_temperature:
+            state["dTdt"] = dTdt
+        state["dmvdt"] = dmvdt + g_ext
+        state["p"] = p
+        state["dtvdt"] = dtvdt
+        return state
@@ -1,6 +1,7 @@
 from fealpy.backend import backend_manager as bm
 from .particle_kernel_function_new import QuinticKernel, CubicSplineKernel, QuadraticKernel, WendlandC2Kernel, QuinticWendlandKernel
 from fealpy.mesh.node_mesh import Space
+from fealpy.mesh.neighbor_list import CellList, NeighborList, csr_to_pairs
 
 class SPHParameters:
     """全局光滑粒子流体动力学默认参数基类"""
@@ -115,7 +116,8 @@ class Kernel:
         return grad, grad_norm
 
 class SPHQueryKernel:
-    def __init__(self, mesh, radius=None, box_size=None, mask_self=True, kernel_info=None, periodic=[False, False, False]):
+    def __init__(self, mesh, radius=None, box_size=None, mask_self=True, kernel_info=None, periodic=[False, False, False],
+                 search='kdtree', skin=0.0, neighbor_list=None):
         """
         参数:
             mesh: 网格对象
@@ -124,6 +126,11 @@ class SPHQueryKernel:
             kernel_info: 核函数参数字典，默认为quintic核
             periodic: 周期性边界条件，默认为[False, False, False]
             mask_self: 是否屏蔽自身节点，默认为True
+            search: 邻近搜索方法, 'kdtree' 使用 bm.query_point, 'cell_list'
+                使用后端无关的网格链表 (fealpy.mesh.NeighborList), 默认为 'kdtree'
+            skin: 'cell_list' 的 Verlet 缓冲半径, 粒子位移小于 skin/2 时复用
+                邻居表, 默认为 0
+            neighbor_list: 跨时间步复用的 NeighborList 对象, 给出时使用 'cell_list'
         """
         if mesh is None:
             raise ValueError("Mesh object must be provided.")
@@ -136,6 +143,16 @@ class SPHQueryKernel:
         self.box_size = box_size if box_size is not None else self.pos.max(axis=0)
         self.periodic = periodic
         self.mask_self = mask_self
+        if search not in ('kdtree', 'cell_list'):
+            raise ValueError(f"Unknown search method: {search}")
+        if neighbor_list is not None:
+            search = 'cell_list'
+        elif search == 'cell_list':
+            # NOTE: 与 query_point 一致, mask_self=True 时保留自身节点对
+            neighbor_list = NeighborList(self.radius, skin=skin, box_size=self.box_size,
+                                         periodic=periodic, include_self=mask_self)
+        self.search = search
+        self.neighbor_list = neighbor_list
 
         # 初始化核函数
         if kernel_info is None:
@@ -144,6 +161,15 @@ class SPHQueryKernel:
 
     def find_node(self, other_pos=None, device=None):
         """执行邻近搜索，返回 node_self 和 neighbors"""
+        if self.search == 'cell_list':
+            # 网格链表只使用后端函数, 直接在数据所在设备上搜索
+            if other_pos is None:
+                crow, col = self.neighbor_list.update(self.pos)
+            else:
+                cells = CellList(self.radius, box_size=self.box_size, periodic=self.periodic)
+                crow, col = cells.build(self.pos).query(other_pos, include_self=self.mask_self)
+            return csr_to_pairs(crow, col)
+
         pos_cpu = self.pos
         other_cpu = other_pos if other_pos is not None else self.pos
 
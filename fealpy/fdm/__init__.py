@@ -1,4 +1,5 @@
 
+from .stencil import StencilOperator
 from .laplace_operator import LaplaceOperator
 from .diffusion_operator import DiffusionOperator
 from .convection_operator import ConvectionOperator
@@ -9,3 +10,5 @@ from .poisson_fdm_model import PoissonFDMModel
 from .wave_fdm_model import WaveFDMModel
 from .parabolic_fdm_model import ParabolicFDMModel
 from .hyperbolic_fdm_model import HyperbolicFDMModel
+from .dst_solver import DSTSolver
+from .time_stepper import LinearTimeStepper
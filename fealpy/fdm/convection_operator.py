@@ -1,12 +1,12 @@
-import math
 from typing import Optional, Callable, Union
 import inspect
 from ..backend import backend_manager as bm
 from ..backend import TensorLike
-from ..sparse import csr_matrix, spdiags, SparseTensor
+from ..sparse import SparseTensor
 from ..mesh import UniformMesh
 
 from .operator_base import OpteratorBase, assemblymethod
+from .stencil import StencilOperator
 
 class ConvectionOperator(OpteratorBase):
     """
@@ -63,21 +63,15 @@ class ConvectionOperator(OpteratorBase):
         self.mesh = mesh
         self.convection_coef = convection_coef
 
-    def assembly(self) -> SparseTensor:
+    def velocity(self) -> TensorLike:
         """
-        Assemble the convection matrix using first‐order upwind differences
-        for constant velocity vector b (scheme: 'upwind_const_1').
-
-        This is the default implementation if no method is specified.
-
-        Returns:
-            SparseTensor: the discrete convection operator matrix.
+        Evaluate the velocity b, shaped (GD, ), or (NN, GD) when
+        convection_coef is a function of the nodes.
         """
         mesh = self.mesh
         GD = mesh.geo_dimension()
         node = mesh.entity('node')
-        context = bm.context(node)
-        
+
         if callable(self.convection_coef):
         # 处理函数情况
             sig = inspect.signature(self.convection_coef)
@@ -98,32 +92,66 @@ class ConvectionOperator(OpteratorBase):
         else:
             raise ValueError(f"Invalid data type: convection_coef must be an int, float, list, tuple, tensor, or callable(e.g. function). \
                              Now is {type(self.convection_coef)}.")
-            
-        h = mesh.h                                # uniform spacing in each dimension
-        NN = mesh.number_of_nodes()
-        K = mesh.linear_index_map('node')         # multi-index map
-        shape = K.shape
-        full = (slice(None),) * GD                # full slicing tuple
+        return b
+
+    def stencil(self) -> StencilOperator:
+        """
+        Return the stencil of the first‐order upwind differences (scheme:
+        'upwind_const_1'): the backward difference along the dimensions where
+        b_i > 0 and the forward difference elsewhere. A velocity given at the
+        nodes is upwinded node by node.
+
+        Returns:
+            StencilOperator: The stencil on the nodes of the mesh.
+        """
+        mesh = self.mesh
+        GD = mesh.geo_dimension()
+        c = self.velocity() / mesh.h      # b_i/h_i
 
-        c = bm.abs(b / h)   # component-wise |b_i|/h_i
-        diag = bm.full((NN,), bm.sum(c), **context)  # diagonal term: sum_i |b_i|/h_i
-        A = spdiags(diag, 0, NN, NN, format='csr')
+        S = StencilOperator(mesh)
+        # diagonal term: sum_i |b_i|/h_i
+        S.add((0,) * GD, sum(bm.abs(c[..., i]) for i in range(GD)))
+        for i in range(GD):
+            ci = c[..., i]
+            e = [0] * GD
+            e[i] = -1
+            S.add(e, -(bm.abs(ci) + ci) / 2)   # backward difference, b_i > 0
+            e[i] = 1
+            S.add(e, -(bm.abs(ci) - ci) / 2)   # forward difference, b_i < 0
+        return S
+
+    def central_stencil(self) -> StencilOperator:
+        """
+        Return the stencil of the second-order central differences (scheme:
+        'central_const_2'): (u_{j+1} - u_{j-1}) / (2 h) along every dimension.
+
+        Returns:
+            StencilOperator: The stencil on the nodes of the mesh.
+        """
+        mesh = self.mesh
+        GD = mesh.geo_dimension()
+        c = self.velocity() / mesh.h / 2.0        # central difference coefficient
 
+        S = StencilOperator(mesh)
         for i in range(GD):
-            n_shift = math.prod(cnt for idx, cnt in enumerate(shape) if idx != i)
-            off = bm.full((NN - n_shift,), -c[i], **context)
+            e = [0] * GD
+            e[i] = -1
+            S.add(e, -c[..., i])
+            e[i] = 1
+            S.add(e, c[..., i])
+        return S
 
-            s1 = full[:i] + (slice(1, None),) + full[i+1:]
-            s2 = full[:i] + (slice(None, -1),) + full[i+1:]
-            I = K[s1].ravel()
-            J = K[s2].ravel()
+    def assembly(self) -> SparseTensor:
+        """
+        Assemble the convection matrix using first‐order upwind differences
+        for constant velocity vector b (scheme: 'upwind_const_1').
 
-            if b[i] > 0:
-                A += csr_matrix((off, (I, J)), shape=(NN, NN))  # backward difference
-            else:
-                A += csr_matrix((off, (J, I)), shape=(NN, NN))  # forward difference
+        This is the default implementation if no method is specified.
 
-        return A
+        Returns:
+            SparseTensor: the discrete convection operator matrix.
+        """
+        return self.stencil().to_csr()
 
     @assemblymethod('central_const_2')
     def assembly_central_const(self) -> SparseTensor:
@@ -136,53 +164,4 @@ class ConvectionOperator(OpteratorBase):
         Returns:
             SparseTensor: the discrete convection operator matrix.
         """
-        mesh = self.mesh
-        node = mesh.entity('node')
-        context = bm.context(node)
-        GD = mesh.geo_dimension()
-        NN = mesh.number_of_nodes()
-        K = mesh.linear_index_map('node')
-        shape = K.shape
-        full = (slice(None),) * GD
-
-         
-        if callable(self.convection_coef):
-        # 处理函数情况
-            sig = inspect.signature(self.convection_coef)
-            l = len(sig.parameters)
-            if l == 2:
-                b = self.convection_coef(node)
-            else:
-                b = self.convection_coef()
-        elif isinstance(self.convection_coef, (int, float)):
-            # 处理单个数值情况
-            data = [float(self.convection_coef)] * GD
-            b = bm.array(data)
-        elif isinstance(self.convection_coef, (list, tuple)):
-            # 处理列表或元组情况
-            b = bm.array(self.convection_coef, dtype=bm.float64)
-        elif isinstance(self.convection_coef, TensorLike):
-            b = self.convection_coef
-        else:
-            raise ValueError(f"Invalid data type: convection_coef must be an int, float, list, tuple, tensor, or callable(e.g. function). \
-                             Now is {type(self.convection_coef)}.")
-        
-
-        c = b / mesh.h / 2.0                            # central difference coefficient
-
-        zero_diag = bm.zeros(NN, dtype=bm.float64) 
-        A = spdiags(zero_diag, 0, NN, NN, format='csr')
-        for i in range(GD):
-            n_shift = math.prod(cnt for idx, cnt in enumerate(shape) if idx != i)
-            off = bm.full((NN - n_shift,), c[i], **context)
-
-            s1 = full[:i] + (slice(1, None),) + full[i+1:]   # 1:
-            s0 = full[:i] + (slice(None, -1),) + full[i+1:]  # 0:-1
-            I = K[s1].ravel()
-            J = K[s0].ravel()
-
-            A += csr_matrix((-off, (I, J)), shape=(NN, NN))
-            A += csr_matrix(( off, (J, I)), shape=(NN, NN))
-
-        return A
-
+        return self.central_stencil().to_csr()
@@ -1,12 +1,11 @@
-import math
 from ..backend import backend_manager as bm
 from typing import Optional, Callable, Union
 from ..backend import TensorLike
 import inspect
-from ..backend import TensorLike
-from ..sparse import csr_matrix, SparseTensor
+from ..sparse import SparseTensor
 from ..mesh import UniformMesh
 from .operator_base import OpteratorBase, assemblymethod
+from .stencil import StencilOperator
 
 class DiffusionOperator(OpteratorBase):
     """
@@ -49,25 +48,14 @@ class DiffusionOperator(OpteratorBase):
         self.mesh = mesh  # Store the mesh for later assembly
         self.diffusion_coef = diffusion_coef 
         
-    def assembly(self) -> SparseTensor:
+    def coefficient(self) -> TensorLike:
         """
-        Assemble the global sparse matrix for the diffusion operator with constant
-        coefficient tensor A, including both pure and mixed second‐derivative terms.
-
-        Pure terms: A_{ii} ∂²u/∂x_i² discretized by three‐point central differences:
-            −A_{ii} * (u_{i+1} − 2 u_i + u_{i−1}) / h_i²
-
-        Mixed terms: (A_{ij}+A_{ji}) ∂²u/(∂x_i∂x_j) discretized by four‐point central differences:
-            −(A_{ij}+A_{ji}) * [u_{i+1,j+1} − u_{i−1,j+1} − u_{i+1,j−1} + u_{i−1,j−1}]
-               / (4 h_i h_j)
-
-        Returns:
-            SparseTensor: CSR-format matrix of size (NN, NN), where NN is total nodes.
+        Evaluate the diffusion tensor D, shaped (GD, GD), or (NN, GD, GD)
+        when diffusion_coef is a function of the nodes.
         """
         mesh = self.mesh
         GD = mesh.geo_dimension()
         node = mesh.entity('node')
-        # Evaluate diffusion tensor at all nodes (if function) or take constant
 
         f = self.diffusion_coef
         if callable(f):
@@ -85,83 +73,68 @@ class DiffusionOperator(OpteratorBase):
         else:
             raise ValueError(f"Invalid data type: diffusion_coef must be an int, float, tensor, or callable(e.g. function). \
                              Now is {type(self.diffusion_coef)}.")
+        return D
+
+    def stencil(self) -> StencilOperator:
+        """
+        Return the stencil of the diffusion operator, including both pure and
+        mixed second‐derivative terms.
+
+        Pure terms: A_{ii} ∂²u/∂x_i² discretized by three‐point central differences:
+            −A_{ii} * (u_{i+1} − 2 u_i + u_{i−1}) / h_i²
+
+        Mixed terms: (A_{ij}+A_{ji}) ∂²u/(∂x_i∂x_j) discretized by four‐point central differences:
+            −(A_{ij}+A_{ji}) * [u_{i+1,j+1} − u_{i−1,j+1} − u_{i+1,j−1} + u_{i−1,j−1}]
+               / (4 h_i h_j)
+
+        A diffusion tensor given at the nodes gives nodal coefficients, taken
+        at the row node.
+
+        Returns:
+            StencilOperator: The stencil on the nodes of the mesh.
+        """
+        mesh = self.mesh
+        GD = mesh.geo_dimension()
+        D = self.coefficient()
 
         # Mesh spacing and coefficient vector per dimension
         h = mesh.h                       # tuple of length GD
-        c = 1.0 / (h ** 2) # 1/h_i^2
-        # If D is nontrivial tensor, contract: c_i ← Σ_j D_{ij} c_j
-        c = D * c                        # shape (GD,)
-        NN = mesh.number_of_nodes()      # total nodes
-        K  = mesh.linear_index_map('node')  
-        shape = K.shape                  # multi-index grid shape
+        c = D * (1.0 / (h ** 2))         # c_ij = D_ij / h_j^2
 
+        S = StencilOperator(mesh)
         # Main diagonal: sum over dims of 2c_i
-        diag_val = bm.full((NN,), 2 * bm.sum(c.diagonal()), dtype=mesh.ftype)
-        I = K.ravel()
-        J = K.ravel()
-        A = csr_matrix((diag_val, (I, J)), shape=(NN, NN))
-
-        # Prepare slicing for neighbor access
-        full = (slice(None),) * GD
-        shifts = [math.prod(shape[j] for j in range(GD) if j != i) for i in range(GD)]
+        S.add((0,) * GD, 2 * sum(c[..., i, i] for i in range(GD)))
 
-        # Off-diagonal contributions in each dimension
         for i in range(GD):
-            # shift between nodes in dim i
-            off_val = bm.full((NN - shifts[i],), -c[i, i], dtype=mesh.ftype)
-
-            # build slices for forward/backward neighbors
-            s_plus  = full[:i] + (slice(1, None),) + full[i+1:]
-            s_minus = full[:i] + (slice(None, -1),) + full[i+1:]
-            I_idx = K[s_plus].ravel()
-            J_idx = K[s_minus].ravel()
-            # add coupling to both directions
-            A += csr_matrix((off_val, (I_idx, J_idx)), shape=(NN, NN))
-            A += csr_matrix((off_val, (J_idx, I_idx)), shape=(NN, NN))
-            
+            e = [0] * GD
+            e[i] = 1
+            S.add(e, -c[..., i, i])
+            e[i] = -1
+            S.add(e, -c[..., i, i])
+
             for j in range(i+1, GD):
-                if c[i, j] != 0:
-                    # +i +j
-                    s_ip_jp = full[:i] + (slice(1,None),) + full[i+1:j] \
-                            + (slice(1,None),) + full[j+1:]
-                    # -i +j
-                    s_im_jp = full[:i] + (slice(None,-1),) + full[i+1:j] \
-                            + (slice(1,None),) + full[j+1:]
-                    # +i -j
-                    s_ip_jm = full[:i] + (slice(1,None),) + full[i+1:j] \
-                            + (slice(None,-1),) + full[j+1:]
-                    # -i -j
-                    s_im_jm = full[:i] + (slice(None,-1),) + full[i+1:j] \
-                            + (slice(None,-1),) + full[j+1:]
-              
-                    s_c_ip_jp = full[:i] + (slice(None,-1),) + full[i+1:j] \
-                                + (slice(None,-1),) + full[j+1:]
-                    s_c_im_jp = full[:i] + (slice(1,None),)  + full[i+1:j] \
-                                + (slice(None,-1),) + full[j+1:]
-                    s_c_ip_jm = full[:i] + (slice(None,-1),) + full[i+1:j] \
-                                + (slice(1,None),)  + full[j+1:]
-                    s_c_im_jm = full[:i] + (slice(1,None),)  + full[i+1:j] \
-                                + (slice(1,None),)  + full[j+1:]
-                                
-                    I_ip_jp = K[s_ip_jp].ravel();  J_ip_jp = K[s_c_ip_jp].ravel()
-                    I_im_jp = K[s_im_jp].ravel();  J_im_jp = K[s_c_im_jp].ravel()
-                    I_ip_jm = K[s_ip_jm].ravel();  J_ip_jm = K[s_c_ip_jm].ravel()
-                    I_im_jm = K[s_im_jm].ravel();  J_im_jm = K[s_c_im_jm].ravel()
-                    coeff = (D[i, j] + D[j, i])/(4*h[i]*h[j])
-                    A += csr_matrix(( +coeff*bm.ones_like(I_ip_jp), (J_ip_jp, I_ip_jp)), shape=(NN,NN))
-                    A += csr_matrix(( -coeff*bm.ones_like(I_im_jp), (J_im_jp, I_im_jp)), shape=(NN,NN))
-                    A += csr_matrix(( -coeff*bm.ones_like(I_ip_jm), (J_ip_jm, I_ip_jm)), shape=(NN,NN))
-                    A += csr_matrix(( +coeff*bm.ones_like(I_im_jm), (J_im_jm, I_im_jm)), shape=(NN,NN))
-                                              
-        return A
+                if bm.any(c[..., i, j] != 0):
+                    coeff = (D[..., i, j] + D[..., j, i])/(4*h[i]*h[j])
+                    for si, sj, sign in [(1, 1, 1), (-1, 1, -1), (1, -1, -1), (-1, -1, 1)]:
+                        e = [0] * GD
+                        e[i], e[j] = si, sj
+                        S.add(e, sign * coeff)
+        return S
+
+    def assembly(self) -> SparseTensor:
+        """
+        Assemble the global sparse matrix for the diffusion operator from its
+        stencil, see `stencil` for the discretization.
+
+        Returns:
+            SparseTensor: CSR-format matrix of size (NN, NN), where NN is total nodes.
+        """
+        return self.stencil().to_csr()
 
     @assemblymethod('fast')
     def assembly_const(self) -> SparseTensor:
         """
-        A faster assembly for constant, isotropic diffusion D = d·I.
-
-        In this special case c_i = d/h_i^2, and the matrix has a
-        tensor‐product structure exploitable for performance.
+        Assemble the same matrix as `assembly`. The stencil assembly already
+        writes every entry once, for constant and nodal coefficients alike.
         """
-        # [Implementation omitted for brevity]
-        raise NotImplementedError("Fast constant‐coefficient assembly not yet implemented")
\ No newline at end of file
+        return self.assembly()
@@ -40,6 +40,29 @@ class DirichletBC:
         self.mesh = mesh
         self.gd = gd
         self.threshold = threshold
+        self._bdflag = None
+
+    def boundary_flag(self):
+        """Return the boolean flag of the Dirichlet nodes, computed once.
+
+        Returns
+        -------
+        bdFlag : TensorLike
+            Boolean array of shape (NN,), True on the nodes where the boundary
+            condition is applied.
+        """
+        if self._bdflag is None:
+            if self.threshold is None:
+                bdFlag = self.mesh.boundary_node_flag()
+            else:
+                total_bd_idx = self.mesh.boundary_node_index()
+                bd_node = self.mesh.node[total_bd_idx]
+                mark = self.threshold(bd_node)
+                mark = bm.array(mark, dtype=bm.bool)
+                bdFlag = bm.zeros(self.mesh.number_of_nodes(), dtype=bm.bool)
+                bdFlag = bm.set_at(bdFlag,total_bd_idx[mark],True)              # Mark selected boundary nodes as True
+            self._bdflag = bdFlag
+        return self._bdflag
 
     def apply(self, A, f, uh=None):
         """Apply Dirichlet boundary conditions to the linear system
@@ -91,15 +114,7 @@ class DirichletBC:
                 uh = bm.zeros(A.shape[0], dtype=A.dtype)
         # Get all node coordinates
         node = self.mesh.entity('node')
-        if self.threshold is None:
-            bdFlag = self.mesh.boundary_node_flag()
-        else:
-            total_bd_idx = self.mesh.boundary_node_index()
-            bd_node = self.mesh.node[total_bd_idx]
-            mark = self.threshold(bd_node)
-            mark = bm.array(mark, dtype=bm.bool)
-            bdFlag = bm.zeros(self.mesh.number_of_nodes(), dtype=bm.bool)
-            bdFlag = bm.set_at(bdFlag,total_bd_idx[mark],True)              # Mark selected boundary nodes as True
+        bdFlag = self.boundary_flag()
 
         # Assign boundary values at selected nodes
         uh = bm.set_at(uh, bdFlag, self.gd(node[bdFlag]))
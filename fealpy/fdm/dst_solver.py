@@ -0,0 +1,91 @@
+from typing import Optional
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..mesh import UniformMesh
+
+from .laplace_operator import LaplaceOperator
+
+
+class DSTSolver:
+    """
+    Fast solver of the finite difference systems
+
+        alpha * u + beta * L u = f    at the interior nodes,
+        u = g                         at the boundary nodes,
+
+    on rectangular uniform grids, where L is the discrete minus Laplacian of
+    `LaplaceOperator`. Restricted to the interior nodes, L is diagonalized by the
+    discrete sine transform (DST-I) along every axis, with eigenvalues
+
+        sum_i 4 / h_i^2 * sin^2(pi * k_i / (2 * n_i)),   k_i = 1, ..., n_i - 1,
+
+    so the system is solved with two multidimensional sine transforms and one
+    division, in O(N log N) operations and without assembling any matrix.
+    alpha = 0, beta = 1 gives the Poisson equation, and alpha = 1, beta = theta * tau
+    the implicit step of the heat equation with a theta-scheme.
+
+    Parameters:
+        mesh (UniformMesh): The structured mesh of a box.
+        alpha (float): Coefficient of the identity, defaults to 0.
+        beta (float): Coefficient of the Laplace operator, defaults to 1.
+
+    Notes:
+        The transforms use `scipy.fft` on the host, the other backends convert
+        the right-hand side to numpy and the solution back.
+    """
+    def __init__(self, mesh: UniformMesh, alpha: float=0.0, beta: float=1.0):
+        self.mesh = mesh
+        self.alpha = alpha
+        self.beta = beta
+        self.L = LaplaceOperator(mesh)
+
+        import numpy as np
+        h = bm.to_numpy(mesh.h)
+        self.shape = tuple(mesh.linear_index_map('node').shape)
+        GD = len(self.shape)
+
+        # Eigenvalues of L on the interior nodes, as an outer sum over the axes.
+        lam = 0.0
+        for i, n in enumerate(self.shape):
+            k = np.arange(1, n - 1)
+            li = 4.0 / h[i] ** 2 * np.sin(np.pi * k / (2 * (n - 1))) ** 2
+            lam = lam + li.reshape((-1,) + (1,) * (GD - 1 - i))
+        self.eigenvalues = alpha + beta * lam
+        if np.any(self.eigenvalues == 0):
+            raise ValueError("The operator alpha*I + beta*L is singular on this grid.")
+
+        self.interior = (slice(1, -1),) * GD
+        self.bdflag = mesh.boundary_node_flag()
+
+    def solve(self, f: TensorLike, gd: Optional[TensorLike]=None) -> TensorLike:
+        """
+        Solve the system for the nodal right-hand side f.
+
+        Parameters:
+            f (TensorLike): Right-hand side on the nodes, shaped (NN, ). The
+                values on the boundary nodes are ignored.
+            gd (TensorLike, optional): Nodal vector holding the Dirichlet values
+                on the boundary nodes, its interior values are ignored.
+                Defaults to homogeneous boundary conditions.
+
+        Returns:
+            TensorLike: The solution on the nodes, shaped (NN, ).
+        """
+        import numpy as np
+        from scipy.fft import dstn, idstn
+
+        if gd is not None:
+            # Move the boundary values to the right-hand side.
+            g = bm.set_at(bm.zeros_like(gd), self.bdflag, gd[self.bdflag])
+            f = f - self.beta * (self.L @ g)
+
+        F = bm.to_numpy(f).reshape(self.shape)[self.interior]
+        U = idstn(dstn(F, type=1, norm='ortho') / self.eigenvalues, type=1, norm='ortho')
+
+        u = np.zeros(self.shape, dtype=U.dtype)
+        u[self.interior] = U
+        u = bm.tensor(u.reshape(-1), dtype=f.dtype, device=bm.get_device(f))
+        if gd is not None:
+            u = bm.set_at(u, self.bdflag, gd[self.bdflag])
+        return u
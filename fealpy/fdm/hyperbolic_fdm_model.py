@@ -9,6 +9,7 @@ from ..solver import spsolve
 from ..model import PDEModelManager
 from ..mesh import UniformMesh     
 from . import DirichletBC, ConvectionOperator
+from .time_stepper import LinearTimeStepper
 
 
 
@@ -37,6 +38,9 @@ class HyperbolicFDMModel:
             or Crank–Nicolson.
         method : optional'upwind_const_1' or 'central_const_2',
             the meaning is the assembly method for the convection term.
+        time_solver : {'lu'}, optional, default='lu'
+            Solver of the implicit time steps, the sparse LU factorization
+            is computed once per time step size.
 
     
     Attributes
@@ -66,7 +70,8 @@ class HyperbolicFDMModel:
     
     def __init__(self, example: str = 'sinsin', maxit: int = 4, 
                  ns: int = 20, solver=spsolve, nt: int = 400, 
-                 scheme: str='backward', method: str ='upwind_const_1'):
+                 scheme: str='backward', method: str ='upwind_const_1',
+                 time_solver: str='lu'):
         """
         Initialize the ParabolicFDMModel.
         
@@ -91,6 +96,7 @@ class HyperbolicFDMModel:
         self.ns = ns
         self.solver = spsolve
         self.scheme = scheme.lower()
+        self.time_solver = time_solver
         self.nt = nt
         self.maxit = maxit
         self.method = method
@@ -130,6 +136,7 @@ class HyperbolicFDMModel:
         I = spdiags(bm.ones(A.shape[0], dtype=mesh.ftype), 0, A.shape[0], A.shape[1])
         self.A = A
         self.I = I
+        self.stepper = LinearTimeStepper(mesh, A, scheme=self.scheme, solver=self.time_solver)
 
 
     def init_solution(self):
@@ -148,36 +155,8 @@ class HyperbolicFDMModel:
             tau : float
                 Time step size.
         """
-        mesh = self.mesh
-        A    = self.A
-        I    = self.I
-        uh   = self.uh
-        t    = self.t0 + n*tau
-        F = mesh.interpolate(lambda p: self.pde.source(p, t), etype='node').reshape(-1)
-
-        if self.scheme == 'forward':
-            uh_new = uh - tau * (A@uh) + tau * F
-            bd = mesh.boundary_node_flag()
-            nodes = mesh.entity('node')
-            uh_new[bd] = self.pde.dirichlet(nodes[bd], t)
-            self.uh = uh_new
-
-        elif self.scheme == 'backward':
-            S = I + tau*A
-            b = uh + tau*F
-            bd = mesh.boundary_node_flag()
-            S, b = DirichletBC(mesh, lambda p: self.pde.dirichlet(p, t)).apply(S, b)
-            self.uh = spsolve(S, b, solver='scipy')
-
-        elif self.scheme == 'cn':
-            S = I + 0.5*tau*A
-            b = (I - 0.5*tau*A)@uh + tau*F
-            bd = mesh.boundary_node_flag()
-            S, b = DirichletBC(mesh, lambda p: self.pde.dirichlet(p, t)).apply(S, b)
-            self.uh = spsolve(S, b, solver='scipy')
-
-        else:
-            raise ValueError(f"Unknown scheme {self.scheme}")
+        t = self.t0 + n*tau
+        self.uh = self.stepper.step(self.uh, t, tau, self.pde.source, self.pde.dirichlet)
         
     def run(self):
         """Execute time-stepping on successively refined meshes.
@@ -1,13 +1,10 @@
-import math
-
 from typing import Optional
 
-from ..backend import backend_manager as bm
-from ..backend import TensorLike
-from ..sparse import csr_matrix, SparseTensor
+from ..sparse import SparseTensor
 from ..mesh import UniformMesh
 
 from .operator_base import OpteratorBase, assemblymethod
+from .stencil import StencilOperator
 
 class LaplaceOperator(OpteratorBase):
     """
@@ -26,70 +23,46 @@ class LaplaceOperator(OpteratorBase):
 
         self.mesh = mesh  # Store the mesh for later assembly
 
-    def assembly(self) -> SparseTensor:
+    def stencil(self) -> StencilOperator:
         """
-        Assemble the global sparse matrix representing the Laplace operator.
+        Return the 2*GD + 1 point stencil of the minus Laplace operator:
+        2 * sum_i 1/h_i^2 at the node and -1/h_i^2 at its two neighbors along
+        every dimension i.
 
         Returns:
-            csr_matrix: Sparse matrix of size (NN, NN), where NN is number of nodes.
+            StencilOperator: The stencil on the nodes of the mesh.
         """
         mesh = self.mesh
-        ftype = mesh.ftype  # Floating point data type for matrix entries
-        itype = mesh.itype  # Integer data type for indexing (not used directly)
-        device = mesh.device  # Device context (e.g., CPU, GPU)
         GD = mesh.geo_dimension()  # Geometric dimension of the mesh
-
-        # spacing of the mesh in each dimension
-        h = mesh.h
         # coefficient c = 1/h^2 per dimension
-        c = 1.0 / (h ** 2)
+        c = 1.0 / (mesh.h ** 2)
 
-        NN = mesh.number_of_nodes()  # Total number of grid nodes
-        K = mesh.linear_index_map('node')  # Multi-dimensional to linear index map
-        shape = K.shape  # Shape of the index map array
-
-        # Create diagonal entries with sum of c over dimensions times 2
-        diag_value = bm.full((NN,), 2 * c.sum().item(), dtype=ftype)
-        I = K.ravel()  # Row indices for diagonal entries
-        A = csr_matrix((diag_value, (I, I)), shape=(NN, NN))
+        S = StencilOperator(mesh)
+        S.add((0,) * GD, 2 * c.sum().item())
+        for i in range(GD):
+            e = tuple(int(d == i) for d in range(GD))
+            S.add(e, -c[i].item())
+            S.add(tuple(-d for d in e), -c[i].item())
+        return S
 
-        # Slices tuple for indexing all dimensions
-        full_slice = (slice(None),) * GD
+    def assembly(self) -> SparseTensor:
+        """
+        Assemble the global sparse matrix representing the Laplace operator.
 
-        # Off-diagonal contributions for each dimension
-        for i in range(GD):
-            # Number of nodes shifted along dimension i
-            n_shift = math.prod(
-                count for dim_idx, count in enumerate(shape) if dim_idx != i
-            )
-            # Off-diagonal value for neighbor entries
-            off_value = bm.full((NN - n_shift,), -c[i].item(), dtype=ftype)
-            # Create slice objects to select neighbor index arrays
-            s1 = full_slice[:i] + (slice(1, None),) + full_slice[i+1:]
-            s2 = full_slice[:i] + (slice(None, -1),) + full_slice[i+1:]
-            # Row indices for off-diagonal
-            I = K[s1].ravel()
-            J = K[s2].ravel()
-            # Add entries for coupling in both directions
-            A += csr_matrix((off_value, (I, J)), shape=(NN, NN))
-            A += csr_matrix((off_value, (J, I)), shape=(NN, NN))
+        The CSR arrays are filled from the stencil in a single pass, see
+        `StencilOperator.to_csr`.
 
-        return A
+        Returns:
+            CSRTensor: Sparse matrix of size (NN, NN), where NN is number of nodes.
+        """
+        return self.stencil().to_csr()
 
     @assemblymethod('fast')
     def fast_assembly(self) -> SparseTensor:
-        pass
-
-    def __matmul__(self, u: TensorLike) -> TensorLike:
         """
-        Apply the assembled Laplace operator to a vector or tensor u via 
-        matrix-vector product.
-
-        Parameters:
-            u (TensorLike): Input field values on mesh nodes.
+        Assemble the same matrix as `assembly`, kept for compatibility.
 
         Returns:
-            TensorLike: Resulting field after applying Laplace operator.
+            CSRTensor: Sparse matrix of size (NN, NN), where NN is number of nodes.
         """
-        # TODO: Implement the matrix-vector multiplication using backend routines
-        pass
+        return self.assembly()
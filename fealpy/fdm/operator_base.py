@@ -132,6 +132,29 @@ class OpteratorBase(metaclass=OperatorMeta):
         
         return meth()
 
+    def stencil(self):
+        """
+        Return the stencil of the operator on the nodes of the structured mesh.
+
+        Returns:
+            StencilOperator: The offsets and the coefficients of the operator,
+                which assemble the matrix (`to_csr`, `to_dia`) or apply it
+                without a matrix (`@`).
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not define a stencil.")
+
+    def __matmul__(self, u):
+        """
+        Apply the operator to the nodal values u without assembling the matrix.
+
+        Parameters:
+            u (TensorLike): Values on the mesh nodes, shaped (NN, ...).
+
+        Returns:
+            TensorLike: The result, shaped like u.
+        """
+        return self.stencil() @ u
+
 
 def assemblymethod(call_name: str, api_name: Optional[str]=None) -> Callable[[_F], _F]:
     """
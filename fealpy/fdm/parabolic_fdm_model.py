@@ -11,6 +11,7 @@ from ..model import PDEModelManager
 from ..mesh import UniformMesh  
 from . import LaplaceOperator, DirichletBC
 from . import DiffusionOperator, ConvectionOperator, ReactionOperator
+from .time_stepper import LinearTimeStepper
 
 
 
@@ -44,6 +45,10 @@ class ParabolicFDMModel:
             - 'forward': Forward Euler (explicit)
             - 'backward': Backward Euler (implicit)
             - 'cn': Crank-Nicolson (implicit)
+        time_solver : str, optional, default='lu'
+            Solver of the implicit time steps:
+            - 'lu': sparse LU factorization, computed once per time step size
+            - 'dst': fast sine transform solver, for the pure Laplace operator
         
     Attributes
     ----------
@@ -68,13 +73,15 @@ class ParabolicFDMModel:
 
     def __init__(self, example: str = 'sinsin', maxit: int = 4, 
                  ns: int = 20, solver=spsolve, nt: int = 400, 
-                 scheme: str='backward', method: str ='upwind_const_1'):
+                 scheme: str='backward', method: str ='upwind_const_1',
+                 time_solver: str='lu'):
     
         self.pde = PDEModelManager('parabolic').get_example(example) 
         self.maxit = maxit
         self.ns = ns
         self.solver = spsolve
         self.scheme = scheme.lower()
+        self.time_solver = time_solver
         self.method = method
         self.nt = nt
         self.maxit = maxit
@@ -103,7 +110,9 @@ class ParabolicFDMModel:
             - Optional convection term
             - Optional reaction term
         
-        Results stored in self.A and self.I.
+        Results stored in self.A and self.I, together with the time stepper
+        self.stepper, which factorizes the implicit operator once per time
+        step size.
         """
         mesh = self.mesh
         pde = self.pde
@@ -132,6 +141,12 @@ class ParabolicFDMModel:
         self.A = A
         self.I = I
 
+        # The pure Laplace operator is applied matrix-free, and is required by
+        # the 'dst' solver.
+        laplace = not any(hasattr(pde, k) for k in ('diffusion_coef', 'convection_coef', 'reaction_coef'))
+        op = LaplaceOperator(mesh) if laplace else A
+        self.stepper = LinearTimeStepper(mesh, op, scheme=self.scheme, solver=self.time_solver)
+
     def init_solution(self):
         """Initialize solution using initial condition
         
@@ -156,38 +171,12 @@ class ParabolicFDMModel:
                 - Forward Euler (explicit)
                 - Backward Euler (implicit)
                 - Crank-Nicolson (implicit)
-            Applies Dirichlet BCs appropriately for each scheme.
+            Applies Dirichlet BCs appropriately for each scheme. The implicit
+            operator, the boundary node flag and the factorization are reused
+            from the previous steps, see `LinearTimeStepper`.
         """
-        mesh = self.mesh
-        A = self.A
-        I = self.I
-        uh = self.uh
         t = self.t0 + n*tau
-        F = mesh.interpolate(lambda p: self.pde.source(p, t), etype='node').reshape(-1)
-
-        if self.scheme == 'forward':
-            uh_new = uh - tau * (A@uh) + tau * F
-            bd = mesh.boundary_node_flag()
-            nodes = mesh.entity('node')
-            uh_new[bd] = self.pde.dirichlet(nodes[bd], t)
-            self.uh = uh_new
-
-        elif self.scheme == 'backward':
-            S = I + tau*A
-            b = uh + tau*F
-            bd = mesh.boundary_node_flag()
-            S, b = DirichletBC(mesh, lambda p: self.pde.dirichlet(p, t)).apply(S, b)
-            self.uh = spsolve(S, b, solver='scipy')
-
-        elif self.scheme == 'cn':
-            S = I + 0.5*tau*A
-            b = (I - 0.5*tau*A)@uh + tau*F
-            bd = mesh.boundary_node_flag()
-            S, b = DirichletBC(mesh, lambda p: self.pde.dirichlet(p, t)).apply(S, b)
-            self.uh = spsolve(S, b, solver='scipy')
-
-        else:
-            raise ValueError(f"Unknown scheme {self.scheme}")
+        self.uh = self.stepper.step(self.uh, t, tau, self.pde.source, self.pde.dirichlet)
         
     def run(self):
         """Execute full simulation with mesh refinement study
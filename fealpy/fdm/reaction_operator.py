@@ -1,13 +1,12 @@
-import math
-from typing import Optional
 from typing import Optional, Callable, Union
 import inspect
 from ..backend import backend_manager as bm
 from ..backend import TensorLike
-from ..sparse import csr_matrix, spdiags, SparseTensor
+from ..sparse import SparseTensor
 from ..mesh import UniformMesh
 
 from .operator_base import OpteratorBase, assemblymethod
+from .stencil import StencilOperator
 
 class ReactionOperator(OpteratorBase):
     """
@@ -50,16 +49,12 @@ class ReactionOperator(OpteratorBase):
         self.mesh = mesh
         self.reaction_coef = reaction_coef
 
-    def assembly(self) -> SparseTensor:
+    def stencil(self) -> StencilOperator:
         """
-        Assemble the diagonal matrix for the reaction operator.
-
-        The operator acts pointwise on the solution vector as:
-            R(x) * u(x)  →  diag(R) · u
+        Return the one point stencil R(x) of the reaction operator.
 
         Returns:
-            SparseTensor: CSR-format sparse diagonal matrix of shape (NN, NN),
-                          where NN is the number of mesh nodes.
+            StencilOperator: The stencil on the nodes of the mesh.
         """
         mesh = self.mesh
         NN = mesh.number_of_nodes()
@@ -83,5 +78,19 @@ class ReactionOperator(OpteratorBase):
             raise ValueError(f"Invalid data type: reaction_coef must be an int, float, tensor, or callable(e.g. function). \
                              Now is {type(self.reaction_coef)}.")
             
-        D = spdiags(data, 0, NN, NN, format='csr')
-        return D
+        S = StencilOperator(mesh)
+        S.add((0,) * mesh.geo_dimension(), data)
+        return S
+
+    def assembly(self) -> SparseTensor:
+        """
+        Assemble the diagonal matrix for the reaction operator.
+
+        The operator acts pointwise on the solution vector as:
+            R(x) * u(x)  →  diag(R) · u
+
+        Returns:
+            SparseTensor: CSR-format sparse diagonal matrix of shape (NN, NN),
+                          where NN is the number of mesh nodes.
+        """
+        return self.stencil().to_csr()
@@ -0,0 +1,178 @@
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import CSRTensor
+from ..mesh import UniformMesh
+
+
+class StencilOperator:
+    """
+    Linear operator given by a stencil on the nodes of a structured mesh:
+
+        (A u)_p = sum_k a_k(p) * u_{p + o_k},
+
+    where the o_k are integer offsets on the node grid, the a_k are constants
+    or nodal arrays evaluated at the row node p, and the neighbors falling
+    outside the grid are dropped.
+
+    For every offset the rows having that neighbor form a box of the grid, so
+    the number of entries of every row, the row pointers and the positions of
+    all the entries are known before any value is written. `to_csr` fills the
+    column indices and the values of the CSR matrix in one pass over the
+    offsets, without sorting or merging partial matrices. `to_dia` gives the
+    diagonals of the same matrix, and `A @ u` applies it without building any
+    matrix.
+
+    Parameters:
+        mesh (UniformMesh): The structured mesh (1D, 2D or 3D).
+        offsets (Sequence[Sequence[int]], optional): The offsets o_k, each of
+            length GD.
+        coefs (Sequence[float | TensorLike], optional): The coefficients a_k,
+            scalars or arrays of shape (NN, ) or of the node grid shape.
+
+    Example:
+        >>> S = StencilOperator(mesh)
+        >>> S.add((0, 0), 4.0)
+        >>> for o in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+        ...     S.add(o, -1.0)
+        >>> A = S.to_csr()
+    """
+    def __init__(self, mesh: UniformMesh,
+                 offsets: Optional[Sequence[Sequence[int]]]=None,
+                 coefs: Optional[Sequence[Union[float, TensorLike]]]=None):
+        self.mesh = mesh
+        self.shape = tuple(mesh.linear_index_map('node').shape)
+        self.GD = len(self.shape)
+        self.NN = mesh.number_of_nodes()
+        self.stencil: Dict[Tuple[int, ...], Union[float, TensorLike]] = {}
+
+        if offsets is not None:
+            for offset, coef in zip(offsets, coefs):
+                self.add(offset, coef)
+
+    def add(self, offset: Sequence[int], coef: Union[float, TensorLike]) -> None:
+        """Add coef * u_{p + offset} to the stencil, summed with a previous coefficient of the same offset."""
+        offset = tuple(int(o) for o in offset)
+        if len(offset) != self.GD:
+            raise ValueError(f"The offset {offset} should have {self.GD} components.")
+        if isinstance(coef, int):
+            coef = float(coef)
+        elif not isinstance(coef, float):
+            coef = float(coef) if coef.ndim == 0 else bm.reshape(coef, self.shape)
+        if offset in self.stencil:
+            coef = self.stencil[offset] + coef
+        self.stencil[offset] = coef
+
+    def _regions(self, offset):
+        """The slices of the rows having the neighbor at `offset`, and of these neighbors."""
+        rows, cols = [], []
+        for o in offset:
+            rows.append(slice(max(-o, 0), None if o <= 0 else -o))
+            cols.append(slice(max(o, 0), None if o >= 0 else o))
+        return tuple(rows), tuple(cols)
+
+    def _items(self):
+        """The offsets sorted by the shift of their linear index, so the columns of every row are sorted."""
+        strides = [1] * self.GD
+        for i in range(self.GD - 2, -1, -1):
+            strides[i] = strides[i+1] * self.shape[i+1]
+        shift = lambda o: sum(s * d for s, d in zip(strides, o))
+        items = sorted(self.stencil.items(), key=lambda item: shift(item[0]))
+        # NOTE: constant zero coefficients and offsets longer than the grid
+        # give no entries.
+        return [(o, shift(o), c) for o, c in items
+                if all(abs(d) < n for d, n in zip(o, self.shape))
+                and not (isinstance(c, float) and c == 0.0)]
+
+    def _values(self, coef, region, size, dtype, device):
+        if isinstance(coef, (int, float)):
+            return bm.full((size,), coef, dtype=dtype, device=device)
+        return bm.astype(bm.reshape(coef[region], (-1,)), dtype)
+
+    def to_csr(self) -> CSRTensor:
+        """
+        Assemble the operator in CSR format.
+
+        Returns:
+            CSRTensor: Sparse matrix of shape (NN, NN) with sorted column indices.
+        """
+        mesh = self.mesh
+        device = mesh.device
+        ftype = mesh.ftype
+        items = self._items()
+        K = bm.arange(self.NN, dtype=bm.int64, device=device)
+        K = bm.reshape(K, self.shape)
+
+        # Row pointers from the number of neighbors of every row.
+        counts = bm.zeros(self.shape, dtype=bm.int64, device=device)
+        for offset, _, _ in items:
+            rows, _ = self._regions(offset)
+            counts = bm.set_at(counts, rows, counts[rows] + 1)
+        crow = bm.concat([bm.zeros((1,), dtype=bm.int64, device=device),
+                          bm.cumsum(bm.reshape(counts, (-1,)), axis=0)], axis=0)
+        NNZ = int(crow[-1])
+
+        col = bm.empty((NNZ,), dtype=bm.int64, device=device)
+        values = bm.empty((NNZ,), dtype=ftype, device=device)
+        fill = bm.reshape(bm.copy(crow[:-1]), self.shape)
+        for offset, shift, coef in items:
+            rows, _ = self._regions(offset)
+            pos = bm.reshape(fill[rows], (-1,))
+            r = bm.reshape(K[rows], (-1,))
+            col = bm.set_at(col, pos, r + shift)
+            values = bm.set_at(values, pos, self._values(coef, rows, r.shape[0], ftype, device))
+            fill = bm.set_at(fill, rows, fill[rows] + 1)
+
+        return CSRTensor(crow, col, values, spshape=(self.NN, self.NN))
+
+    def to_dia(self) -> Tuple[TensorLike, TensorLike]:
+        """
+        Return the diagonals of the operator.
+
+        Returns:
+            Tuple[TensorLike, TensorLike]: `data` of shape (num_diags, NN) and
+                `offsets` of shape (num_diags, ), in the layout of `spdiags` and
+                `scipy.sparse.dia_matrix`: A[j - offsets[k], j] = data[k, j].
+        """
+        mesh = self.mesh
+        items = self._items()
+        data = bm.zeros((len(items), ) + self.shape, dtype=mesh.ftype, device=mesh.device)
+        for k, (offset, _, coef) in enumerate(items):
+            rows, cols = self._regions(offset)
+            index = (k, ) + cols
+            if isinstance(coef, (int, float)):
+                data = bm.set_at(data, index, coef)
+            else:
+                data = bm.set_at(data, index, bm.astype(coef[rows], mesh.ftype))
+        offsets = bm.tensor([shift for _, shift, _ in items], dtype=bm.int64, device=mesh.device)
+        return bm.reshape(data, (len(items), self.NN)), offsets
+
+    def __matmul__(self, u: TensorLike) -> TensorLike:
+        """
+        Apply the operator to u without assembling the matrix.
+
+        The slices of the grid are updated in place with the `out=` argument of
+        the backend functions (numpy, pytorch).
+
+        Parameters:
+            u (TensorLike): Values on the nodes, shaped (NN, ...).
+
+        Returns:
+            TensorLike: A @ u, shaped like u.
+        """
+        batch = tuple(u.shape[1:])
+        U = bm.reshape(u, self.shape + batch)
+        expand = (slice(None),) * self.GD + (None,) * len(batch)
+        coef = lambda c, rows: c if isinstance(c, (int, float)) else c[rows][expand]
+
+        # Start from the diagonal term, which covers the whole grid.
+        center = self.stencil.get((0,) * self.GD, 0.0)
+        r = bm.multiply(U, coef(center, ()))
+        for offset, _, c in self._items():
+            if not any(offset):
+                continue
+            rows, cols = self._regions(offset)
+            t = bm.multiply(U[cols], coef(c, rows))
+            bm.add(r[rows], t, out=r[rows])
+        return bm.reshape(r, u.shape)
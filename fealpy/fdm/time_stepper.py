@@ -0,0 +1,136 @@
+from typing import Callable, Optional, Union
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import spdiags, SparseTensor
+from ..mesh import UniformMesh
+from ..solver import DirectSolverManager
+
+from .laplace_operator import LaplaceOperator
+from .dirichlet_bc import DirichletBC
+from .dst_solver import DSTSolver
+
+
+class LinearTimeStepper:
+    """
+    One-step time integration of du/dt + A u = f with Dirichlet boundary
+    conditions on a uniform mesh, by the theta-schemes
+
+        (I + theta*tau*A) u^{n+1} = (I - (1-theta)*tau*A) u^n + tau*f(t^{n+1}),
+
+    with theta = 0 ('forward'), 1 ('backward') or 1/2 ('cn').
+
+    Everything that does not depend on the time level is set up once: the
+    node coordinates and the Dirichlet node flag, and for every (tau, scheme)
+    the implicit operator with the boundary rows replaced by the identity,
+    factorized once. A time step then costs one evaluation of the source and
+    of the boundary data, one product with A and one solve with the factors.
+
+    Parameters:
+        mesh (UniformMesh): The structured mesh.
+        A (SparseTensor | LaplaceOperator): The spatial operator. A
+            `LaplaceOperator` is applied matrix-free in the explicit products.
+        scheme (str): 'forward', 'backward' or 'cn', defaults to 'backward'.
+        solver (str): The solver of the implicit systems:
+            - 'lu': sparse LU factorization cached by `DirectSolverManager`;
+            - 'dst': `DSTSolver`, fast sine transforms; it needs A to be the
+              `LaplaceOperator` and the boundary conditions on the whole boundary.
+        threshold (Callable, optional): Selects the Dirichlet boundary nodes,
+            see `DirichletBC`.
+    """
+    SCHEMES = {'forward': 0.0, 'backward': 1.0, 'cn': 0.5}
+
+    def __init__(self, mesh: UniformMesh, A: Union[SparseTensor, LaplaceOperator],
+                 scheme: str='backward', solver: str='lu',
+                 threshold: Optional[Callable]=None):
+        scheme = scheme.lower()
+        if scheme not in self.SCHEMES:
+            raise ValueError(f"Unknown scheme {scheme}")
+        if solver not in ('lu', 'dst'):
+            raise ValueError(f"Unknown solver {solver}, expected 'lu' or 'dst'")
+        if solver == 'dst' and (not isinstance(A, LaplaceOperator) or threshold is not None):
+            raise ValueError("The 'dst' solver needs the LaplaceOperator and Dirichlet "
+                             "conditions on the whole boundary.")
+
+        self.mesh = mesh
+        self.A = A
+        self.scheme = scheme
+        self.theta = self.SCHEMES[scheme]
+        self.solver = solver
+
+        self.node = mesh.entity('node')
+        # Only the matrix and the node flag of the boundary condition are used,
+        # the boundary values are evaluated at every time level in `step`.
+        self.bc = DirichletBC(mesh, lambda p: 0.0, threshold=threshold)
+        self.bdflag = self.bc.boundary_flag()
+        self.bd_node = self.node[self.bdflag]
+        self._matrix = None
+        self._systems = {}
+
+    def matrix(self) -> SparseTensor:
+        """The assembled spatial operator, assembled once for a `LaplaceOperator`."""
+        if not isinstance(self.A, LaplaceOperator):
+            return self.A
+        if self._matrix is None:
+            self._matrix = self.A.assembly()
+        return self._matrix
+
+    def system(self, tau: float):
+        """
+        Return the implicit operator S = I + theta*tau*A and the solver of S
+        with the Dirichlet rows, built and factorized once per time step size.
+        """
+        key = float(tau)
+        if key not in self._systems:
+            theta = self.theta
+            if self.solver == 'dst':
+                self._systems[key] = (None, DSTSolver(self.mesh, alpha=1.0, beta=theta*tau))
+            else:
+                A = self.matrix()
+                NN = A.shape[0]
+                I = spdiags(bm.ones(NN, dtype=self.mesh.ftype), 0, NN, NN)
+                S = I + theta*tau*A
+                f = bm.zeros(NN, dtype=self.mesh.ftype, device=self.mesh.device)
+                S_bc, _ = self.bc.apply(S, f, uh=bm.zeros_like(f))
+                manager = DirectSolverManager('scipy')
+                manager.set_matrix(S_bc)
+                self._systems[key] = (S, manager)
+        return self._systems[key]
+
+    def step(self, uh: TensorLike, t: float, tau: float,
+             source: Callable, dirichlet: Callable) -> TensorLike:
+        """
+        Advance the solution from t - tau to t.
+
+        Parameters:
+            uh (TensorLike): The solution at t - tau on the nodes, shaped (NN, ).
+            t (float): The new time level.
+            tau (float): The time step size.
+            source (Callable): f(p, t), evaluated at the nodes at time t.
+            dirichlet (Callable): g(p, t), evaluated at the boundary nodes at time t.
+
+        Returns:
+            TensorLike: The solution at time t.
+        """
+        bdflag = self.bdflag
+        F = source(self.node, t)
+        g = dirichlet(self.bd_node, t)
+        theta = self.theta
+
+        if theta == 0.0:
+            uh_new = uh - tau * (self.A @ uh) + tau * F
+            return bm.set_at(uh_new, bdflag, g)
+
+        b = uh + tau * F
+        if theta != 1.0:
+            b = b - (1.0 - theta) * tau * (self.A @ uh)
+
+        S, solver = self.system(tau)
+        gd = bm.set_at(bm.zeros_like(uh), bdflag, g)
+        if self.solver == 'dst':
+            return solver.solve(b, gd)
+
+        # Move the boundary values to the right-hand side, as DirichletBC does.
+        b = b - S @ gd
+        b = bm.set_at(b, bdflag, g)
+        return solver.solve(b)
@@ -1,75 +1,91 @@
-"""The FEM Module"""
+"""The FEM Module
+
+Forms and integrators are imported on first access, see `fealpy._lazy`.
+"""
+from .._lazy import attach
 
 ### Forms and bases
 from .integrator import *
-from .bilinear_form import BilinearForm
-from .linear_form import LinearForm
-from .nonlinear_form import NonlinearForm
-from .block_form import BlockForm
-from .linear_block_form import LinearBlockForm
+from .integrator import __all__ as _integrator_all
 
-### Cell Operator
-from .scalar_diffusion_integrator import ScalarDiffusionIntegrator
-from .scalar_nonlinear_diffusion_integrator import ScalarNonlinearDiffusionIntegrator
-from .scalar_mass_integrator import ScalarMassIntegrator
-from .scalar_nonlinear_mass_integrator import ScalarNonlinearMassIntegrator
-from .scalar_convection_integrator import ScalarConvectionIntegrator
-from .linear_elasticity_integrator import LinearElasticityIntegrator
-from .press_work_integrator import PressWorkIntegrator, PressWorkIntegratorX, PressWorkIntegratorY
-from .curlcurl_integrator import CurlCurlIntegrator
-from .nonlinear_elastic_integrator import NonlinearElasticIntegrator
-from .div_integrator import DivIntegrator
-from .viscous_work_integrator import ViscousWorkIntegrator
-from .scalar_biharmonic_integrator import ScalarBiharmonicIntegrator
-from .mthlaplace_integrator import MthLaplaceIntegrator
-from .mass_integrator import MassIntegrator
-from .diffusion_integrator import DiffusionIntegrator
-from .optimal_control_integrator import OPCIntegrator
-from .optimal_control_source_integrator import OPCSIntegrator
-from .curl_jump_penalty_intergrator import CurlJumpPenaltyIntergrator
-from .jump_penalty_intergrator import JumpPenaltyIntergrator
+_REGISTRY = {
+    'BilinearForm': '.bilinear_form',
+    'MatrixFreeOperator': '.matrix_free',
+    'LinearForm': '.linear_form',
+    'NonlinearForm': '.nonlinear_form',
+    'BlockForm': '.block_form',
+    'LinearBlockForm': '.linear_block_form',
 
-### Cell Source
-from .cell_source_integrator import CellSourceIntegrator
-SourceIntegrator = CellSourceIntegrator
+    ### Cell Operator
+    'ScalarDiffusionIntegrator': '.scalar_diffusion_integrator',
+    'ScalarNonlinearDiffusionIntegrator': '.scalar_nonlinear_diffusion_integrator',
+    'ScalarMassIntegrator': '.scalar_mass_integrator',
+    'ScalarNonlinearMassIntegrator': '.scalar_nonlinear_mass_integrator',
+    'ScalarConvectionIntegrator': '.scalar_convection_integrator',
+    'LinearElasticityIntegrator': '.linear_elasticity_integrator',
+    'PressWorkIntegrator': '.press_work_integrator',
+    'PressWorkIntegratorX': '.press_work_integrator',
+    'PressWorkIntegratorY': '.press_work_integrator',
+    'CurlCurlIntegrator': '.curlcurl_integrator',
+    'NonlinearElasticIntegrator': '.nonlinear_elastic_integrator',
+    'DivIntegrator': '.div_integrator',
+    'ViscousWorkIntegrator': '.viscous_work_integrator',
+    'ScalarBiharmonicIntegrator': '.scalar_biharmonic_integrator',
+    'MthLaplaceIntegrator': '.mthlaplace_integrator',
+    'MassIntegrator': '.mass_integrator',
+    'DiffusionIntegrator': '.diffusion_integrator',
+    'OPCIntegrator': '.optimal_control_integrator',
+    'OPCSIntegrator': '.optimal_control_source_integrator',
+    'CurlJumpPenaltyIntergrator': '.curl_jump_penalty_intergrator',
+    'JumpPenaltyIntergrator': '.jump_penalty_intergrator',
 
-from .grad_source_integrator import GradSourceIntegrator
-from .scalar_source_integrator import ScalarSourceIntegrator
-from .vector_source_integrator import VectorSourceIntegrator
+    ### Cell Source
+    'CellSourceIntegrator': '.cell_source_integrator',
+    'SourceIntegrator': '.cell_source_integrator:CellSourceIntegrator',
+    'GradSourceIntegrator': '.grad_source_integrator',
+    'ScalarSourceIntegrator': '.scalar_source_integrator',
+    'VectorSourceIntegrator': '.vector_source_integrator',
 
-### Face Operator
-from .scalar_robin_bc_integrator import ScalarRobinBCIntegrator
-from .face_mass_integrator import BoundaryFaceMassIntegrator, InterFaceMassIntegrator
-from .fluid_boundary_friction_integrator import FluidBoundaryFrictionIntegrator
-from .scalar_interior_penalty_integrator import ScalarInteriorPenaltyIntegrator
-from .press_work_integrator import BoundaryPressWorkIntegrator
+    ### Face Operator
+    'ScalarRobinBCIntegrator': '.scalar_robin_bc_integrator',
+    'BoundaryFaceMassIntegrator': '.face_mass_integrator',
+    'InterFaceMassIntegrator': '.face_mass_integrator',
+    'FluidBoundaryFrictionIntegrator': '.fluid_boundary_friction_integrator',
+    'ScalarInteriorPenaltyIntegrator': '.scalar_interior_penalty_integrator',
+    'BoundaryPressWorkIntegrator': '.press_work_integrator',
 
-### Face Source
-from .face_source_integrator import BoundaryFaceSourceIntegrator, InterFaceSourceIntegrator
-ScalarNeumannBCIntegrator = BoundaryFaceSourceIntegrator
-ScalarRobinSourceIntegrator = BoundaryFaceSourceIntegrator
+    ### Face Source
+    'BoundaryFaceSourceIntegrator': '.face_source_integrator',
+    'InterFaceSourceIntegrator': '.face_source_integrator',
+    'ScalarNeumannBCIntegrator': '.face_source_integrator:BoundaryFaceSourceIntegrator',
+    'ScalarRobinSourceIntegrator': '.face_source_integrator:BoundaryFaceSourceIntegrator',
 
-### Dirichlet BC
-from .dirichlet_bc import DirichletBC
-from .dirichlet_bc_operator import DirichletBCOperator
+    ### Dirichlet BC
+    'DirichletBC': '.dirichlet_bc',
+    'DirichletBCPlan': '.dirichlet_bc',
+    'DirichletBCOperator': '.dirichlet_bc_operator',
 
-### recovery estimate
-from .recovery_alg import RecoveryAlg
+    ### recovery estimate
+    'RecoveryAlg': '.recovery_alg',
 
-### Other
-from .nonlinear_wrapper import NonlinearWrapperInt
+    ### Other
+    'NonlinearWrapperInt': '.nonlinear_wrapper',
 
-### computational model 
-from .poisson_lfem_model import PoissonLFEMModel
-from .level_set_lfem_model import LevelSetLFEMModel, LevelSetReinitModel
-from .interface_poisson_lfem_model import InterfacePoissonLFEMModel
-from .elliptic_mixed_fem_model import EllipticMixedFEMModel
-from .allencahn_lfem_model import AllenCahnLFEMModel
-from .optimal_contron_mixed_fem_model import OPCMixedFEMModel
-from .surface_poisson_lfem_model import SurfacePoissonLFEMModel
-from .helmholtz_lfem_model import HelmholtzLFEMModel
-from .curlcurl_lfem_model import CurlCurlLFEMModel
-from .linear_elasticity_eigen_lfem_model import LinearElasticityEigenLFEMModel
-from .stokes_lfem_model import StokesLFEMModel
-from .dld_microfluidic_chip_lfem_model import DLDMicrofluidicChipLFEMModel
+    ### computational model
+    'PoissonLFEMModel': '.poisson_lfem_model',
+    'LevelSetLFEMModel': '.level_set_lfem_model',
+    'LevelSetReinitModel': '.level_set_lfem_model',
+    'InterfacePoissonLFEMModel': '.interface_poisson_lfem_model',
+    'EllipticMixedFEMModel': '.elliptic_mixed_fem_model',
+    'AllenCahnLFEMModel': '.allencahn_lfem_model',
+    'OPCMixedFEMModel': '.optimal_contron_mixed_fem_model',
+    'SurfacePoissonLFEMModel': '.surface_poisson_lfem_model',
+    'HelmholtzLFEMModel': '.helmholtz_lfem_model',
+    'CurlCurlLFEMModel': '.curlcurl_lfem_model',
+    'LinearElasticityEigenLFEMModel': '.linear_elasticity_eigen_lfem_model',
+    'StokesLFEMModel': '.stokes_lfem_model',
+    'DLDMicrofluidicChipLFEMModel': '.dld_microfluidic_chip_lfem_model',
+}
 
+__getattr__, __dir__, __all__ = attach(__name__, _REGISTRY)
+__all__ = _integrator_all + __all__
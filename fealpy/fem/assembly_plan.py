@@ -0,0 +1,95 @@
+
+from typing import List, Sequence, Tuple
+
+from ..typing import TensorLike, Size
+from ..backend import backend_manager as bm
+from ..sparse import CSRTensor
+
+
+class AssemblyPlan():
+    """Reusable CSR sparsity pattern and local-to-global scatter map of a form.
+
+    The plan is built from the entity-to-global-DoF relationships yielded by
+    `Form.assembly_local_iterative`. For every local matrix entry, `slots`
+    stores the position of the entry in the `values` of the CSR matrix, so
+    re-assembly with new coefficients is a single scatter-add into a value
+    buffer, without building COO indices, sorting or coalescing.
+
+    Parameters:
+        e2dofs (Sequence[Tuple[Tensor, Tensor]]): (row, col) entity-to-global
+            DoF relationships of each assembly chunk, shaped (NC, vldof) and (NC, uldof).
+        sparse_shape (Size): shape of the global matrix.
+    """
+    def __init__(self, e2dofs: Sequence[Tuple[TensorLike, TensorLike]], sparse_shape: Size):
+        self.e2dofs = list(e2dofs)
+        self.sparse_shape = tuple(sparse_shape)
+        self._build()
+
+    def _build(self):
+        nrow, ncol = self.sparse_shape
+        keys = []
+
+        for ve2dof, ue2dof in self.e2dofs:
+            key = bm.astype(ve2dof, bm.int64)[:, :, None] * ncol + ue2dof[:, None, :]
+            keys.append(bm.reshape(key, (-1, )))
+
+        key = bm.concat(keys, axis=0)
+        ukey, self.slots = bm.unique(key, return_inverse=True)
+        self.slots = bm.reshape(self.slots, (-1, ))
+        itype = self.e2dofs[0][0].dtype
+        count = bm.bincount(ukey // ncol, minlength=nrow)
+        self.crow = bm.astype(bm.concat([bm.zeros((1, ), **bm.context(count)),
+                                         bm.cumsum(count, axis=0)], axis=0), itype)
+        self.col = bm.astype(ukey % ncol, itype)
+
+    @property
+    def nnz(self) -> int:
+        return self.col.shape[0]
+
+    def match(self, e2dofs: Sequence[Tuple[TensorLike, TensorLike]], sparse_shape: Size) -> bool:
+        """Check whether the plan is still valid for the given DoF layout."""
+        if tuple(sparse_shape) != self.sparse_shape:
+            return False
+        if len(e2dofs) != len(self.e2dofs):
+            return False
+
+        for new, old in zip(e2dofs, self.e2dofs):
+            for a, b in zip(new, old):
+                if a is b:
+                    continue
+                if a.shape != b.shape or (not bm.all(a == b)):
+                    return False
+
+        return True
+
+    def scatter(self, local_tensors: List[TensorLike], batch_size: int = 0) -> TensorLike:
+        """Accumulate local matrices into the CSR values following the pattern.
+
+        Parameters:
+            local_tensors (List[Tensor]): local matrices of each chunk, shaped
+                ([batch,] NC, vldof, uldof), in the same order as the plan.
+            batch_size (int, optional): size of the batch dimension. Defaults to 0.
+
+        Returns:
+            Tensor: values of the CSR matrix, shaped ([batch,] nnz).
+        """
+        ravel_shape = (-1, ) if batch_size == 0 else (batch_size, -1)
+        values = [bm.reshape(lt, ravel_shape) for lt in local_tensors]
+        values = values[0] if len(values) == 1 else bm.concat(values, axis=-1)
+        nnz = self.nnz
+
+        if (bm.backend_name == 'numpy') and (batch_size == 0):
+            # NOTE: bincount is a buffered scatter-add and is much faster than
+            # the `np.add.at` behind `index_add`.
+            import numpy as np
+            if np.iscomplexobj(values):
+                return (np.bincount(self.slots, weights=values.real, minlength=nnz)
+                        + 1j*np.bincount(self.slots, weights=values.imag, minlength=nnz))
+            return np.bincount(self.slots, weights=values, minlength=nnz).astype(values.dtype)
+
+        shape = (nnz, ) if batch_size == 0 else (batch_size, nnz)
+        out = bm.zeros(shape, dtype=values.dtype, device=bm.get_device(values))
+        return bm.index_add(out, self.slots, values, axis=-1)
+
+    def tocsr(self, values: TensorLike) -> CSRTensor:
+        return CSRTensor(self.crow, self.col, values, self.sparse_shape)
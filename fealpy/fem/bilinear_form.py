@@ -1,5 +1,5 @@
 
-from typing import Optional, Literal, overload
+from typing import Optional, Literal, Union, overload
 
 from .. import logger
 from ..typing import TensorLike
@@ -7,10 +7,20 @@ from ..backend import backend_manager as bm
 from ..sparse import COOTensor, CSRTensor
 from .form import Form
 from .integrator import LinearInt
+from .assembly_plan import AssemblyPlan
+from .matrix_free import MatrixFreeOperator
+from .parallel_assembly import ParallelAssembler
+from .streaming import (
+    parse_memory, format_memory, tensor_nbytes, MemoryTracker, CSRAccumulator
+)
 
 
 class BilinearForm(Form[LinearInt]):
     _M = None
+    _plan: Optional[AssemblyPlan] = None
+    peak_memory: Optional[int] = None
+    _PROBE_SIZE = 64
+    _MERGE_FACTOR = 4.0
 
     def _get_sparse_shape(self):
         spaces = self._spaces
@@ -74,22 +84,219 @@ class BilinearForm(Form[LinearInt]):
 
         return M
 
+    def _global_block(self, group_tensor: TensorLike, e2dofs_tuple):
+        """Broadcast the batch dimension and apply the transposition to a local
+        tensor yielded by the integrators.
+
+        Returns:
+            Tuple[Tensor, Tensor, Tensor]: the local tensor shaped ([batch,] NC, vldof, uldof),
+                and the row and column entity-to-global relationships.
+        """
+        ue2dof = e2dofs_tuple[0]
+        ve2dof = e2dofs_tuple[1] if (len(e2dofs_tuple) > 1) else ue2dof
+
+        if (self.batch_size > 0) and (group_tensor.ndim == 3): # Case: no batch dimension
+            group_tensor = bm.stack([group_tensor]*self.batch_size, axis=0)
+        if getattr(self, '_transposed', False):
+            group_tensor = bm.swapaxes(group_tensor, -1, -2)
+            ue2dof, ve2dof = ve2dof, ue2dof
+
+        return group_tensor, ve2dof, ue2dof
+
+    def _plan_assembly(self):
+        """Assembly the CSR matrix through the cached assembly plan.
+
+        The plan is rebuilt only if the DoF layout (entity-to-global relationship
+        or the number of global DoFs) is different from that of the last call."""
+        self.check_space()
+        space = self._spaces
+        batch_size = self.batch_size
+        ugdof = space[0].number_of_global_dofs()
+        vgdof = space[1].number_of_global_dofs() if (len(space) > 1) else ugdof
+        sparse_shape = (vgdof, ugdof)
+        transposed = getattr(self, '_transposed', False)
+        local_tensors = []
+        e2dofs = []
+
+        for group_tensor, e2dofs_tuple in self.assembly_local_iterative():
+            group_tensor, ve2dof, ue2dof = self._global_block(group_tensor, e2dofs_tuple)
+            local_tensors.append(group_tensor)
+            e2dofs.append((ve2dof, ue2dof))
+
+        if transposed:
+            sparse_shape = (ugdof, vgdof)
+
+        plan = self._plan
+        if (plan is None) or (not plan.match(e2dofs, sparse_shape)):
+            logger.info("Building the assembly plan of the bilinear form.")
+            plan = AssemblyPlan(e2dofs, sparse_shape)
+            self._plan = plan
+
+        return plan.tocsr(plan.scatter(local_tensors, batch_size))
+
+    def _streaming_assembly(self, max_memory: int):
+        """Assembly the CSR matrix chunk by chunk under a memory budget.
+
+        A small probe chunk of every integrator is assembled and merged first
+        to measure the memory needed per entity, including the local tensors,
+        the entity-to-global arrays and the merge temporaries. Merging also
+        copies the running accumulator; this overhead is measured on every
+        chunk (numpy backend) and taken out of the budget before choosing the
+        next chunk size."""
+        self.check_space()
+        space = self._spaces
+        batch_size = self.batch_size
+        ugdof = space[0].number_of_global_dofs()
+        vgdof = space[1].number_of_global_dofs() if (len(space) > 1) else ugdof
+        transposed = getattr(self, '_transposed', False)
+        sparse_shape = (ugdof, vgdof) if transposed else (vgdof, ugdof)
+        acc = CSRAccumulator(sparse_shape, batch_size)
+        nchunk = 0
+        exhausted = False
+        # Temporaries of a merge per byte of the accumulator, see `CSRAccumulator.merge`.
+        merge_factor = self._MERGE_FACTOR
+
+        def merge(group_tensor, e2dofs_tuple):
+            group_tensor, ve2dof, ue2dof = self._global_block(group_tensor, e2dofs_tuple)
+            tracker.record(group_tensor, acc.values if acc.nnz > 0 else group_tensor)
+            acc.add(group_tensor, ve2dof, ue2dof)
+            tracker.record(acc.keys, acc.values)
+
+        with MemoryTracker() as tracker:
+            for key, integrator in self.integrators.items():
+                if not self._is_splittable(key):
+                    logger.warning(f"{integrator} does not support assembly on "
+                                   "a part of entities; assembled as a whole.")
+                    merge(*self._assembly_kernel(key))
+                    nchunk += 1
+                    continue
+
+                size = self._number_of_entities(key)
+                start = 0
+                stop = min(size, self._PROBE_SIZE)
+                per_entity = None
+
+                while start < size:
+                    n = stop - start
+                    acc_nbytes = acc.nbytes
+                    mark = tracker.mark()
+                    value, etg = self._assembly_kernel(key, slice(start, stop, 1))
+                    # local tensor, its keys, the unique inverse and the merged
+                    # copy, plus the entity-to-global arrays
+                    accounted = 6 * tensor_nbytes(value) + sum(tensor_nbytes(e) for e in etg)
+                    merge(value, etg)
+                    del value, etg
+                    measured = tracker.window_peak(mark)
+                    nchunk += 1
+
+                    if per_entity is None:
+                        per_entity = max(measured - merge_factor * acc_nbytes, accounted) / n
+                    elif acc_nbytes > 0:
+                        merge_factor = max(merge_factor, (measured - per_entity * n) / acc_nbytes)
+
+                    free = max_memory - (1 + merge_factor) * acc.nbytes
+                    chunk_size = int(free // per_entity)
+                    if chunk_size < acc.nbytes // per_entity:
+                        # NOTE: The budget is exhausted by the matrix itself. Keep
+                        # chunks comparable to the accumulator so that the number
+                        # of merges (each costs O(nnz)) stays logarithmic.
+                        if not exhausted:
+                            logger.warning(f"The memory budget {format_memory(max_memory)} "
+                                           "is too small for the assembled matrix; "
+                                           "the peak memory will exceed it.")
+                            exhausted = True
+                        chunk_size = int(acc.nbytes // per_entity)
+                    chunk_size = max(chunk_size, self._PROBE_SIZE)
+                    start, stop = stop, min(size, stop + chunk_size)
+
+        self.peak_memory = tracker.peak
+        logger.info(f"Streaming assembly finished in {nchunk} chunk(s), with peak memory "
+                    f"{format_memory(tracker.peak)} under the budget {format_memory(max_memory)}.")
+
+        return acc.tocsr(space[0].itype)
+
+    def _parallel_assembly(self, workers: int):
+        """Assembly the CSR matrix over a process pool, see `ParallelAssembler`.
+        Partial results of blocks are coalesced in the workers and merged here
+        in block order."""
+        self.check_space()
+        space = self._spaces
+        ugdof = space[0].number_of_global_dofs()
+        vgdof = space[1].number_of_global_dofs() if (len(space) > 1) else ugdof
+        sparse_shape = (ugdof, vgdof) if getattr(self, '_transposed', False) else (vgdof, ugdof)
+
+        def kernel(key, indices):
+            group_tensor, ve2dof, ue2dof = self._global_block(*self._assembly_kernel(key, indices))
+            block = CSRAccumulator(sparse_shape, self.batch_size)
+            block.add(group_tensor, ve2dof, ue2dof)
+            return block.keys, block.values
+
+        results = ParallelAssembler(self, workers).run(kernel)
+        acc = CSRAccumulator(sparse_shape, self.batch_size)
+        acc.merge([r[0] for r in results], [r[1] for r in results])
+
+        return acc.tocsr(space[0].itype)
+
+    def clear_plan(self):
+        """Drop the cached assembly plan."""
+        self._plan = None
+
     @overload
     def assembly(self) -> CSRTensor: ...
     @overload
     def assembly(self, *, format: Literal['coo']) -> COOTensor: ...
     @overload
     def assembly(self, *, format: Literal['csr']) -> CSRTensor: ...
-    def assembly(self, *, format='csr'):
+    def assembly(self, *, format='csr', reuse_pattern: bool=True,
+                 max_memory: Union[int, str, None]=None,
+                 workers: Optional[int]=None):
         """Assembly the bilinear form matrix.
 
         Parameters:
             format (str, optional): Layout of the output ('csr' | 'coo'). Defaults to 'csr'.\n
-            retain_ints (bool, optional): Whether to retain the integrator cache.csr
+            reuse_pattern (bool, optional): Whether to assembly CSR matrix through
+                the cached sparsity pattern and scatter map. The pattern is built
+                in the first call and rebuilt automatically when the DoF layout
+                changes. Defaults to True.\n
+            max_memory (int | str | None, optional): Memory budget of the assembly,
+                given in bytes or as a string like '4GB'. If given, entities are
+                assembled chunk by chunk and reduced into a running CSR
+                accumulator, with chunk sizes chosen from the budget; splitters
+                and the assembly plan are not used. The budget is a best-effort
+                target rather than a hard limit: merging a chunk needs several
+                times the size of the matrix assembled so far, so budgets below
+                about 6 times the final matrix (values and indices) will be
+                exceeded, with a warning. The achieved peak is saved in the
+                `peak_memory` attribute (in bytes). Defaults to None.\n
+            workers (int | None, optional): Number of processes to assembly with.
+                If given, entities are split into contiguous blocks evaluated by
+                a process pool (numpy backend only), and partial results are
+                merged in a fixed order, so the result does not depend on the
+                number of workers. Defaults to None.
 
         Returns:
             global_matrix (CSRTensor | COOTensor): Global sparse matrix shaped ([batch, ]gdof, gdof).
         """
+        if workers is not None:
+            if format not in ('csr', 'coo'):
+                raise ValueError(f"Unsupported format {format}.")
+            M = self._parallel_assembly(workers)
+            self._M = M if format == 'csr' else M.tocoo()
+            logger.info(f"Bilinear form matrix constructed, with shape {list(self._M.shape)}.")
+            return self._M
+
+        if max_memory is not None:
+            if format not in ('csr', 'coo'):
+                raise ValueError(f"Unsupported format {format}.")
+            M = self._streaming_assembly(parse_memory(max_memory))
+            self._M = M if format == 'csr' else M.tocoo()
+            return self._M
+
+        if reuse_pattern and (format == 'csr'):
+            self._M = self._plan_assembly()
+            logger.info(f"Bilinear form matrix constructed, with shape {list(self._M.shape)}.")
+            return self._M
+
         M = self._scalar_assembly()
         if getattr(self, '_transposed', False):
             M = M.T
@@ -104,6 +311,18 @@ class BilinearForm(Form[LinearInt]):
 
         return self._M
 
+    def matrix_free(self) -> MatrixFreeOperator:
+        """Build a matrix-free operator of the bilinear form.
+
+        Integrators must implement `matrix_free_setup` and `matrix_free_apply`.
+        The global matrix is never formed; local actions are evaluated by
+        sum-factorized kernels on tensor-product meshes.
+
+        Returns:
+            MatrixFreeOperator: linear operator shaped (gdof, gdof).
+        """
+        return MatrixFreeOperator(self)
+
     def mult(self, x: TensorLike, out: Optional[TensorLike]=None) -> TensorLike:
         """Maxtrix vector multiplication.
 
@@ -120,6 +339,7 @@ class BilinearForm(Form[LinearInt]):
     def T(self):
         transposed = self.copy()
         transposed._transposed = True
+        transposed._origin = self
         transposed._M = self._M
         return transposed
 
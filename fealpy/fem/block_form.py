@@ -5,7 +5,6 @@ from ..typing import Size, TensorLike
 from ..backend import backend_manager as bm
 from ..sparse import COOTensor, CSRTensor
 from .form import Form
-from ..sparse import COOTensor, CSRTensor
 
 class BlockForm(Form):
     _M = None
@@ -29,98 +28,228 @@ class BlockForm(Form):
     def shape(self) -> Size:
         return self.sparse_shape
     
+    def _block_offsets(self):
+        """Row and column offsets of the blocks, as Python integers."""
+        row_sizes = bm.max(self.block_shape[..., 0], axis=1)
+        col_sizes = bm.max(self.block_shape[..., 1], axis=0)
+        row_offset, col_offset = [0], [0]
+        for s in row_sizes:
+            row_offset.append(row_offset[-1] + int(s))
+        for s in col_sizes:
+            col_offset.append(col_offset[-1] + int(s))
+        return row_offset, col_offset
+
     def assembly_sparse_matrix(self, format='csr'):
-        a = bm.max(self.block_shape[...,0], axis=1)
-        row_offset = bm.cumsum(bm.max(self.block_shape[...,0],axis = 1), axis=0)
-        col_offset = bm.cumsum(bm.max(self.block_shape[...,1],axis = 0), axis=0)
-        row_offset = bm.concatenate((bm.array([0]),row_offset))
-        col_offset = bm.concatenate((bm.array([0]),col_offset))
-         
-        for j in range(self.ncols):
-            block = self.blocks[0][j]
-            if block is not None:
-                indices = bm.empty((2, 0), dtype=block.indices.dtype)
-                values = bm.empty((0,), dtype=block.values.dtype)
-                break
-        sparse_shape = self.shape
-        
-        for i in range(self.nrows):
-            for j in range(self.ncols):
-                block = self.blocks[i][j]
-                if block is None:
-                    continue
-                block = block.tocoo()
-                block_indices = block.indices + bm.array([[row_offset[i]], [col_offset[j]]])
-                block_values = block.values 
-                indices = bm.concatenate((indices, block_indices), axis=1)
-                values = bm.concatenate((values, block_values))
-        M = COOTensor(indices, values, sparse_shape) 
-        if format == 'csr':
-            self._M = M.coalesce().tocsr()
-        elif format == 'coo':
-            self._M = M.coalesce()
-        else:
-            raise ValueError(f"Unknown format {format}.")
+        """Merge blocks which are already sparse tensors."""
+        mats = {(i, j): block for i, row in enumerate(self.blocks)
+                for j, block in enumerate(row) if block is not None}
+        self._M = self._merge(mats, format)
         logger.info(f"Block form matrix constructed, with shape {list(self._M.shape)}.")
         return self._M
 
-    def assembly(self, format='csr'):
-        a = bm.max(self.block_shape[...,0], axis=1)
-        row_offset = bm.cumsum(bm.max(self.block_shape[...,0],axis = 1), axis=0)
-        col_offset = bm.cumsum(bm.max(self.block_shape[...,1],axis = 0), axis=0)
-        row_offset = bm.concatenate((bm.array([0]),row_offset))
-        col_offset = bm.concatenate((bm.array([0]),col_offset))
-         
-        for j in range(self.ncols):
-            block = self.blocks[0][j]
-            if block is not None:
-                indices = bm.empty((2, 0), dtype=block.space.mesh.itype)
-                values = bm.empty((0,), dtype=block.space.mesh.ftype)
-                break
-        sparse_shape = self.shape
-        
-        for i in range(self.nrows):
-            for j in range(self.ncols):
-                block = self.blocks[i][j]
-                if block is None:
-                    continue
-                block_matrix = block.assembly(format='coo')
-                block_indices = block_matrix.indices + bm.array([[row_offset[i]], [col_offset[j]]])
-                block_values = block_matrix.values 
-                indices = bm.concatenate((indices, block_indices), axis=1)
-                values = bm.concatenate((values, block_values))
-        M = COOTensor(indices, values, sparse_shape) 
-        if format == 'csr':
-            self._M = M.coalesce().tocsr()
-        elif format == 'coo':
-            self._M = M.coalesce()
+    def assembly(self, format='csr', parallel: bool=False):
+        """Assembly the block matrix.
+
+        Every distinct form is assembled once: a transposed view `form.T`
+        reuses the matrix of `form`. All the blocks are then written into index
+        and value buffers preallocated from their numbers of non-zeros.
+        When all the blocks are coalesced CSR matrices and a CSR output is
+        asked, the result is emitted directly without a global coalescence.
+
+        Parameters:
+            format (str, optional): Layout of the output ('csr' | 'coo'). Defaults to 'csr'.
+            parallel (bool, optional): Assembly the forms by a thread pool (numpy
+                backend only). Forms sharing integrators or an evaluation cache
+                are assembled in the same thread. Defaults to False.
+
+        Returns:
+            CSRTensor | COOTensor: the global matrix.
+        """
+        items = [((i, j), block) for i, row in enumerate(self.blocks)
+                 for j, block in enumerate(row) if block is not None]
+        fmt = 'csr' if format == 'csr' else 'coo'
+
+        forms = {}
+        for _, block in items:
+            form, _ = _source_form(block)
+            forms.setdefault(id(form), form)
+        forms = list(forms.values())
+        groups = _dependent_groups(forms)
+
+        if parallel and len(groups) > 1 and bm.backend_name == 'numpy':
+            from concurrent.futures import ThreadPoolExecutor
+
+            def _assembly(group):
+                return [form.assembly(format=fmt) for form in group]
+
+            with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                results = list(executor.map(_assembly, groups))
+            assembled = {id(form): m for group, ms in zip(groups, results)
+                         for form, m in zip(group, ms)}
         else:
-            raise ValueError(f"Unknown format {format}.")
+            assembled = {id(form): form.assembly(format=fmt) for form in forms}
+
+        mats = {}
+        for key, block in items:
+            form, transposed = _source_form(block)
+            M = assembled[id(form)]
+            mats[key] = _transpose(M) if transposed else M
+        self._M = self._merge(mats, format)
         logger.info(f"Block form matrix constructed, with shape {list(self._M.shape)}.")
         return self._M
-    
-    
+
+    def _merge(self, mats: dict, format: str):
+        if format not in ('csr', 'coo'):
+            raise ValueError(f"Unknown format {format}.")
+        if format == 'csr' and all(isinstance(m, CSRTensor) and _is_canonical_csr(m)
+                                   for m in mats.values()):
+            return self._merge_csr(mats)
+        M = self._merge_coo(mats).coalesce()
+        return M.tocsr() if format == 'csr' else M
+
+    def _merge_coo(self, mats: dict) -> COOTensor:
+        row_offset, col_offset = self._block_offsets()
+        mats = {key: m.tocoo() for key, m in mats.items()}
+        first = next(iter(mats.values()))
+        nnz = sum(m.nnz for m in mats.values())
+        kwargs = bm.context(first.values)
+        device = bm.get_device(first.values)
+        indices = bm.empty((2, nnz), dtype=first.indices.dtype, device=device)
+        values = bm.empty(first.values.shape[:-1] + (nnz,), **kwargs)
+
+        start = 0
+        for (i, j), m in mats.items():
+            end = start + m.nnz
+            offset = bm.tensor([[row_offset[i]], [col_offset[j]]], dtype=indices.dtype,
+                               device=device)
+            indices = bm.set_at(indices, (slice(None), slice(start, end)), m.indices + offset)
+            values = bm.set_at(values, (..., slice(start, end)), m.values)
+            start = end
+
+        return COOTensor(indices, values, self.shape)
+
+    def _merge_csr(self, mats: dict) -> CSRTensor:
+        # Blocks are visited by increasing block columns, so the columns of
+        # every global row stay sorted and the result is coalesced.
+        row_offset, col_offset = self._block_offsets()
+        first = next(iter(mats.values()))
+        itype = first.col.dtype
+        kwargs = bm.context(first.values)
+        device = bm.get_device(first.values)
+        nrow = self.shape[0]
+        nnz = sum(m.nnz for m in mats.values())
+
+        counts = bm.zeros(nrow, dtype=itype, device=device)
+        for (i, _), m in mats.items():
+            r0 = row_offset[i]
+            c = m.crow[1:] - m.crow[:-1]
+            counts = bm.index_add(counts, bm.arange(r0, r0 + c.shape[0], dtype=itype,
+                                                    device=device), c)
+        crow = bm.concatenate([bm.zeros(1, dtype=itype, device=device),
+                               bm.cumsum(counts, axis=0)])
+        col = bm.empty(nnz, dtype=itype, device=device)
+        values = bm.empty(first.values.shape[:-1] + (nnz,), **kwargs)
+
+        cursor = bm.copy(crow[:-1])
+        for key in sorted(mats, key=lambda k: (k[1], k[0])):
+            i, j = key
+            m = mats[key]
+            if m.nnz == 0:
+                continue
+            r0 = row_offset[i]
+            c = m.crow[1:] - m.crow[:-1]
+            nr = c.shape[0]
+            base = cursor[r0:r0 + nr] - m.crow[:-1]
+            pos = bm.repeat(base, c) + bm.arange(m.nnz, dtype=itype, device=device)
+            col = bm.set_at(col, pos, m.col + col_offset[j])
+            values = bm.set_at(values, (..., pos), m.values)
+            cursor = bm.set_at(cursor, slice(r0, r0 + nr), cursor[r0:r0 + nr] + c)
+
+        return CSRTensor(crow, col, values, self.shape)
+
     def __matmul__(self, u: TensorLike):
         if self._M is not None:
             return self._M @ u
-        
+
         # u的不同ndim情况
         kwargs = bm.context(u)
         v = bm.zeros_like(u, **kwargs)
 
-        row_offset = bm.cumsum(bm.max(self.block_shape[...,0],axis = 1), axis=0)
-        col_offset = bm.cumsum(bm.max(self.block_shape[...,1],axis = 0), axis=0)
-        row_offset = bm.concatenate((bm.array([0]),row_offset))
-        col_offset = bm.concatenate((bm.array([0]),col_offset))
+        row_offset, col_offset = self._block_offsets()
         for i in range(self.nrows):
             for j in range(self.ncols):
                 block = self.blocks[i][j]
                 if block is None:
                     continue
                 v = bm.index_add(v, bm.arange(row_offset[i],row_offset[i+1]), 
-                                 block @ u[row_offset[j]:row_offset[j+1]] )
-                #v[row_offset[i]:row_offset[i+1]] += block @ u[row_offset[j]:row_offset[j+1]] 
+                                 block @ u[col_offset[j]:col_offset[j+1]] )
+                #v[row_offset[i]:row_offset[i+1]] += block @ u[col_offset[j]:col_offset[j+1]] 
         return v
 
 
+def _is_canonical_csr(m: CSRTensor) -> bool:
+    """Whether the columns are strictly increasing inside every row."""
+    nnz = m.nnz
+    if m.values is None:
+        return False
+    if nnz < 2:
+        return True
+    increasing = m.col[1:] > m.col[:-1]
+    starts = m.crow[1:-1]
+    starts = starts[(starts > 0) & (starts < nnz)] - 1
+    increasing = bm.set_at(increasing, starts, True)
+    return bool(bm.all(increasing))
+
+
+def _transpose(m):
+    """Transpose of a block matrix, kept coalesced if it is a coalesced CSR."""
+    if not (isinstance(m, CSRTensor) and _is_canonical_csr(m)):
+        return m.T
+    row, col = m.tocoo().indices
+    nrow, ncol = m.sparse_shape
+    key = bm.astype(col, bm.int64) * nrow + bm.astype(row, bm.int64)
+    order = bm.argsort(key)
+    count = bm.bincount(col, minlength=ncol)
+    crow = bm.concat([bm.zeros(1, dtype=m.crow.dtype, device=bm.get_device(count)),
+                      bm.astype(bm.cumsum(count, axis=0), m.crow.dtype)])
+    return CSRTensor(crow, row[order], m.values[..., order], (ncol, nrow))
+
+
+def _source_form(block):
+    """The form that a block is assembled from, and whether it is transposed."""
+    origin = getattr(block, '_origin', None)
+    if getattr(block, '_transposed', False) and origin is not None:
+        return origin, True
+    return block, False
+
+
+def _dependent_groups(forms: list) -> List[list]:
+    """Group the forms sharing integrators or an evaluation cache, as their
+    caches can not be filled by two threads at the same time."""
+    parent = list(range(len(forms)))
+
+    def find(k):
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    owner = {}
+    for k, form in enumerate(forms):
+        shared = [id(I) for I in getattr(form, 'integrators', {}).values()]
+        cache = getattr(form, '_eval_cache', None)
+        if cache is not None:
+            shared.append(id(cache))
+        for key in shared:
+            if key in owner:
+                parent[find(k)] = find(owner[key])
+            else:
+                owner[key] = k
+
+    groups = {}
+    for k, form in enumerate(forms):
+        groups.setdefault(find(k), []).append(form)
+    return list(groups.values())
+
+
 Form.register(BlockForm)
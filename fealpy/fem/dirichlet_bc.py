@@ -100,7 +100,7 @@ class DirichletBC():
 
     def apply(self, A: SparseTensor, f: TensorLike, uh: Optional[TensorLike]=None,
               gd: Optional[CoefLike]=None, *,
-              check=True) -> Tuple[TensorLike, TensorLike]:
+              check=True, keep_pattern=False) -> Tuple[TensorLike, TensorLike]:
         """Apply Dirichlet boundary conditions.
 
         Parameters:
@@ -112,14 +112,46 @@ class DirichletBC():
             gd (CoefLike | None, optional): The Dirichlet boundary condition.\
                 Use the default gd passed in the __init__ if `None`. Default to None.
             check (bool, optional): _description_. Defaults to True.
+            keep_pattern (bool, optional): Keep the sparsity pattern of `A`,
+                storing explicit zeros in the eliminated rows and columns.
+                The masks of the boundary entries are computed once per pattern,
+                see `DirichletBC.plan`. Defaults to False.
 
         Returns:
             out (SparseTensor, Tensor): New adjusted `A` and `f`.
         """
+        if keep_pattern:
+            A = self.check_matrix(A) if check else A
+            f = self.check_vector(f) if check else f
+            plan = self.plan(A)
+            uh = self.boundary_values(f, uh, gd)
+            f = plan.apply_vector(f, uh=uh, A=A)
+            A = plan.apply_matrix(A)
+            return A, f
+
         f = self.apply_vector(f, A, uh, gd, check=check)
         A = self.apply_matrix(A, check=check)
         return A, f
 
+    def plan(self, A: SparseTensor, *, symmetric: bool=True) -> 'DirichletBCPlan':
+        """Return the Dirichlet plan of the sparsity pattern of `A`.
+
+        The plan is cached and reused as long as the pattern does not change.
+
+        Parameters:
+            A (SparseTensor): The left-hand-side matrix (COO or CSR).
+            symmetric (bool, optional): Whether to eliminate the boundary columns
+                as well as the boundary rows. Defaults to True.
+
+        Returns:
+            DirichletBCPlan: the plan.
+        """
+        plan = getattr(self, '_plan', None)
+        if plan is None or plan.symmetric != symmetric or not plan.match(A):
+            plan = DirichletBCPlan(self, A, symmetric=symmetric)
+            self._plan = plan
+        return plan
+
     def apply_matrix(self, matrix: _ST, *, check=True) -> _ST:
         """Apply Dirichlet boundary condition to left-hand-size matrix only.
 
@@ -168,8 +200,27 @@ class DirichletBC():
         """
         A = self.check_matrix(matrix) if check else matrix
         f = self.check_vector(vector) if check else vector
+        uh = self.boundary_values(f, uh, gd)
+        bd_idx = self.boundary_dof_index
+        f = f - A.matmul(uh)
+        f = bm.set_at(f, bd_idx, uh[bd_idx])
+        return f
+
+    def boundary_values(self, vector: TensorLike, uh: Optional[TensorLike]=None,
+                        gd: Optional[CoefLike]=None) -> TensorLike:
+        """Interpolate the Dirichlet data on the boundary DoFs.
+
+        Parameters:
+            vector (TensorLike): A vector shaped like the right-hand side.
+            uh (TensorLike | None, optional): Interpolation is done on `uh` in place if given.
+            gd (CoefLike | None, optional): The Dirichlet boundary condition.\
+                Use the default gd passed in the __init__ if `None`. Default to None.
+
+        Returns:
+            TensorLike: A vector holding the boundary values on the boundary DoFs.
+        """
+        f = vector
         gd = self.gd if gd is None else gd
-        
 
         if gd is None:
             raise RuntimeError("The boundary condition is None.")
@@ -192,10 +243,7 @@ class DirichletBC():
                 uh = bm.zeros_like(f)
             uh, _ = self.space.boundary_interpolate(gd=gd,uh=uh,
                                                 threshold=self.threshold, method=self.method)
-        bd_idx = self.boundary_dof_index
-        f = f - A.matmul(uh[:])
-        f = bm.set_at(f, bd_idx, uh[bd_idx])
-        return f
+        return uh[:]
 
     def _mul(self, A, D0):
         isDDof = self.is_boundary_dof
@@ -235,6 +283,149 @@ class DirichletBC():
 
 
 
+class DirichletBCPlan():
+    """Dirichlet boundary condition precomputed for one sparsity pattern.
+
+    The slots (positions among the non-zeros) of the boundary rows, columns
+    and diagonal are found once. Applying the condition is then an update of
+    the values only: the pattern of the matrix is kept, with explicit zeros,
+    so that symbolic factorizations and AMG setups of the pattern can be reused.
+    The values eliminated from the interior rows are saved by `apply_matrix`,
+    so the right-hand sides of the following steps are modified without any
+    product with the whole matrix.
+
+    Parameters:
+        bc (DirichletBC): the boundary condition.
+        A (SparseTensor): a COO (coalesced) or CSR matrix with the pattern.
+        symmetric (bool, optional): Eliminate the boundary columns as well as
+            the boundary rows, which keeps a symmetric matrix symmetric.
+            Defaults to True.
+
+    Example:
+        plan = bc.plan(A)
+        A = plan.apply_matrix(A, inplace=True)
+        for t in times:
+            f = plan.apply_vector(assemble_rhs(t), gd=lambda p: g(p, t))
+    """
+    def __init__(self, bc: DirichletBC, A: SparseTensor, *, symmetric: bool=True):
+        self.bc = bc
+        self.symmetric = symmetric
+        self.shape = A.sparse_shape
+        self._pattern = self._pattern_of(A)
+        row, col = self._row_col(A)
+        isDDof = bc.is_boundary_dof.reshape(-1)
+        bd_row = isDDof[row]
+        bd_col = isDDof[col]
+        is_diag = row == col
+
+        self.diag_slot = bm.nonzero(bd_row & is_diag)[0]
+        if self.diag_slot.shape[0] != bc.boundary_dof_index.shape[0]:
+            raise ValueError("Dirichlet plan needs the diagonal entries of all "
+                             "the boundary rows in the sparsity pattern.")
+        if symmetric:
+            zero_flag = (bd_row | bd_col) & ~is_diag
+        else:
+            zero_flag = bd_row & ~is_diag
+        self.zero_slot = bm.nonzero(zero_flag)[0]
+
+        couple_flag = bd_col & ~bd_row
+        self.couple_slot = bm.nonzero(couple_flag)[0]
+        self.couple_row = row[self.couple_slot]
+        self.couple_col = col[self.couple_slot]
+        self._coupling = None
+        self._uh = None
+
+    @staticmethod
+    def _row_col(A: SparseTensor):
+        if isinstance(A, CSRTensor):
+            return A.row, A.col
+        elif isinstance(A, COOTensor):
+            return A.indices[0], A.indices[1]
+        raise ValueError('The type of matrix must be COOTensor or CSRTensor.')
+
+    @staticmethod
+    def _pattern_of(A: SparseTensor):
+        if isinstance(A, CSRTensor):
+            return (A.crow, A.col)
+        return (A.indices, )
+
+    def match(self, A: SparseTensor) -> bool:
+        """Whether `A` has the sparsity pattern of the plan."""
+        if tuple(A.sparse_shape) != tuple(self.shape):
+            return False
+        pattern = self._pattern_of(A)
+        if len(pattern) != len(self._pattern):
+            return False
+        for a, b in zip(pattern, self._pattern):
+            if a is b:
+                continue
+            if a.shape != b.shape or not bool(bm.all(a == b)):
+                return False
+        return True
+
+    def apply_matrix(self, A: _ST, *, inplace: bool=False) -> _ST:
+        """Apply the condition to the values of `A`, keeping its pattern.
+
+        Parameters:
+            A (SparseTensor): a matrix with the pattern of the plan.
+            inplace (bool, optional): Modify the values of `A` in place.
+                Otherwise, the new matrix shares the index arrays of `A`.
+                Defaults to False.
+
+        Returns:
+            SparseTensor: the matrix with boundary rows (and columns) eliminated.
+        """
+        values = A.values if inplace else bm.copy(A.values)
+        self._coupling = values[..., self.couple_slot]
+        values = bm.set_at(values, (..., self.zero_slot), 0)
+        values = bm.set_at(values, (..., self.diag_slot), 1)
+        if inplace:
+            return A
+        if isinstance(A, CSRTensor):
+            return CSRTensor(A.crow, A.col, values, A.sparse_shape)
+        return COOTensor(A.indices, values, A.sparse_shape)
+
+    def apply_vector(self, vector: TensorLike, uh: Optional[TensorLike]=None,
+                     gd: Optional[CoefLike]=None, *, A: Optional[SparseTensor]=None) -> TensorLike:
+        """Apply the condition to a right-hand-side vector.
+
+        Parameters:
+            vector (TensorLike): the right-hand-side vector.
+            uh (TensorLike | None, optional): boundary values on the boundary DoFs.
+                Interpolated from `gd` if not given.
+            gd (CoefLike | None, optional): the Dirichlet data. If both `uh` and
+                `gd` are None, the default data of the condition are interpolated
+                once and cached.
+            A (SparseTensor | None, optional): the matrix before elimination.
+                If None, the values saved by the last `apply_matrix` are used.
+
+        Returns:
+            TensorLike: the new right-hand-side vector.
+        """
+        if uh is None:
+            if gd is None:
+                if self._uh is None:
+                    self._uh = self.bc.boundary_values(vector)
+                uh = self._uh
+            else:
+                uh = self.bc.boundary_values(vector, gd=gd)
+
+        bd_idx = self.bc.boundary_dof_index
+        f = bm.copy(vector)
+        if self.symmetric:
+            if A is not None:
+                coupling = A.values[..., self.couple_slot]
+            elif self._coupling is not None:
+                coupling = self._coupling
+            else:
+                raise RuntimeError("The matrix is needed before `apply_matrix` is called.")
+            u = uh[self.couple_col]
+            contrib = coupling[:, None] * u if u.ndim == 2 else coupling * u
+            f = bm.index_add(f, self.couple_row, -contrib)
+        f = bm.set_at(f, bd_idx, uh[bd_idx])
+        return f
+
+
 # backup
 def apply_matrix(self, matrix: _ST, *, check=True) -> _ST:
     """Apply Dirichlet boundary condition to left-hand-size matrix only.
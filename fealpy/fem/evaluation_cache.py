@@ -0,0 +1,138 @@
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Union, Tuple
+
+from .. import logger
+from ..typing import TensorLike
+from ..backend import backend_manager as bm
+from .streaming import parse_memory, format_memory, tensor_nbytes
+
+__all__ = ['EvaluationCache']
+
+
+def index_key(index) -> Hashable:
+    """Make a hashable key for the index of entities."""
+    if index is None:
+        return None
+    if isinstance(index, slice):
+        return ('slice', index.start, index.stop, index.step)
+    if bm.is_tensor(index):
+        array = bm.to_numpy(index)
+        return ('tensor', str(array.dtype), array.shape, hash(array.tobytes()))
+    if isinstance(index, int):
+        return ('int', index)
+    return ('object', id(index))
+
+
+def _nbytes(data: Any) -> int:
+    if bm.is_tensor(data):
+        return tensor_nbytes(data)
+    if isinstance(data, (tuple, list)):
+        return sum(_nbytes(d) for d in data)
+    return 0
+
+
+class _Entry():
+    __slots__ = ('owner', 'version', 'value', 'nbytes')
+
+    def __init__(self, owner, version: int, value: Any, nbytes: int):
+        self.owner = owner
+        self.version = version
+        self.value = value
+        self.nbytes = nbytes
+
+
+class EvaluationCache():
+    """LRU cache of geometry and basis evaluations shared by integrators.
+
+    Entries are keyed by (owner, name, quadrature order, entity index), where
+    the owner is a space (for basis) or a mesh (for quadrature and measure),
+    so integrators of a form sharing one cache evaluate `grad_basis`,
+    `entity_measure` and quadrature points only once.
+
+    An entry is invalid once the `version` of the mesh it depends on changed,
+    which happens whenever entities of the mesh are reassigned (e.g. by
+    `uniform_refine` and `bisect`). Call `mesh.mark_modified()` after
+    modifying node coordinates in place.
+
+    Parameters:
+        max_memory (int | str, optional): Memory cap of all entries, in bytes
+            or as a string like '512MB'. Defaults to '512MB'.
+        maxsize (int | None, optional): Maximum number of entries. Defaults to None.
+    """
+    def __init__(self, max_memory: Union[int, str] = '512MB', maxsize: Optional[int] = None):
+        self.max_memory = parse_memory(max_memory)
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Tuple, _Entry] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (f"EvaluationCache(entries={len(self)}, memory={format_memory(self.nbytes)}"
+                f"/{format_memory(self.max_memory)}, hits={self.hits}, misses={self.misses})")
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def _pop(self, key):
+        entry = self._entries.pop(key)
+        self.nbytes -= entry.nbytes
+
+    def invalidate(self, mesh=None):
+        """Remove entries depending on the mesh, or all outdated entries if
+        mesh is None."""
+        for key in list(self._entries.keys()):
+            entry = self._entries[key]
+            owner_mesh = getattr(entry.owner, 'mesh', entry.owner)
+            if mesh is None:
+                if entry.version != getattr(owner_mesh, 'version', 0):
+                    self._pop(key)
+            elif owner_mesh is mesh:
+                self._pop(key)
+
+    def fetch(self, owner, name: str, q: Optional[int], index, func: Callable[[], Any]) -> Any:
+        """Get the value of an evaluation, calling `func` to evaluate on missing.
+
+        Parameters:
+            owner (FunctionSpace | Mesh): the object the evaluation belongs to.
+            name (str): name of the evaluation, e.g. 'cell_grad_basis_x'.
+            q (int | None): index of the quadrature formula.
+            index (Index | None): index of entities.
+            func (Callable): evaluates the value without arguments.
+        """
+        mesh = getattr(owner, 'mesh', owner)
+        version = getattr(mesh, 'version', 0)
+        key = (id(owner), name, q, index_key(index))
+        entry = self._entries.get(key, None)
+
+        if entry is not None:
+            if (entry.owner is owner) and (entry.version == version):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            logger.debug(f"(EVALUATION CACHE) mesh modified, invalidate {name}.")
+            self.invalidate()
+            if key in self._entries:
+                self._pop(key)
+
+        self.misses += 1
+        value = func()
+        nbytes = _nbytes(value)
+
+        if nbytes > self.max_memory:
+            return value
+
+        self._entries[key] = _Entry(owner, version, value, nbytes)
+        self.nbytes += nbytes
+
+        while (self.nbytes > self.max_memory) or \
+              (self.maxsize is not None and len(self._entries) > self.maxsize):
+            self._pop(next(iter(self._entries)))
+
+        return value
@@ -8,9 +8,11 @@ from ..typing import TensorLike, Size, Index
 from ..backend import backend_manager as bm
 from ..functionspace import FunctionSpace as _FS
 from .integrator import Integrator, GroupIntegrator
+from .evaluation_cache import EvaluationCache
 
 from .. import logger
 from abc import ABC
+from inspect import signature
 
 _I = TypeVar('_I', bound=Integrator)
 _IT = TypeVar('_IT')
@@ -56,6 +58,7 @@ class Form(Generic[_I], ABC):
         new_obj.integrators.update(self.integrators)
         # new_obj.chunk_sizes.update(self.chunk_sizes)
         new_obj.splitters.update(self.splitters)
+        new_obj._eval_cache = self._eval_cache
         new_obj._values_ravel_shape = self._values_ravel_shape
         new_obj.sparse_shape = tuple(reversed(self.sparse_shape))
         return new_obj
@@ -141,8 +144,41 @@ class Form(Generic[_I], ABC):
             self.integrators[group] = I
             self.splitters[group] = splitter
 
+        if self._eval_cache is not None:
+            self.integrators[group].set_evaluation_cache(self._eval_cache)
+
         return self
 
+    _eval_cache: Optional[EvaluationCache] = None
+
+    def set_evaluation_cache(self, cache: Union[EvaluationCache, bool, None] = True, /, **kwargs):
+        """Share an evaluation cache of geometry and basis among all integrators
+        of the form, including those added later.
+
+        Parameters:
+            cache (EvaluationCache | bool | None, optional): The cache to share,
+                which can also be shared with other forms on the same spaces.
+                If True, a new cache is created with `kwargs` (see `EvaluationCache`).
+                If False or None, integrators stop using the cache. Defaults to True.
+
+        Returns:
+            Self: the form itself.
+        """
+        if cache is True:
+            cache = EvaluationCache(**kwargs)
+        elif cache is False:
+            cache = None
+        self._eval_cache = cache
+
+        for integrator in self.integrators.values():
+            integrator.set_evaluation_cache(cache)
+
+        return self
+
+    @property
+    def evaluation_cache(self) -> Optional[EvaluationCache]:
+        return self._eval_cache
+
     def _assembly_kernel(self, group: str, /, indices=None):
         integrator = self.integrators[group]
         if indices is None:
@@ -155,6 +191,19 @@ class Form(Generic[_I], ABC):
             etg = (etg, )
         return value, etg
 
+    def _is_splittable(self, group: str, /) -> bool:
+        """Whether the integrator of the group can be assembled on a part of entities."""
+        integrator = self.integrators[group]
+        return 'indices' in signature(integrator.to_global_dof).parameters
+
+    def _number_of_entities(self, group: str, /) -> int:
+        """Number of entities integrated by the group, i.e. the length of its
+        entity-to-global relationship."""
+        etg = self.integrators[group].to_global_dof(self.space)
+        if isinstance(etg, (tuple, list)):
+            etg = etg[0]
+        return etg.shape[0]
+
     def assembly_local_iterative(self):
         """Assembly local matrix considering chunk size.
         Yields local matrix and to_global_dof tuple."""
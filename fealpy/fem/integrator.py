@@ -9,6 +9,7 @@ from ..typing import Index
 from ..backend import TensorLike
 from ..backend import backend_manager as bm
 from ..decorator.variantmethod import VariantMeta
+from .evaluation_cache import EvaluationCache
 
 
 __all__ = [
@@ -106,6 +107,7 @@ class Integrator(metaclass=VariantMeta):
     See `integrator.enable_cache` for details.
     """
     _region: _Region = None
+    _eval_cache: Optional[EvaluationCache] = None
     etype: str
 
     def __init__(self, keep_data=False, *args, **kwds) -> None:
@@ -123,6 +125,18 @@ class Integrator(metaclass=VariantMeta):
     def clear(self) -> None:
         """Clear the cache of integrator."""
         self._cache.clear()
+
+    def set_evaluation_cache(self, cache: Optional[EvaluationCache], /):
+        """Set the evaluation cache shared with other integrators. None to unset."""
+        self._eval_cache = cache
+        return self
+
+    def cached_eval(self, owner, name: str, q: Optional[int], index, func: Callable[[], Any]):
+        """Evaluate through the shared evaluation cache if it is set,
+        see `EvaluationCache.fetch`. Otherwise call `func` directly."""
+        if self._eval_cache is None:
+            return func()
+        return self._eval_cache.fetch(owner, name, q, index, func)
     ### END: Cache System ###
 
     ### START: Region of Integration ###
@@ -206,6 +220,20 @@ class Integrator(metaclass=VariantMeta):
         """The default method of integration on entities."""
         raise NotImplementedError
 
+    ### START: Matrix-free ###
+    def matrix_free_setup(self, space: _SpaceGroup, /, indices: _OpIndex = None) -> Any:
+        """Fetch the data needed by `matrix_free_apply`, such as basis on
+        quadrature points, geometric factors and weights."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support "
+                                  "matrix-free application.")
+
+    def matrix_free_apply(self, data: Any, uloc: TensorLike, /) -> TensorLike:
+        """Apply the local operator to local DoF values shaped (..., NC, uldof),
+        returning the result shaped (..., NC, vldof)."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support "
+                                  "matrix-free application.")
+    ### END: Matrix-free ###
+
     ### Operations
 
     def __add__(self, other: 'Integrator'):
@@ -346,6 +374,11 @@ class GroupIntegrator(Integrator):
     def etype(self) -> str:
         return self.ints[0].etype
 
+    def set_evaluation_cache(self, cache: Optional[EvaluationCache], /):
+        for integrator in self.ints:
+            integrator.set_evaluation_cache(cache)
+        return super().set_evaluation_cache(cache)
+
     def set_region(self, region: TensorLike, /) -> None:
         for integrator in self.ints:
             integrator.set_region(region)
@@ -376,3 +409,16 @@ class GroupIntegrator(Integrator):
                 ct = ct + new_ct
 
         return ct
+
+    def matrix_free_setup(self, space: _SpaceGroup, /, indices: _OpIndex = None):
+        if indices is None:
+            return [int_.matrix_free_setup(space) for int_ in self.ints]
+        return [int_.matrix_free_setup(space, indices=indices) for int_ in self.ints]
+
+    def matrix_free_apply(self, data, uloc: TensorLike, /) -> TensorLike:
+        out = self.ints[0].matrix_free_apply(data[0], uloc)
+
+        for int_, d in zip(self.ints[1:], data[1:]):
+            out = out + int_.matrix_free_apply(d, uloc)
+
+        return out
@@ -6,9 +6,9 @@ from ..typing import TensorLike, Index, _S
 from ..mesh import HomogeneousMesh, SimplexMesh, StructuredMesh
 from ..functionspace.space import FunctionSpace as _FS
 from ..functionspace.tensor_space import TensorFunctionSpace as _TS
-from ..fem.utils import LinearSymbolicIntegration
 from ..decorator.variantmethod import variantmethod
 from .integrator import LinearInt, OpInt, CellInt, enable_cache
+from .reference_tensor import reference_tensor, check_reference_space
 
 
 class LinearElasticityIntegrator(LinearInt, OpInt, CellInt):
@@ -397,6 +397,50 @@ class LinearElasticityIntegrator(LinearInt, OpInt, CellInt):
 
         return KK
 
+    @enable_cache
+    def fetch_reference_assembly(self, space: _TS):
+        index = self.index
+        scalar_space = check_reference_space(space, 'LinearElasticityIntegrator')
+        mesh = scalar_space.mesh
+        GD = mesh.geo_dimension()
+
+        cm = self.cached_eval(mesh, 'cell_measure', None, index,
+            lambda: mesh.entity_measure('cell', index=index))
+        glambda = self.cached_eval(mesh, 'cell_grad_lambda', None, index,
+            lambda: mesh.grad_lambda(index=index))             # (NC, BC, GD)
+        S = reference_tensor('diffusion', mesh.TD, scalar_space.p, **bm.context(cm))  # (LDOF, LDOF, BC, BC)
+
+        D = self.material.elastic_matrix()
+        if D.shape[1] != 1:
+            raise ValueError("assembly currently only supports elastic matrices "
+                            f"with shape (NC, 1, {2*GD}, {2*GD}) or (1, 1, {2*GD}, {2*GD}).")
+        # E[m, v, a]: coefficient of d_m u_a in the v-th strain component,
+        # from the strain matrix of a single basis with unit gradients.
+        gunit = bm.eye(GD, **bm.context(cm))[:, None, None, :]
+        E = self.material.strain_matrix(dof_priority=False, gphi=gunit)[:, 0] # (GD, NV, GD)
+        C = bm.einsum('mva, cvw, nwb -> cambn', E, D[:, 0], E)  # (1 or NC, GD, GD, GD, GD)
+
+        return cm, glambda, S, C
+
+    @assembly.register('reference')
+    def assembly(self, space: _TS) -> TensorLike:
+        """Assemble with the reference diffusion tensor. Only for Lagrange
+        spaces on simplex meshes with constant or piecewise constant
+        elastic matrices."""
+        cm, glambda, S, C = self.fetch_reference_assembly(space)
+        NC, ldof, GD = cm.shape[0], S.shape[0], glambda.shape[-1]
+
+        if C.shape[0] == 1:
+            H = bm.einsum('ckm, ambn, cln, c -> ckalb', glambda, C[0], glambda, cm)
+        else:
+            H = bm.einsum('ckm, cambn, cln, c -> ckalb', glambda, C, glambda, cm)
+        if space.dof_priority:
+            KK = bm.einsum('ijkl, ckalb -> caibj', S, H)
+        else:
+            KK = bm.einsum('ijkl, ckalb -> ciajb', S, H)
+
+        return bm.reshape(KK, (NC, ldof*GD, ldof*GD))
+
     @enable_cache
     def fetch_symbolic_assembly(self, space: _TS) -> TensorLike:
         index = self.index
@@ -416,6 +460,8 @@ class LinearElasticityIntegrator(LinearInt, OpInt, CellInt):
         cell = mesh.entity('cell')
         cell_vertices = node[cell]
 
+        # NOTE: sympy is only imported by the symbolic assembly.
+        from .utils import LinearSymbolicIntegration
         symbolic_int = LinearSymbolicIntegration(space1=scalar_space, space2=scalar_space)
         kwargs = bm.context(node)
 
@@ -7,6 +7,7 @@ from ..backend import backend_manager as bm
 from ..sparse import COOTensor
 from .form import Form
 from .integrator import LinearInt
+from .parallel_assembly import ParallelAssembler
 
 
 class LinearForm(Form[LinearInt]):
@@ -57,23 +58,48 @@ class LinearForm(Form[LinearInt]):
 
         return M
 
+    def _parallel_assembly(self, workers: int):
+        """Assembly the vector over a process pool, see `ParallelAssembler`."""
+        self.check_space()
+        space = self._spaces[0]
+        batch_size = self.batch_size
+        sparse_shape = (space.number_of_global_dofs(), )
+
+        def kernel(key, indices):
+            group_tensor, e2dofs_tuple = self._assembly_kernel(key, indices)
+            if (batch_size > 0) and (group_tensor.ndim == 2):
+                group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
+            return (bm.reshape(e2dofs_tuple[0], (-1, )),
+                    bm.reshape(group_tensor, self._values_ravel_shape))
+
+        results = ParallelAssembler(self, workers).run(kernel)
+        indices = bm.concat([r[0] for r in results], axis=0)
+        values = bm.concat([r[1] for r in results], axis=-1)
+
+        return COOTensor(bm.reshape(indices, (1, -1)), values, sparse_shape)
+
     @overload
     def assembly(self) -> TensorLike: ...
     @overload
     def assembly(self, *, format: Literal['coo']) -> COOTensor: ...
     @overload
     def assembly(self, *, format: Literal['dense']) -> TensorLike: ...
-    def assembly(self, *, format='dense'):
+    def assembly(self, *, format='dense', workers: Optional[int]=None):
         """Assembly the linear form vector.
 
         Parameters:
             format (str, optional): Layout of the output ('dense', 'coo'). Defaults to 'dense'.\n
-            retain_ints (bool, optional): Whether to retain the integrator cache.
+            retain_ints (bool, optional): Whether to retain the integrator cache.\n
+            workers (int | None, optional): Number of processes to assembly with,
+                see `BilinearForm.assembly`. Defaults to None.
 
         Returns:
             global_vector (COOTensor | TensorLike): Global sparse vector shaped ([batch, ]gdof).
         """
-        V = self._scalar_assembly()
+        if workers is None:
+            V = self._scalar_assembly()
+        else:
+            V = self._parallel_assembly(workers)
 
         if format == 'dense':
             self._V = V.to_dense()
@@ -0,0 +1,228 @@
+
+from typing import Sequence, List, Tuple, Any
+
+from .. import logger
+from ..typing import TensorLike
+from ..backend import backend_manager as bm
+from ..operator import LinearOperator
+from ..utils import is_scalar, is_tensor
+
+__all__ = [
+    'MatrixFreeOperator',
+    'tensor_basis_1d',
+    'sum_factorization',
+    'cell_weights',
+    'simplex_value_apply',
+    'simplex_grad_apply',
+    'tensor_value_apply',
+    'tensor_grad_apply'
+]
+
+_AXES = 'ijk'
+
+
+##################################################
+### Kernels
+##################################################
+
+def tensor_basis_1d(bc: TensorLike, p: int) -> Tuple[TensorLike, TensorLike]:
+    """Values and derivatives of the 1-D Lagrange basis on the reference interval.
+
+    Parameters:
+        bc (Tensor): 1-D barycentric coordinates of quadrature points, shaped (NQ1, 2).
+        p (int): degree of the basis.
+
+    Returns:
+        Tuple[Tensor, Tensor]: values and derivatives, both shaped (NQ1, p+1).
+    """
+    phi = bm.simplex_shape_function(bc, p=p)
+    R = bm.simplex_grad_shape_function(bc, p=p)
+    return phi, R[..., 1] - R[..., 0]
+
+
+def sum_factorization(mats: Sequence[TensorLike], x: TensorLike, transpose: bool=False) -> TensorLike:
+    """Apply the Kronecker product of 1-D matrices to tensor-product local data,
+    one axis at a time.
+
+    Parameters:
+        mats (Sequence[Tensor]): 1-D matrices shaped (m_d, n_d), one for each axis.
+        x (Tensor): local data shaped (..., NC, n_0, n_1[, n_2]), or
+            (..., NC, m_0, m_1[, m_2]) if `transpose` is True.
+        transpose (bool, optional): apply the transposed matrices. Defaults to False.
+
+    Returns:
+        Tensor: shaped (..., NC, m_0, m_1[, m_2]), or (..., NC, n_0, n_1[, n_2])
+            if `transpose` is True.
+    """
+    src = _AXES[:len(mats)]
+
+    for d, M in enumerate(mats):
+        x_subs = '...c' + src.replace(src[d], 'z')
+        m_subs = 'z' + src[d] if transpose else src[d] + 'z'
+        x = bm.einsum(f'{m_subs}, {x_subs} -> ...c{src}', M, x)
+
+    return x
+
+
+def cell_weights(coef, ws: TensorLike, cm: TensorLike) -> TensorLike:
+    """Integral weights on quadrature points of cells, with a scalar coefficient
+    (processed by `process_coef_func`) merged in.
+
+    Returns:
+        Tensor: shaped (NC, NQ).
+    """
+    W = cm[:, None] * ws[None, :]
+
+    if coef is None:
+        return W
+    if is_scalar(coef):
+        return W * coef
+    if is_tensor(coef):
+        if coef.ndim == 1:
+            return W * coef[:, None]
+        if coef.ndim == 2:
+            return W * coef
+    raise NotImplementedError("Matrix-free kernels only support scalar coefficients "
+                              "shaped (), (NC,) or (NC, NQ).")
+
+
+def simplex_value_apply(phi: TensorLike, W: TensorLike, uloc: TensorLike) -> TensorLike:
+    """Local action of the mass-type operator on simplex meshes.
+
+    Parameters:
+        phi (Tensor): basis values, shaped (NQ, ldof).
+        W (Tensor): integral weights, shaped (NC, NQ).
+        uloc (Tensor): local DoF values, shaped (..., NC, ldof).
+    """
+    val = bm.einsum('qi, ...ci -> ...cq', phi, uloc)
+    return bm.einsum('qi, ...cq -> ...ci', phi, W * val)
+
+
+def simplex_grad_apply(gphi: TensorLike, K: TensorLike, W: TensorLike, uloc: TensorLike) -> TensorLike:
+    """Local action of the diffusion-type operator on simplex meshes.
+
+    Parameters:
+        gphi (Tensor): gradients of basis to the barycentric coordinates, shaped (NQ, ldof, TD+1).
+        K (Tensor): inner products of the gradients of barycentric coordinates,
+            shaped (NC, TD+1, TD+1).
+        W (Tensor): integral weights, shaped (NC, NQ).
+        uloc (Tensor): local DoF values, shaped (..., NC, ldof).
+    """
+    grad = bm.einsum('qik, ...ci -> ...cqk', gphi, uloc)
+    flux = bm.einsum('ckl, ...cql -> ...cqk', K, grad) * W[..., None]
+    return bm.einsum('qik, ...cqk -> ...ci', gphi, flux)
+
+
+def _to_tensor_shape(x: TensorLike, n: int, TD: int):
+    return bm.reshape(x, x.shape[:-1] + (n, ) * TD)
+
+
+def tensor_value_apply(phi: TensorLike, W: TensorLike, uloc: TensorLike, TD: int) -> TensorLike:
+    """Sum-factorized local action of the mass-type operator on tensor-product meshes.
+
+    Parameters:
+        phi (Tensor): 1-D basis values, shaped (NQ1, p+1).
+        W (Tensor): integral weights, shaped (NC, NQ1**TD).
+        uloc (Tensor): local DoF values, shaped (..., NC, (p+1)**TD).
+        TD (int): topological dimension of the mesh.
+    """
+    nq, n = phi.shape
+    mats = [phi] * TD
+    val = sum_factorization(mats, _to_tensor_shape(uloc, n, TD))
+    val = _to_tensor_shape(bm.reshape(val, val.shape[:-TD] + (-1, )) * W, nq, TD)
+    out = sum_factorization(mats, val, transpose=True)
+    return bm.reshape(out, out.shape[:-TD] + (-1, ))
+
+
+def tensor_grad_apply(phi: TensorLike, dphi: TensorLike, G: TensorLike, W: TensorLike,
+                      uloc: TensorLike) -> TensorLike:
+    """Sum-factorized local action of the diffusion-type operator on tensor-product meshes.
+
+    Parameters:
+        phi (Tensor): 1-D basis values, shaped (NQ1, p+1).
+        dphi (Tensor): 1-D basis derivatives, shaped (NQ1, p+1).
+        G (Tensor): inverse of the first fundamental form, shaped (NC, NQ, TD, TD).
+        W (Tensor): integral weights, shaped (NC, NQ).
+        uloc (Tensor): local DoF values, shaped (..., NC, (p+1)**TD).
+    """
+    TD = G.shape[-1]
+    nq, n = phi.shape
+    u = _to_tensor_shape(uloc, n, TD)
+    mats = [[dphi if d == m else phi for d in range(TD)] for m in range(TD)]
+
+    grad = [sum_factorization(mats[m], u) for m in range(TD)]
+    grad = bm.stack([bm.reshape(g, g.shape[:-TD] + (-1, )) for g in grad], axis=-1)
+    flux = bm.einsum('cqmn, ...cqn -> ...cqm', G, grad) * W[..., None]
+
+    out = 0.
+    for m in range(TD):
+        out = out + sum_factorization(mats[m], _to_tensor_shape(flux[..., m], nq, TD), transpose=True)
+
+    return bm.reshape(out, out.shape[:-TD] + (-1, ))
+
+
+##################################################
+### Operator
+##################################################
+
+class MatrixFreeOperator(LinearOperator):
+    """Matrix-free linear operator of a bilinear form.
+
+    Data depending only on the mesh, space and coefficients (basis on quadrature
+    points, geometric factors and weights) are fetched once by the
+    `matrix_free_setup` method of integrators in `setup`. Then `A @ u` gathers
+    local DoF values, applies the `matrix_free_apply` kernels of integrators
+    and scatters the results, without forming any local or global matrix.
+
+    The operator follows the matrix convention: `u` is shaped (gdof,) or
+    (gdof, nvec), so it can be passed to `cg`, `minres` and `gmres` directly.
+    Call `setup` again after the mesh or coefficients changed.
+    """
+    def __init__(self, form):
+        self.form = form
+        self.shape = form.sparse_shape
+        self._blocks: List[Tuple[Any, Any, TensorLike, TensorLike]] = []
+        super().__init__(self.shape, self._matvec_impl)
+        self.setup()
+
+    def setup(self):
+        form = self.form
+        space = form.space
+        self._blocks.clear()
+
+        for key, integrator in form.integrators.items():
+            splitter = form.splitters[key]
+            chunks = [None] if splitter is None else splitter(space, integrator)
+
+            for indices in chunks:
+                if indices is None:
+                    data = integrator.matrix_free_setup(space)
+                    etg = integrator.to_global_dof(space)
+                else:
+                    data = integrator.matrix_free_setup(space, indices=indices)
+                    etg = integrator.to_global_dof(space, indices=indices)
+                if not isinstance(etg, (tuple, list)):
+                    etg = (etg, )
+                ue2dof = etg[0]
+                ve2dof = etg[1] if (len(etg) > 1) else ue2dof
+                self._blocks.append((integrator, data, ue2dof, ve2dof))
+
+        logger.info(f"Matrix-free operator set up with {len(self._blocks)} block(s).")
+        return self
+
+    def _matvec_impl(self, u: TensorLike) -> TensorLike:
+        if u.ndim == 2:
+            return bm.swapaxes(self._apply(bm.swapaxes(u, 0, 1)), 0, 1)
+        return self._apply(u)
+
+    def _apply(self, u: TensorLike) -> TensorLike:
+        """Apply the operator to `u` shaped (..., gdof)."""
+        nrow = self.shape[0]
+        batch = u.shape[:-1]
+        v = bm.zeros(batch + (nrow, ), **bm.context(u))
+
+        for integrator, data, ue2dof, ve2dof in self._blocks:
+            vloc = integrator.matrix_free_apply(data, u[..., ue2dof])
+            v = bm.index_add(v, ve2dof.reshape(-1), bm.reshape(vloc, batch + (-1, )), axis=-1)
+
+        return v
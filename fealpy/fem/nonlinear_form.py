@@ -1,15 +1,17 @@
 from typing import Optional
 
 from ..backend import backend_manager as bm
-from ..sparse import COOTensor
+from ..sparse import COOTensor, CSRTensor
 from .form import Form
 from .integrator import NonlinearInt, OpInt, SrcInt
 from .nonlinear_wrapper import NonlinearWrapperInt
+from .assembly_plan import AssemblyPlan
 
 
 class NonlinearForm(Form[NonlinearInt]):
     _M: Optional[COOTensor] = None
     _V: Optional[COOTensor] = None
+    _plan: Optional[AssemblyPlan] = None
 
     def _get_sparse_shape(self):
         spaces = self._spaces
@@ -31,7 +33,7 @@ class NonlinearForm(Form[NonlinearInt]):
             etg = (etg, )
         return value, etg
 
-    def _scaler_assembly(self):
+    def _scaler_assembly(self, reuse_pattern=False):
         space = self._spaces
         batch_size = self.batch_size
         ugdof = space[0].number_of_global_dofs()
@@ -49,6 +51,9 @@ class NonlinearForm(Form[NonlinearInt]):
             values = bm.empty(init_value_shape, dtype=space[0].ftype, device=device),
             spshape = (ugdof, )
         )
+        op_tensors = []
+        e2dofs = []
+
         for group_tensor, e2dofs_tuple in self.assembly_local_iterative():
             if isinstance(group_tensor, tuple):
                 op_tensor, src_tensor = group_tensor
@@ -62,11 +67,15 @@ class NonlinearForm(Form[NonlinearInt]):
 
                 if (batch_size > 0) and (op_tensor.ndim == 3): # Case: no batch dimension
                     op_tensor = bm.stack([op_tensor]*batch_size, axis=0)
-                I = bm.broadcast_to(ve2dof[:, :, None], local_shape)
-                J = bm.broadcast_to(ue2dof[:, None, :], local_shape)
-                indices = bm.stack([I.ravel(), J.ravel()], axis=0)
-                op_tensor = bm.reshape(op_tensor, self._values_ravel_shape)
-                M = M.add(COOTensor(indices, op_tensor, (vgdof, ugdof)))
+                if reuse_pattern:
+                    op_tensors.append(op_tensor)
+                    e2dofs.append((ve2dof, ue2dof))
+                else:
+                    I = bm.broadcast_to(ve2dof[:, :, None], local_shape)
+                    J = bm.broadcast_to(ue2dof[:, None, :], local_shape)
+                    indices = bm.stack([I.ravel(), J.ravel()], axis=0)
+                    op_tensor = bm.reshape(op_tensor, self._values_ravel_shape)
+                    M = M.add(COOTensor(indices, op_tensor, (vgdof, ugdof)))
 
             if (batch_size > 0) and (src_tensor.ndim == 2):
                 src_tensor = bm.stack([src_tensor]*batch_size, axis=0)
@@ -74,14 +83,24 @@ class NonlinearForm(Form[NonlinearInt]):
             src_tensor = bm.reshape(src_tensor, self._values_ravel_shape)
             V = V.add(COOTensor(indices, src_tensor, (ugdof, )))
 
+        if reuse_pattern and (len(op_tensors) > 0):
+            plan = self._plan
+            if (plan is None) or (not plan.match(e2dofs, (vgdof, ugdof))):
+                plan = AssemblyPlan(e2dofs, (vgdof, ugdof))
+                self._plan = plan
+            M = plan.tocsr(plan.scatter(op_tensors, batch_size))
+
         return M, V
 
-    def assembly(self, *, return_dense=True, coalesce=True, format='csr') -> COOTensor:
+    def assembly(self, *, return_dense=True, coalesce=True, format='csr',
+                 reuse_pattern: bool=True) -> COOTensor:
 
         # M = self._scalar_assembly_A(retain_ints, self.batch_size)
-        M, V = self._scaler_assembly()
+        M, V = self._scaler_assembly(reuse_pattern=reuse_pattern and (format == 'csr'))
 
-        if format == 'csr':
+        if isinstance(M, CSRTensor):
+            self._M = M
+        elif format == 'csr':
             self._M = M.coalesce().tocsr()
         elif format == 'coo':
             self._M = M.coalesce()
@@ -0,0 +1,108 @@
+
+import multiprocessing as mp
+from math import ceil
+from typing import Optional, List, Tuple, Callable, Any
+
+from .. import logger
+from ..typing import TensorLike
+from ..backend import backend_manager as bm
+
+__all__ = ['ParallelAssembler']
+
+# NOTE: The form and the kernel are passed to the workers through this global
+# state, inherited by forking. So the mesh and the space (node, cell and the
+# other arrays) are shared by copy-on-write pages instead of being pickled.
+_STATE: Optional[Tuple[Callable, List]] = None
+
+
+def _run_block(i: int):
+    kernel, tasks = _STATE
+    return kernel(*tasks[i])
+
+
+class ParallelAssembler():
+    """Evaluate a form block by block over a process pool on a single node.
+
+    Entities of every integrator are renumbered by their smallest global DoF
+    and split into contiguous blocks, so that every block touches a compact
+    range of DoFs. Blocks only depend on the number of entities and
+    `block_size`, and results are returned in block order. Hence the merged
+    result is deterministic regardless of the number of workers.
+
+    Parameters:
+        form (Form): the form to assemble.
+        workers (int): number of worker processes.
+        block_size (int | None, optional): number of entities in a block.
+            Defaults to `ceil(N / 64)` bounded in [1024, 65536], where N is the
+            number of entities of the integrator.
+    """
+    def __init__(self, form, workers: int, block_size: Optional[int] = None):
+        if workers < 1:
+            raise ValueError(f"workers should be a positive integer, but got {workers}.")
+        self.form = form
+        self.workers = workers
+        self.block_size = block_size
+
+    def _block_size(self, size: int) -> int:
+        if self.block_size is not None:
+            return self.block_size
+        return min(max(ceil(size / 64), 1024), 65536)
+
+    def tasks(self) -> List[Tuple[str, Any]]:
+        """Split all integrators of the form into (group, indices) blocks.
+        Indices are None if the integrator can not be split."""
+        form = self.form
+        tasks = []
+
+        for key in form.integrators.keys():
+            if not form._is_splittable(key):
+                tasks.append((key, None))
+                continue
+
+            etg = form.integrators[key].to_global_dof(form.space)
+            if isinstance(etg, (tuple, list)):
+                etg = etg[0]
+            size = etg.shape[0]
+            first = bm.min(etg, axis=1)
+            if bm.backend_name == 'numpy':
+                order = first.argsort(kind='stable')
+            else:
+                order = bm.argsort(first, stable=True)
+            block_size = self._block_size(size)
+
+            for start in range(0, size, block_size):
+                tasks.append((key, order[start:start+block_size]))
+
+        return tasks
+
+    def run(self, kernel: Callable[[str, Any], Any]) -> List[Any]:
+        """Evaluate the kernel on every block and return results in block order.
+
+        The kernel receives the group name and the entity indices of a block.
+        On backends other than numpy, or on platforms without `fork`, blocks
+        are evaluated in the current process with a warning.
+        """
+        global _STATE
+        tasks = self.tasks()
+        workers = min(self.workers, len(tasks))
+
+        if workers > 1 and bm.backend_name != 'numpy':
+            logger.warning(f"Parallel assembly is not supported on the {bm.backend_name} "
+                           "backend; blocks are assembled serially.")
+            workers = 1
+        if workers > 1 and 'fork' not in mp.get_all_start_methods():
+            logger.warning("Parallel assembly requires the 'fork' start method; "
+                           "blocks are assembled serially.")
+            workers = 1
+
+        logger.info(f"Assembling {len(tasks)} block(s) with {workers} worker(s).")
+
+        if workers == 1:
+            return [kernel(*task) for task in tasks]
+
+        _STATE = (kernel, tasks)
+        try:
+            with mp.get_context('fork').Pool(workers) as pool:
+                return pool.map(_run_block, range(len(tasks)), chunksize=1)
+        finally:
+            _STATE = None
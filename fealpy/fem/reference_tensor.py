@@ -0,0 +1,176 @@
+
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .. import logger
+from ..typing import TensorLike
+from ..backend import backend_manager as bm
+from ..backend.numpy_backend import NumPyBackend
+from ..quadrature.stroud_quadrature import StroudQuadrature
+from ..mesh import SimplexMesh
+
+__all__ = [
+    'reference_tensor', 'reference_tensor_dir', 'clear_reference_tensors',
+    'check_reference_space', 'cell_weight', 'expand_tensor_space'
+]
+
+# Integrals of Lagrange shape functions (and their derivatives with respect
+# to the barycentric coordinates) over the reference simplex, normalized by
+# the measure of the simplex:
+#   value      (ldof, )                     : int phi_i
+#   mass       (ldof, ldof)                 : int phi_i phi_j
+#   convection (ldof, ldof, TD+1)           : int phi_i d_k phi_j
+#   diffusion  (ldof, ldof, TD+1, TD+1)     : int d_k phi_i d_l phi_j
+OPERATORS = ('value', 'mass', 'convection', 'diffusion')
+
+_TENSORS: Dict[Tuple[str, int, int], np.ndarray] = {}
+
+
+def reference_tensor_dir() -> str:
+    """Directory of the reference tensors persisted on disk. Set the
+    `FEALPY_REFERENCE_TENSOR_DIR` environment variable to change it, or to an
+    empty string to disable the persistence."""
+    path = os.environ.get('FEALPY_REFERENCE_TENSOR_DIR', None)
+    if path is None:
+        path = os.path.join(os.path.expanduser('~'), '.cache', 'fealpy', 'reference_tensor')
+    return path
+
+
+def clear_reference_tensors(disk: bool = False):
+    """Clear reference tensors in memory, and on disk if `disk` is True."""
+    _TENSORS.clear()
+    path = reference_tensor_dir()
+    if disk and path and os.path.isdir(path):
+        for fname in os.listdir(path):
+            if fname.endswith('.npy'):
+                os.remove(os.path.join(path, fname))
+
+
+def _compute(name: str, TD: int, p: int) -> np.ndarray:
+    # Stroud rules with p+1 points in each direction are exact up to degree
+    # 2p+1, which covers all integrands above.
+    qf = StroudQuadrature(TD, p+1)
+    bcs, ws = (bm.to_numpy(a) for a in qf.get_quadrature_points_and_weights())
+    bcs = bcs.astype(np.float64)
+    ws = ws.astype(np.float64)
+    phi = NumPyBackend.simplex_shape_function(bcs, p)       # (NQ, ldof)
+    gphi = NumPyBackend.simplex_grad_shape_function(bcs, p) # (NQ, ldof, TD+1)
+
+    if name == 'value':
+        return np.einsum('q, qi -> i', ws, phi)
+    elif name == 'mass':
+        return np.einsum('q, qi, qj -> ij', ws, phi, phi)
+    elif name == 'convection':
+        return np.einsum('q, qi, qjk -> ijk', ws, phi, gphi)
+    else:
+        return np.einsum('q, qik, qjl -> ijkl', ws, gphi, gphi)
+
+
+def _load(name: str, TD: int, p: int) -> np.ndarray:
+    key = (name, TD, p)
+    if key in _TENSORS:
+        return _TENSORS[key]
+
+    path = reference_tensor_dir()
+    fname = os.path.join(path, f'{name}_{TD}d_p{p}.npy') if path else None
+    array = None
+
+    if fname is not None and os.path.isfile(fname):
+        try:
+            array = np.load(fname)
+        except (OSError, ValueError):
+            logger.warning(f"Failed to load the reference tensor {fname}, recomputing.")
+
+    if array is None:
+        array = _compute(name, TD, p)
+        if fname is not None:
+            try:
+                os.makedirs(path, exist_ok=True)
+                tmp = f'{fname}.{os.getpid()}.tmp'
+                with open(tmp, 'wb') as f:
+                    np.save(f, array)
+                os.replace(tmp, fname)
+            except OSError as e:
+                logger.debug(f"Can not save the reference tensor to {path}: {e}")
+
+    _TENSORS[key] = array
+    return array
+
+
+def reference_tensor(name: str, TD: int, p: int, *, dtype=None, device=None) -> TensorLike:
+    """Get the reference tensor of an operator for the Lagrange space of
+    degree `p` on simplices of dimension `TD`.
+
+    Tensors are computed once, then persisted in `reference_tensor_dir()` and
+    kept in memory.
+
+    Parameters:
+        name (str): 'value', 'mass', 'convection' or 'diffusion'.
+        TD (int): topological dimension of the simplex.
+        p (int): degree of the Lagrange space.
+
+    Returns:
+        TensorLike: the tensor in the current backend, normalized by the
+            measure of the reference simplex.
+    """
+    if name not in OPERATORS:
+        raise ValueError(f"Unknown reference tensor '{name}', should be one of {OPERATORS}.")
+    if p < 1:
+        raise ValueError(f"The degree should be positive, but got {p}.")
+    dtype = bm.float64 if dtype is None else dtype
+    return bm.tensor(_load(name, TD, p), dtype=dtype, device=device)
+
+
+def check_reference_space(space, integrator: str):
+    """Check that the scalar space of `space` is a Lagrange space on a
+    simplex mesh, and return it."""
+    from ..functionspace.lagrange_fe_space import LagrangeFESpace
+    scalar_space = getattr(space, 'scalar_space', space)
+    mesh = getattr(scalar_space, 'mesh', None)
+
+    if not isinstance(mesh, SimplexMesh) or not isinstance(scalar_space, LagrangeFESpace):
+        raise NotImplementedError(f"The reference assembly of {integrator} only supports "
+                                  "Lagrange spaces on simplex meshes.")
+    return scalar_space
+
+
+def cell_weight(coef, cm: TensorLike, name: str = 'coef') -> TensorLike:
+    """Multiply the cell measure by a coefficient constant on every cell.
+
+    Parameters:
+        coef (Number | TensorLike | None): None, a number, or a tensor shaped
+            ([batch, ]NC) of values on cells.
+        cm (TensorLike): cell measure shaped (NC, ).
+
+    Returns:
+        TensorLike: weights shaped ([batch, ]NC).
+    """
+    if coef is None:
+        return cm
+    if isinstance(coef, (int, float)):
+        return cm * coef
+    if bm.is_tensor(coef) and (coef.ndim == 0 or coef.shape[-1] == cm.shape[0]):
+        return cm * coef
+    raise ValueError(f"The reference assembly only supports constant or piecewise "
+                     f"constant {name}, but got {type(coef).__name__}"
+                     f"{tuple(coef.shape) if bm.is_tensor(coef) else ''}.")
+
+
+def expand_tensor_space(space, local_tensor: TensorLike) -> TensorLike:
+    """Expand local matrices (..., NC, ldof, ldof) of a scalar space to the
+    block diagonal ones of a tensor space whose basis is the scalar basis times
+    unit tensors."""
+    if not hasattr(space, 'scalar_space'):
+        return local_tensor
+    numel = space.dof_numel
+    ldof = local_tensor.shape[-1]
+    kwargs = bm.context(local_tensor)
+    I = bm.eye(numel, **kwargs)
+
+    if space.dof_priority:
+        A = bm.einsum('...ij, ab -> ...aibj', local_tensor, I)
+    else:
+        A = bm.einsum('...ij, ab -> ...iajb', local_tensor, I)
+    return bm.reshape(A, local_tensor.shape[:-2] + (ldof*numel, ldof*numel))
@@ -10,6 +10,7 @@ from ..utils import process_coef_func
 from ..functional import bilinear_integral
 from ..decorator.variantmethod import variantmethod
 from .integrator import LinearInt, OpInt, CellInt, enable_cache
+from .reference_tensor import reference_tensor, check_reference_space
 
 
 class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
@@ -39,12 +40,15 @@ class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
                                f"homogeneous meshes, but {type(mesh).__name__} is"
                                "not a subclass of HomoMesh.")
 
-        cm = mesh.entity_measure('cell', index=index)
+        cm = self.cached_eval(mesh, 'cell_measure', None, index,
+            lambda: mesh.entity_measure('cell', index=index))
         q = space.p+3 if self.q is None else self.q
-        qf = mesh.quadrature_formula(q, 'cell')
-        bcs, ws = qf.get_quadrature_points_and_weights()
-        gphi = space.grad_basis(bcs, index=index)
-        phi = space.basis(bcs, index=index)
+        bcs, ws = self.cached_eval(mesh, 'cell_qf', q, None,
+            lambda: mesh.quadrature_formula(q, 'cell').get_quadrature_points_and_weights())
+        gphi = self.cached_eval(space, 'cell_grad_basis_x', q, index,
+            lambda: space.grad_basis(bcs, index=index))
+        phi = self.cached_eval(space, 'cell_basis', q, index,
+            lambda: space.basis(bcs, index=index))
         return bcs, ws, phi, gphi, cm, index
 
     @variantmethod
@@ -60,6 +64,30 @@ class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
             raise TypeError(f"coef should be Tensor, but got {type(coef)}.")
         return result
     
+    @assembly.register('reference')
+    def assembly(self, space: _FS) -> TensorLike:
+        """Assemble with the reference convection tensor. Only for Lagrange
+        spaces on simplex meshes with constant velocity, shaped (GD, ), or
+        piecewise constant velocity, shaped (NC, GD)."""
+        scalar_space = check_reference_space(space, 'ScalarConvectionIntegrator')
+        mesh = scalar_space.mesh
+        index = self.index
+        coef = self.coef
+        cm = self.cached_eval(mesh, 'cell_measure', None, index,
+            lambda: mesh.entity_measure('cell', index=index))
+        glambda = self.cached_eval(mesh, 'cell_grad_lambda', None, index,
+            lambda: mesh.grad_lambda(index=index))
+        T = reference_tensor('convection', mesh.TD, scalar_space.p, **bm.context(cm))
+
+        if not is_tensor(coef) or coef.ndim not in (1, 2):
+            raise ValueError("The reference assembly only supports velocity shaped "
+                             f"(GD, ) or (NC, GD), but got {type(coef).__name__}.")
+        if coef.ndim == 1:
+            bl = bm.einsum('ckm, m -> ck', glambda, coef)
+        else:
+            bl = bm.einsum('ckm, cm -> ck', glambda, coef)
+        return bm.einsum('ijk, ck, c -> cij', T, bl, cm)
+
     @assembly.register('isopara')
     def assembly(self, space: _FS) -> TensorLike:
         coef = self.coef
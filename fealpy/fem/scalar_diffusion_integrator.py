@@ -1,5 +1,5 @@
 from typing import Optional, Literal
-from ..mesh.mesh_base import SimplexMesh
+from ..mesh.mesh_base import SimplexMesh, TensorMesh
 
 from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, _S, CoefLike
@@ -9,6 +9,12 @@ from ..utils import process_coef_func
 from ..functional import bilinear_integral, linear_integral, get_semilinear_coef
 from ..decorator.variantmethod import variantmethod
 from .integrator import LinearInt, OpInt, CellInt, enable_cache
+from .matrix_free import (
+    tensor_basis_1d, cell_weights, simplex_grad_apply, tensor_grad_apply
+)
+from .reference_tensor import (
+    reference_tensor, check_reference_space, cell_weight, expand_tensor_space
+)
 
 
 class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
@@ -32,24 +38,31 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
     def fetch_qf(self, space: _FS):
         mesh = space.mesh
         q = space.p+3 if self.q is None else self.q
-        qf = mesh.quadrature_formula(q, 'cell')
-        bcs, ws = qf.get_quadrature_points_and_weights()
-        return bcs, ws
+        return self.cached_eval(mesh, 'cell_qf', q, None,
+            lambda: mesh.quadrature_formula(q, 'cell').get_quadrature_points_and_weights())
 
     @enable_cache
     def fetch_measure(self, space: _FS, /, indices=None):
         mesh = space.mesh
-        return mesh.entity_measure('cell', index=self.entity_selection(indices))
+        index = self.entity_selection(indices)
+        return self.cached_eval(mesh, 'cell_measure', None, index,
+            lambda: mesh.entity_measure('cell', index=index))
 
     @enable_cache
     def fetch_gphix(self, space: _FS, /, indices=None):
         bcs = self.fetch_qf(space)[0]
-        return space.grad_basis(bcs, index=self.entity_selection(indices), variable='x')
+        q = space.p+3 if self.q is None else self.q
+        index = self.entity_selection(indices)
+        return self.cached_eval(space, 'cell_grad_basis_x', q, index,
+            lambda: space.grad_basis(bcs, index=index, variable='x'))
 
     @enable_cache
     def fetch_gphiu(self, space: _FS, /, indices=None):
         bcs = self.fetch_qf(space)[0]
-        return space.grad_basis(bcs, index=self.entity_selection(indices), variable='u')
+        q = space.p+3 if self.q is None else self.q
+        index = self.entity_selection(indices)
+        return self.cached_eval(space, 'cell_grad_basis_u', q, index,
+            lambda: space.grad_basis(bcs, index=index, variable='u'))
 
     @variantmethod
     def assembly(self, space: _FS, /, indices=None) -> TensorLike:
@@ -94,6 +107,22 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
             result = bm.einsum('cqkn, qijmn, cqkm, c -> cij', JG, M, JG, cm) # (NC, NQ, ldof, GD)
         return result
 
+    @assembly.register('reference')
+    def assembly(self, space: _FS, /, indices=None) -> TensorLike:
+        """Assemble with the reference diffusion tensor, without evaluating
+        basis at quadrature points. Only for Lagrange spaces on simplex meshes
+        with constant or piecewise constant scalar coefficients."""
+        scalar_space = check_reference_space(space, 'ScalarDiffusionIntegrator')
+        mesh = scalar_space.mesh
+        index = self.entity_selection(indices)
+        cm = self.fetch_measure(space, indices)
+        glambda = self.cached_eval(mesh, 'cell_grad_lambda', None, index,
+            lambda: mesh.grad_lambda(index=index))
+        S = reference_tensor('diffusion', mesh.TD, scalar_space.p, **bm.context(cm))
+        w = cell_weight(self.coef, cm)
+        G = bm.einsum('ckm, clm -> ckl', glambda, glambda)
+        return expand_tensor_space(space, bm.einsum('ijkl, ckl, ...c -> ...cij', S, G, w))
+
     @assembly.register('nonlinear')
     def assembly(self, space: _FS, /, indices=None) -> TensorLike:
         uh = self.uh
@@ -139,4 +168,31 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
                 A = bm.einsum('q, cqim, cqjm, cq, cq -> cij', ws*rm, gphi, gphi, d, coef)
         return A
 
+    def matrix_free_setup(self, space: _FS, /, indices=None):
+        """Fetch basis, geometric factors and weights for `matrix_free_apply`.
+        Only simplex meshes and tensor-product meshes with scalar coefficients
+        are supported."""
+        mesh = space.mesh
+        index = self.entity_selection(indices)
+        bcs, ws = self.fetch_qf(space)
+        cm = self.fetch_measure(space, indices)
+        coef = process_coef_func(self.coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
+        W = cell_weights(coef, ws, cm)
+
+        if isinstance(mesh, SimplexMesh):
+            gphi = self.fetch_gphiu(space, indices)
+            glambda = mesh.grad_lambda(index=index)
+            K = bm.einsum('ckm, clm -> ckl', glambda, glambda)
+            return 'simplex', gphi, K, W
+        elif isinstance(mesh, TensorMesh):
+            phi, dphi = tensor_basis_1d(bcs[0], space.p)
+            J = mesh.jacobi_matrix(bcs, index)
+            G = bm.linalg.inv(mesh.first_fundamental_form(J))
+            return 'tensor', phi, dphi, G, W
+        else:
+            raise NotImplementedError(f"Matrix-free diffusion is not supported on {type(mesh).__name__}.")
 
+    def matrix_free_apply(self, data, uloc: TensorLike, /) -> TensorLike:
+        if data[0] == 'simplex':
+            return simplex_grad_apply(*data[1:], uloc)
+        return tensor_grad_apply(*data[1:], uloc)
@@ -2,12 +2,18 @@ from typing import Optional
 
 from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, _S, CoefLike
-from ..mesh import HomogeneousMesh
+from ..mesh import HomogeneousMesh, SimplexMesh, TensorMesh
 from ..functionspace.space import FunctionSpace as _FS
 from ..utils import process_coef_func
 from ..functional import bilinear_integral, linear_integral, get_semilinear_coef
 from ..decorator.variantmethod import variantmethod
 from .integrator import LinearInt, OpInt, CellInt, enable_cache
+from .matrix_free import (
+    tensor_basis_1d, cell_weights, simplex_value_apply, tensor_value_apply
+)
+from .reference_tensor import (
+    reference_tensor, check_reference_space, cell_weight, expand_tensor_space
+)
 
 
 class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
@@ -18,41 +24,56 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
         super().__init__()
         self.coef = coef
         self.q = q
-        self.index = index
+        self.set_region(None if isinstance(index, slice) and index == _S else index)
         self.batched = batched
         self.assembly.set(method)
 
     @enable_cache
-    def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+    def to_global_dof(self, space: _FS, /, indices=None) -> TensorLike:
+        return space.cell_to_dof()[self.entity_selection(indices)]
 
     @enable_cache
-    def fetch(self, space: _FS):
+    def fetch(self, space: _FS, /, indices=None):
         q = self.q
-        index = self.index
         mesh = getattr(space, 'mesh', None)
+        index = self.entity_selection(indices)
 
         if not isinstance(mesh, HomogeneousMesh):
             raise RuntimeError("The ScalarMassIntegrator only support spaces on"
                                f"homogeneous meshes, but {type(mesh).__name__} is"
                                "not a subclass of HomoMesh.")
 
-        cm = mesh.entity_measure('cell', index=index)
+        cm = self.cached_eval(mesh, 'cell_measure', None, index,
+            lambda: mesh.entity_measure('cell', index=index))
         q = space.p+3 if self.q is None else self.q
-        qf = mesh.quadrature_formula(q, 'cell')
-        bcs, ws = qf.get_quadrature_points_and_weights()
-        phi = space.basis(bcs, index=index)
+        bcs, ws = self.cached_eval(mesh, 'cell_qf', q, None,
+            lambda: mesh.quadrature_formula(q, 'cell').get_quadrature_points_and_weights())
+        phi = self.cached_eval(space, 'cell_basis', q, index,
+            lambda: space.basis(bcs, index=index))
         return bcs, ws, phi, cm, index
 
     @variantmethod
-    def assembly(self, space: _FS) -> TensorLike:
+    def assembly(self, space: _FS, /, indices=None) -> TensorLike:
         coef = self.coef
         mesh = getattr(space, 'mesh', None)
-        bcs, ws, phi, cm, index = self.fetch(space)
+        bcs, ws, phi, cm, index = self.fetch(space, indices)
         val = process_coef_func(coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
 
         return bilinear_integral(phi, phi, ws, cm, val, batched=self.batched)
 
+    @assembly.register('reference')
+    def assembly(self, space: _FS, /, indices=None) -> TensorLike:
+        """Assemble with the reference mass tensor. Only for Lagrange spaces
+        on simplex meshes with constant or piecewise constant coefficients."""
+        scalar_space = check_reference_space(space, 'ScalarMassIntegrator')
+        mesh = scalar_space.mesh
+        index = self.entity_selection(indices)
+        cm = self.cached_eval(mesh, 'cell_measure', None, index,
+            lambda: mesh.entity_measure('cell', index=index))
+        M = reference_tensor('mass', mesh.TD, scalar_space.p, **bm.context(cm))
+        w = cell_weight(self.coef, cm)
+        return expand_tensor_space(space, bm.einsum('ij, ...c -> ...cij', M, w))
+
     @assembly.register('semilinear')
     def assembly(self, space: _FS) -> TensorLike:
         uh = self.uh
@@ -94,3 +115,23 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
         return M
 
 
+
+    def matrix_free_setup(self, space: _FS, /, indices=None):
+        """Fetch basis and weights for `matrix_free_apply`. Only simplex meshes
+        and tensor-product meshes with scalar coefficients are supported."""
+        mesh = getattr(space, 'mesh', None)
+        bcs, ws, phi, cm, index = self.fetch(space, indices)
+        coef = process_coef_func(self.coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
+        W = cell_weights(coef, ws, cm)
+
+        if isinstance(mesh, SimplexMesh):
+            return 'simplex', phi[0], W
+        elif isinstance(mesh, TensorMesh):
+            return 'tensor', tensor_basis_1d(bcs[0], space.p)[0], W, mesh.TD
+        else:
+            raise NotImplementedError(f"Matrix-free mass is not supported on {type(mesh).__name__}.")
+
+    def matrix_free_apply(self, data, uloc: TensorLike, /) -> TensorLike:
+        if data[0] == 'simplex':
+            return simplex_value_apply(data[1], data[2], uloc)
+        return tensor_value_apply(data[1], data[2], uloc, data[3])
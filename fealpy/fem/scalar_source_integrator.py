@@ -8,6 +8,7 @@ from ..utils import process_coef_func
 from ..functional import linear_integral
 from ..decorator.variantmethod import variantmethod
 from .integrator import LinearInt, SrcInt, CellInt, enable_cache
+from .reference_tensor import reference_tensor, check_reference_space, cell_weight
 
 
 class ScalarSourceIntegrator(LinearInt, SrcInt, CellInt):
@@ -40,11 +41,13 @@ class ScalarSourceIntegrator(LinearInt, SrcInt, CellInt):
         #                        f"homogeneous meshes, but {type(mesh).__name__} is"
         #                        "not a subclass of HomoMesh.")
 
-        cm = mesh.entity_measure('cell', index=index)
+        cm = self.cached_eval(mesh, 'cell_measure', None, index,
+            lambda: mesh.entity_measure('cell', index=index))
         q = space.p+3 if self.q is None else self.q
-        qf = mesh.quadrature_formula(q, 'cell')
-        bcs, ws = qf.get_quadrature_points_and_weights()
-        phi = space.basis(bcs, index=index)
+        bcs, ws = self.cached_eval(mesh, 'cell_qf', q, None,
+            lambda: mesh.quadrature_formula(q, 'cell').get_quadrature_points_and_weights())
+        phi = self.cached_eval(space, 'cell_basis', q, index,
+            lambda: space.basis(bcs, index=index))
 
         return bcs, ws, phi, cm, index
 
@@ -57,6 +60,30 @@ class ScalarSourceIntegrator(LinearInt, SrcInt, CellInt):
   
         return linear_integral(phi, ws, cm, val, batched=self.batched)
 
+    @assembly.register('reference')
+    def assembly(self, space: _FS, indices=None) -> TensorLike:
+        """Assemble with the reference tensor of basis integrals. Only for
+        Lagrange spaces on simplex meshes with constant or piecewise constant
+        sources; sources of tensor spaces are shaped ([NC, ]numel)."""
+        scalar_space = check_reference_space(space, 'ScalarSourceIntegrator')
+        mesh = scalar_space.mesh
+        index = self.entity_selection(indices)
+        cm = self.cached_eval(mesh, 'cell_measure', None, index,
+            lambda: mesh.entity_measure('cell', index=index))
+        R = reference_tensor('value', mesh.TD, scalar_space.p, **bm.context(cm))
+        f = self.source
+
+        if not hasattr(space, 'scalar_space'):
+            return bm.einsum('i, ...c -> ...ci', R, cell_weight(f, cm, 'source'))
+
+        if not bm.is_tensor(f) or f.ndim not in (1, 2) or f.shape[-1] != space.dof_numel:
+            raise ValueError("The reference assembly only supports sources shaped "
+                             f"(numel, ) or (NC, numel) for tensor spaces, but got {type(f).__name__}.")
+        subs = 'a' if f.ndim == 1 else 'ca'
+        out = 'cai' if space.dof_priority else 'cia'
+        F = bm.einsum(f'i, c, {subs} -> {out}', R, cm, f)
+        return bm.reshape(F, (cm.shape[0], -1))
+
     @assembly.register('isopara')
     def assembly(self, space: _FS) -> TensorLike: 
         f = self.source
@@ -0,0 +1,166 @@
+
+import re
+import tracemalloc
+from typing import Optional, Union, Sequence
+
+from ..typing import TensorLike, Size
+from ..backend import backend_manager as bm
+from ..sparse import CSRTensor
+
+__all__ = ['parse_memory', 'format_memory', 'tensor_nbytes',
+           'MemoryTracker', 'CSRAccumulator']
+
+_UNITS = {
+    '': 1, 'B': 1,
+    'K': 1 << 10, 'KB': 1 << 10, 'KIB': 1 << 10,
+    'M': 1 << 20, 'MB': 1 << 20, 'MIB': 1 << 20,
+    'G': 1 << 30, 'GB': 1 << 30, 'GIB': 1 << 30,
+    'T': 1 << 40, 'TB': 1 << 40, 'TIB': 1 << 40,
+}
+
+
+def parse_memory(size: Union[int, float, str]) -> int:
+    """Convert a memory size like `4GB`, `512 MB` or `1.5GiB` to bytes.
+    Numbers are taken as bytes. Units are binary (1KB = 1024B)."""
+    if isinstance(size, (int, float)):
+        nbytes = int(size)
+    else:
+        match = re.fullmatch(r'\s*([0-9]*\.?[0-9]+)\s*([a-zA-Z]*)\s*', size)
+        if match is None or match.group(2).upper() not in _UNITS:
+            raise ValueError(f"Invalid memory size '{size}'.")
+        nbytes = int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+    if nbytes <= 0:
+        raise ValueError(f"Memory size should be positive, but got {size}.")
+    return nbytes
+
+
+def format_memory(nbytes: int) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if nbytes < 1024:
+            return f"{nbytes:.1f}{unit}" if unit != 'B' else f"{nbytes}B"
+        nbytes /= 1024
+    return f"{nbytes:.1f}TB"
+
+
+def tensor_nbytes(x: TensorLike) -> int:
+    if hasattr(x, 'nbytes'):
+        return int(x.nbytes)
+    return int(x.numel() * x.element_size())
+
+
+class MemoryTracker():
+    """Track the peak memory of a code region.
+
+    On the numpy backend, allocations are measured by `tracemalloc` (numpy
+    reports its buffers to it). On other backends, the peak is accounted
+    from the sizes of buffers registered by `record`.
+    """
+    def __init__(self):
+        self.measured = bm.backend_name == 'numpy'
+        self.peak = 0
+        self._started = False
+        self._base = 0
+
+    def __enter__(self):
+        if self.measured:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started = True
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *args):
+        self.update()
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def mark(self) -> int:
+        """Fold the peak so far into `peak` and start a new peak window.
+        Returns the traced memory at the mark (numpy backend only)."""
+        if not self.measured:
+            return 0
+        self.update()
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+    def window_peak(self, mark: int) -> int:
+        """Peak memory above `mark` since it was made (numpy backend only)."""
+        if not self.measured:
+            return 0
+        return max(tracemalloc.get_traced_memory()[1] - mark, 0)
+
+    def update(self):
+        if self.measured and tracemalloc.is_tracing():
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1] - self._base)
+        return self.peak
+
+    def record(self, *tensors: TensorLike):
+        """Account buffers alive at the same time (ignored when measured)."""
+        if not self.measured:
+            self.peak = max(self.peak, sum(tensor_nbytes(t) for t in tensors))
+        return self.peak
+
+
+class CSRAccumulator():
+    """Running, always-coalesced accumulator of sparse matrix blocks.
+
+    Non-zeros are stored as sorted flattened keys `row * ncol + col` with
+    their values, so every block is merged by a single unique-and-scatter,
+    and the accumulated block can be freed right after.
+
+    Parameters:
+        sparse_shape (Size): shape of the global matrix.
+        batch_size (int, optional): size of the batch dimension. Defaults to 0.
+    """
+    def __init__(self, sparse_shape: Size, batch_size: int = 0):
+        self.sparse_shape = tuple(sparse_shape)
+        self.batch_size = batch_size
+        self.keys: Optional[TensorLike] = None
+        self.values: Optional[TensorLike] = None
+
+    @property
+    def nnz(self) -> int:
+        return 0 if self.keys is None else self.keys.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        if self.keys is None:
+            return 0
+        return tensor_nbytes(self.keys) + tensor_nbytes(self.values)
+
+    def add(self, local_tensor: TensorLike, ve2dof: TensorLike, ue2dof: TensorLike):
+        """Merge local matrices shaped ([batch,] NC, vldof, uldof) in."""
+        ncol = self.sparse_shape[1]
+        key = bm.astype(ve2dof, bm.int64)[:, :, None] * ncol + ue2dof[:, None, :]
+        ravel_shape = (-1, ) if self.batch_size == 0 else (self.batch_size, -1)
+        self.merge([bm.reshape(key, (-1, ))], [bm.reshape(local_tensor, ravel_shape)])
+
+    def merge(self, keys: Sequence[TensorLike], values: Sequence[TensorLike]):
+        """Merge blocks of flattened keys and values in, summed in the given order."""
+        keys, values = list(keys), list(values)
+        if self.keys is not None:
+            keys.insert(0, self.keys)
+            values.insert(0, self.values)
+        key = keys[0] if len(keys) == 1 else bm.concat(keys, axis=0)
+        value = values[0] if len(values) == 1 else bm.concat(values, axis=-1)
+        del keys, values
+
+        ukey, inverse = bm.unique(key, return_inverse=True)
+        del key
+        shape = value.shape[:-1] + (ukey.shape[0], )
+        out = bm.zeros(shape, dtype=value.dtype, device=bm.get_device(value))
+        self.values = bm.index_add(out, bm.reshape(inverse, (-1, )), value, axis=-1)
+        self.keys = ukey
+
+    def tocsr(self, itype=None) -> CSRTensor:
+        nrow, ncol = self.sparse_shape
+        if self.keys is None:
+            raise RuntimeError("Nothing has been accumulated.")
+        itype = bm.int64 if itype is None else itype
+        count = bm.bincount(self.keys // ncol, minlength=nrow)
+        crow = bm.concat([bm.zeros((1, ), **bm.context(count)),
+                          bm.cumsum(count, axis=0)], axis=0)
+        col = bm.astype(self.keys % ncol, itype)
+        return CSRTensor(bm.astype(crow, itype), col, self.values, self.sparse_shape)
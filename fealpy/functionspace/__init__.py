@@ -1,54 +1,62 @@
+"""The Function Space Module
 
-from .space import FunctionSpace
-from .function import Function
+The space classes are imported on first access, see `fealpy._lazy`.
+"""
+from .._lazy import attach
 
-from .dofs import LinearMeshCFEDof
+_REGISTRY = {
+    'FunctionSpace': '.space',
+    'Function': '.function',
 
-from .lagrange_fe_space import LagrangeFESpace
-from .tensor_space import TensorFunctionSpace
-from .cm_conforming_fe_space_2d import CmConformingFESpace2d
-from .cm_conforming_fe_space_3d import CmConformingFESpace3d
-from .bernstein_fe_space import BernsteinFESpace
+    'LinearMeshCFEDof': '.dofs',
 
-from .first_nedelec_fe_space import FirstNedelecFESpace
-from .first_nedelec_fe_space_2d import FirstNedelecFESpace2d
-from .first_nedelec_fe_space_3d import FirstNedelecFESpace3d
+    'LagrangeFESpace': '.lagrange_fe_space',
+    'TensorFunctionSpace': '.tensor_space',
+    'CmConformingFESpace2d': '.cm_conforming_fe_space_2d',
+    'CmConformingFESpace3d': '.cm_conforming_fe_space_3d',
+    'BernsteinFESpace': '.bernstein_fe_space',
 
-from .second_nedelec_fe_space import SecondNedelecFESpace
-from .second_nedelec_fe_space_2d import SecondNedelecFESpace2d
-from .second_nedelec_fe_space_3d import SecondNedelecFESpace3d
+    'FirstNedelecFESpace': '.first_nedelec_fe_space',
+    'FirstNedelecFESpace2d': '.first_nedelec_fe_space_2d',
+    'FirstNedelecFESpace3d': '.first_nedelec_fe_space_3d',
 
-from .raviart_thomas_fe_space import RaviartThomasFESpace
-from .raviart_thomas_fe_space_2d import  RaviartThomasFESpace2d
-from .raviart_thomas_fe_space_3d import  RaviartThomasFESpace3d
+    'SecondNedelecFESpace': '.second_nedelec_fe_space',
+    'SecondNedelecFESpace2d': '.second_nedelec_fe_space_2d',
+    'SecondNedelecFESpace3d': '.second_nedelec_fe_space_3d',
 
-from .parametric_lagrange_fe_space import ParametricLagrangeFESpace
+    'RaviartThomasFESpace': '.raviart_thomas_fe_space',
+    'RaviartThomasFESpace2d': '.raviart_thomas_fe_space_2d',
+    'RaviartThomasFESpace3d': '.raviart_thomas_fe_space_3d',
 
-from .huzhang_fe_space import HuZhangFESpace
-from .huzhang_fe_space_2d import HuZhangFESpace2d
-from .huzhang_fe_space_3d import HuZhangFESpace3d
+    'ParametricLagrangeFESpace': '.parametric_lagrange_fe_space',
 
-from .brezzi_douglas_marini_fe_space import BrezziDouglasMariniFESpace
-from .brezzi_douglas_marini_fe_space_2d import BrezziDouglasMariniFESpace2d
-from .brezzi_douglas_marini_fe_space_3d import BrezziDouglasMariniFESpace3d
+    'HuZhangFESpace': '.huzhang_fe_space',
+    'HuZhangFESpace2d': '.huzhang_fe_space_2d',
+    'HuZhangFESpace3d': '.huzhang_fe_space_3d',
 
+    'BrezziDouglasMariniFESpace': '.brezzi_douglas_marini_fe_space',
+    'BrezziDouglasMariniFESpace2d': '.brezzi_douglas_marini_fe_space_2d',
+    'BrezziDouglasMariniFESpace3d': '.brezzi_douglas_marini_fe_space_3d',
 
-from .interior_penalty_fe_space_2d import InteriorPenaltyFESpace2d
+    'InteriorPenaltyFESpace2d': '.interior_penalty_fe_space_2d',
 
-## VESpace
-from .scaled_monomial_space_2d import ScaledMonomialSpace2d
-from .conforming_scalar_ve_space_2d import ConformingScalarVESpace2d
-from .non_conforming_scalar_ve_space_2d import NonConformingScalarVESpace2d
+    ## VESpace
+    'ScaledMonomialSpace2d': '.scaled_monomial_space_2d',
+    'ConformingScalarVESpace2d': '.conforming_scalar_ve_space_2d',
+    'NonConformingScalarVESpace2d': '.non_conforming_scalar_ve_space_2d',
+}
 
+__getattr__, __dir__, __all__ = attach(__name__, _REGISTRY)
+__all__ = __all__ + ['functionspace']
 
 
 def functionspace(mesh, space_type, shape=None):
+    from .lagrange_fe_space import LagrangeFESpace
+    from .tensor_space import TensorFunctionSpace
+
     if space_type[0] == 'Lagrange':
         scalar_space = LagrangeFESpace(mesh, space_type[1])
         if shape is not None:
             return TensorFunctionSpace(scalar_space, shape)
         else:
             return scalar_space
-
-
-
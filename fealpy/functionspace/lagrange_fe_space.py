@@ -242,4 +242,70 @@ class LagrangeFESpace(FunctionSpace, Generic[_MT]):
             p = c
         return Ps
 
-    
+    def transfer(self, uh: TensorLike, maps: dict):
+        """Copy the DoFs of a function on the mesh before a local refinement or
+        coarsening to this space, by the `entity_maps` of the mesh (see
+        `Mesh.update_topology`).
+
+        The DoFs on the nodes, edges, faces and cells kept by the update are
+        copied, following the new vertex order of the kept edges and faces;
+        the others, on the new or modified entities, are left to the caller,
+        e.g. for interpolation.
+
+        Parameters:
+            uh (TensorLike): the DoFs on the old mesh, shaped (..., old_gdof).
+            maps (dict): the maps returned by `update_topology`. Without 'node',
+                the old nodes keep their indices.
+
+        Returns:
+            Tuple[TensorLike, TensorLike]: the DoFs on the current mesh shaped
+                (..., gdof), zero if not transferred, and the bool flag of the
+                transferred DoFs shaped (gdof,).
+        """
+        if self.ctype != 'C':
+            raise RuntimeError("transfer is only supported by continuous spaces.")
+        from math import comb
+        p, TD = self.p, self.TD
+        mesh = self.mesh
+        kwargs = bm.context(maps['cell'])
+        etypes = [('edge', 1), ('cell', TD)] if TD == 2 else [('edge', 1), ('face', 2), ('cell', 3)]
+        ldofs = [comb(p - 1, d) for _, d in etypes]
+        NN_old = uh.shape[-1] - sum(maps[e].shape[0] * k for (e, _), k in zip(etypes, ldofs))
+        node_map = maps.get('node', bm.arange(NN_old, **kwargs))
+
+        old_dofs = [bm.arange(NN_old, **kwargs)]
+        new_dofs = [node_map]
+        offset_old, offset_new = NN_old, mesh.number_of_nodes()
+        for (etype, d), k in zip(etypes, ldofs):
+            if k == 0:
+                continue
+            emap = maps[etype]
+            kept, = bm.nonzero(emap >= 0)
+            local = bm.broadcast_to(bm.arange(k, **kwargs), (kept.shape[0], k))
+            if etype != 'cell':
+                # Interior DoFs are ordered by the multi-indices relative to the
+                # vertices, so permute them if the vertex order changed.
+                mi = mesh.multi_index_matrix(p, d)
+                mi = mi[bm.all(mi > 0, axis=-1)]
+                old = node_map[maps['old_' + etype][kept]]
+                new = mesh.entity(etype)[emap[kept]]
+                perm = bm.argmax(bm.astype(new[:, None, :] == old[:, :, None], bm.int32), axis=-1)
+                mi_new = bm.swapaxes(mi[:, bm.argsort(perm, axis=-1)], 0, 1)
+                weight = bm.astype((p + 1)**bm.arange(d + 1, **kwargs), mi.dtype)
+                code = bm.sum(mi*weight, axis=-1)
+                local = bm.argmax(bm.astype(bm.sum(mi_new*weight, axis=-1)[..., None] == code,
+                                            bm.int32), axis=-1)
+            old_dofs.append((offset_old + kept[:, None]*k + bm.arange(k, **kwargs)).reshape(-1))
+            new_dofs.append((offset_new + emap[kept][:, None]*k + local).reshape(-1))
+            offset_old += emap.shape[0] * k
+            offset_new += mesh.count(etype) * k
+
+        old_dofs = bm.concat(old_dofs, axis=0)
+        new_dofs = bm.astype(bm.concat(new_dofs, axis=0), self.itype)
+        flag = new_dofs >= 0
+        gdof = self.number_of_global_dofs()
+        val = bm.zeros(uh.shape[:-1] + (gdof, ), **bm.context(uh))
+        val = bm.set_at(val, (..., new_dofs[flag]), uh[..., old_dofs[flag]])
+        is_transferred = bm.zeros((gdof, ), dtype=bm.bool, device=bm.get_device(uh))
+        is_transferred = bm.set_at(is_transferred, new_dofs[flag], True)
+        return val, is_transferred
@@ -1,5 +1,4 @@
 import sys
-from tqdm import tqdm
 import logging
 
 FORMAT = '%(asctime)s %(levelname)s - %(message)s'
@@ -19,6 +18,7 @@ class TqdmLoggingHandler(logging.Handler):
         self.setFormatter(FORMATTER)
 
     def emit(self, record):
+        from tqdm import tqdm
         try:
             msg = self.format(record)
             tqdm.write(msg)
@@ -1,26 +1,44 @@
+"""The Mesh Module
 
-from .mesh_data_structure import MeshDS
-from .mesh_data import MeshData
-from .mesh_base import Mesh, HomogeneousMesh, SimplexMesh, TensorMesh, StructuredMesh
+The mesh classes are imported on first access, see `fealpy._lazy`.
+"""
+from .._lazy import attach
 
-from .interval_mesh import IntervalMesh
-from .triangle_mesh import TriangleMesh
-from .tetrahedron_mesh import TetrahedronMesh
-from .quadrangle_mesh import QuadrangleMesh
-from .hexahedron_mesh import HexahedronMesh
-from .polygon_mesh import PolygonMesh
-from .halfedge_mesh import HalfEdgeMesh2d
-from .dart_mesh import DartMesh
-from .prism_mesh import PrismMesh
+_REGISTRY = {
+    'MeshDS': '.mesh_data_structure',
+    'MeshData': '.mesh_data',
+    'Mesh': '.mesh_base',
+    'HomogeneousMesh': '.mesh_base',
+    'SimplexMesh': '.mesh_base',
+    'TensorMesh': '.mesh_base',
+    'StructuredMesh': '.mesh_base',
+    'PointLocator': '.point_locator',
+    'CellList': '.neighbor_list',
+    'NeighborList': '.neighbor_list',
 
-from .uniform_mesh import UniformMesh
-from .uniform_mesh_1d import UniformMesh1d
-from .uniform_mesh_2d import UniformMesh2d
-from .uniform_mesh_3d import UniformMesh3d
+    'IntervalMesh': '.interval_mesh',
+    'TriangleMesh': '.triangle_mesh',
+    'TetrahedronMesh': '.tetrahedron_mesh',
+    'QuadrangleMesh': '.quadrangle_mesh',
+    'HexahedronMesh': '.hexahedron_mesh',
+    'PolygonMesh': '.polygon_mesh',
+    'HalfEdgeMesh2d': '.halfedge_mesh',
+    'DartMesh': '.dart_mesh',
+    'PrismMesh': '.prism_mesh',
 
-from .lagrange_triangle_mesh import LagrangeTriangleMesh
-from .lagrange_quadrangle_mesh import LagrangeQuadrangleMesh
+    'UniformMesh': '.uniform_mesh',
+    'UniformMesh1d': '.uniform_mesh_1d',
+    'UniformMesh2d': '.uniform_mesh_2d',
+    'UniformMesh3d': '.uniform_mesh_3d',
 
-from .edge_mesh import EdgeMesh
-from .inp_file_parser import InpFileParser
-from .bdf_file_parser import BdfFileParser, NodeSection, ElementSection
+    'LagrangeTriangleMesh': '.lagrange_triangle_mesh',
+    'LagrangeQuadrangleMesh': '.lagrange_quadrangle_mesh',
+
+    'EdgeMesh': '.edge_mesh',
+    'InpFileParser': '.inp_file_parser',
+    'BdfFileParser': '.bdf_file_parser',
+    'NodeSection': '.bdf_file_parser',
+    'ElementSection': '.bdf_file_parser',
+}
+
+__getattr__, __dir__, __all__ = attach(__name__, _REGISTRY)
@@ -475,6 +475,43 @@ class HomogeneousMesh(Mesh):
 
         return bm.bc_to_points(bcs, node, entity)
 
+    # point location
+    def point_locator(self, **kwargs):
+        """Get the point locator of the mesh, built on the first call.
+
+        Parameters:
+            **kwargs: options of `PointLocator`. The locator is rebuilt if
+                they are given.
+
+        Returns:
+            PointLocator: the locator. It is updated automatically when the
+                mesh version changes, see `mark_modified`.
+        """
+        from .point_locator import PointLocator
+        locator = self.__dict__.get('_point_locator', None)
+        if (locator is None) or kwargs:
+            locator = PointLocator(self, **kwargs)
+            self.__dict__['_point_locator'] = locator
+        return locator
+
+    def location(self, points: TensorLike, return_bc: bool=False):
+        """Find the cells containing the points.
+
+        Parameters:
+            points (TensorLike): the points, shaped (NP, GD).
+            return_bc (bool, optional): whether to return the local coordinates
+                of the points in their cells. Defaults to False.
+
+        Returns:
+            TensorLike: the cell index of every point, -1 for the points outside
+                the mesh. The local coordinates are returned as well if
+                `return_bc` is True, see `PointLocator.locate`.
+        """
+        cidx, bc = self.point_locator().locate(points)
+        if return_bc:
+            return cidx, bc
+        return cidx
+
     # ipoints
     def interpolation_points(self, p: int, index: Index=_S) -> TensorLike:
         """Get interpolation points of order p.
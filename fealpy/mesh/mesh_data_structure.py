@@ -80,6 +80,7 @@ class MeshDS(metaclass=MeshMeta):
                 raise RuntimeError('please call super().__init__() before setting attributes.')
             etype_dim = estr2dim(self, name)
             self._entity_storage[etype_dim] = value
+            self.mark_modified()
         else:
             super().__setattr__(name, value)
 
@@ -100,6 +101,18 @@ class MeshDS(metaclass=MeshMeta):
     def clear(self) -> None:
         """Remove all entities from the storage."""
         self._entity_storage.clear()
+        self.mark_modified()
+
+    @property
+    def version(self) -> int:
+        """Counter of modifications, increased whenever entities are reassigned.
+        Data evaluated on the mesh are outdated once the version changed."""
+        return self.__dict__.get('_version', 0)
+
+    def mark_modified(self) -> None:
+        """Increase the version of the mesh. Call this after modifying entities
+        (e.g. node coordinates) in place."""
+        self.__dict__['_version'] = self.__dict__.get('_version', 0) + 1
 
     ### properties
     def top_dimension(self) -> int: return self.TD
@@ -462,3 +475,207 @@ class MeshDS(metaclass=MeshMeta):
             f"Mesh topology relation constructed, with {NC} cells, {NF} "
             f"faces, {NN} nodes on device {self.device}."
         )
+
+    def update_topology(self, cell: TensorLike, old_cell: TensorLike,
+                        node_map: Optional[TensorLike] = None) -> Dict[str, TensorLike]:
+        """Update the topology after a local modification of the cells, e.g.
+        bisection or coarsening, instead of calling `construct` again.
+
+        Only the entities of the new or modified cells are matched and
+        numbered, so the cost depends on the number of changed cells. The
+        untouched entities keep their indices. The indices released by the
+        removed entities are reused by the new ones, and if there are not
+        enough new entities, the last entities are moved into the remaining
+        holes.
+
+        Parameters:
+            cell (TensorLike): the new cells, shaped (NC, NVC).
+            old_cell (TensorLike): the index of the old cell that every new cell
+                is identical to (same vertices in the same order), or -1 for the
+                new and modified cells. The kept cells must be in the same
+                relative order as before.
+            node_map (TensorLike, optional): the new index of every old node,
+                or -1 for the removed nodes. Defaults to None (nodes are only
+                appended).
+
+        Returns:
+            Dict[str, TensorLike]: the old to new index maps of 'cell', 'face'
+                and 'edge', with -1 for the removed or modified entities,
+                `node_map` as 'node' if given, and the old faces and edges as
+                'old_face' and 'old_edge'. A kept face or edge may change its
+                vertex order, following its first cell as in `construct`.
+                See `LagrangeFESpace.transfer` for copying finite element
+                functions with these maps.
+
+        Note:
+            Every entity of the new and modified cells must be either an
+            entity of a removed or modified old cell, or a new entity. This
+            holds for the refinement and coarsening of conforming meshes.
+        """
+        if not self.is_homogeneous():
+            raise RuntimeError('Can not update the topology of a non-homogeneous mesh.')
+        if self.TD < 2:
+            raise NotImplementedError('update_topology only supports meshes of dimension 2 and 3.')
+
+        kwargs = bm.context(self.cell2face)
+        cell = bm.astype(cell, self.itype)
+        old_cell = bm.astype(old_cell, self.itype)
+        NC_old = self.number_of_cells()
+        NC = cell.shape[0]
+        kept, = bm.nonzero(old_cell >= 0)
+        changed, = bm.nonzero(old_cell < 0)
+        old2new_cell = bm.full((NC_old, ), -1, **kwargs)
+        old2new_cell = bm.set_at(old2new_cell, old_cell[kept], bm.astype(kept, self.itype))
+        dead, = bm.nonzero(old2new_cell < 0)
+        args = (cell, old_cell, kept, changed, dead, old2new_cell, node_map)
+
+        face, cell2face, face2cell, face_map = self._patch_entity(
+            self.face, self.cell2face, self.face2cell, self.localFace, *args)
+        maps = {'cell': old2new_cell, 'face': face_map, 'old_face': self.face}
+        if node_map is not None:
+            maps['node'] = node_map
+
+        if self.TD == 3:
+            edge, cell2edge, _, edge_map = self._patch_entity(
+                self.edge, self.cell2edge, None, self.localEdge, *args)
+            maps['edge'] = edge_map
+            maps['old_edge'] = self.edge
+
+        self.cell = cell
+        self.face = face
+        self.cell2face = cell2face
+        self.face2cell = face2cell
+
+        if self.TD == 3:
+            self.edge = edge
+            self.cell2edge = cell2edge
+        else:
+            self.edge2cell = self.face2cell
+            self.cell2edge = self.cell2face
+            maps['edge'] = face_map
+            maps['old_edge'] = maps['old_face']
+
+        self.logger.info(
+            f"Mesh topology relation updated, with {NC} cells ({changed.shape[0]} "
+            f"changed), {face.shape[0]} faces."
+        )
+        return maps
+
+    def _patch_entity(self, entity, cell2entity, entity2cell, local,
+                      cell, old_cell, kept, changed, dead, old2new_cell, node_map):
+        """Update one kind of entities (faces or edges) for `update_topology`."""
+        kwargs = bm.context(cell2entity)
+        NE = entity.shape[0]
+        NLE, NVE = local.shape
+        if node_map is not None:
+            entity = node_map[entity]
+
+        # Candidates: the old entities of the removed or modified cells.
+        # The entities with removed nodes are removed without matching.
+        removable = bm.unique(cell2entity[dead].reshape(-1))
+        cand = removable
+        if node_map is not None:
+            cand = cand[bm.all(entity[cand] >= 0, axis=-1)]
+        NCand = cand.shape[0]
+
+        # Match the entities of the changed cells with the candidates. The
+        # candidates come first, so a group whose first occurrence is less
+        # than NCand is an old entity.
+        total = cell[changed][:, local].reshape(-1, NVE)
+        array = bm.sort(bm.concat([entity[cand], total], axis=0), axis=1)
+        i0, _, j = flocc(array)
+        j = j[NCand:]
+        first = i0[j]
+        is_old = first < NCand
+        new_group = bm.unique(j[~is_old])
+        NNew = new_group.shape[0]
+        group_map = bm.full((i0.shape[0], ), -1, **kwargs)
+        group_map = bm.set_at(group_map, new_group, bm.arange(NNew, **kwargs))
+
+        # Only the entities of the removed cells can be removed: a candidate is
+        # kept if a kept cell still uses it, or if a changed cell matches it.
+        if entity2cell is not None:
+            used = bm.any(old2new_cell[entity2cell[cand, :2]] >= 0, axis=1)
+        else:
+            used = bm.zeros((NE, ), dtype=bm.bool, device=bm.get_device(cell2entity))
+            used = bm.set_at(used, cell2entity[old_cell[kept]].reshape(-1), True)[cand]
+        if NCand > 0:
+            matched = cand[bm.where(is_old, first, 0)]
+        else:
+            matched = bm.zeros_like(first)
+        alive = bm.ones((NE, ), dtype=bm.bool, device=bm.get_device(cell2entity))
+        alive = bm.set_at(alive, removable, False)
+        alive = bm.set_at(alive, cand, used)
+        alive = bm.set_at(alive, matched[is_old], True)
+
+        # Reuse the holes of the removed entities, then append or compact.
+        # Without compaction the alive entities keep their rows, so the old
+        # arrays are copied as a whole and only the changed rows are written.
+        holes = removable[~alive[removable]]
+        NH = holes.shape[0]
+        old2new = bm.set_at(bm.arange(NE, **kwargs), holes, -1)
+        if NNew >= NH:
+            NE_new = NE + NNew - NH
+            new_index = bm.concat([holes, bm.arange(NE, NE_new, **kwargs)], axis=0)
+            movers = None
+            new_entity = bm.concat([entity, bm.zeros((NE_new - NE, NVE), **kwargs)], axis=0)
+        else:
+            NE_new = NE - NH + NNew
+            new_index = holes[:NNew]
+            rest = holes[NNew:]
+            movers, = bm.nonzero(alive[NE_new:])
+            movers = bm.astype(movers, self.itype) + NE_new
+            old2new = bm.set_at(old2new, movers, rest[rest < NE_new])
+            new_entity = bm.copy(entity[:NE_new])
+            new_entity = bm.set_at(new_entity, old2new[movers], entity[movers])
+        new_entity = bm.set_at(new_entity, new_index, total[i0[new_group] - NCand])
+
+        new_cell2entity = cell2entity[bm.where(old_cell >= 0, old_cell, 0)]
+        if movers is not None:
+            new_cell2entity = old2new[new_cell2entity]
+        eid = old2new[matched]
+        if NNew > 0:
+            eid = bm.where(is_old, eid, new_index[bm.where(is_old, 0, group_map[j])])
+        new_cell2entity = bm.set_at(new_cell2entity, changed, eid.reshape(-1, NLE))
+
+        if entity2cell is None:
+            return new_entity, new_cell2entity, None, old2new
+
+        if movers is None:
+            new_entity2cell = bm.concat([entity2cell, bm.zeros((NE_new - NE, 4), **kwargs)], axis=0)
+        else:
+            new_entity2cell = bm.copy(entity2cell[:NE_new])
+            new_entity2cell = bm.set_at(new_entity2cell, old2new[movers], entity2cell[movers])
+        if not bm.all(old_cell[kept] == kept):
+            # The kept cells are renumbered.
+            new_entity2cell = bm.concat([old2new_cell[new_entity2cell[:, :2]],
+                                         new_entity2cell[:, 2:]], axis=1)
+
+        # Recompute the entities touched by the changed cells from all their
+        # incidences: those of the changed cells, and the kept sides of the
+        # alive candidates.
+        inc_entity = [eid]
+        inc_cell = [bm.repeat(bm.astype(changed, self.itype), NLE)]
+        inc_local = [bm.tile(bm.arange(NLE, **kwargs), (changed.shape[0], ))]
+        old_touched = cand[alive[cand]]
+        for s in range(2):
+            c = old2new_cell[entity2cell[old_touched, s]]
+            flag = c >= 0
+            inc_entity.append(old2new[old_touched[flag]])
+            inc_cell.append(c[flag])
+            inc_local.append(entity2cell[old_touched[flag], s+2])
+        inc_entity, inc_cell, inc_local = (bm.concat(a, axis=0) for a in (inc_entity, inc_cell, inc_local))
+
+        order = bm.lexsort((inc_cell*NLE + inc_local, inc_entity))
+        inc_entity, inc_cell, inc_local = inc_entity[order], inc_cell[order], inc_local[order]
+        TRUE = bm.ones((1, ), dtype=bm.bool, device=bm.get_device(inc_entity))
+        flag = bm.concat([TRUE, inc_entity[1:] != inc_entity[:-1], TRUE], axis=0)
+        head, tail = flag[:-1], flag[1:]
+        touched = inc_entity[head]
+        new_entity2cell = bm.set_at(new_entity2cell, touched, bm.stack([
+            inc_cell[head], inc_cell[tail], inc_local[head], inc_local[tail]
+        ], axis=-1))
+        # The entity follows the local orientation of its first cell, as in `construct`.
+        new_entity = bm.set_at(new_entity, touched, cell[inc_cell[head][:, None], local[inc_local[head]]])
+
+        return new_entity, new_cell2entity, new_entity2cell, old2new
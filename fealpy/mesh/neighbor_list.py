@@ -0,0 +1,285 @@
+from typing import Optional, Sequence, Tuple, Union
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+
+
+def _periodic_flags(periodic, GD: int) -> Tuple[bool, ...]:
+    if isinstance(periodic, bool):
+        return (periodic,) * GD
+    periodic = tuple(bool(p) for p in periodic)
+    if len(periodic) < GD:
+        raise ValueError(f"periodic should have at least {GD} entries, but got {len(periodic)}.")
+    # NOTE: `query_point` takes three flags whatever the dimension.
+    return periodic[:GD]
+
+
+def csr_to_pairs(crow: TensorLike, col: TensorLike) -> Tuple[TensorLike, TensorLike]:
+    """Expand CSR neighbor arrays to the (node_self, neighbors) pairs of `bm.query_point`."""
+    M = crow.shape[0] - 1
+    rows = bm.arange(M, dtype=col.dtype, device=bm.get_device(col))
+    return bm.repeat(rows, crow[1:] - crow[:-1]), col
+
+
+def _squared_distance(a, b, periods):
+    """Minimum image squared distances of pairs given axis by axis; the arrays a are overwritten."""
+    r2 = None
+    for t, bd, L in zip(a, b, periods):
+        bm.subtract(t, bd, out=t)
+        if L is not None:
+            q = bm.round(t / L)
+            bm.multiply(q, L, out=q)
+            bm.subtract(t, q, out=t)
+        bm.multiply(t, t, out=t)
+        if r2 is None:
+            r2 = t
+        else:
+            bm.add(r2, t, out=r2)
+    return r2
+
+
+class CellList():
+    """Cell-linked list of particles for fixed-radius neighbor search.
+
+    The box is split into cells not smaller than the cutoff radius, and the
+    particles are sorted by cell, so that the particles of a cell are a
+    contiguous range of `order`. The neighbors of a point are searched among
+    the particles of the 3**GD cells around it only, which costs O(N) instead of
+    the O(N log N) of a tree and uses the backend functions only (numpy,
+    pytorch), so that the search stays on the device of the positions.
+
+    Along a periodic axis the positions are wrapped into [0, box_size) and the
+    distances follow the minimum image convention. Along the other axes the
+    cells cover the bounding box of the particles, so the box size is not used
+    and particles may lie outside of it (e.g. wall particles).
+
+    Parameters:
+        cutoff (float): the search radius.
+        box_size (TensorLike, optional): the side lengths of the box, required
+            if some axis is periodic.
+        periodic (bool | Sequence[bool], optional): periodicity of every axis.
+            Defaults to False.
+        chunk (int, optional): the maximum number of candidate pairs tested at
+            once by `query`. Defaults to 2**22.
+    """
+    def __init__(self, cutoff: float, box_size: Optional[TensorLike]=None,
+                 periodic: Union[bool, Sequence[bool]]=False, chunk: int=2**22):
+        self.cutoff = float(cutoff)
+        self.box_size = box_size
+        self.periodic = periodic
+        self.chunk = chunk
+
+    def build(self, x: TensorLike) -> "CellList":
+        """Sort the particles x, shaped (N, GD), into the cells."""
+        N, GD = x.shape
+        kwargs = bm.context(x)
+        self.GD = GD
+        self.flags = _periodic_flags(self.periodic, GD)
+
+        if any(self.flags):
+            if self.box_size is None:
+                raise ValueError("box_size is required for periodic axes.")
+            box = bm.tensor(bm.to_numpy(self.box_size), **kwargs)[:GD]
+        lower, upper = [], []
+        xmin, xmax = bm.min(x, axis=0), bm.max(x, axis=0)
+        for i in range(GD):
+            if self.flags[i]:
+                lower.append(0.0)
+                upper.append(float(box[i]))
+            else:
+                lower.append(float(xmin[i]))
+                upper.append(max(float(xmax[i]), lower[-1] + self.cutoff))
+
+        self.shape = tuple(max(int((u - l) // self.cutoff), 1) for l, u in zip(lower, upper))
+        self.lower = bm.tensor(lower, **kwargs)
+        self.length = bm.tensor([u - l for l, u in zip(lower, upper)], **kwargs)
+        self.size = self.length / bm.tensor(self.shape, **kwargs)
+
+        strides = [1] * GD
+        for i in range(GD - 2, -1, -1):
+            strides[i] = strides[i+1] * self.shape[i+1]
+        device = bm.get_device(x)
+        self.strides = bm.tensor(strides, dtype=bm.int64, device=device)
+        NC = strides[0] * self.shape[0]
+
+        # The cells around a cell. Along a periodic axis with less than three
+        # cells, every cell is a neighbor and is listed once.
+        axes = []
+        for i, n in enumerate(self.shape):
+            axes.append(list(range(n)) if self.flags[i] and n < 3 else [-1, 0, 1])
+        offsets = bm.stack(bm.meshgrid(*[bm.tensor(a, dtype=bm.int64, device=device)
+                                         for a in axes], indexing='ij'), axis=-1)
+        self.offsets = bm.reshape(offsets, (-1, GD))
+
+        self.x = self.wrap(x)
+        cell = self.cell_index(self.x)
+        self.order = bm.argsort(cell, stable=True)
+        self.counts = bm.bincount(cell, minlength=NC)
+        self.start = bm.cumsum(self.counts, axis=0) - self.counts
+        # The coordinates of the sorted particles, one contiguous array per
+        # axis: the candidates of a cell are read as a contiguous range.
+        xs = self.x[self.order]
+        self._xs = [bm.copy(xs[:, i]) for i in range(GD)]
+        self._periods = [float(self.length[i]) if self.flags[i] else None for i in range(GD)]
+        return self
+
+    def wrap(self, x: TensorLike) -> TensorLike:
+        """Wrap the coordinates along the periodic axes into the box."""
+        if not any(self.flags):
+            return x
+        L = bm.where(bm.tensor(self.flags, device=bm.get_device(x)), self.length, 0.0)
+        shift = bm.where(L > 0, L * bm.floor(x / bm.where(L > 0, L, 1.0)), 0.0)
+        return x - shift
+
+    def cell_coordinates(self, x: TensorLike) -> TensorLike:
+        """The integer cell coordinates of wrapped points, clipped to the grid."""
+        c = bm.astype(bm.floor((x - self.lower) / self.size), bm.int64)
+        upper = bm.tensor(self.shape, dtype=bm.int64, device=bm.get_device(x)) - 1
+        return bm.clip(c, bm.zeros_like(upper), upper)
+
+    def cell_index(self, x: TensorLike) -> TensorLike:
+        """The linear cell index of wrapped points."""
+        return bm.sum(self.cell_coordinates(x) * self.strides, axis=-1)
+
+    def displacement(self, dx: TensorLike) -> TensorLike:
+        """Apply the minimum image convention to the differences dx."""
+        if not any(self.flags):
+            return dx
+        L = bm.where(bm.tensor(self.flags, device=bm.get_device(dx)), self.length, 0.0)
+        return dx - L * bm.round(dx / bm.where(L > 0, L, 1.0))
+
+    def query(self, y: Optional[TensorLike]=None, cutoff: Optional[float]=None,
+              include_self: bool=True) -> Tuple[TensorLike, TensorLike]:
+        """
+        Find the particles within the cutoff of every query point.
+
+        Parameters:
+            y (TensorLike, optional): the query points, shaped (M, GD).
+                Defaults to the particles themselves.
+            cutoff (float, optional): a radius not larger than the one of the
+                cells. Defaults to the cell list cutoff.
+            include_self (bool, optional): keep the pairs (i, i). Defaults to True.
+
+        Returns:
+            Tuple[TensorLike, TensorLike]: the CSR arrays `crow`, shaped (M+1, ),
+                and `col`: the neighbors of the query point i are
+                col[crow[i]:crow[i+1]], the indices of the particles.
+        """
+        cutoff = self.cutoff if cutoff is None else float(cutoff)
+        if cutoff > self.cutoff:
+            raise ValueError(f"The cutoff {cutoff} is larger than the cell size {self.cutoff}.")
+        y = self.x if y is None else self.wrap(y)
+        M = y.shape[0]
+        device = bm.get_device(y)
+        K = self.offsets.shape[0]
+        shape = bm.tensor(self.shape, dtype=bm.int64, device=device)
+        flags = bm.tensor(self.flags, device=device)
+
+        # The number of query points per chunk from the average cell occupancy.
+        occupancy = self.x.shape[0] / max(self.counts.shape[0], 1)
+        step = max(int(self.chunk / (K * occupancy + 1)), 1)
+
+        rows, cols = [], []
+        for s in range(0, M, step):
+            e = min(s + step, M)
+            cq = self.cell_coordinates(y[s:e])
+            nc = cq[:, None, :] + self.offsets[None, :, :]                # (m, K, GD)
+            valid = bm.all(flags | ((nc >= 0) & (nc < shape)), axis=-1)
+            nc = nc % shape
+            cell = bm.reshape(bm.sum(nc * self.strides, axis=-1), (-1,))
+            num = bm.where(bm.reshape(valid, (-1,)), self.counts[cell], 0)
+
+            # Expand the (query, cell) pairs to (query, candidate) pairs, the
+            # candidates being positions in the sorted particles.
+            T = int(bm.sum(num))
+            pair = bm.repeat(bm.arange(num.shape[0], dtype=bm.int64, device=device), num)
+            base = self.start[cell] - (bm.cumsum(num, axis=0) - num)
+            pos = bm.arange(T, dtype=bm.int64, device=device) + base[pair]
+            qnum = bm.sum(bm.reshape(num, (-1, K)), axis=-1)
+
+            r2 = _squared_distance([bm.repeat(y[s:e, d], qnum) for d in range(self.GD)],
+                                   [xd[pos] for xd in self._xs], self._periods)
+            keep = r2 <= cutoff * cutoff
+            i = bm.repeat(bm.arange(s, e, dtype=bm.int64, device=device), qnum)[keep]
+            j = self.order[pos[keep]]
+            if not include_self:
+                other = i != j
+                i, j = i[other], j[other]
+            rows.append(i)
+            cols.append(j)
+
+        rows = bm.concat(rows, axis=0) if rows else bm.zeros((0,), dtype=bm.int64, device=device)
+        col = bm.concat(cols, axis=0) if cols else bm.zeros((0,), dtype=bm.int64, device=device)
+        zero = bm.zeros((1,), dtype=bm.int64, device=device)
+        crow = bm.concat([zero, bm.cumsum(bm.bincount(rows, minlength=M), axis=0)], axis=0)
+        return crow, col
+
+
+class NeighborList():
+    """Verlet neighbor list of moving particles on top of `CellList`.
+
+    The list is built with the radius cutoff + skin. As long as no particle
+    has moved by more than skin/2 since the last build, every pair closer than
+    the cutoff is still in the list, so `update` only filters the listed pairs
+    by their current distance and the cells are not rebuilt.
+
+    Parameters:
+        cutoff (float): the search radius.
+        skin (float, optional): the extra radius of the list. Defaults to 0,
+            which rebuilds the list at every update.
+        box_size (TensorLike, optional): the side lengths of the box, required
+            if some axis is periodic.
+        periodic (bool | Sequence[bool], optional): periodicity of every axis.
+            Defaults to False.
+        include_self (bool, optional): keep the pairs (i, i). Defaults to True.
+
+    Attributes:
+        num_builds (int): the number of times the cell list has been built.
+    """
+    def __init__(self, cutoff: float, skin: float=0.0,
+                 box_size: Optional[TensorLike]=None,
+                 periodic: Union[bool, Sequence[bool]]=False,
+                 include_self: bool=True):
+        self.cutoff = float(cutoff)
+        self.skin = float(skin)
+        self.include_self = include_self
+        self.cells = CellList(self.cutoff + self.skin, box_size=box_size, periodic=periodic)
+        self.num_builds = 0
+        self._x0 = None
+
+    def needs_build(self, x: TensorLike) -> bool:
+        """Whether a particle has moved by more than skin/2 since the last build."""
+        if self._x0 is None or x.shape != self._x0.shape or self.skin == 0.0:
+            return True
+        dx = self.cells.displacement(self.cells.wrap(x) - self._x0)
+        return float(bm.max(bm.sum(dx * dx, axis=-1))) > (0.5 * self.skin) ** 2
+
+    def build(self, x: TensorLike) -> None:
+        """Build the cells and the list of the pairs within cutoff + skin."""
+        self.cells.build(x)
+        self._x0 = self.cells.x
+        self._crow, self._col = self.cells.query(include_self=self.include_self)
+        self._row = csr_to_pairs(self._crow, self._col)[0]
+        self.num_builds += 1
+
+    def update(self, x: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """
+        Return the neighbors of the particles at the positions x.
+
+        Returns:
+            Tuple[TensorLike, TensorLike]: the CSR arrays `crow` and `col`, see
+                `CellList.query`.
+        """
+        if self.needs_build(x):
+            self.build(x)
+            if self.skin == 0.0:
+                return self._crow, self._col
+        x = [bm.copy(x[:, d]) for d in range(x.shape[1])]
+        r2 = _squared_distance([xd[self._row] for xd in x], [xd[self._col] for xd in x],
+                               self.cells._periods)
+        keep = r2 <= self.cutoff * self.cutoff
+        row, col = self._row[keep], self._col[keep]
+        M = x[0].shape[0]
+        zero = bm.zeros((1,), dtype=row.dtype, device=bm.get_device(row))
+        crow = bm.concat([zero, bm.cumsum(bm.bincount(row, minlength=M), axis=0)], axis=0)
+        return crow, col
@@ -0,0 +1,386 @@
+from typing import Tuple
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+
+
+class PointLocator():
+    """Batched point location on homogeneous meshes with a uniform grid of
+    buckets.
+
+    Every cell is registered in the buckets overlapped by its bounding box,
+    enlarged by a skin. A query point is only tested against the cells of
+    its bucket. The skin lets the nodes move a little without rebuilding the
+    buckets, see `update`.
+
+    Supported meshes are simplex meshes (interval, triangle, tetrahedron) and
+    tensor meshes (quadrangle, hexahedron) whose geometric dimension equals
+    the topological dimension.
+
+    Parameters:
+        mesh (HomogeneousMesh): the mesh.
+        factor (float, optional): the bucket size relative to the average size
+            of the cell bounding boxes. Defaults to 0.5.
+        skin (float, optional): enlargement of the cell boxes relative to the
+            bucket size. Defaults to 0.1.
+        tol (float, optional): tolerance of the local coordinates when testing
+            if a point is inside a cell. Defaults to 1e-10.
+        chunk (int, optional): number of points processed at once by `locate`.
+            Defaults to 2**18.
+    """
+    def __init__(self, mesh, factor: float=0.5, skin: float=0.1,
+                 tol: float=1e-10, chunk: int=2**18):
+        TD = mesh.top_dimension()
+        GD = mesh.geo_dimension()
+        if TD != GD:
+            raise ValueError("PointLocator requires the geometric dimension equal "
+                             f"to the topological dimension, but got TD={TD}, GD={GD}.")
+        NVC = mesh.number_of_vertices_of_cells()
+        if NVC == TD + 1:
+            self.ctype = 'simplex'
+        elif NVC == 2**TD:
+            self.ctype = 'tensor'
+        else:
+            raise NotImplementedError(f"PointLocator does not support {type(mesh).__name__}.")
+
+        self.mesh = mesh
+        self.TD = TD
+        self.factor = factor
+        self.skin = skin
+        self.tol = tol
+        self.chunk = chunk
+        self.build()
+
+    def build(self):
+        """Build the buckets from the current nodes and cells."""
+        mesh = self.mesh
+        self._cell = mesh.entity('cell')
+        self._version = mesh.version
+        self._update_geometry()
+        kwargs = bm.context(self._cell)
+        NC = self._cell.shape[0]
+        GD = self.TD
+
+        lo, hi = self._lower, self._upper
+        pmin, pmax = bm.min(lo, axis=0), bm.max(hi, axis=0)
+        # The bucket size is proportional to the average size of the cell
+        # boxes, so that a cell only overlaps a few buckets.
+        h = self.factor * float(bm.mean(bm.max(hi - lo, axis=-1)))
+        h = max(h, float(bm.max(pmax - pmin))/2**20, 1e-300)
+        pad = self.skin * h
+        lo, hi = lo - pad, hi + pad
+        pmin, pmax = pmin - pad, pmax + pad
+        shape = bm.astype(bm.ceil((pmax - pmin)/h), kwargs['dtype'])
+        shape = bm.clip(shape, 1, None)
+
+        self.h = h
+        self.origin = pmin
+        self.shape = shape
+        self._box = (lo, hi)
+
+        # The range of buckets overlapped by every cell.
+        blo = self._bucket_index(lo)
+        bhi = self._bucket_index(hi)
+        width = bhi - blo + 1
+        count = bm.prod(width, axis=1)
+        NR = int(bm.sum(count))
+        cell = bm.repeat(bm.arange(NC, **kwargs), count)
+        start = bm.cumsum(count, axis=0) - count
+        local = bm.arange(NR, **kwargs) - start[cell]
+        stride = self._stride(shape)
+        bucket = bm.zeros((NR, ), **kwargs)
+        for d in range(GD-1, -1, -1):
+            w = width[cell, d]
+            bucket = bucket + (blo[cell, d] + local % w) * stride[d]
+            local = local // w
+
+        NB = int(bm.prod(shape))
+        order = bm.argsort(bucket)
+        self.bucket2cell = cell[order]
+        self.bucket_ptr = bm.concat([
+            bm.zeros((1, ), **kwargs),
+            bm.cumsum(bm.bincount(bucket, minlength=NB), axis=0)
+        ], axis=0)
+        self.bucket_ptr = bm.astype(self.bucket_ptr, kwargs['dtype'])
+        self._update_slots()
+
+    def update(self) -> bool:
+        """Update the locator after the nodes have moved.
+
+        The cell geometry is always recomputed. The buckets are rebuilt only
+        if the cells have been changed, or if a cell has moved out of its
+        enlarged box.
+
+        Returns:
+            bool: True if the buckets have been rebuilt.
+        """
+        mesh = self.mesh
+        cell = mesh.entity('cell')
+        if cell is not self._cell:
+            self.build()
+            return True
+        self._version = mesh.version
+        self._update_geometry()
+        lo, hi = self._box
+        if bm.all(self._lower >= lo) and bm.all(self._upper <= hi):
+            self._update_slots()
+            return False
+        self.build()
+        return True
+
+    def locate(self, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """Find the cells containing the points.
+
+        Parameters:
+            points (TensorLike): the points, shaped (NP, GD).
+
+        Returns:
+            cidx (TensorLike): the index of the cell containing every point,
+                shaped (NP, ). -1 for the points outside the mesh.
+            bc (TensorLike): the local coordinates of the points in their cells.
+                Barycentric coordinates shaped (NP, TD+1) on simplex meshes, and
+                the 1d barycentric coordinates of every direction shaped
+                (NP, TD, 2) on tensor meshes, in the same convention as the
+                tuple of `bc_to_point`. Zero for the points outside the mesh.
+        """
+        if self.mesh.version != self._version:
+            self.update()
+        points = points.reshape(-1, self.TD)
+        NP = points.shape[0]
+        parts = [self._locate(points[s:s+self.chunk]) for s in range(0, NP, self.chunk)]
+        if len(parts) == 1:
+            return parts[0]
+        cidx = bm.concat([p[0] for p in parts], axis=0)
+        bc = bm.concat([p[1] for p in parts], axis=0)
+        return cidx, bc
+
+    def candidates(self, lower: TensorLike, upper: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """Find the cells that may intersect the boxes.
+
+        Parameters:
+            lower (TensorLike): the lower corners of the boxes, shaped (NB, GD).
+            upper (TensorLike): the upper corners of the boxes, shaped (NB, GD).
+
+        Returns:
+            bidx (TensorLike): the index of the box of every pair.
+            cidx (TensorLike): the candidate cell of every pair, whose bounding
+                box meets the box. A cell may appear more than once for the same
+                box. Every cell intersecting a box is found, the exact test is
+                left to the caller.
+        """
+        if self.mesh.version != self._version:
+            self.update()
+        kwargs = bm.context(self._cell)
+        TD = self.TD
+        blo = self._bucket_index(lower)
+        bhi = self._bucket_index(upper)
+        width = bhi - blo + 1
+        nb = bm.prod(width, axis=1)
+        nbox = bm.repeat(bm.arange(lower.shape[0], **kwargs), nb)
+        start = bm.cumsum(nb, axis=0) - nb
+        local = bm.arange(nbox.shape[0], **kwargs) - start[nbox]
+        stride = self._stride(self.shape)
+        bid = bm.zeros(nbox.shape, **kwargs)
+        for d in range(TD-1, -1, -1):
+            w = width[nbox, d]
+            bid = bid + (blo[nbox, d] + local % w) * stride[d]
+            local = local // w
+
+        # Expand the (box, cell) pairs of the overlapped buckets.
+        count = self.bucket_ptr[bid + 1] - self.bucket_ptr[bid]
+        NR = int(bm.sum(count))
+        ridx = bm.repeat(bm.arange(bid.shape[0], **kwargs), count)
+        offset = self.bucket_ptr[bid] - (bm.cumsum(count, axis=0) - count)
+        slot = bm.arange(NR, **kwargs) + offset[ridx]
+        bidx = nbox[ridx]
+
+        # Drop the cells whose bounding box does not meet the box.
+        flag = None
+        for d in range(TD):
+            f = (lower[bidx, d] <= self._slot_upper[d][slot]) & (upper[bidx, d] >= self._slot_lower[d][slot])
+            flag = f if flag is None else flag & f
+        keep, = bm.nonzero(flag)
+        return bidx[keep], self.bucket2cell[slot[keep]]
+
+    def bc_to_point(self, cidx: TensorLike, bc: TensorLike) -> TensorLike:
+        """Map the local coordinates returned by `locate` back to the points."""
+        return self._map(self._cell[cidx], self._bc_weight(bc))
+
+    ### internal
+
+    @staticmethod
+    def _stride(shape):
+        GD = shape.shape[0]
+        stride = [1]*GD
+        for d in range(GD-2, -1, -1):
+            stride[d] = stride[d+1] * int(shape[d+1])
+        return stride
+
+    def _bucket_index(self, points: TensorLike):
+        index = bm.floor((points - self.origin) / self.h)
+        index = bm.astype(index, self._cell.dtype)
+        index = bm.where(index < 0, 0, index)
+        return bm.where(index < self.shape, index, self.shape - 1)
+
+    def _update_geometry(self):
+        node = self.mesh.entity('node')
+        vertex = node[self._cell]
+        self._lower = bm.min(vertex, axis=1)
+        self._upper = bm.max(vertex, axis=1)
+        if self.ctype == 'simplex':
+            # The inverse of the affine map from the reference simplex.
+            v0 = vertex[:, 0, :]
+            J = bm.swapaxes(vertex[:, 1:, :] - v0[:, None, :], -1, -2)
+            self._v0 = v0
+            self._Jinv = bm.linalg.inv(J)
+        else:
+            # The coefficients of the monomials of the multilinear map.
+            # The vertices are reordered so that bit `TD-1-d` of the local
+            # index is the side in direction d, as in `bc_to_point`.
+            perm = [0, 3, 1, 2] if self.TD == 2 else [0, 4, 3, 7, 1, 5, 2, 6]
+            coef = [vertex[:, i, :] for i in perm]
+            for d in range(self.TD):
+                bit = 1 << (self.TD - 1 - d)
+                for k in range(len(coef)):
+                    if k & bit:
+                        coef[k] = coef[k] - coef[k ^ bit]
+            self._coef = bm.stack(coef, axis=1)
+
+    def _update_slots(self):
+        # The tight boxes of the cells in the bucket order, one contiguous
+        # array per direction, for the box test of the candidates.
+        cell = self.bucket2cell
+        self._slot_lower = [self._lower[cell, d] for d in range(self.TD)]
+        self._slot_upper = [self._upper[cell, d] for d in range(self.TD)]
+
+    def _locate(self, points: TensorLike):
+        kwargs = bm.context(self._cell)
+        NP = points.shape[0]
+        TD = self.TD
+        inside = bm.all(points >= self.origin, axis=-1)
+        inside = inside & bm.all(points <= self.origin + self.shape*self.h, axis=-1)
+        bucket = self._bucket_index(points)
+        stride = self._stride(self.shape)
+        bid = sum(bucket[:, d] * stride[d] for d in range(TD))
+        count = self.bucket_ptr[bid + 1] - self.bucket_ptr[bid]
+        count = bm.where(inside, count, 0)
+
+        # Expand the (point, candidate cell) pairs, grouped by point.
+        NR = int(bm.sum(count))
+        pidx = bm.repeat(bm.arange(NP, **kwargs), count)
+        offset = self.bucket_ptr[bid] - (bm.cumsum(count, axis=0) - count)
+        slot = bm.arange(NR, **kwargs) + offset[pidx]
+
+        # Drop the candidates whose bounding box does not contain the point.
+        eps = self.tol * self.h
+        flag = None
+        for d in range(TD):
+            x = points[:, d][pidx]
+            f = (x >= self._slot_lower[d][slot] - eps) & (x <= self._slot_upper[d][slot] + eps)
+            flag = f if flag is None else flag & f
+        keep, = bm.nonzero(flag)
+        pidx, cand = pidx[keep], self.bucket2cell[slot[keep]]
+        bc, valid = self._local_coordinates(points[pidx], cand)
+
+        # Take the first candidate containing the point.
+        vidx, = bm.nonzero(valid)
+        p = pidx[vidx]
+        TRUE = bm.ones((1, ), dtype=bm.bool, device=bm.get_device(p))
+        first = bm.concat([TRUE, p[1:] != p[:-1]], axis=0)
+        vidx, p = vidx[first], p[first]
+
+        cidx = bm.full((NP, ), -1, **kwargs)
+        cidx = bm.set_at(cidx, p, cand[vidx])
+        out = bm.zeros((NP, ) + bc.shape[1:], dtype=points.dtype, device=bm.get_device(points))
+        out = bm.set_at(out, p, bc[vidx])
+        return cidx, out
+
+    def _local_coordinates(self, points: TensorLike, cell: TensorLike):
+        tol = self.tol
+        if self.ctype == 'simplex':
+            lam = bm.einsum('cij, cj -> ci', self._Jinv[cell], points - self._v0[cell])
+            bc = bm.concat([1 - bm.sum(lam, axis=-1, keepdims=True), lam], axis=-1)
+            return bc, bm.all(bc >= -tol, axis=-1)
+
+        # Newton iterations for the inverse of the multilinear map.
+        # Only the pairs not converged yet are iterated, and the pairs going
+        # far outside the reference cell are given up.
+        coef = self._coef[cell]
+        xi = bm.full(points.shape, 0.5, dtype=points.dtype, device=bm.get_device(points))
+        active = bm.arange(xi.shape[0], **bm.context(cell))
+        for it in range(20):
+            c, x = coef[active], xi[active]
+            F, J = self._multilinear(c, x)
+            dx = self._solve(J, F - points[active])
+            x = x - dx
+            xi = bm.set_at(xi, active, x)
+            # The convergence is quadratic, so one more step after a step of
+            # 1e-8 reaches the machine precision.
+            flag = bm.max(bm.abs(dx), axis=-1) > 1e-8
+            margin = 1.0 if it < 2 else 0.75
+            flag = flag & bm.all(bm.abs(x - 0.5) < margin, axis=-1)
+            active = active[flag]
+            if active.shape[0] == 0:
+                break
+        bc = bm.stack([1 - xi, xi], axis=-1)
+        # Newton may not converge for the cells far from the point, so check
+        # the residual as well.
+        r = self._multilinear(coef, xi, jacobian=False) - points
+        valid = bm.all((xi >= -tol) & (xi <= 1 + tol), axis=-1)
+        valid = valid & (bm.max(bm.abs(r), axis=-1) <= 1e-8 * self.h)
+        return bc, valid
+
+    def _multilinear(self, coef: TensorLike, xi: TensorLike, jacobian: bool=True):
+        """The value (N, GD) and the Jacobian (N, GD, TD) of the multilinear
+        map at xi, from the monomial coefficients `coef` (N, 2**TD, GD)."""
+        C = [coef[:, k, :] for k in range(coef.shape[1])]
+        if self.TD == 2:
+            a, b = xi[:, 0:1], xi[:, 1:2]
+            da = C[2] + b*C[3]
+            F = C[0] + b*C[1] + a*da
+            if not jacobian:
+                return F
+            return F, bm.stack([da, C[1] + a*C[3]], axis=-1)
+
+        a, b, c = xi[:, 0:1], xi[:, 1:2], xi[:, 2:3]
+        da = C[4] + c*C[5] + b*(C[6] + c*C[7])
+        F = C[0] + c*C[1] + b*(C[2] + c*C[3]) + a*da
+        if not jacobian:
+            return F
+        db = C[2] + c*C[3] + a*(C[6] + c*C[7])
+        dc = C[1] + b*C[3] + a*(C[5] + b*C[7])
+        return F, bm.stack([da, db, dc], axis=-1)
+
+    @staticmethod
+    def _solve(J: TensorLike, r: TensorLike):
+        """Solve the batched 2x2 or 3x3 systems J x = r by Cramer's rule."""
+        if J.shape[-1] == 2:
+            det = J[:, 0, 0]*J[:, 1, 1] - J[:, 0, 1]*J[:, 1, 0]
+            x0 = J[:, 1, 1]*r[:, 0] - J[:, 0, 1]*r[:, 1]
+            x1 = J[:, 0, 0]*r[:, 1] - J[:, 1, 0]*r[:, 0]
+            return bm.stack([x0, x1], axis=-1) / det[:, None]
+        c0 = bm.cross(J[:, :, 1], J[:, :, 2], axis=-1)
+        c1 = bm.cross(J[:, :, 2], J[:, :, 0], axis=-1)
+        c2 = bm.cross(J[:, :, 0], J[:, :, 1], axis=-1)
+        det = bm.sum(J[:, :, 0] * c0, axis=-1)
+        x = bm.stack([bm.sum(c * r, axis=-1) for c in (c0, c1, c2)], axis=-1)
+        return x / det[:, None]
+
+    def _bc_weight(self, bc: TensorLike):
+        """The weights of the cell vertices from the local coordinates."""
+        if self.ctype == 'simplex':
+            return bc
+        if self.TD == 2:
+            w = bm.einsum('im, in -> imn', bc[:, 0], bc[:, 1]).reshape(-1, 4)
+            return w[:, [0, 2, 3, 1]]
+        w = bm.einsum('im, in, io -> imno', bc[:, 0], bc[:, 1], bc[:, 2]).reshape(-1, 8)
+        # The inverse of the permutation [0, 4, 3, 7, 1, 5, 2, 6] of `bc_to_point`.
+        return w[:, [0, 4, 6, 2, 1, 5, 7, 3]]
+
+    def _map(self, cell: TensorLike, weight: TensorLike):
+        node = self.mesh.entity('node')
+        return self._map_vertex(node[cell], weight)
+
+    @staticmethod
+    def _map_vertex(vertex: TensorLike, weight: TensorLike):
+        return bm.einsum('cv, cvd -> cd', weight, vertex)
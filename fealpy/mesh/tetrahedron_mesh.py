@@ -4,7 +4,7 @@ from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, _S
 from .mesh_base import SimplexMesh
 from .plot import Plotable
-from fealpy.sparse import coo_matrix,csr_matrix
+from fealpy.sparse import coo_matrix,csr_matrix, COOTensor
 
 class TetrahedronMesh(SimplexMesh, Plotable): 
     def __init__(self, node, cell):
@@ -431,7 +431,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             isInCellIPoint = ~(isFaceIPoint[0] | isFaceIPoint[1] | isFaceIPoint[2] | isFaceIPoint[3])
             cell2ipoint[:, isInCellIPoint] = base + bm.arange(NC*idof,**self.ikwargs).reshape(NC, idof)
 
-        return cell2ipoint
+        return cell2ipoint[index]
 
     def direction(self,i):
         """
@@ -739,8 +739,8 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         for i in range(n):
             self.bisect()
 
-    def bisect_options(self, HB=None, data=None, disp=None):
-        options = {'HB': HB, 'data': data, 'disp': disp}
+    def bisect_options(self, HB=None, data=None, disp=None, incremental=False):
+        options = {'HB': HB, 'data': data, 'disp': disp, 'incremental': incremental}
         return options
            
     def bisect(self, isMarkedCell=None, data=None, returnim=False, options={'disp': True}):
@@ -793,7 +793,26 @@ class TetrahedronMesh(SimplexMesh, Plotable):
 
         # 非协调边的标记数组
         nonConforming = bm.ones(8*NN, dtype=bm.bool, device=self.device)
-        IM = eye(NN)
+
+        # 被修改或新增的单元的标记数组, 用于增量更新拓扑
+        isModifiedCell = bm.zeros(4*NC, dtype=bm.bool, device=self.device)
+        # 边用排序后的端点编号 (i, j) 表示, 以键 i*base + j 查找
+        base = node.shape[0]
+
+        def find_edge(edge, query):
+            """查找 query 中每条边在 edge 中的位置, 不存在时为 -1"""
+            qkey = bm.astype(bm.min(query, axis=-1), bm.int64)*base + bm.max(query, axis=-1)
+            if edge.shape[0] == 0:
+                return bm.full(qkey.shape, -1, **self.ikwargs)
+            ekey = bm.astype(bm.min(edge, axis=-1), bm.int64)*base + bm.max(edge, axis=-1)
+            order = bm.argsort(ekey)
+            ekey = ekey[order]
+            pos = bm.clip(bm.searchsorted(ekey, qkey), 0, ekey.shape[0]-1)
+            return bm.where(ekey[pos] == qkey, bm.astype(order[pos], self.itype), -1)
+
+        if returnim is True:
+            IM = COOTensor(bm.stack([bm.arange(NN, **self.ikwargs)]*2, axis=0),
+                           bm.ones(NN, **self.fkwargs), (NN, NN)).tocsr()
         while len(markedCell) != 0:
             # 标记最长边
             self.label(node, cell, markedCell)
@@ -812,35 +831,20 @@ class TetrahedronMesh(SimplexMesh, Plotable):
                 idx = bm.arange(nMarked) # cells introduce new cut edges
             else:
                 # all non-conforming edges
-                ncEdge = bm.nonzero(nonConforming[:nCut])
-                NE = len(ncEdge)
-                I = cutEdge[ncEdge][:, [2, 2]].reshape(-1)
-                J = cutEdge[ncEdge][:, [0, 1]].reshape(-1)
-                val = bm.ones(len(I), dtype=bm.bool, device=self.device)
-                nv2v = csr_matrix(
-                        (val, (I, J)),
-                        shape=(NN, NN))
-                i, j =  (nv2v[:, p0].multiply(nv2v[:, p1])).nonzero()
-                p4 = bm.set_at(p4, bm.array(j,**self.ikwargs), bm.array(i,**self.ikwargs))
+                ncEdge, = bm.nonzero(nonConforming[:nCut])
+                k = find_edge(cutEdge[ncEdge, :2], bm.stack([p0, p1], axis=-1))
+                isFound = k >= 0
+                p4 = bm.where(isFound, cutEdge[ncEdge[bm.where(isFound, k, 0)], 2], p4)
                 idx, = bm.nonzero(p4 == 0)
 
             if len(idx) != 0:
                 # 把需要二分的边唯一化
-                NE = len(idx)
-                cellCutEdge = bm.stack([p0[idx], p1[idx]])
-                cellCutEdge = bm.sort(cellCutEdge,axis=0)
-                s = csr_matrix(
-                    (
-                        bm.ones(NE, dtype=bm.bool, device=self.device),
-                        (
-                            cellCutEdge[0, ...],
-                            cellCutEdge[1, ...]
-                        )
-                    ), shape=(NN, NN))
+                cellCutEdge = bm.stack([p0[idx], p1[idx]], axis=-1)
+                cellCutEdge = bm.sort(cellCutEdge, axis=-1)
                 # 获得唯一的边
-                i, j = s.nonzero()
-                i = bm.tensor(i,**self.ikwargs)
-                j = bm.tensor(j,**self.ikwargs)
+                newEdge = bm.unique(cellCutEdge, axis=0)
+                i = bm.astype(newEdge[:, 0], self.itype)
+                j = bm.astype(newEdge[:, 1], self.itype)
                 nNew = len(i)
                 newCutEdge = bm.arange(nCut, nCut+nNew)
                 cutEdge = bm.set_at(cutEdge, (newCutEdge,0), i)
@@ -849,28 +853,22 @@ class TetrahedronMesh(SimplexMesh, Plotable):
                 node = bm.set_at(node, slice(NN, NN+nNew), (node[i, :] + node[j, :])/2.0)
 
                 if returnim is True:
-                    val = bm.full(nNew, 0.5)
-                    I = coo_matrix(
-                            (val, (range(nNew), i)), shape=(nNew, NN),
-                            **self.fkwargs)
-                    I += coo_matrix(
-                            (val, (range(nNew), j)), shape=(nNew, NN),
-                            **self.fkwargs)
-                    I = bmat([[eye(NN)], [I]], format='csr')
+                    I = bm.concatenate([bm.arange(NN, **self.ikwargs),
+                                        bm.repeat(bm.arange(NN, NN+nNew, **self.ikwargs), 2)])
+                    J = bm.concatenate([bm.arange(NN, **self.ikwargs),
+                                        bm.stack([i, j], axis=-1).reshape(-1)])
+                    val = bm.concatenate([bm.ones(NN, **self.fkwargs),
+                                          bm.full((2*nNew,), 0.5, **self.fkwargs)])
+                    I = COOTensor(bm.stack([I, J], axis=0), val, (NN+nNew, NN)).tocsr()
                     IM = I@IM
 
                 nCut += nNew
                 NN += nNew
 
-                # 新点和旧点的邻接矩阵
-                I = cutEdge[newCutEdge][:, [2, 2]].reshape(-1)
-                J = cutEdge[newCutEdge][:, [0, 1]].reshape(-1)
-                val = bm.ones(len(I), dtype=bm.bool, device=self.device)
-                nv2v = csr_matrix(
-                        (val, (I, J)),
-                        shape=(NN, NN))
-                i, j =  (nv2v[:, p0].multiply(nv2v[:, p1])).nonzero()
-                p4 = bm.set_at(p4, bm.array(j,**self.ikwargs), bm.array(i,**self.ikwargs))
+                # 新点和旧点的邻接关系
+                k = find_edge(cutEdge[newCutEdge, :2], bm.stack([p0, p1], axis=-1))
+                isFound = k >= 0
+                p4 = bm.where(isFound, cutEdge[newCutEdge[bm.where(isFound, k, 0)], 2], p4)
 
             # 如果新点的代数仍然为 0
             idx = (generation[p4] == 0)
@@ -887,6 +885,8 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             cell = bm.set_at(cell, (slice(NC, NC+nMarked),1), p1)
             cell = bm.set_at(cell, (slice(NC, NC+nMarked),2), p3)
             cell = bm.set_at(cell, (slice(NC, NC+nMarked),3), p4)
+            isModifiedCell = bm.set_at(isModifiedCell, markedCell, True)
+            isModifiedCell = bm.set_at(isModifiedCell, slice(NC, NC+nMarked), True)
 
             for key in self.celldata:
                 data = self.celldata[key]
@@ -899,30 +899,32 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             NC = NC + nMarked
             del cellGeneration, p0, p1, p2, p3, p4
 
-            # 找到非协调的单元
+            # 找到非协调的单元: 包含某条非协调边两个端点的单元
             checkEdge, = bm.nonzero(nonConforming[:nCut])
             isCheckNode = bm.zeros(NN, dtype=bm.bool, device=self.device)
-            isCheckNode = bm.set_at(isCheckNode, cutEdge[checkEdge], True)
+            isCheckNode = bm.set_at(isCheckNode, cutEdge[checkEdge, :2], True)
             isCheckCell = bm.sum(
                     isCheckNode[cell[:NC]],
                     axis= -1) > 0
             # 找到所有包含检查节点的单元编号
             checkCell, = bm.nonzero(isCheckCell)
-            I = bm.repeat(checkCell, 4)
-            J = cell[checkCell].reshape(-1)
-            val = bm.ones(len(I), dtype=bm.bool, device=self.device)
-            cell2node = csr_matrix((val, (I, J)), shape=(NC, NN))
-            i, j =  (cell2node[:, cutEdge[checkEdge, 0]].multiply(
-                        cell2node[:, cutEdge[checkEdge, 1]]
-                        )).nonzero()
-            markedCell = bm.unique(bm.array(i))
+            localEdge = self.localEdge
+            k = find_edge(cutEdge[checkEdge, :2], cell[checkCell][:, localEdge].reshape(-1, 2))
+            k = k.reshape(-1, localEdge.shape[0])
+            isFound = k >= 0
+            markedCell = checkCell[bm.any(isFound, axis=-1)]
             nonConforming = bm.set_at(nonConforming, checkEdge, False)
-            nonConforming = bm.set_at(nonConforming, checkEdge[j], True)
+            nonConforming = bm.set_at(nonConforming, checkEdge[k[isFound]], True)
 
 
         self.node = node[:NN]
-        self.cell = cell[:NC]
-        self.construct()
+        if options.get('incremental', False):
+            oldCell = bm.arange(NC, **self.ikwargs)
+            oldCell = bm.where(isModifiedCell[:NC], -1, oldCell)
+            self.entity_maps = self.update_topology(cell[:NC], oldCell)
+        else:
+            self.cell = cell[:NC]
+            self.construct()
         
 
         for key in self.celldata:
@@ -420,21 +420,84 @@ class TriangleMesh(SimplexMesh, Plotable):
         """
         @berif 给定一组线段，找到这些线段的一个邻域单元集合, 且这些单元要满足一定的连通
         性
-        """
-        pass
-    
-    def location(self, points):
-        """
-        @breif  给定一组点 p , 找到这些点所在的单元
 
-        这里假设：
+        线段被切成长度不超过点定位器桶宽的小段, 由 `PointLocator.candidates`
+        给出候选单元, 再用分离轴判断候选单元与线段是否相交. 线段经过的网格节点,
+        以及标记区域边界上度大于 2 的节点, 其周围的单元也被标记.
 
-        1. 所有点在网格内部，
-        2. 网格中没有洞
-        3. 区域还要是凸的
+        @param point 线段端点, 形状为 (NP, 2)
+        @param segment 线段的端点编号, 形状为 (NS, 2)
+        @return 长度为 NC 的布尔数组, 被线段穿过的单元为 True
         """
-        pass
-
+        NN = self.number_of_nodes()
+        NC = self.number_of_cells()
+        node = self.entity('node')
+        cell = self.entity('cell')
+        kwargs = bm.context(cell)
+        locator = self.point_locator()
+        h = locator.h
+        eps = locator.tol * h
+
+        def cross(u, v):
+            return u[..., 0]*v[..., 1] - u[..., 1]*v[..., 0]
+
+        # 1. 切分线段, 每一小段的包围盒至多覆盖 2 x 2 个桶
+        p0 = point[segment[:, 0]]
+        p1 = point[segment[:, 1]]
+        length = bm.sqrt(bm.sum((p1 - p0)**2, axis=-1))
+        n = bm.astype(bm.ceil(length / h), kwargs['dtype'])
+        n = bm.where(n < 1, 1, n)
+        sidx = bm.repeat(bm.arange(segment.shape[0], **kwargs), n)
+        start = bm.cumsum(n, axis=0) - n
+        k = bm.astype(bm.arange(sidx.shape[0], **kwargs) - start[sidx], node.dtype)
+        t = bm.astype(n[sidx], node.dtype)
+        d = p1[sidx] - p0[sidx]
+        a = p0[sidx] + (k/t)[:, None] * d
+        b = p0[sidx] + ((k + 1)/t)[:, None] * d
+        lower = bm.where(a < b, a, b) - eps
+        upper = bm.where(a < b, b, a) + eps
+
+        # 2. 候选单元与小段的分离轴判断
+        bidx, cidx = locator.candidates(lower, upper)
+        a, b = a[bidx], b[bidx]
+        v = node[cell[cidx]]
+        sign = cross(v[:, 1] - v[:, 0], v[:, 2] - v[:, 0])
+        sign = bm.where(sign < 0, -1.0, 1.0)
+        tol = eps * h
+        # 三个顶点严格位于小段所在直线的同一侧
+        s = cross((b - a)[:, None, :], v - a[:, None, :])
+        isSeparated = bm.all(s > tol, axis=-1) | bm.all(s < -tol, axis=-1)
+        # 小段的两个端点都严格位于某条边的外侧
+        for i in range(3):
+            vi, vj = v[:, (i+1)%3], v[:, (i+2)%3]
+            sa = sign * cross(vj - vi, a - vi)
+            sb = sign * cross(vj - vi, b - vi)
+            isSeparated = isSeparated | ((sa < -tol) & (sb < -tol))
+        isCrossed = ~isSeparated
+
+        isCrossedCell = bm.zeros(NC, dtype=bm.bool, device=bm.get_device(cell))
+        isCrossedCell = bm.set_at(isCrossedCell, cidx[isCrossed], True)
+
+        # 3. 线段经过的网格节点
+        isCrossedNode = bm.zeros(NN, dtype=bm.bool, device=bm.get_device(cell))
+        ab = b - a
+        l2 = bm.sum(ab**2, axis=-1, keepdims=True)
+        proj = bm.sum((v - a[:, None, :]) * ab[:, None, :], axis=-1)
+        isOn = (bm.abs(s) <= tol) & (proj >= -tol) & (proj <= l2 + tol)
+        isOn = isOn & isCrossed[:, None]
+        isCrossedNode = bm.set_at(isCrossedNode, cell[cidx][isOn], True)
+
+        # 4. 标记区域边界上度大于 2 的节点
+        edge = self.entity('edge')
+        edge2cell = self.edge_to_cell()
+        flag = isCrossedCell[edge2cell[:, 0]] != isCrossedCell[edge2cell[:, 1]]
+        valence = bm.zeros(NN, **kwargs)
+        valence = bm.index_add(valence, edge[flag].reshape(-1),
+                               bm.ones(2*int(bm.sum(flag)), **kwargs))
+        isCrossedNode = isCrossedNode | (valence > 2)
+
+        return isCrossedCell | bm.any(isCrossedNode[cell], axis=-1)
+    
     def circumcenter(self, index: Index=_S, returnradius=False):
         """
         @brief 计算三角形外接圆的圆心和半径
@@ -511,13 +574,15 @@ class TriangleMesh(SimplexMesh, Plotable):
             IM=None,
             data=None,
             disp=True,
+            incremental=False,
     ):
 
         options = {
             'HB': HB,
             'IM': IM,
             'data': data,
-            'disp': disp
+            'disp': disp,
+            'incremental': incremental
         }
         return options
 
@@ -603,12 +668,16 @@ class TriangleMesh(SimplexMesh, Plotable):
         if 'HB' in options:
             options['HB'] = bm.arange(NC)
 
+        isModifiedCell = bm.zeros((NC,), dtype=bm.bool, device=self.device)
         for k in range(2):
             idx, = bm.nonzero(edge2newNode[cell2edge0] > 0)
             nc = len(idx)
             if nc == 0:
                 break
 
+            isModifiedCell = bm.set_at(isModifiedCell, idx, True)
+            isModifiedCell = bm.concatenate((isModifiedCell, bm.ones((nc,), dtype=bm.bool, device=self.device)))
+
             if 'HB' in options:
                 HB = options['HB']
                 options['HB'] = bm.concatenate((HB, HB[idx]), axis=0)
@@ -673,8 +742,13 @@ class TriangleMesh(SimplexMesh, Plotable):
             NC = NC + nc
 
         self.NN = self.node.shape[0]
-        self.cell = cell
-        self.construct()
+        if options.get('incremental', False):
+            oldCell = bm.arange(NC, dtype=self.itype, device=self.device)
+            oldCell = bm.where(isModifiedCell, -1, oldCell)
+            self.entity_maps = self.update_topology(cell, oldCell)
+        else:
+            self.cell = cell
+            self.construct()
 
     def coarsen(self, isMarkedCell=None, options={}):
         """
@@ -734,7 +808,9 @@ class TriangleMesh(SimplexMesh, Plotable):
         cell = bm.set_at(cell , (t3, 0) , -1)
 
         # I, J = bm.nonzero(node2cell[isBGoodNode, :])
-        _, J, _ = inverse_relation(cell, NN, isBGoodNode)
+        # 被删除的单元用 -1 标记, 多加一个 False 以免 -1 被当作最后一个节点
+        isBStarNode = bm.concatenate((isBGoodNode, bm.zeros(1, dtype=bm.bool, device=self.device)))
+        _, J, _ = inverse_relation(cell, NN, isBStarNode)
         nodeStar = J.reshape(-1, 2)
         idx = (cell[nodeStar[:, 0], 2] == cell[nodeStar[:, 1], 1])
         nodeStar = bm.set_at(nodeStar , idx , nodeStar[idx, :][:, [0, 1]])
@@ -789,8 +865,16 @@ class TriangleMesh(SimplexMesh, Plotable):
         idxMap = bm.set_at(idxMap , ~isGoodNode , arange)
         cell = idxMap[cell]
 
-        self.cell = cell
-        self.construct()
+        if options.get('incremental', False):
+            keepCell, = bm.nonzero(isKeepCell)
+            isModifiedCell = bm.zeros(NC, dtype=bm.bool, device=self.device)
+            isModifiedCell = bm.set_at(isModifiedCell, bm.concatenate((t0, t2, t4)), True)
+            oldCell = bm.where(isModifiedCell[keepCell], -1, bm.astype(keepCell, self.itype))
+            nodeMap = bm.where(isGoodNode, -1, idxMap)
+            self.entity_maps = self.update_topology(cell, oldCell, node_map=nodeMap)
+        else:
+            self.cell = cell
+            self.construct()
 
     def label(self, node=None, cell=None, cellidx=None):
         """
@@ -1136,20 +1220,7 @@ class TriangleMesh(SimplexMesh, Plotable):
         """
         @brief 找到定点 point 所在的单元，并计算其重心坐标 
         """
-        index = self.location(point)
-        node = self.node
-        cell = self.entity('cell')
-        cm = self.cell_area()[index]
-        point = point[:, bm.newaxis, :]
-        v = node[cell[index]] - point
-        a0 = 0.5 * bm.abs(bm.cross(v[:, 1, :], v[:, 2, :]))
-        a1 = 0.5 * bm.abs(bm.cross(v[:, 0, :], v[:, 2, :]))
-        a2 = 0.5 * bm.abs(bm.cross(v[:, 0, :], v[:, 1, :]))
-        result = bm.zeros((index.shape[0], 3))
-        result[:, 0] = a0 / cm
-        result[:, 1] = a1 / cm
-        result[:, 2] = a2 / cm
-        return index, result
+        return self.location(point, return_bc=True)
 
     def mark_interface_cell(self, phi):
         """
@@ -1,4 +1,4 @@
-from typing import Callable, Union, Tuple, List, Any, Optional
+from typing import Callable, Union, Tuple, List, Any, Optional, TYPE_CHECKING
 from types import ModuleType
 
 from .mesh_base import StructuredMesh, TensorMesh
@@ -9,6 +9,10 @@ from ..typing import TensorLike, Index, _S, Union, Tuple
 from .utils import entitymethod, estr2dim
 from ..backend import backend_manager as bm
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.axes import Axes
+
 class UniformMesh1d(StructuredMesh, TensorMesh, Plotable):
     """
     @brief    A class for representing a uniformly partitioned one-dimensional mesh.
@@ -506,12 +510,10 @@ class UniformMesh1d(StructuredMesh, TensorMesh, Plotable):
         return line
 
     ## @ingroup GeneralInterface
-    from matplotlib.figure import Figure
-    from matplotlib.axes import Axes
     from typing import Optional, Callable, Any, Tuple
     def show_animation(self, 
-                fig: Figure, 
-                axes: Axes, 
+                fig: 'Figure', 
+                axes: 'Axes', 
                 box: Tuple[float, float, float, float], 
                 advance: Callable[[int, Any], Tuple[Any, float]], 
                 fname: str = 'test.mp4',
@@ -2,11 +2,12 @@ from ..backend import backend_manager as bm
 
 from ..typing import TensorLike, Index, _S
 
-from typing import Union, Optional, Callable, Tuple, List, Any
+from typing import Union, Optional, Callable, Tuple, List, Any, TYPE_CHECKING
 from types import ModuleType
-from matplotlib.pyplot import Figure
-from matplotlib.projections import Axes3D
-from matplotlib.axes import Axes
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.projections import Axes3D
+    from matplotlib.axes import Axes
 
 from .utils import entitymethod, estr2dim
 
@@ -1199,8 +1200,8 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
                                 uh, cmap=cmap)
 
     def show_animation(self,
-            fig: Figure,
-            axes: Union[Axes, Axes3D],
+            fig: 'Figure',
+            axes: Union['Axes', 'Axes3D'],
             box: List[float],
             advance: Callable[[int], Tuple[TensorLike, float]],
             fname: str = 'test.mp4',
@@ -1216,6 +1217,8 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
         import matplotlib.animation as animation
         # 绘制颜色条的类
         from matplotlib.contour import QuadContourSet
+        from matplotlib.axes import Axes
+        from matplotlib.projections import Axes3D
 
         nx, ny = self.shape
 
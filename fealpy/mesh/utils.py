@@ -1,5 +1,5 @@
 
-from typing import Dict, Callable, TypeVar, Tuple, Any
+from typing import Dict, Callable, TypeVar, Tuple, Any, Optional
 from math import comb
 
 from ..backend import backend_manager as bm
@@ -78,9 +78,50 @@ def inverse_relation(entity: TensorLike, size: int, index=None, *, sorted=True):
     return row, col, (size, entity.shape[0])
 
 
-def flocc(array: TensorLike, /):
+def pack_rows(array: TensorLike, size: int, /) -> Tuple[TensorLike, ...]:
+    """Pack the rows of a non-negative integer 2D array into 63-bit keys.
+
+    Each key holds as many columns as possible in base `size`, so that the
+    lexicographic order of the rows is the order of the keys, compared from
+    the first to the last one. Only one key is needed when `size**ncol`
+    does not exceed 2**63, e.g. NN < 2**21 for triangles and 2**15 for
+    quadrangles.
+
+    Parameters:
+        array (TensorLike): the 2D array with values in [0, size).
+        size (int): upper bound of the values.
+
+    Returns:
+        Tuple[TensorLike, ...]: the int64 keys of the rows.
+    """
+    ncol = array.shape[1]
+    size = max(int(size), 2)
+    per_key = 1
+    while per_key < ncol and size**(per_key + 1) <= 2**63:
+        per_key += 1
+
+    array = bm.astype(array, bm.int64)
+    keys = []
+    for start in range(0, ncol, per_key):
+        key = array[:, start]
+        for k in range(start + 1, min(start + per_key, ncol)):
+            key = key * size + array[:, k]
+        keys.append(key)
+    return tuple(keys)
+
+
+def flocc(array: TensorLike, /, size: Optional[int] = None, *, method: str = 'key'):
     """Find the first and last occurrence of each unique row in a 2D array.
 
+    Parameters:
+        array (TensorLike): the 2D integer array.
+        size (int | None, optional): upper bound of the values in `array`,
+            e.g. the number of nodes. Computed from `array` if not given.
+        method (str, optional): 'key' packs the rows into 64-bit integer keys
+            (several keys when `size` is too large, see `pack_rows`) to sort
+            them with a single-key stable argsort; 'lexsort' sorts all the
+            columns with `lexsort`. Both give the same results. Defaults to 'key'.
+
     Returns:
         out (TensorLike, TensorLike, TensorLike):
         - The first occurrence index of each unique row.
@@ -90,12 +131,32 @@ def flocc(array: TensorLike, /):
     if array.ndim != 2:
         raise ValueError("total_face must be a 2D array.")
 
-    indices = bm.lexsort(tuple(reversed(array.T)), axis=0)
-    sorted_array = array[indices]
-    diff_flag = bm.any(
-        sorted_array[1:] != sorted_array[:-1],
-        axis=1,
-    )
+    if method == 'lexsort':
+        indices = bm.lexsort(tuple(reversed(array.T)), axis=0)
+        sorted_array = array[indices]
+        diff_flag = bm.any(
+            sorted_array[1:] != sorted_array[:-1],
+            axis=1,
+        )
+    elif method == 'key':
+        if size is None:
+            size = int(bm.max(array)) + 1 if array.shape[0] > 0 else 1
+        keys = pack_rows(array, size)
+        if len(keys) == 1:
+            key = keys[0]
+            if bm.backend_name == 'numpy':
+                indices = key.argsort(kind='stable')
+            else:
+                indices = bm.argsort(key, stable=True)
+            sorted_key = key[indices]
+            diff_flag = sorted_key[1:] != sorted_key[:-1]
+        else: # more than 64 bits are needed
+            indices = bm.lexsort(tuple(reversed(keys)), axis=0)
+            sorted_keys = bm.stack([k[indices] for k in keys], axis=1)
+            diff_flag = bm.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+    else:
+        raise ValueError(f"Unknown method '{method}', should be 'key' or 'lexsort'.")
+
     TRUE = bm.ones((1,), dtype=bm.bool, device=bm.get_device(diff_flag))
     diff_flag = bm.concat([TRUE, diff_flag, TRUE])
     group_index = bm.cumsum(diff_flag[:-1], axis=0) - 1
@@ -104,8 +165,7 @@ def flocc(array: TensorLike, /):
     i1 = indices[diff_flag[1:]] # last occurrence index: unique -> original
     j = bm.empty_like(indices)
     # NOTE: This will hardly cause thread conflicts because it is a one-to-one correspondence.
-    j = bm.set_at(j, indices, bm.arange(len(indices), dtype=j.dtype, device=bm.get_device(j))) # original <> sorted
-    j = group_index[j] # original >> unique
+    j = bm.set_at(j, indices, bm.astype(group_index, j.dtype)) # original >> unique
 
     return i0, i1, j
 
@@ -3,6 +3,7 @@
 class LinearOperator:
 
     def __init__(self, shape, matvec):
+        self.shape = shape
         self.__matvec_impl = matvec
 
 
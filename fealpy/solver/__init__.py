@@ -12,3 +12,8 @@ from .direct_solver_manger import DirectSolverManager
 from .iterative_solver_manger import IterativeSolverManager
 from .bicgstab import bicgstab
 from .bicg import bicg
+from .krylov import KrylovSolver, KrylovWorkspace
+from .block_preconditioner import (
+    BlockOperator, BlockDiagonalPreconditioner, BlockTriangularPreconditioner,
+    PressureMassSchur, LSCSchur, block_inverse
+)
@@ -1,18 +1,84 @@
-from .amg_core import classical_strength_of_connection, rs_cf_splitting,rs_direct_interpolation
+import time
+
+from .amg_core import (
+    classical_strength_of_connection, symmetric_strength_of_connection,
+    rs_cf_splitting, pmis_cf_splitting, rs_direct_interpolation,
+    classical_interpolation, standard_aggregation, smoothed_aggregation_interpolation
+)
 from ..sparse import csr_matrix
 from ..backend import backend_manager as bm
 
+COARSENINGS = ('rs', 'pmis', 'hmis', 'sa')
+INTERPOLATIONS = ('direct', 'classical')
+# Smoothed aggregation measures the strength symmetrically, where the classical
+# threshold 0.25 is right at the border of the P1 and five-point Laplacians.
+DEFAULT_THETA = {'rs': 0.25, 'pmis': 0.25, 'hmis': 0.25, 'sa': 0.08}
+
+
 def ruge_stuben_amg(A,theta = 0.25):
-    
+    return amg_coarsen(A, theta, ctype='rs', itype='direct')
+
+
+def amg_coarsen(A, theta=None, ctype='rs', itype='direct', timing=None):
+    """One level of algebraic coarsening.
+
+    Parameters:
+        A (CSRTensor): the matrix on the current level.
+        theta (float | None): threshold of strong connections. Defaults to
+            0.25 for the C/F splitting methods and 0.08 for 'sa'.
+        ctype (str): coarsening method, 'rs' (classical Ruge-Stuben),
+            'pmis', 'hmis' or 'sa' (smoothed aggregation).
+        itype (str): interpolation of the C/F splitting methods, 'direct'
+            or 'classical'. Ignored by 'sa'.
+        timing (dict | None): if given, seconds spent in the 'strength',
+            'splitting' and 'interpolation' phases are added to it.
+
+    Returns:
+        p, r (CSRTensor): the prolongation and restriction matrices.
+    """
+    if ctype not in COARSENINGS:
+        raise ValueError(f"Unknown coarsening method '{ctype}', should be one of {COARSENINGS}.")
+    if itype not in INTERPOLATIONS:
+        raise ValueError(f"Unknown interpolation method '{itype}', should be one of {INTERPOLATIONS}.")
+    timing = {} if timing is None else timing
+    theta = DEFAULT_THETA[ctype] if theta is None else theta
+
+    def record(key, start):
+        now = time.perf_counter()
+        timing[key] = timing.get(key, 0.0) + now - start
+        return now
+
     n_row = A.shape[0]
     Ap, Aj, Ax = A.indptr, A.indices, A.data
-    Sp, Sj, Sx = classical_strength_of_connection(Ap, Aj, Ax,n_row,theta)
-    S = csr_matrix((Sx, Sj, Sp), shape=(n_row, n_row))
-    T = S.T
-    Tp, Tj = T.indptr, T.indices
-    splitting = rs_cf_splitting(Sp, Sj, Tp, Tj, n_row)
-    p,r = rs_direct_interpolation(Ap, Aj, Ax,Sp, Sj, Sx, splitting)
-    return p,r
+    t = time.perf_counter()
+
+    if ctype == 'sa':
+        Sp, Sj, Sx = symmetric_strength_of_connection(Ap, Aj, Ax, n_row, theta)
+        t = record('strength', t)
+        aggregates = standard_aggregation(Sp, Sj, n_row)
+        t = record('splitting', t)
+        p, r = smoothed_aggregation_interpolation(A, aggregates)
+        record('interpolation', t)
+        return p, r
+
+    Sp, Sj, Sx = classical_strength_of_connection(Ap, Aj, Ax, n_row, theta)
+    t = record('strength', t)
+
+    if ctype == 'rs':
+        S = csr_matrix((Sx, Sj, Sp), shape=(n_row, n_row))
+        T = S.T
+        Tp, Tj = T.indptr, T.indices
+        splitting = rs_cf_splitting(Sp, Sj, Tp, Tj, n_row)
+    else:
+        splitting = pmis_cf_splitting(Sp, Sj, n_row, method=ctype)
+    t = record('splitting', t)
+
+    if itype == 'direct':
+        p, r = rs_direct_interpolation(Ap, Aj, Ax, Sp, Sj, Sx, splitting)
+    else:
+        p, r = classical_interpolation(Ap, Aj, Ax, Sp, Sj, Sx, splitting)
+    record('interpolation', t)
+    return p, r
 
 # def ruge_stuben_coarse(A,theta = 0.025):
 #     isC,Am = ruge_stuben_chen_coarsen(A,theta)
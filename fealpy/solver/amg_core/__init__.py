@@ -1,3 +1,4 @@
-from .amg_connection import classical_strength_of_connection
-from .amg_interpolation import rs_direct_interpolation
-from .amg_splitting import rs_cf_splitting
\ No newline at end of file
+from .amg_connection import classical_strength_of_connection, symmetric_strength_of_connection
+from .amg_interpolation import rs_direct_interpolation, classical_interpolation
+from .amg_splitting import rs_cf_splitting, pmis_cf_splitting
+from .amg_aggregation import standard_aggregation, smoothed_aggregation_interpolation
@@ -0,0 +1,102 @@
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import csr_matrix, CSRTensor
+
+from .amg_splitting import strong_graph, hash_fraction, maximal_independent_set
+
+
+def standard_aggregation(Sp, Sj, n_nodes):
+    """
+    基于极大独立集的标准聚集。
+
+    1. 在距离为 2 的强连接图上求极大独立集，作为各聚集的根节点；
+    2. 未聚集的节点加入权重最大的已聚集强邻居所在的聚集，重复至不再变化。
+    孤立点（没有强连接）不属于任何聚集。
+
+    Parameters:
+        Sp, Sj : 强连接矩阵 S 的 CSR 行指针与列索引（可含对角元）。
+        n_nodes : 节点个数。
+
+    Returns:
+        aggregates : 长度 n_nodes 的整型数组，节点所属聚集编号，孤立点为 -1。
+    """
+    _, _, Gp, Gj = strong_graph(Sp, Sj, n_nodes)
+    grow = bm.repeat(bm.arange(n_nodes), Gp[1:] - Gp[:-1])
+    degree = Gp[1:] - Gp[:-1]
+    w = degree + hash_fraction(n_nodes)
+
+    # 距离为 2 的图 G + G^2
+    G = csr_matrix((bm.ones(Gj.shape[0]), Gj, Gp), shape=(n_nodes, n_nodes))
+    G2 = G + G @ G
+    roots = maximal_independent_set(G2.indptr, G2.indices, degree > 0, w)
+
+    aggregates = bm.full(n_nodes, -1, dtype=int)
+    aggregates[roots] = bm.arange(int(bm.sum(roots)))
+
+    while True:
+        flag = (aggregates[grow] < 0) & (aggregates[Gj] >= 0)
+        if not bm.any(flag):
+            break
+        i, j = grow[flag], Gj[flag]
+        # 每个节点选择权重最大的已聚集邻居
+        order = bm.lexsort((w[j], i))
+        i, j = i[order], j[order]
+        last = bm.concatenate((i[1:] != i[:-1], [True]))
+        aggregates[i[last]] = aggregates[j[last]]
+
+    return aggregates
+
+
+def tentative_prolongation(aggregates):
+    """
+    以常向量为近零空间的试探延长算子，列按 2-范数单位化。
+    """
+    n_nodes = aggregates.shape[0]
+    n_agg = int(bm.max(aggregates)) + 1 if n_nodes > 0 else 0
+    nodes = bm.nonzero(aggregates >= 0)[0]
+    agg = aggregates[nodes]
+    size = bm.bincount(agg, minlength=n_agg)
+    val = 1.0 / bm.sqrt(size[agg])
+    return csr_matrix((val, (nodes, agg)), shape=(n_nodes, n_agg))
+
+
+def spectral_radius(A, maxit=15):
+    """
+    幂迭代估计矩阵的谱半径。
+    """
+    n = A.shape[0]
+    x = 1.0 + hash_fraction(n)
+    rho = 1.0
+    for _ in range(maxit):
+        y = A @ x
+        norm = bm.linalg.norm(y)
+        if norm == 0:
+            break
+        rho = norm / bm.linalg.norm(x)
+        x = y / norm
+    return rho
+
+
+def smoothed_aggregation_interpolation(A, aggregates, omega=4.0/3.0):
+    """
+    光滑聚集插值 P = (I - omega / rho(D^{-1} A) * D^{-1} A) T，其中 T 为
+    试探延长算子。
+
+    Parameters:
+        A (CSRTensor): 系数矩阵。
+        aggregates : 节点所属聚集编号，见 `standard_aggregation`。
+        omega (float): 阻尼 Jacobi 光滑的系数，默认 4/3。
+
+    Returns:
+        p, r : 延长与限制矩阵。
+    """
+    T = tentative_prolongation(aggregates)
+    row = A.row
+    is_diag = row == A.col
+    diag = bm.bincount(row[is_diag], weights=A.values[is_diag], minlength=A.shape[0])
+    dinv = bm.where(diag != 0, 1.0 / bm.where(diag != 0, diag, 1), 0)
+    DA = CSRTensor(A.crow, A.col, A.values * dinv[row], A.sparse_shape)
+    rho = spectral_radius(DA)
+
+    p = T.add(DA @ T, alpha=-omega / rho)
+    r = p.T
+    return p, r
@@ -2,6 +2,18 @@ from fealpy.backend import backend_manager as bm
 from fealpy.sparse import csr_matrix
 
 
+def segment_max(values, ptr, fill=0):
+    """
+    按 CSR 行指针 ptr 分段计算 values 的最大值，空行取 fill。
+    """
+    n_row = ptr.shape[0] - 1
+    out = bm.full(n_row, fill, dtype=values.dtype)
+    nonempty = ptr[1:] > ptr[:-1]
+    if values.shape[0] > 0:
+        out[nonempty] = bm.maximum.reduceat(values, ptr[:-1][nonempty])
+    return out
+
+
 def classical_strength_of_connection(Ap, Aj, Ax,n_row, theta=0.25):
 
     row_inds = bm.repeat(bm.arange(n_row), Ap[1:] - Ap[:-1])
@@ -9,12 +21,10 @@ def classical_strength_of_connection(Ap, Aj, Ax,n_row, theta=0.25):
     
     # 对于非对角元素 (Aj != row_inds) 计算绝对值；对角元素置为0
     is_offdiag = (Aj != row_inds)
-    offdiag_abs = absAx.copy()
-    offdiag_abs[~is_offdiag] = 0
+    offdiag_abs = bm.where(is_offdiag, absAx, 0)
 
-    # 利用 np.maximum.reduceat 按行计算非对角元素的最大值
-    # 注意：每行至少包含一个对角元素，所以该行不会为空
-    max_off = bm.maximum.reduceat(offdiag_abs, Ap[:-1])
+    # 按行计算非对角元素的最大值（空行为 0）
+    max_off = segment_max(offdiag_abs, Ap)
 
     # 计算每行的阈值：theta * (最大非对角绝对值)
     threshold = theta * max_off
@@ -25,7 +35,7 @@ def classical_strength_of_connection(Ap, Aj, Ax,n_row, theta=0.25):
     Sj_new = Aj[keep]
     Sx_new = Ax[keep]
     # 计算每行保留的元素数量（由于 A 本身是按行存储的）
-    row_keep = bm.add.reduceat(keep.astype(int), Ap[:-1])
+    row_keep = bm.bincount(row_inds[keep], minlength=n_row)
     Sp_new = bm.concatenate(([0], bm.cumsum(row_keep)))
 
 
@@ -3,59 +3,127 @@ from fealpy.sparse.ops import spdiags
 from fealpy.sparse import csr_matrix
 
 def rs_direct_interpolation(Ap, Aj, Ax, Sp, Sj, Sx, splitting):
+    """
+    Ruge-Stuben 直接插值，按行的求和用 bincount 向量化实现。
+
+    F 点 i 的插值权重为 w_ij = -alpha_i * a_ij / a_ii (a_ij < 0) 或
+    -beta_i * a_ij / a_ii (a_ij > 0)，其中 alpha_i, beta_i 分别为全部负 (正)
+    非对角元之和与强 C 邻居负 (正) 元之和的比值。
+    """
+    n_nodes = len(splitting)
+    isC = splitting == 1
+    nodes = bm.arange(n_nodes)
+
+    # 强 C 邻居
+    srow = bm.repeat(nodes, Sp[1:] - Sp[:-1])
+    strong_c = isC[Sj] & (Sj != srow)
+    neg = Sx < 0
+    sum_strong_neg = bm.bincount(srow, weights=bm.where(strong_c & neg, Sx, 0), minlength=n_nodes)
+    sum_strong_pos = bm.bincount(srow, weights=bm.where(strong_c & ~neg, Sx, 0), minlength=n_nodes)
+
+    # 全部非对角元
+    arow = bm.repeat(nodes, Ap[1:] - Ap[:-1])
+    is_diag = Aj == arow
+    diag = bm.bincount(arow, weights=bm.where(is_diag, Ax, 0), minlength=n_nodes)
+    sum_all_neg = bm.bincount(arow, weights=bm.where(~is_diag & (Ax < 0), Ax, 0), minlength=n_nodes)
+    sum_all_pos = bm.bincount(arow, weights=bm.where(~is_diag & (Ax >= 0), Ax, 0), minlength=n_nodes)
+
+    alpha = bm.where(sum_strong_neg != 0, sum_all_neg / bm.where(sum_strong_neg != 0, sum_strong_neg, 1), 0)
+    beta = bm.where(sum_strong_pos != 0, sum_all_pos / bm.where(sum_strong_pos != 0, sum_strong_pos, 1), 0)
+    diag = bm.where(sum_strong_pos == 0, diag + sum_all_pos, diag)
+    safe_diag = bm.where(diag != 0, diag, 1)
+    neg_coeff = bm.where(diag != 0, -alpha / safe_diag, 0)
+    pos_coeff = bm.where(diag != 0, -beta / safe_diag, 0)
+
+    # 组装 P：C 点直接映射到自身，F 点用强 C 邻居插值
+    flag = strong_c & ~isC[srow]
+    fi, fj, fx = srow[flag], Sj[flag], Sx[flag]
+    fw = bm.where(fx < 0, neg_coeff[fi], pos_coeff[fi]) * fx
+    cnode = nodes[isC]
+
+    coarse_map = bm.cumsum(isC) - 1  # 计算 C 点编号映射
+    n_coarse = int(bm.sum(isC))  # C 点个数
+    I = bm.concatenate((cnode, fi))
+    J = coarse_map[bm.concatenate((cnode, fj))]
+    V = bm.concatenate((bm.ones(cnode.shape[0]), fw))
+    p = csr_matrix((V, (I, J)), shape=(n_nodes, n_coarse))
+    r = p.T
+    return p, r
 
+
+def classical_interpolation(Ap, Aj, Ax, Sp, Sj, Sx, splitting):
+    """
+    Ruge-Stuben 经典 (标准) 插值，F 点 i 的插值权重为
+
+        w_ij = -(a_ij + sum_{k in F_i^s} a_ik * a'_kj / sum_{m in C_i^s} a'_km)
+               / (a_ii + sum_{k in N_i^w} a_ik),  j in C_i^s
+
+    其中 C_i^s, F_i^s 为 i 的强 C、强 F 邻居，N_i^w 为弱邻居，a'_kj 只保留与
+    a_kk 符号相反的元素。若强 F 邻居 k 与 C_i^s 没有连接，a_ik 并入对角元。
+
+    F-F 强连接通过展开 (i, k, j) 三元组、在 C_i^s 的排序键中二分查找完成，
+    不含按节点的循环。
+    """
     n_nodes = len(splitting)
-    row_indices = bm.repeat(bm.arange(n_nodes), Sp[1:] - Sp[:-1])     # 2. 判断每个邻接记录是否满足条件：对应的 Sj 是 C 点，且不等于自身
-    valid = splitting[Sj] & (Sj != row_indices)  # 3. 对每个行号统计符合条件的邻接记录个数
-    neighbor_counts = bm.bincount(row_indices, weights=valid.astype(int), minlength=n_nodes)   # 4. 对于 C 点固定计数为 1，F 点使用统计到的邻接记录个数
-    counts = bm.where(splitting, 1, neighbor_counts)     # 5. 构造 P 的行指针（CSR格式），首元素为 0，后续为累计和
-    Pp = bm.concatenate(([0], bm.cumsum(counts).astype(int)))   # 计算 P 的列索引 (Pj) 和数值 (Px)
-    Pj = bm.zeros(Pp[-1], dtype=int)
-    Px = bm.zeros(Pp[-1], dtype=float)
-
-    for i in range(n_nodes):
-        if splitting[i] == True:
-            Pj[Pp[i]] = i
-            Px[Pp[i]] = 1.0  # C 点直接映射到自身
-        else:      # 计算 F 点插值的权重
-            sum_strong_pos, sum_strong_neg = 0, 0
-            for jj in range(Sp[i], Sp[i+1]):
-                if splitting[Sj[jj]] == True and Sj[jj] != i:
-                    if Sx[jj] < 0:
-                        sum_strong_neg += Sx[jj]
-                    else:
-                        sum_strong_pos += Sx[jj]
-
-            sum_all_pos, sum_all_neg, diag = 0, 0, 0
-            for jj in range(Ap[i], Ap[i+1]):
-                if Aj[jj] == i:
-                    diag += Ax[jj]
-                else:
-                    if Ax[jj] < 0:
-                        sum_all_neg += Ax[jj]
-                    else:
-                        sum_all_pos += Ax[jj]
-
-            alpha = sum_all_neg / sum_strong_neg if sum_strong_neg != 0 else 0
-            beta = sum_all_pos / sum_strong_pos if sum_strong_pos != 0 else 0
-
-            if sum_strong_pos == 0:
-                diag += sum_all_pos
-                beta = 0
-
-            neg_coeff = -alpha / diag if diag != 0 else 0
-            pos_coeff = -beta / diag if diag != 0 else 0         # 计算 P 的插值系数
-            nnz_index = Pp[i]
-            for jj in range(Sp[i], Sp[i+1]):
-                if splitting[Sj[jj]] == True and Sj[jj] != i:
-                    Pj[nnz_index] = Sj[jj]
-                    Px[nnz_index] = neg_coeff * Sx[jj] if Sx[jj] < 0 else pos_coeff * Sx[jj]
-                    nnz_index += 1
-
-    coarse_map = bm.cumsum(splitting) - 1  # 计算 C 点编号映射
-    Pj[:] = coarse_map[Pj[:]]
-    n_coarse = bm.sum(splitting)  # C 点个数
-    p = csr_matrix((Px, Pj, Pp), shape=(n_nodes, n_coarse))
+    isC = splitting == 1
+    nodes = bm.arange(n_nodes)
+    arow = bm.repeat(nodes, Ap[1:] - Ap[:-1])
+    is_diag = Aj == arow
+    diag = bm.bincount(arow, weights=bm.where(is_diag, Ax, 0), minlength=n_nodes)
+
+    # A 中的强连接：S 是 A 的子集，按 (行, 列) 键查找
+    akey = arow * n_nodes + Aj
+    aorder = bm.argsort(akey, kind='stable')
+    srow = bm.repeat(nodes, Sp[1:] - Sp[:-1])
+    skey = (srow * n_nodes + Sj)[Sj != srow]
+    strong = bm.zeros(Aj.shape[0], dtype=bool)
+    strong[aorder[bm.searchsorted(akey[aorder], skey)]] = True
+
+    fine_row = ~isC[arow]
+    strong_c = fine_row & strong & isC[Aj]
+    strong_f = fine_row & strong & ~isC[Aj]
+    weak = fine_row & ~strong & ~is_diag
+
+    # C_i^s 的排序键，用于查找 (i, j)
+    ckey = akey[strong_c]
+    corder = bm.argsort(ckey, kind='stable')
+    ckey_sorted = ckey[corder]
+    numer = bm.copy(Ax[strong_c])
+
+    # 展开强 F 邻居 k 所在行的元素 (i, k, j)
+    pi, pk, pa = arow[strong_f], Aj[strong_f], Ax[strong_f]
+    counts = Ap[pk + 1] - Ap[pk]
+    pair = bm.repeat(bm.arange(pi.shape[0]), counts)
+    offset = bm.concatenate(([0], bm.cumsum(counts)[:-1]))
+    pos = Ap[pk][pair] + bm.arange(pair.shape[0]) - offset[pair]
+    j, akj = Aj[pos], Ax[pos]
+    key = pi[pair] * n_nodes + j
+    if ckey_sorted.shape[0] > 0:
+        loc = bm.minimum(bm.searchsorted(ckey_sorted, key), ckey_sorted.shape[0] - 1)
+        found = (ckey_sorted[loc] == key) & (bm.sign(akj) != bm.sign(diag[pk[pair]]))
+    else:
+        loc = bm.zeros_like(key)
+        found = bm.zeros(key.shape[0], dtype=bool)
+    pair, akj, loc = pair[found], akj[found], loc[found]
+
+    denom = bm.bincount(pair, weights=akj, minlength=pi.shape[0])
+    lumped = denom == 0
+    contrib = pa[pair] * akj / bm.where(lumped, 1, denom)[pair]
+    numer[corder] += bm.bincount(loc, weights=contrib, minlength=ckey.shape[0])
+
+    scale = diag + bm.bincount(arow[weak], weights=Ax[weak], minlength=n_nodes) \
+        + bm.bincount(pi[lumped], weights=pa[lumped], minlength=n_nodes)
+    scale = bm.where(scale != 0, scale, 1)
+
+    ci, cj = arow[strong_c], Aj[strong_c]
+    cw = -numer / scale[ci]
+    cnode = nodes[isC]
+    coarse_map = bm.cumsum(isC) - 1
+    n_coarse = int(bm.sum(isC))
+    I = bm.concatenate((cnode, ci))
+    J = coarse_map[bm.concatenate((cnode, cj))]
+    V = bm.concatenate((bm.ones(cnode.shape[0]), cw))
+    p = csr_matrix((V, (I, J)), shape=(n_nodes, n_coarse))
     r = p.T
     return p, r
 
@@ -2,6 +2,7 @@
 from fealpy.backend import backend_manager as bm
 from fealpy.sparse.ops import spdiags
 from fealpy.sparse import csr_matrix
+from .amg_connection import segment_max
 
 U_NODE = -1  # 未标记
 C_NODE = 1   # C-节点
@@ -47,6 +48,8 @@ def rs_cf_splitting(Sp, Sj, Tp, Tj, n_nodes):
             for jj in range(Tp[i], Tp[i+1]):
                 j = Tj[jj]
                 if splitting[j] == U_NODE:
+                    # 强依赖于 C 点 i 的点设为 F
+                    splitting[j] = F_NODE
                     # 更新邻居 k 的 lambda 值
                     for kk in range(Sp[j], Sp[j+1]):
                         k = Sj[kk]
@@ -97,6 +100,108 @@ def rs_cf_splitting(Sp, Sj, Tp, Tj, n_nodes):
 
     return splitting
 
+def hash_fraction(n):
+    """
+    确定性的伪随机数 frac(i * 0.618...)，用于独立集选择中打破平局，
+    保证粗化结果可复现。
+    """
+    return (bm.arange(n, dtype=bm.float64) * 0.6180339887498949) % 1.0
+
+
+def strong_graph(Sp, Sj, n_nodes):
+    """
+    由强连接矩阵 S（可含对角元）生成：
+        si, sj : 非对角强连接，si 强依赖于 sj
+        Gp, Gj : 对称化强连接图 S + S^T 的 CSR 结构
+    """
+    row = bm.repeat(bm.arange(n_nodes), Sp[1:] - Sp[:-1])
+    off = Sj != row
+    si, sj = row[off], Sj[off]
+    gi = bm.concatenate((si, sj))
+    gj = bm.concatenate((sj, si))
+    order = bm.argsort(gi, kind='stable')
+    Gj = gj[order]
+    Gp = bm.concatenate(([0], bm.cumsum(bm.bincount(gi, minlength=n_nodes))))
+    return si, sj, Gp, Gj
+
+
+def pmis_cf_splitting(Sp, Sj, n_nodes, method='pmis'):
+    """
+    并行修正独立集 (PMIS) 及 HMIS 粗化。
+
+    每一轮同时选出权重大于所有未定邻居的未定点作为 C 点，并把强依赖于新
+    C 点的未定点标记为 F 点。点 i 的权重为受其强影响的点数 |S_i^T| 加上
+    [0, 1) 内的确定性扰动。每一轮都是整体的数组运算，轮数通常只有十余次。
+
+    method='hmis' 时，每一轮之后按照 RS 第一遍的规则更新权重（新 F 点强依赖
+    的未定点权重加一，新 C 点强依赖的未定点权重减一），并在最后把有强连接
+    却没有强 C 邻居的 F 点改为 C 点，保证直接插值有定义。
+
+    Parameters:
+        Sp, Sj : 强连接矩阵 S 的 CSR 行指针与列索引，S_ij 表示 i 强依赖于 j。
+        n_nodes : 节点个数。
+        method : 'pmis' 或 'hmis'。
+
+    Returns:
+        splitting : 长度 n_nodes 的整型数组，C 点为 1，F 点为 0。
+    """
+    si, sj, Gp, Gj = strong_graph(Sp, Sj, n_nodes)
+    w = bm.bincount(sj, minlength=n_nodes) + hash_fraction(n_nodes)
+
+    splitting = bm.full(n_nodes, U_NODE, dtype=int)
+    # 不影响任何点的节点设为 F
+    splitting[w < 1] = F_NODE
+
+    while True:
+        U = splitting == U_NODE
+        if not bm.any(U):
+            break
+        wn = bm.where(U[Gj], w[Gj], -1.0)
+        new_c = U & (w > segment_max(wn, Gp, -1.0))
+        splitting[new_c] = C_NODE
+
+        # 强依赖于新 C 点的未定点设为 F
+        new_f = bm.zeros(n_nodes, dtype=bool)
+        new_f[si[new_c[sj]]] = True
+        new_f &= U & ~new_c
+        splitting[new_f] = F_NODE
+
+        if method == 'hmis':
+            U = splitting == U_NODE
+            inc = bm.bincount(sj[new_f[si] & U[sj]], minlength=n_nodes)
+            dec = bm.bincount(sj[new_c[si] & U[sj]], minlength=n_nodes)
+            w = w + inc - dec
+            splitting[U & (w < 1)] = F_NODE
+
+    if method == 'hmis':
+        has_strong = bm.bincount(si, minlength=n_nodes) > 0
+        has_c = bm.bincount(si[splitting[sj] == C_NODE], minlength=n_nodes) > 0
+        splitting[(splitting == F_NODE) & has_strong & ~has_c] = C_NODE
+
+    return splitting
+
+
+def maximal_independent_set(Gp, Gj, candidate, w):
+    """
+    在图 (Gp, Gj) 的候选点中以 Luby 方式求极大独立集，权重 w 需互不相同，
+    图中的自环被忽略。
+    """
+    n_nodes = Gp.shape[0] - 1
+    row = bm.repeat(bm.arange(n_nodes), Gp[1:] - Gp[:-1])
+    other = Gj != row
+    in_set = bm.zeros(n_nodes, dtype=bool)
+    U = bm.copy(candidate)
+
+    while bm.any(U):
+        wn = bm.where(U[Gj] & other, w[Gj], -1.0)
+        new = U & (w > segment_max(wn, Gp, -1.0))
+        in_set |= new
+        U &= ~new
+        U[row[new[Gj]]] = False
+
+    return in_set
+
+
 def ruge_stuben_coarsen(A, theta=0.025):
     
     """Ruge-Stuben coarsening method for multigrid preconditioning.
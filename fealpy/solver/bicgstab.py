@@ -4,6 +4,7 @@ from ..backend import backend_manager as bm
 from ..backend import TensorLike
 
 from .. import logger
+from .krylov import KrylovWorkspace
 
 
 class SupportsMatmul(Protocol):
@@ -17,7 +18,9 @@ def bicgstab(
     atol: float = 1e-8,
     rtol: float = 1e-8,
     maxit: Optional[int] = None,
-    M: Optional[SupportsMatmul] = None
+    M: Optional[SupportsMatmul] = None,
+    *,
+    workspace: Optional[KrylovWorkspace] = None
 ) -> tuple[TensorLike, dict]:
     """
     Solve a linear system Ax = b using BiConjugate Gradient Stabilized (BiCGSTAB) method.
@@ -33,10 +36,13 @@ def bicgstab(
             If not provided, the method will continue until convergence based on tolerances.
         M (TensorLike): Inverse of the preconditioner of `A`.  `M` should approximate the
             inverse of `A` and be easy to solve. Defaults to None.
+        workspace (KrylovWorkspace, optional): buffers reused across calls,
+            see `KrylovSolver`. A temporary workspace is used if not given.
 
     Returns:
         TensorLike: The approximate solution to the system Ax = b.
-        dict: Information dictionary containing residual, iteration count, and relative tolerance.
+        dict: Information dictionary containing residual, iteration count and
+            the residual history.
 
     Raises:
         ValueError: If inputs do not meet specified conditions (e.g., dimensions mismatch).
@@ -60,58 +66,61 @@ def bicgstab(
     m, _ = A.shape  # Matrix dimensions
 
     maxit = maxit or 5 * m  # Default maximum iterations
-    if x0 is None:
-        r = b.copy()
-    else:
-        r = b - A @ x0 
-
-    info = {}
+    if workspace is None:
+        workspace = KrylovWorkspace()
+    workspace.prepare(b)
+    kernels = workspace.kernels
+
+    # NOTE: the vectors below live in the workspace and are updated in place;
+    # only the products with A and M create new tensors.
+    tmp = workspace.get('tmp', b)
+    x = bm.copy(x0)
+    r = kernels.assign(workspace.get('r', b), b - A @ x)
+    r1 = kernels.assign(workspace.get('r1', b), r)
+    p = kernels.assign(workspace.get('p', b), r)
+    q = workspace.get('q', b)
+
+    info = {'history': []}
+    history = info['history']
     b_norm = bm.linalg.norm(b)
     atol = max(float(atol), float(rtol) * float(b_norm))
     rhotol = bm.finfo(x0.dtype).eps**2
 
-    x = x0
-    r1 = r
-    a = r @ r1
-    p = r
-    
-    q = bm.empty_like(r,**kwags)
-    Mp = bm.empty_like(r,**kwags)
-    AMp = bm.empty_like(r,**kwags)
-    Mq = bm.empty_like(r,**kwags)
-    AMq = bm.empty_like(r,**kwags)
-    tmp = bm.empty_like(r,**kwags)
-    
+    sqrt, = bm.bind('sqrt')
+    a = kernels.dot(r, r1)
+    res = sqrt(a)
+
     for niter in range(maxit):
         if abs(a) < rhotol:
             logger.info(f"break")
             break
 
         if niter > 0:
-            a = r @ r1
+            a = kernels.dot(r, r1)
             mu = (eta / w) * (a / a_pre)
             # p = mu * (p - w * AMp) + r
-            tmp = p - w * AMp
-            tmp = mu * tmp
-            p = tmp + r
-        
+            p = kernels.axpy(-w, AMp, p, tmp)
+            p = kernels.xpay(r, mu, p)
+
         if M is not None:
             Mp = M @ p
         else:
             Mp = p
         AMp = A @ Mp
-        c = AMp @ r1
-        # c = bm.einsum('i,i->', AMp, r1)
+        c = kernels.dot(AMp, r1)
         if abs(c) == 0:
             logger.info(f"break")
             break
         eta = a / c
 
-        q = r - eta * AMp
-        qnorm = bm.linalg.norm(q)
+        # q = r - eta * AMp
+        q = kernels.assign(q, r)
+        q = kernels.axpy(-eta, AMp, q, tmp)
+        qnorm = sqrt(kernels.dot(q, q))
         if qnorm <= max(atol,rtol * b_norm):
-            x = x + eta * Mp
+            x = kernels.axpy(eta, Mp, x, tmp)
             res = qnorm
+            history.append(res)
             logger.info(
                 f"bicgstab converged in {niter} iterations"
             )
@@ -122,15 +131,18 @@ def bicgstab(
         else:
             Mq = q
         AMq = A @ Mq
-        w = (AMq @ Mq) / (AMq @ AMq)
+        w = kernels.dot(AMq, Mq) / kernels.dot(AMq, AMq)
 
-        x += w * Mq
-        x += eta * Mp
+        x = kernels.axpy(w, Mq, x, tmp)
+        x = kernels.axpy(eta, Mp, x, tmp)
 
-        r = q - w *AMq
+        # r = q - w * AMq
+        r = kernels.assign(r, q)
+        r = kernels.axpy(-w, AMq, r, tmp)
         a_pre = a
-        
-        res = bm.linalg.norm(r)
+
+        res = sqrt(kernels.dot(r, r))
+        history.append(res)
         if res <= atol:
             logger.info(
                 f"bicgstab converged in {niter} iterations (absolute tolerance: {atol:.1e})"
@@ -147,6 +159,8 @@ def bicgstab(
             logger.info(f"bicgstab failed to converge within {maxit} iterations.")
             break
 
+    # NOTE: the residual norms are kept on the device until the end.
+    info['history'] = kernels.tolist(history)
     info['residual'] = res
     info['niter'] = niter+1
     return x, info
@@ -0,0 +1,345 @@
+from typing import Optional, Protocol, List, Sequence, Any
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import SparseTensor, CSRTensor, spdiags
+
+
+
+class SupportsMatmul(Protocol):
+    def __matmul__(self, other: TensorLike) -> TensorLike: ...
+
+
+def _to_csr(block) -> Optional[CSRTensor]:
+    if block is None:
+        return None
+    if isinstance(block, SparseTensor):
+        return block.tocsr()
+    if hasattr(block, 'assembly'):
+        return block.assembly(format='csr')
+    raise TypeError(f"Unsupported block type {type(block).__name__}")
+
+
+def _diagonal(A: SparseTensor) -> TensorLike:
+    """Diagonal of a sparse matrix, including the entries not stored."""
+    A = A.tocsr()
+    loc = A.row == A.col
+    d = bm.zeros(A.shape[0], **bm.context(A.values))
+    return bm.index_add(d, A.col[loc], A.values[loc])
+
+
+def _offsets(sizes: Sequence[int]) -> List[int]:
+    offsets = [0]
+    for s in sizes:
+        offsets.append(offsets[-1] + int(s))
+    return offsets
+
+
+class BlockOperator():
+    """Block matrix keeping its sub-blocks as separate sparse matrices.
+
+    A block system is never assembled into one monolithic matrix: products are
+    evaluated block by block, and the preconditioners below work on the
+    individual blocks.
+
+    Parameters:
+        blocks (List[List[CSRTensor | None]]): the sub-blocks, None for zero blocks.
+        row_sizes, col_sizes (Sequence[int] | None, optional): sizes of the block
+            rows and columns, inferred from the blocks if not given.
+
+    Example:
+        op = BlockOperator.from_blockform(BlockForm([[A00, A01], [A01.T, None]]))
+        P = BlockDiagonalPreconditioner(op, [
+            block_inverse(op.block(0, 0), 'amg'),
+            PressureMassSchur(Mp)
+        ])
+        x, info = minres(op, F, M=P)
+    """
+    def __init__(self, blocks: List[List[Optional[CSRTensor]]],
+                 row_sizes: Optional[Sequence[int]]=None,
+                 col_sizes: Optional[Sequence[int]]=None) -> None:
+        self.blocks = [[_to_csr(b) for b in row] for row in blocks]
+        self.nrows = len(self.blocks)
+        self.ncols = len(self.blocks[0])
+
+        if row_sizes is None:
+            row_sizes = [max((b.shape[0] for b in row if b is not None), default=0)
+                         for row in self.blocks]
+        if col_sizes is None:
+            col_sizes = [max((self.blocks[i][j].shape[1] for i in range(self.nrows)
+                              if self.blocks[i][j] is not None), default=0)
+                         for j in range(self.ncols)]
+        self.row_offsets = _offsets(row_sizes)
+        self.col_offsets = _offsets(col_sizes)
+
+        for i, row in enumerate(self.blocks):
+            for j, b in enumerate(row):
+                if b is not None and tuple(b.shape) != (row_sizes[i], col_sizes[j]):
+                    raise ValueError(f"block ({i}, {j}) has shape {tuple(b.shape)}, "
+                                     f"but ({row_sizes[i]}, {col_sizes[j]}) is expected")
+
+    @classmethod
+    def from_blockform(cls, form) -> 'BlockOperator':
+        """Assemble every block of a BlockForm separately."""
+        return cls(form.blocks)
+
+    @classmethod
+    def from_matrix(cls, A: SparseTensor, sizes: Sequence[int]) -> 'BlockOperator':
+        """Split an assembled square matrix into blocks of the given sizes."""
+        A = A.tocsr()
+        off = _offsets(sizes)
+        if off[-1] != A.shape[0]:
+            raise ValueError(f"sum of block sizes {off[-1]} does not match the "
+                             f"matrix size {A.shape[0]}")
+        n = len(sizes)
+        blocks = [[A[off[i]:off[i+1], off[j]:off[j+1]] for j in range(n)]
+                  for i in range(n)]
+        return cls(blocks, sizes, sizes)
+
+    @property
+    def shape(self):
+        return (self.row_offsets[-1], self.col_offsets[-1])
+
+    def block(self, i: int, j: int) -> Optional[CSRTensor]:
+        return self.blocks[i][j]
+
+    def split(self, x: TensorLike, axis: str='col') -> List[TensorLike]:
+        """Views of the segments of `x` matching the block columns (or rows)."""
+        off = self.col_offsets if axis == 'col' else self.row_offsets
+        return [x[off[k]:off[k+1]] for k in range(len(off) - 1)]
+
+    def block_matmul(self, i: int, xs: List[TensorLike], cols=None) -> Optional[TensorLike]:
+        """Sum of A_ij @ xs[j] over the block columns `cols` (all by default)."""
+        out = None
+        for j in (range(self.ncols) if cols is None else cols):
+            b = self.blocks[i][j]
+            if b is None:
+                continue
+            y = b @ xs[j]
+            out = y if out is None else out + y
+        return out
+
+    def __matmul__(self, x: TensorLike) -> TensorLike:
+        xs = self.split(x)
+        ys = []
+        for i in range(self.nrows):
+            y = self.block_matmul(i, xs)
+            if y is None:
+                n = self.row_offsets[i+1] - self.row_offsets[i]
+                y = bm.zeros((n,) + x.shape[1:], **bm.context(x))
+            ys.append(y)
+        return bm.concatenate(ys, axis=0)
+
+
+### Approximate inverses of sub-blocks
+
+class DirectInverse():
+    """Exact inverse of a block by a sparse factorization, computed once and
+    reused by every application."""
+    def __init__(self, A: SparseTensor, solver_name: str='auto',
+                 matrix_type: str='G') -> None:
+        from .direct_solver_manger import DirectSolverManager
+        self.shape = A.shape
+        self.manager = DirectSolverManager(solver_name)
+        self.manager.set_matrix(A, matrix_type=matrix_type)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        return self.manager.solve(r)
+
+
+class AMGInverse():
+    """Approximate inverse of a block by algebraic multigrid cycles.
+
+    Parameters:
+        A (CSRTensor): the block.
+        cycles (int, optional): number of cycles per application. Defaults to 1.
+        **kwargs: options of `GAMGSolver`, e.g. `ptype`, `sstep`, `theta`.
+            The strength threshold `theta` defaults to 0.25 here, the classical
+            value giving mesh independent cycles on elliptic blocks.
+    """
+    def __init__(self, A: SparseTensor, cycles: int=1, **kwargs) -> None:
+        from .gamg_solver import GAMGSolver
+        self.shape = A.shape
+        self.cycles = cycles
+        kwargs.setdefault('theta', 0.25)
+        self.ml = GAMGSolver(**kwargs)
+        self.ml.setup(A.tocsr())
+        self._cycle = {'V': self.ml.vcycle, 'W': self.ml.wcycle,
+                       'F': self.ml.fcycle}[self.ml.ptype]
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        e = self._cycle(r)
+        for _ in range(self.cycles - 1):
+            e = e + self._cycle(r - self.ml.A[0] @ e)
+        return e
+
+
+class JacobiInverse():
+    """Inverse of the diagonal of a block, e.g. for mass matrices."""
+    def __init__(self, A: SparseTensor) -> None:
+        self.shape = A.shape
+        self.dinv = 1.0 / _diagonal(A)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        if r.ndim == 2:
+            return self.dinv[:, None] * r
+        return self.dinv * r
+
+
+_INVERSE_MAPPING = {
+    'direct': DirectInverse,
+    'amg': AMGInverse,
+    'jacobi': JacobiInverse,
+}
+
+
+def block_inverse(A: SparseTensor, method: str='amg', **kwargs) -> SupportsMatmul:
+    """Approximate inverse of a sub-block.
+
+    Parameters:
+        A (SparseTensor): the sub-block.
+        method (str, optional): 'direct' (sparse factorization), 'amg'
+            (multigrid cycles) or 'jacobi' (diagonal). Defaults to 'amg'.
+        **kwargs: options passed to the inverse class.
+    """
+    try:
+        cls = _INVERSE_MAPPING[method.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown block inverse method '{method}', "
+                         f"choose from {list(_INVERSE_MAPPING)}")
+    return cls(A, **kwargs)
+
+
+### Schur complement approximations
+# For the saddle-point system [[F, B^T], [B, 0]], the Schur complement is
+# S = -B F^{-1} B^T. The objects below apply approximations of S^{-1}.
+
+class PressureMassSchur():
+    """Schur complement approximation by the pressure mass matrix,
+    S^{-1} ~ scale * Mp^{-1}.
+
+    For the Stokes problem with viscosity nu, use `scale = 1/nu` in
+    block-diagonal preconditioners (which must be positive definite for
+    MINRES) and `scale = -1/nu` in block-triangular ones.
+
+    Parameters:
+        Mp (SparseTensor): pressure mass matrix.
+        scale (float, optional): scaling factor. Defaults to 1.0.
+        method (str, optional): inverse of Mp, see `block_inverse`.
+            Defaults to 'jacobi', which is spectrally equivalent for mass matrices.
+    """
+    def __init__(self, Mp: SparseTensor, scale: float=1.0, method: str='jacobi',
+                 **kwargs) -> None:
+        self.shape = Mp.shape
+        self.scale = scale
+        self.inv = block_inverse(Mp, method, **kwargs)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        return self.scale * (self.inv @ r)
+
+
+class LSCSchur():
+    """Least-squares commutator approximation of the Schur complement,
+
+        S^{-1} ~ -(B Q^{-1} B^T)^{-1} (B Q^{-1} F Q^{-1} B^T) (B Q^{-1} B^T)^{-1},
+
+    with Q the diagonal of the velocity mass matrix (identity if not given).
+    It only needs the blocks F and B and does not assume F symmetric, so it
+    also applies to Navier-Stokes (Oseen) problems.
+
+    This form is not mesh independent. No adjustment is made near Dirichlet
+    boundaries, and the iteration counts grow under refinement, with or
+    without Q: 22, 44, 96, 165 GMRES iterations for Q = None in
+    example/solver/stokes_block_preconditioner.py. For the Stokes problem,
+    use `PressureMassSchur`, whose iteration counts stay bounded.
+
+    Parameters:
+        F (SparseTensor): velocity block.
+        B (SparseTensor): divergence block, shaped (n_pressure, n_velocity).
+        Q (SparseTensor | None, optional): velocity mass matrix.
+        method (str, optional): inverse of B Q^{-1} B^T, see `block_inverse`.
+            Defaults to 'amg'. A direct factorization needs a non-singular
+            pressure Laplacian, e.g. with a fixed pressure dof.
+    """
+    def __init__(self, F: SparseTensor, B: SparseTensor, Q: Optional[SparseTensor]=None,
+                 method: str='amg', **kwargs) -> None:
+        F = F.tocsr()
+        B = B.tocsr()
+        n = F.shape[0]
+        if Q is None:
+            qinv = bm.ones(n, **bm.context(B.values))
+        else:
+            qinv = 1.0 / _diagonal(Q)
+        Qinv = spdiags(qinv, 0, n, n).tocsr()
+        BQ = B @ Qinv
+        self.shape = (B.shape[0], B.shape[0])
+        self.F = F
+        self.BQ = BQ
+        self.BQT = (Qinv @ B.T).tocsr()
+        self.inv = block_inverse((BQ @ B.T).tocsr(), method, **kwargs)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        y = self.inv @ r
+        y = self.BQ @ (self.F @ (self.BQT @ y))
+        return -(self.inv @ y)
+
+
+### Block preconditioners
+
+class BlockDiagonalPreconditioner():
+    """P^{-1} = diag(inv_0, inv_1, ...).
+
+    Symmetric positive definite when all the inverses are, so it can be
+    used with MINRES.
+
+    Parameters:
+        op (BlockOperator): the block system, used for the block sizes.
+        inverses (List[SupportsMatmul]): approximate inverses of the diagonal
+            blocks (or of the Schur complement for the last one).
+    """
+    def __init__(self, op: BlockOperator, inverses: List[SupportsMatmul]) -> None:
+        if len(inverses) != op.nrows:
+            raise ValueError(f"{op.nrows} inverses are needed, but got {len(inverses)}")
+        self.op = op
+        self.inverses = inverses
+        self.shape = op.shape
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        rs = self.op.split(r, axis='row')
+        return bm.concatenate([inv @ ri for inv, ri in zip(self.inverses, rs)], axis=0)
+
+
+class BlockTriangularPreconditioner():
+    """Inverse of the block upper (or lower) triangular part of the system,
+    with the diagonal blocks replaced by approximate inverses.
+
+    With the exact velocity inverse and the exact Schur complement, the upper
+    triangular preconditioner [[F, B^T], [0, S]]^{-1} makes GMRES converge in
+    two iterations. It is not symmetric, use it with GMRES.
+
+    Parameters:
+        op (BlockOperator): the block system.
+        inverses (List[SupportsMatmul]): approximate inverses of the diagonal
+            blocks (or of the Schur complement for the last one).
+        lower (bool, optional): use the lower triangular part. Defaults to False.
+    """
+    def __init__(self, op: BlockOperator, inverses: List[SupportsMatmul],
+                 lower: bool=False) -> None:
+        if len(inverses) != op.nrows:
+            raise ValueError(f"{op.nrows} inverses are needed, but got {len(inverses)}")
+        self.op = op
+        self.inverses = inverses
+        self.lower = lower
+        self.shape = op.shape
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        op = self.op
+        rs = op.split(r, axis='row')
+        n = op.nrows
+        xs: List[Any] = [None] * n
+        order = range(n) if self.lower else range(n - 1, -1, -1)
+        for i in order:
+            cols = range(i) if self.lower else range(i + 1, n)
+            y = op.block_matmul(i, xs, cols)
+            xs[i] = self.inverses[i] @ (rs[i] if y is None else rs[i] - y)
+        return bm.concatenate(xs, axis=0)
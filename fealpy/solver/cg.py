@@ -5,6 +5,7 @@ from ..backend import backend_manager as bm
 from ..backend import TensorLike
 
 from .. import logger
+from .krylov import KrylovWorkspace
 
 
 class SupportsMatmul(Protocol):
@@ -14,7 +15,8 @@ class SupportsMatmul(Protocol):
 def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, M: Optional[SupportsMatmul] = None, *,
        batch_first: bool=False,
        atol: float=1e-12, rtol: float=1e-8,
-       maxit: Optional[int]=10000,returninfo: bool=False) -> TensorLike:
+       maxit: Optional[int]=10000,returninfo: bool=False,
+       workspace: Optional[KrylovWorkspace]=None) -> TensorLike:
     """Solve a linear system Ax = b using the Conjugate Gradient (CG) method.
 
     Parameters:
@@ -28,7 +30,9 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, M: Optio
         rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
         maxit (int, optional): Maximum number of iterations allowed. Default is 10000.\
         If not provided, the method will continue until convergence based on the given tolerances.
-        returninfo(bool):if or not return info{['residual],['niter]}
+        returninfo(bool):if or not return info{['residual],['niter],['history']}
+        workspace (KrylovWorkspace, optional): buffers reused across calls,
+        see `KrylovSolver`. A temporary workspace is used if not given.
 
     Returns:
         Tensor: The approximate solution to the system Ax = b.
@@ -63,7 +67,7 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, M: Optio
         b = bm.swapaxes(b, 0, 1)
         x0 = bm.swapaxes(x0, 0, 1)
 
-    sol,info = _cg_impl(A, b, x0,M,atol, rtol, maxit)
+    sol,info = _cg_impl(A, b, x0,M,atol, rtol, maxit, workspace)
 
     if (not single_vector) and batch_first:
         sol = bm.swapaxes(sol, 0, 1)
@@ -73,34 +77,42 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, M: Optio
         return sol
 
 
-def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M: SupportsMatmul, atol, rtol, maxit):
+def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M: SupportsMatmul, atol, rtol, maxit,
+             workspace: Optional[KrylovWorkspace]=None):
     # initialize
-    info = {'residual': 0.0, 'niter': 0}
+    info = {'residual': 0.0, 'niter': 0, 'history': []}
     if bm.linalg.norm(b) < 1e-15:
         return bm.zeros_like(b), info
-    x = x0              # (dof, batch)
-    r = b - A @ x       # (dof, batch)
+    if workspace is None:
+        workspace = KrylovWorkspace()
+    workspace.prepare(b)
+    kernels = workspace.kernels
+    # NOTE: r, p and the scratch buffer live in the workspace and are updated
+    # in place; only the products with A and M create new tensors.
+    tmp = workspace.get('tmp', b)
+    x = bm.copy(x0)     # (dof, batch)
+    r = kernels.assign(workspace.get('r', b), b - A @ x)
     z = M @ r if M is not None else r
-    p = z               # (dof, batch)
+    p = kernels.assign(workspace.get('p', b), z)
     n_iter = 0
     b_norm = bm.linalg.norm(b)
-    sum_func = bm.sum
-    sqrt_func = bm.sqrt
-    rTr = sum_func(r * z, axis=0)
-    Ap = A @ p
+    rTr = kernels.dot(r, z)
+    history = info['history']
+    sqrt, sum_ = bm.bind('sqrt', 'sum')
     # iterate
     while True:
         Ap = A @ p      # (dof, batch)
-        alpha = rTr / sum_func(p*Ap, axis=0)  # r @ r / (p @ Ap) # (batch,)
-        x = x + alpha[None, ...] * p  # (dof, batch)
-        r_new = r - alpha[None, ...] * Ap
-        z_new = M @ r_new if M is not None  else r_new 
-        rTr_new = sum_func(r_new*z_new, axis=0)  # (batch,)
-        r_norm_new = sqrt_func(sum_func(rTr_new))
+        alpha = rTr / kernels.dot(p, Ap)  # r @ r / (p @ Ap) # (batch,)
+        x = kernels.axpy(alpha, p, x, tmp)  # x += alpha * p
+        r = kernels.axpy(-alpha, Ap, r, tmp)  # r -= alpha * Ap
+        z = M @ r if M is not None else r
+        rTr_new = kernels.dot(r, z)  # (batch,)
+        r_norm_new = sqrt(sum_(rTr_new))
 
         n_iter += 1
         info['residual'] = r_norm_new
         info['niter'] = n_iter
+        history.append(r_norm_new)
 
         if r_norm_new < atol:
             logger.info(f"CG: converged in {n_iter} iterations, "
@@ -117,9 +129,11 @@ def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M: SupportsMatmul
             break
 
         beta = rTr_new / rTr # (batch,)
-        p = z_new + beta[None, ...] * p
-        r, z, rTr = r_new, z_new, rTr_new
+        p = kernels.xpay(z, beta, p)  # p = z + beta * p
+        rTr = rTr_new
 
+    # NOTE: the residual norms are kept on the device until the end.
+    info['history'] = kernels.tolist(history)
     return x,info
 
     # @staticmethod
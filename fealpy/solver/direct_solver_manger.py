@@ -1,7 +1,9 @@
 import threading
+import hashlib
+from collections import OrderedDict
 from .. import logger
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import asyncio
 import inspect
 from ..backend import backend_manager as bm
@@ -20,6 +22,21 @@ class DirectSolverManager:
         mgr = DirectSolverManager(solver_name='auto')
         mgr.set_matrix(A, matrix_type='U')
         x = mgr.solve(b)
+
+    Factorization lifecycle:
+        The solvers supporting factorizations ('scipy', 'mumps', 'pardiso' and
+        'cholmod') split the solution into three phases:
+
+        1. `analyze()`: symbolic analysis (ordering), done once per sparsity pattern;
+        2. `factorize()`: numeric factorization, done once per matrix values,
+           reusing the symbolic analysis of the pattern;
+        3. `solve(b)`: forward and backward substitutions, `b` shaped (n, ) or (n, k).
+
+        `solve` calls the first two phases when needed. The analyses and the
+        factorizations are kept in LRU caches of `cache_size` entries keyed by
+        the fingerprints of the pattern and of the values, so switching between
+        a few matrices (e.g. in time stepping) does not refactorize them. Call
+        `set_matrix` again after modifying the values of the matrix in place.
     """
     _SOLVER_MAPPING: Dict[str, type] = {}
     _solver_cache = threading.local()
@@ -39,11 +56,12 @@ class DirectSolverManager:
             return solver_cls
         return decorator
 
-    def __init__(self, solver_name: str = 'auto'):
+    def __init__(self, solver_name: str = 'auto', cache_size: int = 4):
         """
         Initialize the DirectSolverManager.
         Parameters:
             solver_name: the name of the solver to use or 'auto' to select automatically.
+            cache_size: the maximum number of symbolic analyses and of factorizations kept.
         """
         self.solver_name = solver_name
         self.A = None
@@ -51,6 +69,12 @@ class DirectSolverManager:
         self._available: List[str] = []
         self._matrix_type: str = 'G'
         self.raw_kwargs: Dict[str, Any] = {}
+        self.cache_size = cache_size
+        self._fingerprint: Optional[Tuple[str, str]] = None
+        self._scipy_matrix = None
+        self._symbolics: OrderedDict = OrderedDict()
+        self._factors: OrderedDict = OrderedDict()
+        self._owners: Dict[tuple, Any] = {}
 
     @classmethod
     def available_solvers(cls) -> List[str]:
@@ -68,6 +92,8 @@ class DirectSolverManager:
         self.A = A
         self._matrix_type = matrix_type
         self.device = A.indices.device
+        self._fingerprint = matrix_fingerprint(A)
+        self._scipy_matrix = None
         
         # Clear thread-local solver cache
         for attr in ('solver', 'solver_name'):
@@ -150,25 +176,112 @@ class DirectSolverManager:
             if hasattr(self._solver_cache, attr):
                 delattr(self._solver_cache, attr)
 
+    def clear(self) -> None:
+        """Release all the cached analyses and factorizations."""
+        for solver, symbolic in self._symbolics.values():
+            solver.release(symbolic)
+        self._symbolics.clear()
+        self._factors.clear()
+        self._owners.clear()
+        self._clear_cache()
+
+    def _matrix(self):
+        """The matrix in scipy CSR format, converted once per `set_matrix`."""
+        if self._scipy_matrix is None:
+            A = self.A
+            if isinstance(A, COOTensor):
+                A = A.to_scipy().tocsr()
+            elif isinstance(A, CSRTensor):
+                A = A.to_scipy()
+            self._scipy_matrix = A
+        return self._scipy_matrix
+
+    def _check_factorization(self):
+        if self.A is None:
+            raise ValueError("Matrix not set, call set_matrix() first.")
+        solver = self.get_solver()
+        if not solver.supports_factorization:
+            raise NotImplementedError(f"Solver '{self.solver_name}' does not support "
+                                      "the factorization lifecycle.")
+        return solver
+
+    def analyze(self) -> Any:
+        """
+        Symbolic analysis of the current matrix, reused for all the matrices
+        with the same sparsity pattern and type.
+
+        Returns:
+            The solver-dependent symbolic analysis.
+        """
+        solver = self._check_factorization()
+        key = (self.solver_name, self._matrix_type, self._fingerprint[0])
+        if key in self._symbolics:
+            self._symbolics.move_to_end(key)
+            return self._symbolics[key][1]
+
+        symbolic = solver.analyze(self._matrix(), matrix_type=self._matrix_type)
+        self._symbolics[key] = (solver, symbolic)
+        while len(self._symbolics) > self.cache_size:
+            old, (old_solver, old_symbolic) = self._symbolics.popitem(last=False)
+            for fkey in [k for k in self._factors if k[:3] == old]:
+                del self._factors[fkey]
+            self._owners.pop(old, None)
+            old_solver.release(old_symbolic)
+        return symbolic
+
+    def factorize(self) -> Any:
+        """
+        Numeric factorization of the current matrix, reusing the symbolic
+        analysis of its pattern and the cached factorization of the same values.
+
+        Returns:
+            The solver-dependent factorization.
+        """
+        solver = self._check_factorization()
+        skey = (self.solver_name, self._matrix_type, self._fingerprint[0])
+        key = skey + (self._fingerprint[1], )
+        if key in self._factors:
+            self._factors.move_to_end(key)
+            return self._factors[key]
+
+        symbolic = self.analyze()
+        if solver.inplace_factor:
+            # The factorization is stored in the symbolic analysis, which holds
+            # only one of them.
+            owner = self._owners.get(skey, None)
+            if owner is not None:
+                self._factors.pop(owner, None)
+            self._owners[skey] = key
+        logger.debug(f"Factorizing the matrix with solver '{self.solver_name}'")
+        factor = solver.factorize(self._matrix(), matrix_type=self._matrix_type,
+                                  symbolic=symbolic)
+        self._factors[key] = factor
+        while len(self._factors) > self.cache_size:
+            self._factors.popitem(last=False)
+        return factor
+
     def solve(self, b: Any):
         """
-        Synchronously solve A x = b, then clear the solver cache.
+        Synchronously solve A x = b.
 
         Parameters:
-            b: right-hand side vector or tensor.
+            b: right-hand side vector shaped (n, ), or a block of right-hand
+                sides shaped (n, k).
         Returns:
-            x: solution as a NumPy ndarray.
+            x: solution tensor.
         """
         if self.A is None:
             raise ValueError("Matrix not set, call set_matrix() first.")
         solver = self.get_solver()
-        x = solver.solve(self.A, b, matrix_type=self._matrix_type)
-        self._clear_cache()
-        return x
+        if not solver.supports_factorization:
+            return solver.solve(self.A, b, matrix_type=self._matrix_type)
+        factor = self.factorize()
+        arr = bm.to_numpy(b) if not isinstance(b, np.ndarray) else b
+        return bm.tensor(solver.solve_factor(factor, arr))
 
     async def solve_async(self, b: Any) -> np.ndarray:
         """
-        Asynchronously solve A x = b, then clear the solver cache.
+        Asynchronously solve A x = b.
 
         Parameters:
             b: right-hand side vector or tensor.
@@ -179,7 +292,10 @@ class DirectSolverManager:
             raise ValueError("Matrix not set, call set_matrix() first.")
         solver = self.get_solver()
         arr = bm.to_numpy(b) if not isinstance(b, np.ndarray) else b
-        if hasattr(solver, 'solve_async') and inspect.iscoroutinefunction(solver.solve_async):
+        if solver.supports_factorization:
+            loop = asyncio.get_event_loop()
+            x = await loop.run_in_executor(None, lambda: self.solve(arr))
+        elif hasattr(solver, 'solve_async') and inspect.iscoroutinefunction(solver.solve_async):
             x = await solver.solve_async(self.A, arr, matrix_type=self._matrix_type)
         else:
             loop = asyncio.get_event_loop()
@@ -187,11 +303,37 @@ class DirectSolverManager:
                 None,
                 lambda: solver.solve(self.A, arr, matrix_type=self._matrix_type)
             )
-        self._clear_cache()
         return x
 
+
+def matrix_fingerprint(A: Any) -> Tuple[str, str]:
+    """
+    Fingerprints of the sparsity pattern and of the values of a COOTensor or
+    CSRTensor, used as the keys of the caches of `DirectSolverManager`.
+    """
+    if isinstance(A, CSRTensor):
+        index = (A.crow, A.col)
+    else:
+        index = (A.indices, )
+    pattern = hashlib.blake2b(digest_size=16)
+    pattern.update(f"{type(A).__name__}{tuple(A.shape)}".encode())
+    for array in index:
+        pattern.update(np.ascontiguousarray(bm.to_numpy(array)).tobytes())
+    values = hashlib.blake2b(digest_size=16)
+    values.update(np.ascontiguousarray(bm.to_numpy(A.values)).tobytes())
+    return pattern.hexdigest(), values.hexdigest()
+
 class BaseSolver(ABC):
-    """Abstract base class for all solver implementations."""
+    """Abstract base class for all solver implementations.
+
+    Solvers supporting the factorization lifecycle set `supports_factorization`
+    and implement `analyze`, `factorize` and `solve_factor`, all of them
+    working on scipy CSR matrices. If `inplace_factor` is set, the
+    factorization is stored in the symbolic analysis object, so a symbolic
+    analysis holds at most one factorization.
+    """
+    supports_factorization = False
+    inplace_factor = False
 
     def __init__(self, **kwargs):
         self.kwargs = kwargs
@@ -201,10 +343,28 @@ class BaseSolver(ABC):
         """Solve the linear system A x = b."""
         pass
 
+    def analyze(self, A, matrix_type: str = 'G') -> Any:
+        """Symbolic analysis of the scipy CSR matrix A."""
+        return None
+
+    def factorize(self, A, matrix_type: str = 'G', symbolic: Any = None) -> Any:
+        """Numeric factorization of the scipy CSR matrix A."""
+        raise NotImplementedError
+
+    def solve_factor(self, factor: Any, b: np.ndarray) -> np.ndarray:
+        """Solve with a factorization, `b` shaped (n, ) or (n, k)."""
+        raise NotImplementedError
+
+    def release(self, symbolic: Any) -> None:
+        """Release the memory held by a symbolic analysis."""
+        pass
+
 @DirectSolverManager.register('scipy')
 class ScipySolver(BaseSolver):
     """Solver using scipy.sparse.linalg."""
 
+    supports_factorization = True
+
     def solve(self, A, b, matrix_type: str = 'G') :
         if isinstance(A, COOTensor):
             A = A.to_scipy().tocsr()
@@ -219,9 +379,31 @@ class ScipySolver(BaseSolver):
         else:
             return bm.tensor(spsolve(A, b, **self.kwargs))
 
+    # SuperLU does not expose its symbolic phase, so `analyze` is a no-op
+    # and every factorization computes its own column ordering.
+    def factorize(self, A, matrix_type: str = 'G', symbolic=None):
+        if matrix_type in ('U', 'L'):
+            return (A, matrix_type == 'L')
+        from scipy.sparse.linalg import splu
+        if matrix_type in ('SP', 'S'):
+            permc_spec = self.kwargs.get('permc_spec', 'MMD_AT_PLUS_A')
+            return splu(A.tocsc(), permc_spec=permc_spec,
+                        options=dict(SymmetricMode=True), diag_pivot_thresh=0.0)
+        return splu(A.tocsc(), permc_spec=self.kwargs.get('permc_spec', 'COLAMD'))
+
+    def solve_factor(self, factor, b):
+        if isinstance(factor, tuple):
+            from scipy.sparse.linalg import spsolve_triangular
+            A, lower = factor
+            return spsolve_triangular(A, b, lower=lower)
+        return factor.solve(np.asarray(b, dtype=np.float64))
+
 @DirectSolverManager.register('mumps')
 class MumpsSolver(BaseSolver):
     """Solver using MUMPS (via pymumps)."""
+
+    supports_factorization = True
+    inplace_factor = True
     
 
     def solve(self, A, b, matrix_type: str = 'G') :
@@ -241,10 +423,56 @@ class MumpsSolver(BaseSolver):
         ctx.destroy()
         return bm.tensor(x)
 
+    def analyze(self, A, matrix_type: str = 'G'):
+        from mumps import DMumpsContext
+        sym = {'G': 0, 'SP': 1, 'S': 2}.get(matrix_type, 0)
+        A = A.tocoo()
+        # Only the upper triangle of a symmetric matrix is given to MUMPS
+        index = np.nonzero(A.col >= A.row)[0] if sym else np.arange(A.nnz)
+        ctx = DMumpsContext(par=1, sym=sym, comm=None)
+        ctx.set_silent()
+        ctx.set_shape(A.shape[0])
+        ctx.set_centralized_assembled_rows_cols(
+            (A.row[index] + 1).astype('i'), (A.col[index] + 1).astype('i'))
+        ctx.set_centralized_assembled_values(np.ascontiguousarray(A.data[index]))
+        ctx.run(job=1)
+        return ctx, index
+
+    def factorize(self, A, matrix_type: str = 'G', symbolic=None):
+        ctx, index = symbolic
+        # The values of a CSR matrix are in the same order as its COO form
+        ctx.set_centralized_assembled_values(np.ascontiguousarray(A.data[index]))
+        ctx.run(job=2)
+        return ctx
+
+    def solve_factor(self, factor, b):
+        b = np.asarray(b, dtype=np.float64)
+        if b.ndim == 1:
+            x = b.copy()
+            factor.set_rhs(x)
+            factor.run(job=3)
+            return x
+        # All the columns in one solve phase: MUMPS reads the right hand sides
+        # as a column-major (lrhs, nrhs) block and overwrites it by the solution.
+        n, nrhs = b.shape
+        x = np.array(b.T, dtype=np.float64, order='C')
+        factor.id.nrhs = nrhs
+        factor.id.lrhs = n
+        factor.id.rhs = factor.cast_array(x)
+        factor.run(job=3)
+        factor.id.nrhs = 1
+        return x.T
+
+    def release(self, symbolic):
+        symbolic[0].destroy()
+
 @DirectSolverManager.register('pardiso')
 class PardisoSolver(BaseSolver):
     """Solver using pypardiso."""
 
+    supports_factorization = True
+    inplace_factor = True
+
     def solve(self, A, b: np.ndarray, matrix_type: str = 'G') :
         if isinstance(A, COOTensor):
             A = A.to_scipy().tocsr()
@@ -260,10 +488,35 @@ class PardisoSolver(BaseSolver):
         solver.free_memory(everything=True)
         return bm.tensor(x)
 
+    # The public API of pypardiso has no separate analysis phase: `factorize`
+    # runs the analysis and the numerical factorization (phase 12) together,
+    # so `analyze` only creates and configures the solver.
+    def analyze(self, A, matrix_type: str = 'G'):
+        from pypardiso import PyPardisoSolver
+        mapping = {'G': 11, 'SP': 1, 'S': 1}
+        solver = PyPardisoSolver()
+        solver.set_matrix_type(mapping.get(matrix_type.upper(), 11))
+        return solver
+
+    def factorize(self, A, matrix_type: str = 'G', symbolic=None):
+        A = A.tocsr()
+        symbolic.factorize(A)
+        return symbolic, A
+
+    def solve_factor(self, factor, b):
+        # `solve` reuses the stored factorization as long as A is unchanged.
+        solver, A = factor
+        return solver.solve(A, np.asarray(b, dtype=np.float64))
+
+    def release(self, symbolic):
+        symbolic.free_memory(everything=True)
+
 @DirectSolverManager.register('cholmod')
 class CholmodSolver(BaseSolver):
     """Solver using scikit-sparse Cholmod."""
 
+    supports_factorization = True
+
     def solve(self, A, b, matrix_type: str = 'G') -> np.ndarray:
         if matrix_type != 'SP':
             raise ValueError("CholmodSolver only supports SP type")
@@ -276,6 +529,19 @@ class CholmodSolver(BaseSolver):
         factor = cholesky(A)
         return bm.tensor(factor(b))
 
+    def analyze(self, A, matrix_type: str = 'G'):
+        if matrix_type != 'SP':
+            raise ValueError("CholmodSolver only supports SP type")
+        from sksparse.cholmod import analyze
+        return analyze(A.tocsc())
+
+    def factorize(self, A, matrix_type: str = 'G', symbolic=None):
+        # A new factor reusing the symbolic analysis
+        return symbolic.cholesky(A.tocsc())
+
+    def solve_factor(self, factor, b):
+        return factor(np.asarray(b, dtype=np.float64))
+
 @DirectSolverManager.register('cupy')
 class CupySolver(BaseSolver):
     """Solver using CuPy for GPU-based sparse solutions."""
@@ -3,12 +3,14 @@ from ..backend import backend_manager as bm
 from ..operator import LinearOperator
 from .cg import cg
 from scipy.sparse.linalg import spsolve_triangular,spsolve
-from .amg import ruge_stuben_amg
+from .amg import amg_coarsen, DEFAULT_THETA
 from ..sparse.coo_tensor import COOTensor
 from ..sparse.csr_tensor import CSRTensor
+from ..sparse._spspmm import spgemm_symbolic, spgemm_numeric
 from .. import logger
 from ..utils import timer
 import time 
+from typing import Optional
 from scipy.sparse.linalg import eigs
 
 class GAMGSolver():
@@ -23,10 +25,13 @@ class GAMGSolver():
     6.Algebraic multigrid methods use the structure of the discrete matrix to construct prolongation and restriction operators.
 
     Parameters:
-        theta(float) : Coarsening coefficient
+        theta(float) : Coarsening coefficient, None for 0.025 with the C/F
+                       splitting methods and 0.08 with 'sa'
         csize(int)   : Size of the coarsest problem
-        ctype(str)   : Coarsening method
-        itype(str)   : Interpolation method
+        ctype(str)   : Coarsening method of the algebraic coarsening, 'C' or 'rs'
+                       (classical Ruge-Stuben), 'pmis', 'hmis' or 'sa' (smoothed aggregation)
+        itype(str)   : Interpolation method of 'rs', 'pmis' and 'hmis', 'T' or 'direct',
+                       and 'classical'
         ptype(str)   : Preconditioner type
         sstep(int)   : Default number of smoothing steps
         isolver(str) : Default iterative solver; other options include 'MG'
@@ -34,12 +39,17 @@ class GAMGSolver():
         csolver(str) : Default solver for the coarsest grid
         rtol(float)  : Relative error convergence threshold
         atol(float)  : Absolute error convergence threshold
+        max_reuse(int)     : Maximum number of numeric updates by `update` before a
+                             full setup, None for no limit
+        reuse_factor(float): A full setup is triggered by `update` when the last
+                             solve took more than `reuse_factor` times the iterations
+                             of the first solve after the full setup
 
     Returns:
         Tensor: The numerical solutions under Multigrid solver.
     """
     def __init__(self,
-            theta: float = 0.025, # 粗化系数
+            theta: Optional[float] = None, # 粗化系数
             csize: int = 50, # 最粗问题规模
             ctype: str = 'C', # 粗化方法
             itype: str = 'T', # 插值方法
@@ -50,6 +60,8 @@ class GAMGSolver():
             csolver: str = 'direct', # 默认粗网格解法器
             rtol: float = 1e-8,      # 相对误差收敛阈值
             atol: float = 1e-8,      # 绝对误差收敛阈值
+            max_reuse: Optional[int] = None, # 两次完整 setup 之间最多的数值更新次数
+            reuse_factor: float = 1.5, # 迭代次数增长超过该倍数时重新 setup
             ):
         self.csize = csize 
         self.theta = theta
@@ -62,6 +74,9 @@ class GAMGSolver():
         self.csolver = csolver
         self.rtol = rtol
         self.atol = atol
+        self.max_reuse = max_reuse
+        self.reuse_factor = reuse_factor
+        self.setup_timing = {}
 
     def setup(self, A, P=None, R=None, mesh=None, space=None, cdegree=[1]):
         """
@@ -72,6 +87,13 @@ class GAMGSolver():
             R (Optional[list]): restriction matrix, from coarsest to finnest
             mesh (Optional[Mesh]): the mesh
         """
+        # 0. Record the arguments and reset the state of `update`
+        self._setup_args = (P, R, mesh, space, cdegree)
+        self._plan = None
+        self.nupdate = 0
+        self.niter_ref = None
+        self.niter = None
+
         # 1. Initialize the storage structure for operators
         self.A = [A]  # List to store the system matrices at each level
         self.L = []   # List to store the lower triangular matrices
@@ -102,23 +124,43 @@ class GAMGSolver():
         elif mesh is not None: # geometric coarsening from finnest to coarsest
             pass
         else: # algebraic coarsening 
+            ctype = {'C': 'rs'}.get(self.ctype, self.ctype)
+            itype = {'T': 'direct'}.get(self.itype, self.itype)
+            theta = self.theta
+            if theta is None:
+                theta = DEFAULT_THETA['sa'] if ctype == 'sa' else 0.025
+            timing = {'strength': 0.0, 'splitting': 0.0, 'interpolation': 0.0,
+                      'galerkin': 0.0, 'smoother': 0.0}
             NN = bm.ceil(bm.log2(self.A[-1].shape[0])/2-4)
             NL = max(min(int(NN), 8), 2) # 估计粗化的层数 
-            start_time = time.time()
+            start_time = time.perf_counter()
             for l in range(NL):
+                p, r = amg_coarsen(self.A[-1], theta, ctype, itype, timing=timing)
+                if p.shape[1] in (0, self.A[-1].shape[0]): # 无法继续粗化
+                    if l == 0:
+                        logger.warning(f"The matrix of size {self.A[0].shape[0]} cannot be "
+                                       f"coarsened by '{ctype}' with theta={theta}; "
+                                       "the solver falls back to the coarsest grid solver.")
+                    break
+
+                t = time.perf_counter()
                 self.L.append(self.A[-1].tril()) # 前磨光的光滑子
                 self.U.append(self.A[-1].triu()) # 后磨光的光滑子
+                timing['smoother'] += time.perf_counter() - t
 
-                p, r = ruge_stuben_amg(self.A[-1], self.theta)
-                
                 self.P.append(p)
                 self.R.append(r)
 
+                t = time.perf_counter()
                 self.A.append(r @ self.A[-1] @ p)
+                timing['galerkin'] += time.perf_counter() - t
                 if self.A[-1].shape[0] < self.csize:
                     break
-            end_time = time.time()
-            logger.info(f"Coarsening time: {end_time-start_time}")
+            timing['total'] = time.perf_counter() - start_time
+            self.setup_timing = timing
+            logger.info(f"Coarsening time: {timing['total']}")
+            logger.info("Setup time of the phases: " + ", ".join(
+                f"{k} {v:.4f}s" for k, v in timing.items() if k != 'total'))
             # # 计算最粗矩阵最大和最小特征值
             # A = self.A[-1].toarray()
             # emax, _ = eigs(A, 1, which='LM')
@@ -131,6 +173,103 @@ class GAMGSolver():
             #     N = self.A[-1].shape[0]
             #     self.A[-1] += 1e-12*bm.eye(N)  
 
+    def update(self, A, force=False):
+        """
+        Update the hierarchy for a new matrix without coarsening again.
+
+        The prolongation and restriction operators are kept, only the coarse
+        matrices `R @ A @ P` and the smoothers are recomputed from the values of
+        the new matrix. The symbolic triple products and the positions of the
+        smoothers are computed at the first update and cached. A full setup is
+        done instead when:
+
+        1. `force` is True, or no setup has been done;
+        2. the sparsity pattern of `A` differs from the one of the setup;
+        3. `max_reuse` numeric updates have been done since the last setup;
+        4. the last solve took more than `reuse_factor` times the iterations of
+           the first solve after the last setup.
+
+        Parameters:
+            A (CSRTensor): the new matrix.
+            force (bool): do a full setup anyway.
+
+        Returns:
+            bool: True if a full setup has been done.
+        """
+        reason = self._setup_reason(A, force)
+        if reason is not None:
+            logger.info(f"GAMG update: full setup, {reason}.")
+            P, R, mesh, space, cdegree = getattr(self, '_setup_args', (None, )*4 + ([1], ))
+            self.setup(A, P=P, R=R, mesh=mesh, space=space, cdegree=cdegree)
+            return True
+
+        start_time = time.perf_counter()
+        if self._plan is None:
+            self._plan = self._reuse_plan()
+
+        values = A.values
+        self.A[0] = A
+        for l, (lower, upper, ra, rap) in enumerate(self._plan):
+            Al = self.A[l]
+            self.L[l] = CSRTensor(lower[0], lower[1], values[lower[2]], Al.sparse_shape)
+            self.U[l] = CSRTensor(upper[0], upper[1], values[upper[2]], Al.sparse_shape)
+            values = spgemm_numeric(ra, self.R[l].values, values)
+            values = spgemm_numeric(rap, values, self.P[l].values)
+            self.A[l+1] = CSRTensor(rap.crow, rap.col, values, rap.shape)
+
+        self.nupdate += 1
+        logger.info(f"GAMG update: numeric update {self.nupdate} in "
+                    f"{time.perf_counter() - start_time} seconds.")
+        return False
+
+    def _setup_reason(self, A, force):
+        """Return the reason of a full setup in `update`, or None."""
+        if force:
+            return "forced"
+        if getattr(self, 'A', None) is None:
+            return "no hierarchy"
+        A0 = self.A[0]
+        if A is not A0:
+            if (A.shape != A0.shape) or (A.nnz != A0.nnz):
+                return "the sparsity pattern has changed"
+            if (A.crow is not A0.crow) and not bm.all(A.crow == A0.crow):
+                return "the sparsity pattern has changed"
+            if (A.col is not A0.col) and not bm.all(A.col == A0.col):
+                return "the sparsity pattern has changed"
+        if (self.max_reuse is not None) and (self.nupdate >= self.max_reuse):
+            return f"{self.nupdate} numeric updates have been done"
+        if (self.niter_ref is not None) and (self.niter is not None) and \
+                (self.niter > self.reuse_factor * self.niter_ref):
+            return (f"the convergence degraded from {self.niter_ref} "
+                    f"to {self.niter} iterations")
+        return None
+
+    def _reuse_plan(self):
+        """
+        Symbolic part of `update`: for each level, the structures of the
+        smoothers with the positions of their values in the level matrix, and
+        the patterns of `R @ A` and `(R @ A) @ P`. The coarse matrices of the
+        plan follow the structures of the patterns.
+        """
+        plan = []
+        crow, col = self.A[0].crow, self.A[0].col
+        for l in range(len(self.P)):
+            shape = self.A[l].sparse_shape
+            row = bm.repeat(bm.arange(shape[0], **bm.context(crow)), crow[1:] - crow[:-1])
+            smoothers = []
+            for flag in (row >= col, col >= row):
+                index = bm.nonzero(flag)[0]
+                count = bm.bincount(row[index], minlength=shape[0])
+                scrow = bm.concat([bm.zeros((1, ), **bm.context(count)),
+                                   bm.cumsum(count, axis=0)], axis=0)
+                smoothers.append((bm.astype(scrow, crow.dtype), col[index], index))
+            R, P = self.R[l], self.P[l]
+            ra = spgemm_symbolic(R.crow, R.col, R.sparse_shape, crow, col, shape)
+            rap = spgemm_symbolic(ra.crow, ra.col, ra.shape, P.crow, P.col, P.sparse_shape)
+            plan.append((smoothers[0], smoothers[1], ra, rap))
+            crow, col = rap.crow, rap.col
+        return plan
+
     def construct_coarse_equation(self, A, F, level=1):
         """
         Given a linear algebraic system, construct a smaller-scale problem
@@ -211,11 +350,15 @@ class GAMGSolver():
         if self.isolver == 'CG':
             x0 = bm.zeros(N, **self.kargs)
             x, info = cg(self.A[0], b, x0=x0, M=P, atol=self.atol, rtol=self.rtol, maxit=self.maxit, returninfo=True)
-            return x,info
         elif self.isolver == 'MG':
             x0 = bm.zeros(N, **self.kargs)
             x, info = self.mg_solve(b, x0=x0)
-            return x,info
+
+        # 记录迭代次数, 供 `update` 判断收敛性是否变差
+        self.niter = info.get('niter', None)
+        if self.niter_ref is None:
+            self.niter_ref = self.niter
+        return x,info
 
     def mg_solve(self,r,x0=None):
         info = {}
@@ -0,0 +1,151 @@
+from typing import Optional, Protocol, Dict, Tuple, Any
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+
+class SupportsMatmul(Protocol):
+    def __matmul__(self, other: TensorLike) -> TensorLike: ...
+
+
+class KrylovKernels():
+    """In-place vector kernels shared by the Krylov solvers.
+
+    Every kernel returns its output, so that backends with immutable tensors
+    (jax, ...) fall back to the functional form while numpy and pytorch update
+    the workspace buffers in place without temporary arrays. Vectors are
+    shaped (dof,) or (dof, batch); coefficients are scalars or shaped (batch,).
+    The backend functions are bound once when the kernels are created.
+    """
+    def __init__(self, backend_name: Optional[str]=None) -> None:
+        self.backend_name = bm.backend_name if backend_name is None else backend_name
+        self._dot, self._einsum, self._multiply, self._add, self._copy = \
+            bm.bind('dot', 'einsum', 'multiply', 'add', 'copy')
+
+    def dot(self, x: TensorLike, y: TensorLike) -> TensorLike:
+        """Column-wise inner products of x and y, in one pass."""
+        if x.ndim == 1:
+            return self._dot(x, y)
+        return self._einsum('ij,ij->j', x, y)
+
+    def assign(self, out: TensorLike, x: TensorLike) -> TensorLike:
+        """out <- x"""
+        if self.backend_name == 'numpy':
+            out[:] = x
+            return out
+        elif self.backend_name == 'pytorch':
+            return out.copy_(x)
+        return self._copy(x)
+
+    def axpy(self, alpha, x: TensorLike, y: TensorLike, tmp: TensorLike) -> TensorLike:
+        """y <- y + alpha * x, with `tmp` as scratch buffer shaped like x."""
+        if self.backend_name == 'numpy':
+            self._multiply(x, alpha, out=tmp)
+            return self._add(y, tmp, out=y)
+        elif self.backend_name == 'pytorch':
+            if isinstance(alpha, (int, float)):
+                return y.add_(x, alpha=alpha)
+            return y.addcmul_(x, alpha)
+        return y + alpha * x
+
+    def scal(self, alpha, x: TensorLike, out: TensorLike) -> TensorLike:
+        """out <- alpha * x"""
+        if self.backend_name == 'numpy':
+            return self._multiply(x, alpha, out=out)
+        elif self.backend_name == 'pytorch':
+            return out.copy_(x).mul_(alpha)
+        return alpha * x
+
+    def xpay(self, x: TensorLike, beta, y: TensorLike) -> TensorLike:
+        """y <- x + beta * y"""
+        if self.backend_name == 'numpy':
+            self._multiply(y, beta, out=y)
+            return self._add(y, x, out=y)
+        elif self.backend_name == 'pytorch':
+            return y.mul_(beta).add_(x)
+        return x + beta * y
+
+    def tolist(self, values: list) -> list:
+        """Floats of the scalars recorded during a solve, fetched in one
+        transfer instead of one device synchronization per iteration."""
+        if len(values) == 0:
+            return []
+        return bm.to_numpy(bm.stack(values)).tolist()
+
+
+class KrylovWorkspace():
+    """Buffers of a Krylov solver, reused as long as the shape, the dtype and
+    the device of the right-hand side do not change."""
+    def __init__(self) -> None:
+        self._buffers: Dict[str, TensorLike] = {}
+        self._key: Optional[Tuple[Any, ...]] = None
+        self.kernels = KrylovKernels()
+
+    def prepare(self, b: TensorLike) -> None:
+        key = (bm.backend_name, tuple(b.shape), b.dtype, bm.get_device(b))
+        if key != self._key:
+            self._buffers.clear()
+            self._key = key
+            self.kernels = KrylovKernels()
+
+    def get(self, name: str, like: TensorLike) -> TensorLike:
+        buf = self._buffers.get(name, None)
+        if buf is None:
+            buf = bm.empty_like(like)
+            self._buffers[name] = buf
+        return buf
+
+    def clear(self) -> None:
+        self._buffers.clear()
+        self._key = None
+
+
+class KrylovSolver():
+    """Reusable Krylov solver keeping its workspace across calls.
+
+    Parameters:
+        A (SupportsMatmul): the coefficient matrix.
+        method (str, optional): 'cg', 'bicgstab' or 'minres'. Defaults to 'cg'.
+        M (SupportsMatmul | None, optional): inverse of the preconditioner.
+        atol, rtol (float, optional): absolute and relative tolerances.
+        maxit (int | None, optional): maximum number of iterations.
+
+    Example:
+        solver = KrylovSolver(A, 'cg', M=P, rtol=1e-10)
+        for b in rhs:
+            x = solver.solve(b)
+            print(solver.info['niter'], solver.info['history'][-1])
+    """
+    def __init__(self, A: SupportsMatmul, method: str='cg',
+                 M: Optional[SupportsMatmul]=None, *,
+                 atol: float=1e-12, rtol: float=1e-8,
+                 maxit: Optional[int]=10000) -> None:
+        method = method.lower()
+        if method not in ('cg', 'bicgstab', 'minres'):
+            raise ValueError(f"Unsupported Krylov method '{method}'")
+        self.A = A
+        self.M = M
+        self.method = method
+        self.atol = atol
+        self.rtol = rtol
+        self.maxit = maxit
+        self.workspace = KrylovWorkspace()
+        self.info: Dict[str, Any] = {}
+
+    def solve(self, b: TensorLike, x0: Optional[TensorLike]=None) -> TensorLike:
+        if self.method == 'cg':
+            from .cg import cg
+            x, info = cg(self.A, b, x0, self.M, atol=self.atol, rtol=self.rtol,
+                         maxit=self.maxit, returninfo=True, workspace=self.workspace)
+        elif self.method == 'bicgstab':
+            from .bicgstab import bicgstab
+            x, info = bicgstab(self.A, b, x0, atol=self.atol, rtol=self.rtol,
+                               maxit=self.maxit, M=self.M, workspace=self.workspace)
+        else:
+            from .minres import minres
+            x, info = minres(self.A, b, x0, atol=self.atol, rtol=self.rtol,
+                             maxit=self.maxit, M=self.M, workspace=self.workspace)
+        self.info = info
+        return x
+
+    __call__ = solve
@@ -6,6 +6,7 @@ from ..sparse.coo_tensor import COOTensor
 from ..sparse.csr_tensor import CSRTensor
 
 from .. import logger
+from .krylov import KrylovWorkspace
 
 
 class SupportsMatmul(Protocol):
@@ -21,7 +22,8 @@ def minres(
     maxit: Optional[int] = None,
     M: Optional[SupportsMatmul] = None,
     *,
-    shape: Optional[tuple[int,int]] = None
+    shape: Optional[tuple[int,int]] = None,
+    workspace: Optional[KrylovWorkspace] = None
 ) -> tuple[TensorLike, dict]:
     """
     Solve a linear system Ax = b using MINimum RESidual iteration (minres) method.
@@ -37,10 +39,13 @@ def minres(
             If not provided, the method will continue until convergence based on tolerances.
         M (TensorLike): Inverse of the preconditioner of `A`.  `M` should approximate the
             inverse of `A` and be easy to solve. Defaults to None.
+        workspace (KrylovWorkspace, optional): buffers reused across calls,
+            see `KrylovSolver`. A temporary workspace is used if not given.
 
     Returns:
         TensorLike: The approximate solution to the system Ax = b.
-        dict: Information dictionary containing residual, iteration count, and relative tolerance.
+        dict: Information dictionary containing residual, iteration count, relative tolerance
+            and the residual history.
 
     Raises:
         ValueError: If inputs do not meet specified conditions (e.g., dimensions mismatch).
@@ -66,48 +71,42 @@ def minres(
             n = m
 
     maxit = maxit or 5 * m  # Default maximum iterations
-    if x0 is None:
-        r = b.copy()
-    else:
-        r = b - A @ x0  # Initial residual
+    if workspace is None:
+        workspace = KrylovWorkspace()
+    workspace.prepare(b)
+    kernels = workspace.kernels
+    sqrt, = bm.bind('sqrt')
+
+    # NOTE: the vectors below live in the workspace and are updated in place;
+    # only the products with A and M create new tensors. The Lanczos vectors
+    # and the search directions rotate between their buffers.
+    tmp = workspace.get('tmp', b)
+    x = bm.copy(x0)
+    r = b - A @ x  # Initial residual
     if M is not None:
         y = M @ r
     else:
         y = r
-    beta = bm.sqrt(y @ r)
+    beta = sqrt(kernels.dot(y, r))
 
     # check if A is symmetric
     w = A @ r
     w_1 = A @ w
-    s = w @ w
-    a = r @ w_1
+    s = kernels.dot(w, w)
+    a = kernels.dot(r, w_1)
     eps = bm.finfo(x0.dtype).eps
     epsa = (s + eps) * eps**(1.0 / 3.0)
     if bm.abs(s - a) > epsa:
         raise ValueError("A must be symmetric matrix")
-    
-    # check if M is symmetric
-    # if M is not None:
-    #     w = M @ r
-    #     w_1 = M @ w
-    #     s = w @ w
-    #     a = r @ w_1
-    #     if bm.abs(s - a) > epsa:
-    #         raise ValueError('non-symmetric preconditioner')
-
-    if x0 is not None:
-        kwags = bm.context(x0)
-    else:
-        kwags = bm.context(b)
+    del w, w_1
 
     info = {}
+    history = []
 
     # bases of Krylov subspace
     r2 = r1 = r
-    
-    # Tridiagonal matrix storage
-    T_diag = []  # Main diagonal elements
-    T_offdiag = []  # Off-diagonal elements
+    v = workspace.get('v', b)
+    v0 = workspace.get('v0', b)
 
     # QR decomposition elements
     a1 = 0
@@ -116,54 +115,52 @@ def minres(
     a = 0
     b0 = 0
     d = 0
+    # The last two diagonal elements of the tridiagonal matrix, and the
+    # previous off-diagonal element, after the rotations applied so far.
+    diag0 = diag1 = 0
+    oldbeta = beta
 
     t_0 = 0
     t_1 = beta
 
-    p_1 = bm.zeros(n, **kwags)
-    p_0 = bm.zeros(n, **kwags)
-    p_2 = bm.zeros(n, **kwags)
-    
+    p_0 = kernels.scal(0, b, workspace.get('p0', b))
+    p_1 = kernels.scal(0, b, workspace.get('p1', b))
+    p_2 = kernels.scal(0, b, workspace.get('p2', b))
+
     Tnorm = 0  # Norm of tridiagonal matrix
-    x = x0
     prev_res = float('inf')
-    Tnorm = 0
-    
+
     for niter in range(maxit):
         # Lanczos
-        s = 1.0 / beta
-        if niter > 0:
-            w0 = w
-        v = s * y
-        w = v
-        y = bm.tensor(A @ v)
-        
+        v, v0 = v0, v
+        v = kernels.scal(1.0 / beta, y, v)
+        y = A @ v
+
         # Orthogonalization
         if niter > 0:
-            y -= (T_offdiag[niter-1] / oldbeta) * r1
-        T_diag.append(v @ y)
-        y -= (T_diag[niter] / beta) * r2
+            y = kernels.axpy(-(beta / oldbeta), r1, y, tmp)
+        alpha = kernels.dot(v, y)
+        y = kernels.axpy(-(alpha / beta), r2, y, tmp)
 
         oldbeta = beta
         r1 = r2
         r2 = y
         if M is not None:
             y = M @ y
-        beta = r2 @ y
-        beta = bm.sqrt(beta)
-        T_offdiag.append(beta)
-        
+        beta = sqrt(kernels.dot(r2, y))
+
         # Update Tnorm
         Tnorm0 = Tnorm
-        Tnorm += T_diag[-1]**2 + T_offdiag[-1]**2 + oldbeta**2
-        Anorm = bm.sqrt(bm.tensor(Tnorm0))
-        
+        Tnorm = Tnorm + alpha**2 + beta**2 + oldbeta**2
+        diag0, diag1 = diag1, alpha
+
         if niter < 1:
-            continue 
+            continue
+        Anorm = sqrt(Tnorm0)
 
         # QR step
-        c = T_diag[-2] / bm.sqrt(abs(T_offdiag[-2])**2 + abs(T_diag[-2])**2)
-        s = T_offdiag[-2] / bm.sqrt(abs(T_offdiag[-2])**2 + abs(T_diag[-2])**2)
+        c = diag0 / sqrt(abs(oldbeta)**2 + abs(diag0)**2)
+        s = oldbeta / sqrt(abs(oldbeta)**2 + abs(diag0)**2)
         t_0 = t_1
         t_1 = s * t_0
         t_0 = c * t_0
@@ -172,33 +169,36 @@ def minres(
         a2 = b1
         a1 = a
         b1 = b0
-        T_diag = bm.set_at(T_diag, -2, c*T_diag[-2] + s*T_offdiag[-2])
+        diag0 = c*diag0 + s*oldbeta
         if niter < 2:
-            a = c * T_offdiag[-2] + s * T_diag[-1]
-            T_diag = bm.set_at(T_diag, -1, s.conj()*T_offdiag[-2] - c*T_diag[-1])
+            a = c * oldbeta + s * diag1
+            diag1 = s.conj()*oldbeta - c*diag1
         else:
-            a = c * d + s * T_diag[-1]
-            T_diag = bm.set_at(T_diag, -1, s*d - c*T_diag[-1])
+            a = c * d + s * diag1
+            diag1 = s*d - c*diag1
 
-        b0 = s * T_offdiag[-1]
-        d = -c * T_offdiag[-1]
-        T_offdiag[-2] = 0
+        b0 = s * beta
+        d = -c * beta
 
         # x
-        p_0 = p_1
-        p_1 = p_2
-        p_2 = (w0 - a1 * p_1 - a2 * p_0) / T_diag[-2]
-        x = x + t_0 * p_2
+        p_0, p_1, p_2 = p_1, p_2, p_0
+        # p_2 = (v0 - a1 * p_1 - a2 * p_0) / diag0
+        p_2 = kernels.assign(p_2, v0)
+        p_2 = kernels.axpy(-a1, p_1, p_2, tmp)
+        p_2 = kernels.axpy(-a2, p_0, p_2, tmp)
+        p_2 = kernels.scal(1.0 / diag0, p_2, p_2)
+        x = kernels.axpy(t_0, p_2, x, tmp)
 
         # Residual
         res = bm.abs(t_1)
+        history.append(res)
         # Monitor residual growth
         if res > prev_res:
             logger.warning("Residual stagnation, terminating early.")
             break
 
         prev_res = res
-        xnorm = bm.linalg.norm(x)
+        xnorm = sqrt(kernels.dot(x, x))
         stop_res = res / (Anorm * xnorm)
 
         # Convergence checks
@@ -213,7 +213,7 @@ def minres(
                 f"minres: converged in {niter} iterations, (relative tolerance: {rtol:.1e})"
             )
             break
-        
+
         if (maxit is not None) and (niter >= maxit):
             logger.info(f"minres: failed, stopped by maxiter ({maxit}).")
             break
@@ -221,4 +221,5 @@ def minres(
     info['residual'] = res
     info['niter'] = niter
     info['relative tolerance'] = stop_res
-    return x,info
\ No newline at end of file
+    info['history'] = kernels.tolist(history)
+    return x, info
@@ -9,6 +9,7 @@ from .coo_tensor import COOTensor
 from .csr_tensor import CSRTensor
 
 from .ops import spdiags, speye
+from ._parallel_spmv import SymmetricCSR, get_num_threads, set_num_threads
 
 
 
@@ -0,0 +1,236 @@
+"""Multithreaded sparse matrix-vector kernels for CSR matrices on CPU.
+
+The rows of the matrix are split into blocks holding about the same number of
+non-zeros, and every block is handled by scipy's compiled `csr_matvec(s)`
+kernels on a thread pool. These kernels release the GIL, so the blocks run in
+parallel without any copy of the matrix: a block only passes a view of the
+row pointers together with the full column and value arrays.
+
+Only the numpy backend is concerned, other backends rely on their own threaded
+kernels.
+"""
+import os
+from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from numpy.typing import NDArray
+
+_Size = Tuple[int, ...]
+
+# Matrices with fewer non-zeros are multiplied by the serial kernel, as the
+# thread synchronization would cost more than the product itself.
+PARALLEL_NNZ_THRESHOLD = 200_000
+
+_num_threads: int = int(os.environ.get('FEALPY_NUM_THREADS', os.cpu_count() or 1))
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_num_threads() -> int:
+    """Number of threads used by the parallel sparse kernels."""
+    return _num_threads
+
+
+def set_num_threads(n: int) -> None:
+    """Set the number of threads used by the parallel sparse kernels.
+
+    The default value is taken from the environment variable
+    `FEALPY_NUM_THREADS`, or the number of CPUs if it is not set.
+    With `n = 1`, `CSRTensor.matmul` never selects the parallel kernels.
+    """
+    global _num_threads, _executor
+    n = int(n)
+    if n < 1:
+        raise ValueError(f"number of threads must be positive, but got {n}")
+    if n != _num_threads and _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    _num_threads = n
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_num_threads,
+                                       thread_name_prefix='fealpy-spmv')
+    return _executor
+
+
+def use_parallel_spmv(nnz: int) -> bool:
+    """Whether a matrix with `nnz` non-zeros should use the parallel kernels."""
+    return _num_threads > 1 and nnz >= PARALLEL_NNZ_THRESHOLD
+
+
+def nnz_balanced_partition(crow: NDArray, nparts: int) -> NDArray:
+    """Split the rows into `nparts` contiguous blocks of nearly equal non-zeros.
+
+    Parameters:
+        crow (ndarray): compressed row pointers, shaped (M+1,).
+        nparts (int): number of blocks.
+
+    Returns:
+        ndarray: the block bounds, shaped (nparts+1,). Block `i` holds rows
+            `bounds[i]:bounds[i+1]`; blocks may be empty for tiny matrices.
+    """
+    nrow = crow.shape[0] - 1
+    target = np.linspace(0, crow[-1], nparts + 1)
+    bounds = np.searchsorted(crow, target, side='left')
+    bounds[0], bounds[-1] = 0, nrow
+    return np.minimum(np.maximum.accumulate(bounds), nrow)
+
+
+def _sparsetools():
+    # NOTE: scipy.sparse is imported by the first product, not with fealpy.sparse.
+    from scipy.sparse import _sparsetools
+    return _sparsetools
+
+
+def _result_type(values: NDArray, x: NDArray):
+    dtype = np.result_type(values.dtype, x.dtype)
+    return np.ascontiguousarray(values, dtype=dtype), np.ascontiguousarray(x, dtype=dtype)
+
+
+def _check_operand(ncol: int, x: NDArray):
+    if x.ndim not in (1, 2):
+        raise ValueError("`other` must be a 1-D or 2-D array.")
+    if x.shape[0] != ncol:
+        raise ValueError("Incompatible shapes detected in sparse-dense "
+                         f"multiplication, {ncol} columns and {x.shape}")
+
+
+def _csr_block(crow, col, values, ncol, x, y, r0, r1):
+    if r1 <= r0:
+        return
+    st = _sparsetools()
+    if x.ndim == 1:
+        st.csr_matvec(r1 - r0, ncol, crow[r0:r1+1], col, values, x, y[r0:r1])
+    else:
+        nvec = x.shape[1]
+        st.csr_matvecs(r1 - r0, ncol, nvec, crow[r0:r1+1], col, values,
+                    x.ravel(), y[r0:r1].ravel())
+
+
+def parallel_csr_spmm(crow: NDArray, col: NDArray, values: NDArray, spshape: _Size,
+                      x: NDArray, *, bounds: Optional[NDArray]=None) -> NDArray:
+    """Multithreaded CSR matrix times dense vector(s), y = A @ x.
+
+    Parameters:
+        crow, col, values (ndarray): the CSR arrays of A.
+        spshape (Size): shape of A.
+        x (ndarray): dense vector shaped (N,) or vectors shaped (N, k).
+        bounds (ndarray | None, optional): row blocks from `nnz_balanced_partition`.
+            Computed for the current number of threads if not given.
+
+    Returns:
+        ndarray: shaped (M,) or (M, k).
+    """
+    M, N = spshape
+    _check_operand(N, x)
+    values, x = _result_type(values, x)
+    if bounds is None:
+        bounds = nnz_balanced_partition(crow, _num_threads)
+    y = np.zeros((M,) + x.shape[1:], dtype=x.dtype)
+
+    nparts = bounds.shape[0] - 1
+    if nparts == 1:
+        _csr_block(crow, col, values, N, x, y, 0, M)
+        return y
+
+    executor = _get_executor()
+    futures = [executor.submit(_csr_block, crow, col, values, N, x, y,
+                               bounds[i], bounds[i+1]) for i in range(nparts)]
+    for f in futures:
+        f.result()
+    return y
+
+
+class SymmetricCSR():
+    """Symmetric sparse matrix keeping only its strictly upper triangle in CSR.
+
+    The product is evaluated as y = D x + U x + U^T x. Every block of rows of U
+    contributes to its own rows through U and to all rows through U^T, so each
+    thread accumulates into a private buffer that is summed at the end. About
+    half of the index and value memory of the full matrix is read per product,
+    which is the limiting factor of SpMV.
+
+    Parameters:
+        crow, col, values (ndarray): CSR arrays of the full symmetric matrix.
+        spshape (Size): shape of the matrix, must be square.
+        nthreads (int | None, optional): number of row blocks, defaults to
+            `get_num_threads()`.
+    """
+    def __init__(self, crow: NDArray, col: NDArray, values: NDArray, spshape: _Size,
+                 nthreads: Optional[int]=None) -> None:
+        M, N = spshape
+        if M != N:
+            raise ValueError(f"symmetric matrix must be square, but got {spshape}")
+        counts = np.diff(crow)
+        row = np.repeat(np.arange(M, dtype=col.dtype), counts)
+        upper = col > row
+        diag = col == row
+
+        self.shape = (M, N)
+        self.diag = np.zeros(M, dtype=values.dtype)
+        np.add.at(self.diag, row[diag], values[diag])
+        self.col = np.ascontiguousarray(col[upper])
+        self.values = np.ascontiguousarray(values[upper])
+        ucounts = np.bincount(row[upper], minlength=M)
+        self.crow = np.zeros(M + 1, dtype=crow.dtype)
+        np.cumsum(ucounts, out=self.crow[1:])
+        self.nthreads = _num_threads if nthreads is None else int(nthreads)
+        self.bounds = nnz_balanced_partition(self.crow, self.nthreads)
+
+    @classmethod
+    def from_csr(cls, A, nthreads: Optional[int]=None) -> 'SymmetricCSR':
+        """Build from a CSRTensor (or scipy csr_matrix) storing the full matrix."""
+        if hasattr(A, 'crow'):
+            return cls(np.asarray(A.crow), np.asarray(A.col), np.asarray(A.values),
+                       A.sparse_shape, nthreads)
+        return cls(A.indptr, A.indices, A.data, A.shape, nthreads)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored entries, including the diagonal."""
+        return self.col.shape[0] + self.shape[0]
+
+    def _block(self, values, x, y, r0, r1):
+        if r1 <= r0:
+            return
+        N = self.shape[1]
+        crow = self.crow[r0:r1+1]
+        st = _sparsetools()
+        if x.ndim == 1:
+            st.csr_matvec(r1 - r0, N, crow, self.col, values, x, y[r0:r1])
+            st.csc_matvec(N, r1 - r0, crow, self.col, values, x[r0:r1], y)
+        else:
+            nvec = x.shape[1]
+            st.csr_matvecs(r1 - r0, N, nvec, crow, self.col, values,
+                           x.ravel(), y[r0:r1].ravel())
+            st.csc_matvecs(N, r1 - r0, nvec, crow, self.col, values,
+                           x[r0:r1].ravel(), y.ravel())
+
+    def matmul(self, x: NDArray) -> NDArray:
+        M = self.shape[0]
+        _check_operand(M, x)
+        values, x = _result_type(self.values, x)
+        diag = self.diag.reshape((M,) + (1,) * (x.ndim - 1))
+        nparts = self.bounds.shape[0] - 1
+
+        if nparts == 1:
+            y = diag * x
+            self._block(values, x, y, 0, M)
+            return y
+
+        buffers = [np.zeros_like(x) for _ in range(nparts)]
+        executor = _get_executor()
+        futures = [executor.submit(self._block, values, x, buffers[i],
+                                   self.bounds[i], self.bounds[i+1])
+                   for i in range(nparts)]
+        for f in futures:
+            f.result()
+        y = diag * x
+        for buf in buffers:
+            y += buf
+        return y
+
+    __matmul__ = matmul
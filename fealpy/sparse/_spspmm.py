@@ -1,5 +1,5 @@
 
-from typing import Tuple
+from typing import Tuple, NamedTuple
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike as _DT
@@ -7,6 +7,33 @@ from ..backend import TensorLike as _DT
 _Size = Tuple[int, ...]
 
 
+class SpGEMMPattern(NamedTuple):
+    """Symbolic result of a sparse-sparse matrix multiplication C = A @ B.
+
+    The pattern only depends on the sparsity structures of A and B. It can be
+    reused by `spgemm_numeric` for any values living on the same structures.
+
+    Attributes:
+        crow (Tensor): compressed row pointers of C, shaped (M+1,).
+        col (Tensor): column indices of C, sorted inside each row, shaped (nnz,).
+        left (Tensor): index into the non-zeros of A for every product, shaped (nprod,).
+        right (Tensor): index into the non-zeros of B for every product, shaped (nprod,).
+        segment (Tensor): non-decreasing index of the non-zero of C that every
+            product is accumulated to, shaped (nprod,).
+        shape (Size): sparse shape of C.
+    """
+    crow: _DT
+    col: _DT
+    left: _DT
+    right: _DT
+    segment: _DT
+    shape: _Size
+
+    @property
+    def nnz(self) -> int:
+        return self.col.shape[0]
+
+
 def _shape_check(spshape1: _Size, spshape2: _Size):
     if len(spshape1) != 2 or len(spshape2) != 2:
         raise ValueError("Sparse tensors to matmul must be both 2-D for sparse dims, "
@@ -17,99 +44,147 @@ def _shape_check(spshape1: _Size, spshape2: _Size):
                         f"got shape {spshape1} and {spshape2}.")
 
 
-def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
-               indices2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
-    _shape_check(spshape1, spshape2)
-
+def _structure_check(values1: _DT, values2: _DT):
     structure = values1.shape[:-1]
     if values2.shape[:-1] != structure:
         raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
                          f"must match that of matrix1 {structure}")
+    return structure
 
-    size = spshape1[1]
-    indices_list = []
-    values_list = []
-
-    for i in range(size):
-        left_col_flag = (indices1[1, :] == i)
 
-        if not bm.any(left_col_flag, axis=0):
-            continue
+def _crow_to_row(crow: _DT) -> _DT:
+    """Expand compressed row pointers to the row index of every non-zero."""
+    counts = crow[1:] - crow[:-1]
+    row = bm.arange(counts.shape[0], **bm.context(crow))
+    return bm.repeat(row, counts)
 
-        right_row_flag = (indices2[0, :] == i)
 
-        if not bm.any(right_row_flag, axis=0):
-            continue
+def _exclusive_cumsum(x: _DT) -> _DT:
+    return bm.cumsum(x, axis=0) - x
 
-        row = indices1[0, left_col_flag]
-        col = indices2[1, right_row_flag]
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.meshgrid(row, col, indexing='ij')
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., right_row_flag]
 
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
-        indices_list.append(idx)
-        values_list.append(val)
+def spgemm_symbolic(crow1: _DT, col1: _DT, spshape1: _Size,
+                    crow2: _DT, col2: _DT, spshape2: _Size) -> SpGEMMPattern:
+    """Symbolic phase of the CSR-CSR matrix multiplication.
 
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
-    return indices, values, (spshape1[0], spshape2[1])
-
-
-def spspmm_csr(crow1: _DT, col1: _DT, values1: _DT, spshape1: _Size,
-               crow2: _DT, col2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
+    Every non-zero A[i, k] is paired with the whole row k of B by a
+    vectorized expansion, then the products are sorted by the flattened
+    output position and grouped into segments. No Python-level loop over
+    rows or columns is involved.
+    """
     _shape_check(spshape1, spshape2)
+    M, N = spshape1[0], spshape2[1]
+    ctx = bm.context(crow1)
+
+    nnz1 = col1.shape[0]
+    count2 = crow2[1:] - crow2[:-1]
+    nprod = count2[col1] # number of products generated by each non-zero of A
+    offset = _exclusive_cumsum(nprod)
+    total = int(bm.sum(nprod)) if nnz1 > 0 else 0
+
+    if total == 0:
+        crow = bm.zeros((M+1, ), **ctx)
+        empty = bm.zeros((0, ), **ctx)
+        return SpGEMMPattern(crow, empty, empty, empty, empty, (M, N))
+
+    left = bm.repeat(bm.arange(nnz1, **ctx), nprod)
+    right = bm.arange(total, **ctx) + bm.repeat(crow2[col1] - offset, nprod)
+
+    # Flattened positions exceed int32 as soon as M * N > 2**31, so the keys
+    # are always formed in int64.
+    row = bm.astype(_crow_to_row(crow1)[left], bm.int64)
+    key = row * N + bm.astype(col2[right], bm.int64)
+
+    if bm.backend_name == 'numpy':
+        order = key.argsort(kind='stable')
+    else:
+        order = bm.argsort(key)
+    key = key[order]
+    left = left[order]
+    right = right[order]
+
+    head = bm.concat([
+        bm.ones((1, ), dtype=bm.bool, device=bm.get_device(key)),
+        key[1:] != key[:-1]
+    ], axis=0)
+    segment = bm.cumsum(bm.astype(head, key.dtype), axis=0) - 1
+    ukey = key[head]
+    col = bm.astype(ukey % N, col1.dtype)
+    count = bm.bincount(ukey // N, minlength=M)
+    crow = bm.concat([bm.zeros((1, ), **bm.context(count)), bm.cumsum(count, axis=0)], axis=0)
+    crow = bm.astype(crow, crow1.dtype)
+
+    return SpGEMMPattern(crow, col, left, right, segment, (M, N))
+
+
+def spgemm_numeric(pattern: SpGEMMPattern, values1: _DT, values2: _DT) -> _DT:
+    """Numeric phase of the CSR-CSR matrix multiplication.
+
+    Parameters:
+        pattern (SpGEMMPattern): the result of `spgemm_symbolic`.
+        values1 (Tensor): non-zero values of A, shaped (..., nnz1).
+        values2 (Tensor): non-zero values of B, shaped (..., nnz2).
+
+    Returns:
+        Tensor: non-zero values of C, shaped (..., nnz) following `pattern.col`.
+    """
+    structure = _structure_check(values1, values2)
+    prod = values1[..., pattern.left] * values2[..., pattern.right]
+    nnz = pattern.nnz
+
+    if nnz == 0:
+        return bm.zeros(structure + (0, ), dtype=prod.dtype, device=bm.get_device(prod))
+
+    if bm.backend_name == 'numpy':
+        # Segments are sorted, so a single reduceat is enough and much faster
+        # than the unbuffered `np.add.at` behind `index_add`.
+        import numpy as np
+        seg = pattern.segment
+        starts = np.flatnonzero(np.concatenate([[1], seg[1:] != seg[:-1]]))
+        return np.add.reduceat(prod, starts, axis=-1)
+
+    values = bm.zeros(structure + (nnz, ), dtype=prod.dtype, device=bm.get_device(prod))
+    return bm.index_add(values, pattern.segment, prod, axis=-1)
 
-    structure = values1.shape[:-1]
-    if values2.shape[:-1] != structure:
-        raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
-                         f"must match that of matrix1 {structure}")
-
-    size = spshape1[0]
-    indices_list = []
-    values_list = []
-    kargs = bm.context(crow1)
-    new_crow = bm.zeros(size+1, **kargs)
-
-    for i in range(size):
-        row = bm.array([], **kargs)
-        left_col_flag = (col1 == i)
 
-        for x in bm.where(left_col_flag == True)[0]+1:
-            flag = ~(x>crow1[:-1])^(x<=crow1[1:])
-            row = bm.concat((row,(bm.where(flag == True))[0]))
-
-        col = col2[crow2[i]:crow2[i+1]]
-
-        if not bm.any(row, axis=0):
-            continue
+def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
+               indices2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
+    """Sparse-sparse matrix multiplication for COO tensors.
 
-        if not bm.any(col, axis=0):
-            continue
+    The products are generated by the vectorized expansion of
+    `spgemm_symbolic`; the returned indices are coalesced.
+    """
+    _shape_check(spshape1, spshape2)
+    _structure_check(values1, values2)
+    M, K = spshape1
+    ctx = bm.context(indices1)
 
-        idx = bm.meshgrid(row, col, indexing='ij')
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., crow2[i]:crow2[i+1]]
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
+    order1 = bm.argsort(indices1[0])
+    crow1 = bm.concat([bm.zeros((1, ), **ctx),
+                       bm.cumsum(bm.bincount(indices1[0], minlength=M), axis=0)], axis=0)
+    order2 = bm.argsort(indices2[0])
+    crow2 = bm.concat([bm.zeros((1, ), **ctx),
+                       bm.cumsum(bm.bincount(indices2[0], minlength=K), axis=0)], axis=0)
 
-        indices_list.append(idx)
-        values_list.append(val)
+    pattern = spgemm_symbolic(
+        bm.astype(crow1, indices1.dtype), indices1[1, order1], spshape1,
+        bm.astype(crow2, indices2.dtype), indices2[1, order2], spshape2
+    )
+    values = spgemm_numeric(pattern, values1[..., order1], values2[..., order2])
+    indices = bm.stack([_crow_to_row(pattern.crow), pattern.col], axis=0)
 
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
+    return indices, values, pattern.shape
 
-    unique_indices, inverse_indices = bm.unique(indices, return_inverse=True, axis=1)
-    new_values = bm.zeros(unique_indices.shape[1])
-    new_values = bm.index_add(new_values, inverse_indices, values, axis=-1)
 
-    for x in unique_indices[0,:]:
-        # new_crow[x+1]+=1
-        new_crow = bm.set_at(new_crow, x+1, new_crow[x+1])
+def spspmm_csr(crow1: _DT, col1: _DT, values1: _DT, spshape1: _Size,
+               crow2: _DT, col2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _DT, _Size]:
+    """Sparse-sparse matrix multiplication for CSR tensors.
 
-    new_crow=bm.cumsum(new_crow, axis =-1)
+    Batched values shaped (..., nnz) are supported as long as the dense
+    shapes of the two operands are the same.
+    """
+    _structure_check(values1, values2)
+    pattern = spgemm_symbolic(crow1, col1, spshape1, crow2, col2, spshape2)
+    values = spgemm_numeric(pattern, values1, values2)
 
-    return new_crow, unique_indices[1,:], new_values,(spshape1[0], spshape2[1])
+    return pattern.crow, pattern.col, values, pattern.shape
@@ -8,7 +8,7 @@ from .sparse_tensor import SparseTensor
 from .utils import (
     flatten_indices, check_shape_match, check_spshape_match
 )
-from ._spspmm import spspmm_coo
+from ._spspmm import spspmm_csr
 from ._spmm import spmm_coo
 
 
@@ -453,21 +453,22 @@ class COOTensor(SparseTensor):
             if (self.values is None) or (other.values is None):
                 raise ValueError("Matrix multiplication between COOTensor without "
                                  "value is not implemented now")
-            if hasattr(bm, 'csr_spspmm'):
-                from .csr_tensor import CSRTensor
-                mat1 = self.tocsr()
-                mat2 = other.tocsr()
+            from .csr_tensor import CSRTensor
+            mat1 = self.tocsr()
+            mat2 = other.tocsr()
+            # NOTE: backend kernels do not support batched values,
+            # the vectorized engine is used for them and for other backends.
+            if hasattr(bm, 'csr_spspmm') and self.dense_ndim == 0:
                 crow, col, values, spshape = bm.csr_spspmm(
                     mat1.crow, mat1.col, mat1.values, mat1.sparse_shape,
                     mat2.crow, mat2.col, mat2.values, mat2.sparse_shape
                 )
-                return CSRTensor(crow, col, values, spshape)
             else:
-                indices, values, spshape = spspmm_coo(
-                    self.indices, self.values, self.sparse_shape,
-                    other.indices, other.values, other.sparse_shape,
+                crow, col, values, spshape = spspmm_csr(
+                    mat1.crow, mat1.col, mat1.values, mat1.sparse_shape,
+                    mat2.crow, mat2.col, mat2.values, mat2.sparse_shape
                 )
-            return COOTensor(indices, values, spshape).coalesce().tocsr()
+            return CSRTensor(crow, col, values, spshape)
 
         elif isinstance(other, TensorLike):
             if self.values is None:
@@ -11,6 +11,9 @@ from .utils import (
 )
 from ._spspmm import spspmm_csr
 from ._spmm import spmm_csr
+from ._parallel_spmv import (
+    parallel_csr_spmm, use_parallel_spmv, nnz_balanced_partition, get_num_threads
+)
 from .coo_tensor import COOTensor
 
 class CSRTensor(SparseTensor):
@@ -178,9 +181,10 @@ class CSRTensor(SparseTensor):
             raise ValueError("Only CSRTensor with 0 dense dimension "
                              "can be converted to scipy sparse matrix")
 
+        # Copy the arrays, as scipy may sort the indices in place.
         return csr_matrix(
             (bm.to_numpy(self._values), bm.to_numpy(self._col), bm.to_numpy(self._crow)),
-            shape = self._spshape
+            shape = self._spshape, copy=True
         )
 
     @classmethod
@@ -428,21 +432,30 @@ class CSRTensor(SparseTensor):
             if (self.values is None) or (other.values is None):
                 raise ValueError("Matrix multiplication between CSRTensor without "
                                  "value is not implemented now")
-            if hasattr(bm, 'csr_spspmm'):
+            # NOTE: backend kernels do not support batched values,
+            # the vectorized engine is used for them and for other backends.
+            if hasattr(bm, 'csr_spspmm') and self.dense_ndim == 0:
                 crow, col, values, spshape = bm.csr_spspmm(
                     self.crow, self.col, self.values, self.sparse_shape,
                     other.crow, other.col, other.values, other.sparse_shape
                 )
             else:
-                crow, col,values, spshape = spspmm_csr(
-                    self._crow,self._col ,self._values, self.sparse_shape,
-                    other._crow, other._col,other._values, other.sparse_shape,
+                crow, col, values, spshape = spspmm_csr(
+                    self._crow, self._col, self._values, self.sparse_shape,
+                    other._crow, other._col, other._values, other.sparse_shape,
                 )
             return CSRTensor(crow, col, values, spshape)
 
         elif isinstance(other, TensorLike):
             if self.values is None:
                 raise ValueError()
+            # NOTE: large matrices on the numpy backend use the multithreaded
+            # kernels, with the row partition cached on the tensor.
+            if bm.backend_name == 'numpy' and self.dense_ndim == 0 \
+                    and other.ndim in (1, 2) and use_parallel_spmv(self.nnz):
+                return parallel_csr_spmm(self._crow, self._col, self._values,
+                                         self._spshape, other,
+                                         bounds=self._spmv_partition())
             if hasattr(bm, 'csr_spmm'):
                 return bm.csr_spmm(self._crow, self._col, self._values, self._spshape, other)
             else:
@@ -452,6 +465,16 @@ class CSRTensor(SparseTensor):
             raise TypeError(f"Unsupported type {type(other).__name__} in matmul")
 
 
+    def _spmv_partition(self):
+        """Row partition of the parallel SpMV kernels, cached until the
+        row pointers or the number of threads change."""
+        cache = getattr(self, '_spmv_cache', None)
+        nthreads = get_num_threads()
+        if cache is None or cache[0] is not self._crow or cache[1] != nthreads:
+            cache = (self._crow, nthreads, nnz_balanced_partition(self._crow, nthreads))
+            self._spmv_cache = cache
+        return cache[2]
+
     def find(self):
         """
         Find the non-zero entries in the sparse matrix..
@@ -0,0 +1,82 @@
+import threading
+
+import numpy as np
+import pytest
+
+from fealpy.backend import BackendManager
+
+
+def test_dispatch_table():
+    manager = BackendManager(default_backend='numpy')
+    assert manager.add is np.add
+    assert manager.backend_name == 'numpy'
+    assert 'add' in manager._tables['numpy']
+    assert manager.bind('sqrt', 'backend_name') == (np.sqrt, 'numpy')
+
+    # Setting an attribute through the manager drops the resolved attributes.
+    add = manager.add
+    manager.add = np.subtract
+    assert manager.add is np.subtract
+    assert manager._tables['numpy'].get('sqrt', None) is None
+    manager.add = add
+    assert manager.add is np.add
+
+    with pytest.raises(AttributeError):
+        manager.not_a_function
+
+
+def test_dispatch_threads():
+    manager = BackendManager()
+    manager.set_backend('numpy')
+    assert manager.backend_name == 'numpy'
+    result = {}
+
+    def worker():
+        # The backend of the main thread is not seen by the other threads.
+        try:
+            manager.backend_name
+        except RuntimeError:
+            result['unset'] = True
+        manager.set_backend('numpy')
+        result['worker'] = manager.add
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert result == {'unset': True, 'worker': np.add}
+    assert manager.backend_name == 'numpy'
+
+
+def test_dispatch_switch():
+    torch = pytest.importorskip('torch')
+    manager = BackendManager(default_backend='numpy')
+    assert manager.add is np.add
+    manager.set_backend('pytorch')
+    assert manager.add is torch.add
+    assert manager.bind('sqrt', 'backend_name') == (torch.sqrt, 'pytorch')
+
+    names = {}
+
+    def worker():
+        names['default'] = manager.backend_name
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert names == {'default': 'numpy'}
+    manager.set_backend('numpy')
+    assert manager.add is np.add
+
+
+def test_dispatch_compile():
+    torch = pytest.importorskip('torch')
+    manager = BackendManager(default_backend='pytorch')
+
+    def func(a, b):
+        # `stack` is resolved for the first time while tracing.
+        return manager.stack([a, b], axis=0).sum(0)
+
+    func = torch.compile(func, dynamic=True)
+    a = torch.arange(4, dtype=torch.float64)
+    assert torch.equal(func(a, a), 2*a)
+    assert 'stack' in manager._tables['pytorch']
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import UniformMesh2d, UniformMesh3d
+from fealpy.cem import EMFDTDSim
+from fealpy.cem.fdtd_recorder import MemmapRecorder
+
+
+def make_sim(dim, bc, n=8):
+    h = 1 / n
+    if dim == 2:
+        mesh = UniformMesh2d((0, n, 0, n), h=(h, h))
+    else:
+        mesh = UniformMesh3d((0, n, 0, n, 0, n), h=(h, h, h))
+    sim = EMFDTDSim(mesh, NT=12, R=0.5)
+    if bc == 'UPML':
+        sim.boundary('UPML', m=4, ng=2)
+    params = {'amplitude': 1.0, 'frequency': 0, 'PPW': 8}
+    sim.set_source([0.5] * dim, 'sine', params=params)
+    if dim == 3:
+        sim.set_source([0.25] * dim, 'sine', params=params, direction='x')
+    return sim
+
+
+def fields(sim):
+    out = {}
+    for name, F in (('E', sim.E), ('H', sim.H)):
+        for c, v in F.items():
+            if v is not None:
+                out[name + c] = bm.to_numpy(v)
+    return out
+
+
+class TestEMFDTDEngine:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("dim", [2, 3])
+    @pytest.mark.parametrize("bc", ['PEC', 'UPML'])
+    def test_fast_engine(self, backend, dim, bc):
+        bm.set_backend(backend)
+        ref = make_sim(dim, bc)
+        ref.run(step=3)
+        fast = make_sim(dim, bc)
+        fast.run(step=3, engine='fast')
+
+        expected, result = fields(ref), fields(fast)
+        # NOTE: the default engine stores the frames in the default float
+        # dtype of the backend, float32 for pytorch.
+        rtol = 1e-12 if backend == 'numpy' else 1e-6
+        assert expected.keys() == result.keys()
+        for name in expected:
+            assert result[name].shape == expected[name].shape
+            np.testing.assert_allclose(result[name], expected[name], rtol=rtol, atol=1e-14)
+        bm.set_backend('numpy')
+
+    def test_memmap_recorder(self, tmp_path):
+        bm.set_backend('numpy')
+        ref = make_sim(2, 'UPML')
+        ref.run(step=2)
+        sim = make_sim(2, 'UPML')
+        sim.run(step=2, engine='fast', recorder=MemmapRecorder(str(tmp_path), flush_every=2))
+
+        for name in ('E_z', 'H_x', 'H_y'):
+            data = np.load(tmp_path / f"{name}.npy", mmap_mode='r')
+            field, comp = name.split('_')
+            np.testing.assert_allclose(data, getattr(ref, field)[comp], rtol=1e-12, atol=1e-14)
+
+    def test_upml_coefficients_cache(self):
+        bm.set_backend('numpy')
+        sim = make_sim(2, 'UPML')
+        c0 = sim.upml_coefficients()
+        assert sim.upml_coefficients() is c0
+        sim.boundary('UPML', m=4, ng=3)
+        assert sim.upml_coefficients() is not c0
+
+    def test_unknown_engine(self):
+        bm.set_backend('numpy')
+        sim = make_sim(2, 'PEC')
+        with pytest.raises(ValueError):
+            sim.run(engine='jit')
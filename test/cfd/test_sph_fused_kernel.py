@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.cfd.simulation.sph.equation_solver import EquationSolver
+from fealpy.cfd.simulation.sph.processing_technology import ProcessingTechnology
+from fealpy.cfd.simulation.sph.fused_kernel import FusedSPHKernel
+
+
+def pairs_and_state(N=300, GD=2, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.random((N, GD))
+    R = 0.15
+    d = np.linalg.norm(x[:, None, :] - x[None, :, :], axis=-1)
+    self_node, neighbors = np.nonzero((d < R) & (d > 0))
+    dr = x[neighbors] - x[self_node]
+    dist = np.linalg.norm(dr, axis=1)
+    q = 1 - dist / R
+    w = q**4 * (1 + 4*dist/R)
+    grad_w_norm = -20 * dist / R**2 * q**3
+    tag = rng.choice([0, 0, 0, 1, 2, 3], N)
+    state = {
+        "position": x, "tag": tag,
+        "mass": 0.5 + rng.random(N), "rho": 0.9 + 0.2*rng.random(N),
+        "eta": 0.01 + rng.random(N), "mv": rng.normal(size=(N, GD)),
+        "tv": rng.normal(size=(N, GD)), "T": 1 + rng.random(N),
+        "dTdt": rng.normal(size=N), "kappa": 0.5 + rng.random(N),
+        "Cp": 1 + rng.random(N), "p": np.zeros(N),
+        "dmvdt": np.zeros((N, GD)), "dtvdt": np.zeros((N, GD)),
+    }
+    g_ext = rng.normal(size=(N, GD))
+    return state, self_node, neighbors, dr, dist, w, grad_w_norm, g_ext
+
+
+def reference_step(state, self_node, neighbors, dr, dist, w, grad_w, grad_w_norm, g_ext, dt):
+    """The step of fealpy/cfd/example/sph/heat_transfer.py"""
+    solver = EquationSolver()
+    fluid_mask = state["tag"] == 0
+    rho = bm.where(fluid_mask, solver.mass_equation_solve(0, state, neighbors, w), state["rho"])
+    p = solver.state_equation("tait_eos", state, rho=rho, X=5.0)
+    pb = solver.state_equation("tait_eos", state, rho=bm.zeros_like(p), X=5.0)
+    p, rho, mv, tv, T = ProcessingTechnology.enforce_wall_boundary(
+            state, p, g_ext, neighbors, self_node, w, dr, with_temperature=True)
+    state["rho"], state["mv"], state["tv"] = rho, mv, tv
+    state["T"] = T + dt * state["dTdt"]
+    state["dTdt"] = solver.heat_equation_solve(0, state, dr, dist, neighbors, self_node, grad_w)
+    state["dmvdt"] = solver.momentum_equation_solve(0, state, neighbors, self_node,
+                                                    dr, dist, grad_w_norm, p) + g_ext
+    state["p"] = p
+    state["dtvdt"] = solver.momentum_equation_solve(1, state, neighbors, self_node,
+                                                    dr, dist, grad_w_norm, pb)
+    return state
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch', 'jax'])
+@pytest.mark.parametrize("compile", [False, True])
+def test_forward(backend, compile):
+    # EquationSolver 的默认 dtype 在导入时确定, 参考解用 numpy 计算
+    bm.set_backend('numpy')
+    data = pairs_and_state()
+    state, self_node, neighbors, dr, dist, w, grad_w_norm, g_ext = data
+    grad_w = grad_w_norm[:, None] * dr / (dist[:, None] + np.finfo(float).eps)
+    ref = reference_step(dict(state), self_node, neighbors, dr, dist, w,
+                         grad_w, grad_w_norm, g_ext, 1e-3)
+
+    bm.set_backend(backend)
+    state0, self_node, neighbors, dr, dist, w, grad_w_norm, g_ext = [
+        {k: bm.tensor(v) for k, v in x.items()} if isinstance(x, dict) else bm.tensor(x)
+        for x in data]
+    kernel = FusedSPHKernel(compile=compile)
+    for step in range(2):
+        # 第二步复用上一步的累加数组
+        state = dict(state0)
+        kernel.set_pairs(state, neighbors, self_node, dr, dist, w, grad_w_norm)
+        state = kernel.forward(state, g_ext, 1e-3, with_temperature=True)
+
+    for key in ["rho", "p", "mv", "tv", "T", "dTdt", "dmvdt", "dtvdt"]:
+        np.testing.assert_allclose(bm.to_numpy(state[key]), ref[key],
+                                   rtol=1e-10, atol=1e-10, err_msg=key)
+    bm.set_backend('numpy')
+
+
+def test_density_without_temperature():
+    bm.set_backend('numpy')
+    state, self_node, neighbors, dr, dist, w, grad_w_norm, g_ext = pairs_and_state(GD=3, seed=1)
+    kernel = FusedSPHKernel().set_pairs(state, neighbors, self_node, dr, dist, w, grad_w_norm)
+    rho = kernel.density(state)
+    np.testing.assert_allclose(rho, EquationSolver().rho_tradition(state, neighbors, w))
+
+    p = kernel.tait_eos(rho)
+    dmvdt, dtvdt, dTdt = kernel.accelerations(state, p, kernel.tait_eos(0*p))
+    assert dTdt is None
+    # u_tradition 只支持二维, 融合的写法对任意维数成立
+    assert dmvdt.shape == (300, 3)
+    assert dtvdt.shape == (300, 3)
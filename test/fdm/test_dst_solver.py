@@ -0,0 +1,33 @@
+from fealpy.backend import backend_manager as bm
+from fealpy.fdm import LaplaceOperator, DirichletBC, DSTSolver
+from fealpy.mesh import UniformMesh
+from fealpy.sparse import spdiags
+from fealpy.solver import spsolve
+import numpy as np
+import pytest
+
+
+class TestDSTSolver:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("domain, extent", [
+        ([0, 1], [0, 7]),
+        ([0, 1, 0, 2], [0, 5, 0, 4]),
+        ([0, 1, 0, 1, 0, 1], [0, 3, 0, 4, 0, 5]),
+    ])
+    @pytest.mark.parametrize("alpha, beta", [(0.0, 1.0), (1.0, 0.01)])
+    def test_solve(self, backend, domain, extent, alpha, beta):
+        bm.set_backend(backend)
+        mesh = UniformMesh(domain, extent)
+        NN = mesh.number_of_nodes()
+        A = LaplaceOperator(mesh).assembly()
+        S = beta*A + spdiags(bm.full((NN,), alpha, dtype=bm.float64), 0, NN, NN)
+
+        f = bm.tensor(np.random.rand(NN))
+        g = bm.tensor(np.random.rand(NN))
+        bd = mesh.boundary_node_flag()
+        S, b = DirichletBC(mesh, lambda p: g[bd]).apply(S, f)
+        expected = spsolve(S, b, solver='scipy')
+
+        u = DSTSolver(mesh, alpha=alpha, beta=beta).solve(f, g)
+        np.testing.assert_allclose(bm.to_numpy(u), bm.to_numpy(expected), atol=1e-10)
+        bm.set_backend('numpy')
@@ -42,5 +42,25 @@ class TestLaplaceOperator:
         A_test = bm.to_numpy(A.toarray())
         np.testing.assert_allclose(A_test, A_3d, atol=1e-10)
 
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("domain, extent", [
+        ([0, 1], [0, 7]),
+        ([0, 1, 0, 2], [0, 5, 0, 4]),
+        ([0, 1, 0, 1, 0, 1], [0, 3, 0, 4, 0, 5]),
+    ])
+    def test_fast_assembly_and_matmul(self, backend, domain, extent):
+        bm.set_backend(backend)
+        mesh = UniformMesh(domain, extent)
+        L = LaplaceOperator(mesh=mesh)
+        A = L.assembly()
+        np.testing.assert_allclose(bm.to_numpy(L.fast_assembly().toarray()),
+                                   bm.to_numpy(A.toarray()), atol=1e-10)
+
+        NN = mesh.number_of_nodes()
+        u = bm.tensor(np.random.rand(NN))
+        np.testing.assert_allclose(bm.to_numpy(L @ u), bm.to_numpy(A @ u), atol=1e-10)
+        U = bm.tensor(np.random.rand(NN, 2))
+        np.testing.assert_allclose(bm.to_numpy(L @ U), bm.to_numpy(A @ U), atol=1e-10)
+
 if __name__ == "__main__":
     pytest.main(["-s", "-v", "test_laplace_operator.py"])
@@ -0,0 +1,92 @@
+from fealpy.backend import backend_manager as bm
+from fealpy.fdm import StencilOperator, DiffusionOperator, ConvectionOperator
+from fealpy.mesh import UniformMesh
+from fealpy.sparse import spdiags
+import numpy as np
+import pytest
+
+
+def dense_reference(shape, stencil):
+    """Dense matrix of the stencil, entry by entry."""
+    NN = int(np.prod(shape))
+    A = np.zeros((NN, NN))
+    K = np.arange(NN).reshape(shape)
+    for p in np.ndindex(*shape):
+        for offset, coef in stencil.items():
+            q = tuple(i + o for i, o in zip(p, offset))
+            if all(0 <= i < n for i, n in zip(q, shape)):
+                a = coef if np.isscalar(coef) else coef.reshape(shape)[p]
+                A[K[p], K[q]] += a
+    return A
+
+
+class TestStencilOperator:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("domain, extent", [
+        ([0, 1], [0, 6]),
+        ([0, 1, 0, 2], [0, 4, 0, 3]),
+        ([0, 1, 0, 1, 0, 1], [0, 2, 0, 3, 0, 4]),
+    ])
+    def test_csr_dia_matmul(self, backend, domain, extent):
+        bm.set_backend(backend)
+        mesh = UniformMesh(domain, extent)
+        GD = mesh.geo_dimension()
+        NN = mesh.number_of_nodes()
+        shape = tuple(mesh.linear_index_map('node').shape)
+
+        rng = np.random.default_rng(0)
+        stencil = {(0,) * GD: rng.random(NN)}
+        for i in range(GD):
+            for s in (-1, 1, 2):
+                e = [0] * GD
+                e[i] = s
+                stencil[tuple(e)] = float(rng.random())
+        if GD > 1:
+            stencil[(1, -1) + (0,) * (GD - 2)] = rng.random(NN)
+
+        S = StencilOperator(mesh)
+        for offset, coef in stencil.items():
+            S.add(offset, coef if np.isscalar(coef) else bm.tensor(coef))
+        S.add((0,) * GD, 1.0)
+        stencil[(0,) * GD] = stencil[(0,) * GD] + 1.0
+        expected = dense_reference(shape, stencil)
+
+        A = S.to_csr()
+        np.testing.assert_allclose(bm.to_numpy(A.toarray()), expected, atol=1e-12)
+        col = bm.to_numpy(A.col)
+        crow = bm.to_numpy(A.crow)
+        for i in range(NN):
+            assert np.all(np.diff(col[crow[i]:crow[i+1]]) > 0)
+
+        data, offsets = S.to_dia()
+        B = spdiags(data, offsets, NN, NN)
+        np.testing.assert_allclose(bm.to_numpy(B.toarray()), expected, atol=1e-12)
+
+        u = rng.random((NN, 3))
+        r = S @ bm.tensor(u)
+        np.testing.assert_allclose(bm.to_numpy(r), expected @ u, atol=1e-12)
+        r = S @ bm.tensor(u[:, 0])
+        np.testing.assert_allclose(bm.to_numpy(r), expected @ u[:, 0], atol=1e-12)
+        bm.set_backend('numpy')
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_operator_matmul(self, backend):
+        bm.set_backend(backend)
+        mesh = UniformMesh([0, 1, 0, 2], [0, 5, 0, 4])
+        NN = mesh.number_of_nodes()
+        u = bm.tensor(np.random.rand(NN))
+        D = bm.tensor([[1.0, -0.5], [-0.5, 2.0]], dtype=bm.float64)
+        b = lambda p, index=None: bm.stack([p[:, 1] - 1, 0.5 - p[:, 0]], axis=-1)
+        for op in [DiffusionOperator(mesh, D), ConvectionOperator(mesh, b)]:
+            A = op.assembly()
+            np.testing.assert_allclose(bm.to_numpy(op @ u), bm.to_numpy(A @ u), atol=1e-12)
+
+        # The upwind differences with a nodal velocity vanish on constants.
+        A = bm.to_numpy(ConvectionOperator(mesh, b).assembly().toarray())
+        interior = ~bm.to_numpy(mesh.boundary_node_flag())
+        np.testing.assert_allclose(A.sum(axis=1)[interior], 0.0, atol=1e-12)
+        bm.set_backend('numpy')
+
+
+if __name__ == "__main__":
+    pytest.main(["-s", "-v", "test_stencil.py"])
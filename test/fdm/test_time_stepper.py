@@ -0,0 +1,74 @@
+from fealpy.backend import backend_manager as bm
+from fealpy.fdm import LaplaceOperator, DirichletBC, LinearTimeStepper
+from fealpy.mesh import UniformMesh
+from fealpy.sparse import spdiags
+from fealpy.solver import spsolve
+import numpy as np
+import pytest
+
+
+class HeatData:
+    """u = exp(-20t) sin(4 pi x) sin(4 pi y) + x y t on the unit square."""
+    def solution(self, p, t):
+        x, y = p[..., 0], p[..., 1]
+        return bm.exp(-20*t) * bm.sin(4*bm.pi*x) * bm.sin(4*bm.pi*y) + x*y*t
+
+    def source(self, p, t):
+        x, y = p[..., 0], p[..., 1]
+        return (-20 + 32*bm.pi**2) * bm.exp(-20*t) * bm.sin(4*bm.pi*x) * bm.sin(4*bm.pi*y) + x*y
+
+    def dirichlet(self, p, t):
+        return self.solution(p, t)
+
+
+def reference_step(mesh, A, uh, t, tau, scheme, pde):
+    """Rebuild and solve the system of the time step from scratch."""
+    NN = A.shape[0]
+    I = spdiags(bm.ones(NN, dtype=mesh.ftype), 0, NN, NN)
+    F = pde.source(mesh.entity('node'), t)
+    if scheme == 'forward':
+        uh = uh - tau*(A@uh) + tau*F
+        bd = mesh.boundary_node_flag()
+        return bm.set_at(uh, bd, pde.dirichlet(mesh.entity('node')[bd], t))
+    theta = 1.0 if scheme == 'backward' else 0.5
+    S = I + theta*tau*A
+    b = (I - (1 - theta)*tau*A)@uh + tau*F
+    S, b = DirichletBC(mesh, lambda p: pde.dirichlet(p, t)).apply(S, b)
+    return spsolve(S, b, solver='scipy')
+
+
+class TestLinearTimeStepper:
+    @pytest.mark.parametrize("scheme", ['forward', 'backward', 'cn'])
+    @pytest.mark.parametrize("solver", ['lu', 'dst'])
+    def test_step(self, scheme, solver):
+        bm.set_backend('numpy')
+        pde = HeatData()
+        mesh = UniformMesh([0, 1, 0, 1], [0, 16, 0, 16])
+        A = LaplaceOperator(mesh).assembly()
+        stepper = LinearTimeStepper(mesh, LaplaceOperator(mesh), scheme=scheme, solver=solver)
+        tau = 1e-4 if scheme == 'forward' else 1e-3
+
+        u0 = pde.solution(mesh.entity('node'), 0.0)
+        u1 = bm.copy(u0)
+        for n in range(1, 11):
+            u0 = reference_step(mesh, A, u0, n*tau, tau, scheme, pde)
+            u1 = stepper.step(u1, n*tau, tau, pde.source, pde.dirichlet)
+        np.testing.assert_allclose(u1, u0, atol=1e-12)
+        if scheme != 'forward':
+            assert len(stepper._systems) == 1
+
+    def test_sparse_operator(self):
+        bm.set_backend('numpy')
+        pde = HeatData()
+        mesh = UniformMesh([0, 1, 0, 1], [0, 8, 0, 8])
+        A = LaplaceOperator(mesh).assembly()
+        stepper = LinearTimeStepper(mesh, A, scheme='cn')
+        u0 = pde.solution(mesh.entity('node'), 0.0)
+        u1 = stepper.step(u0, 0.01, 0.01, pde.source, pde.dirichlet)
+        u2 = reference_step(mesh, A, u0, 0.01, 0.01, 'cn', pde)
+        np.testing.assert_allclose(u1, u2, atol=1e-12)
+
+        with pytest.raises(ValueError):
+            LinearTimeStepper(mesh, A, solver='dst')
+        with pytest.raises(ValueError):
+            LinearTimeStepper(mesh, A, scheme='leapfrog')
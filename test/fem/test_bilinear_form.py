@@ -2,11 +2,15 @@ import numpy as np
 import pytest
 from fealpy.backend import backend_manager as bm
 
-from fealpy.mesh import TriangleMesh
-from fealpy.functionspace import LagrangeFESpace
+from fealpy.mesh import TriangleMesh, QuadrangleMesh, HexahedronMesh, TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.material import LinearElasticMaterial
+from fealpy.sparse import CSRTensor
 from fealpy.fem import (
-        BilinearForm, ScalarDiffusionIntegrator
+        BilinearForm, LinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator,
+        ScalarSourceIntegrator, LinearElasticityIntegrator
     )
+from fealpy.fem.reference_tensor import clear_reference_tensors
 
 from bilinear_form_data import *
 
@@ -43,6 +47,210 @@ class TestBilinearFormInterface:
         z = bm.to_numpy(bform @ x)
         assert np.linalg.norm(y-z) < 1e-12 
 
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", range(1, 4))
+    def test_assembly_plan(self, backend, p):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=4, ny=4)
+        space = LagrangeFESpace(mesh, p)
+        bform = BilinearForm(space)
+        integrator = ScalarDiffusionIntegrator(coef=1.0)
+        bform.add_integrator(integrator)
+
+        A0 = bform.assembly(reuse_pattern=False).to_dense()
+        A1 = bform.assembly()
+        plan = bform._plan
+        assert plan is not None
+        assert np.allclose(bm.to_numpy(A1.to_dense()), bm.to_numpy(A0))
+
+        integrator.coef = 3.0
+        A2 = bform.assembly()
+        assert bform._plan is plan # the pattern is reused
+        assert np.allclose(bm.to_numpy(A2.to_dense()), 3*bm.to_numpy(A0))
+
+        mesh.uniform_refine()
+        space = LagrangeFESpace(mesh, p)
+        bform._spaces = (space, )
+        A3 = bform.assembly()
+        assert bform._plan is not plan # rebuilt for the new DoF layout
+        assert A3.shape == (space.number_of_global_dofs(), ) * 2
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("mesh", [
+        lambda: TriangleMesh.from_box([0, 1, 0, 2], nx=3, ny=3),
+        lambda: QuadrangleMesh.from_box([0, 1, 0, 2], nx=3, ny=3),
+        lambda: HexahedronMesh.from_box([0, 1, 0, 2, 0, 1], nx=2, ny=2, nz=2)
+    ])
+    @pytest.mark.parametrize("p", range(1, 4))
+    def test_matrix_free(self, backend, mesh, p):
+        bm.set_backend(backend)
+
+        mesh = mesh()
+        space = LagrangeFESpace(mesh, p)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef=2.0))
+        bform.add_integrator(ScalarMassIntegrator(coef=3.0))
+        A = bform.assembly()
+        op = bform.matrix_free()
+        gdof = space.number_of_global_dofs()
+        assert op.shape == (gdof, gdof)
+
+        x = bm.astype(bm.random.rand(gdof, 2), bm.float64)
+        y = bm.to_numpy(op @ x)
+        z = bm.to_numpy(A @ x)
+        assert np.allclose(y, z, atol=1e-12)
+        assert np.allclose(bm.to_numpy(op @ x[:, 0]), z[:, 0], atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_matrix_free_split(self, backend):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box([0, 1, 0, 2], nx=4, ny=4)
+        space = LagrangeFESpace(mesh, 2)
+        index = bm.arange(0, mesh.number_of_cells(), 3)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef=2.0), splitter=7)
+        bform.add_integrator(ScalarMassIntegrator(coef=3.0, index=index), splitter=4)
+        A = bform.assembly()
+        op = bform.matrix_free()
+
+        x = bm.astype(bm.random.rand(space.number_of_global_dofs()), bm.float64)
+        assert np.allclose(bm.to_numpy(op @ x), bm.to_numpy(A @ x), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("max_memory", ['256KB', '1MB', 1 << 30])
+    def test_streaming_assembly(self, backend, max_memory):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=10, ny=10)
+        space = LagrangeFESpace(mesh, 2)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef=2.0))
+        bform.add_integrator(ScalarMassIntegrator(coef=3.0))
+
+        A0 = bm.to_numpy(bform.assembly(reuse_pattern=False).to_dense())
+        A1 = bform.assembly(max_memory=max_memory)
+        assert isinstance(A1, CSRTensor)
+        assert np.allclose(bm.to_numpy(A1.to_dense()), A0)
+        assert bform.peak_memory > 0
+
+        A2 = bform.T.assembly(format='coo', max_memory=max_memory)
+        assert np.allclose(bm.to_numpy(A2.to_dense()), A0.T)
+
+    def test_streaming_assembly_budget(self):
+        bm.set_backend('numpy')
+
+        mesh = TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=4, ny=4, nz=4)
+        space = LagrangeFESpace(mesh, 3)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef=2.0))
+        bform.add_integrator(ScalarMassIntegrator(coef=3.0))
+
+        A0 = bform.assembly(reuse_pattern=False)
+        max_memory = 12 * (A0.nnz * 16)
+        A1 = bform.assembly(max_memory=max_memory)
+        assert np.allclose(A1.values, A0.values)
+        assert bform.peak_memory <= max_memory
+
+    @pytest.mark.parametrize("workers", [1, 2, 3])
+    def test_parallel_assembly(self, workers):
+        bm.set_backend('numpy')
+
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=40, ny=40)
+        space = LagrangeFESpace(mesh, 2)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef=2.0))
+        bform.add_integrator(ScalarMassIntegrator(coef=3.0))
+        lform = LinearForm(space)
+        lform.add_integrator(ScalarSourceIntegrator(1.0))
+
+        A0 = bform.assembly()
+        A1 = bform.assembly(workers=workers)
+        assert np.allclose(A1.to_dense(), A0.to_dense())
+        # Blocks do not depend on the number of workers.
+        A2 = bform.assembly(workers=1)
+        assert np.array_equal(A1.values, A2.values)
+
+        b0 = lform.assembly()
+        b1 = lform.assembly(workers=workers)
+        assert np.allclose(b1, b0)
+        assert np.array_equal(b1, lform.assembly(workers=1))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_evaluation_cache(self, backend):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=4, ny=4)
+        space = LagrangeFESpace(mesh, 2)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef=2.0, q=4))
+        bform.add_integrator(ScalarMassIntegrator(coef=3.0, q=4))
+        A0 = bm.to_numpy(bform.assembly().to_dense())
+
+        bform.set_evaluation_cache(max_memory='16MB')
+        cache = bform.evaluation_cache
+        bform.add_integrator(ScalarMassIntegrator(coef=1.0, q=4))
+        A1 = bm.to_numpy(bform.assembly().to_dense())
+        assert cache.hits > 0 # measure and quadrature are shared
+        misses = cache.misses
+        A2 = bm.to_numpy(bform.assembly().to_dense())
+        assert cache.misses == misses
+        assert np.allclose(A1, A2)
+
+        bform.integrators['_group_2'].coef = 0.0
+        assert np.allclose(bm.to_numpy(bform.assembly().to_dense()), A0)
+
+        version = mesh.version
+        mesh.uniform_refine()
+        assert mesh.version > version
+        bform._spaces = (LagrangeFESpace(mesh, 2), )
+        A3 = bform.assembly()
+        assert cache.misses > misses
+        assert cache.nbytes <= cache.max_memory
+        assert A3.shape == (bform.space.number_of_global_dofs(), ) * 2
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("mesh", [
+        lambda: TriangleMesh.from_box([0, 1, 0, 1], nx=3, ny=3),
+        lambda: TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=2, ny=2, nz=2)
+    ])
+    @pytest.mark.parametrize("p", range(1, 4))
+    def test_reference_assembly(self, backend, mesh, p, tmp_path, monkeypatch):
+        bm.set_backend(backend)
+        monkeypatch.setenv('FEALPY_REFERENCE_TENSOR_DIR', str(tmp_path))
+        clear_reference_tensors()
+
+        mesh = mesh()
+        NC = mesh.number_of_cells()
+        coef = bm.arange(NC, dtype=bm.float64) + 1.0
+        space = LagrangeFESpace(mesh, p)
+        forms = []
+        for method in (None, 'reference'):
+            bform = BilinearForm(space)
+            bform.add_integrator(ScalarDiffusionIntegrator(coef, method=method))
+            bform.add_integrator(ScalarMassIntegrator(2.0, method=method))
+            lform = LinearForm(space)
+            lform.add_integrator(ScalarSourceIntegrator(3.0, method=method))
+            forms.append((bm.to_numpy(bform.assembly().to_dense()), bm.to_numpy(lform.assembly())))
+        assert np.allclose(forms[0][0], forms[1][0])
+        assert np.allclose(forms[0][1], forms[1][1])
+        assert (tmp_path / f'diffusion_{mesh.TD}d_p{p}.npy').exists()
+
+        # Loaded from disk.
+        clear_reference_tensors()
+        A = ScalarMassIntegrator(method='reference').assembly(space)
+        assert np.allclose(bm.to_numpy(A), bm.to_numpy(ScalarMassIntegrator().assembly(space)))
+
+        GD = mesh.geo_dimension()
+        material = LinearElasticMaterial('material', elastic_modulus=1.0, poisson_ratio=0.3,
+                                         hypo='3D' if GD == 3 else 'plane_strain')
+        for shape in [(-1, GD), (GD, -1)]:
+            tspace = TensorFunctionSpace(space, shape)
+            K0 = LinearElasticityIntegrator(material).assembly(tspace)
+            K1 = LinearElasticityIntegrator(material, method='reference').assembly(tspace)
+            assert np.allclose(bm.to_numpy(K0), bm.to_numpy(K1))
+
 
 if __name__ == "__main__":
     pytest.main(['./test_bilinear_form.py', '-k', 'test_matmul'])
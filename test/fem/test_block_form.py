@@ -42,6 +42,57 @@ class TestBlockForm:
         np.testing.assert_array_almost_equal(vector, true_vector, 
                                      err_msg=f" `blockform __mult__` function is not equal to real result in backend {backend}")
 
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_assembly_paths(self, backend):
+        bm.set_backend(backend)
+        from scipy.sparse import bmat
+        from fealpy.fem import ScalarMassIntegrator, PressWorkIntegrator
+        from fealpy.functionspace import TensorFunctionSpace
+
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=3, ny=3)
+        pspace = LagrangeFESpace(mesh, p=1)
+        uspace = TensorFunctionSpace(LagrangeFESpace(mesh, p=2), (2, -1))
+        A00 = BilinearForm(uspace)
+        A00.add_integrator(ScalarDiffusionIntegrator())
+        A01 = BilinearForm((pspace, uspace))
+        A01.add_integrator(PressWorkIntegrator())
+        A11 = BilinearForm(pspace)
+        A11.add_integrator(ScalarMassIntegrator())
+        A22 = BilinearForm(pspace)
+        A22.add_integrator(ScalarDiffusionIntegrator())
+        blocks = [[A00, A01, None], [A01.T, A11, A11], [None, A11, A22]]
+        blockform = BlockForm(blocks)
+
+        # A01.T reuses the matrix of A01, and the forms sharing an integrator
+        # are assembled by the same thread.
+        from fealpy.fem.block_form import _source_form, _dependent_groups
+        assert _source_form(A01.T)[0] is A01
+        A02 = BilinearForm(pspace)
+        A02.add_integrator(A22.integrators['_group_0'])
+        groups = _dependent_groups([A00, A01, A11, A22, A02])
+        assert sorted(len(g) for g in groups) == [1, 1, 1, 2]
+
+        ref = bmat([[None if b is None else b.assembly(format='coo').to_scipy()
+                     for b in row] for row in blocks]).toarray()
+        for kwargs in [{}, {'parallel': True}]:
+            M = blockform.assembly(**kwargs)
+            assert isinstance(M, CSRTensor)
+            np.testing.assert_allclose(bm.to_numpy(M.toarray()), ref, atol=1e-12)
+            # CSR output emitted directly keeps the columns sorted in every row.
+            crow, col = bm.to_numpy(M.crow), bm.to_numpy(M.col)
+            for r in range(M.shape[0]):
+                assert np.all(np.diff(col[crow[r]:crow[r+1]]) > 0)
+
+        M = blockform.assembly(format='coo')
+        assert isinstance(M, COOTensor)
+        np.testing.assert_allclose(bm.to_numpy(M.toarray()), ref, atol=1e-12)
+
+        sparse = BlockForm([[None if b is None else b.assembly(format='coo') for b in row]
+                            for row in blocks])
+        M = sparse.assembly_sparse_matrix(format='csr')
+        np.testing.assert_allclose(bm.to_numpy(M.toarray()), ref, atol=1e-12)
+
+
 if __name__ == "__main__":
     pytest.main(['./test_block_form.py', '-sk', 'test_diag_diffusion'])
 
@@ -29,3 +29,53 @@ def test_apply_csr_matrix(backend):
     assert isinstance(coo_result, COOTensor)
     assert isinstance(csr_result, CSRTensor)
     assert bm.allclose(A_COO.toarray(), A_CSR.toarray())
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("fmt", ['csr', 'coo'])
+def test_plan(backend, fmt):
+    bm.set_backend(backend)
+    from fealpy.fem import BilinearForm, LinearForm, ScalarDiffusionIntegrator
+    from fealpy.fem import ScalarSourceIntegrator, DirichletBCPlan
+
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=4, ny=4)
+    space = LagrangeFESpace(mesh, p=2)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    lform = LinearForm(space)
+    lform.add_integrator(ScalarSourceIntegrator(1.0))
+    A = bform.assembly(format=fmt)
+    F = lform.assembly()
+    gd = lambda p: p[..., 0]**2 + p[..., 1]
+
+    dbc = DirichletBC(space, gd=gd)
+    A0, F0 = dbc.apply(A, F)
+    A1, F1 = dbc.apply(A, F, keep_pattern=True)
+    assert A1.nnz == A.nnz
+    assert bm.allclose(A1.toarray(), A0.toarray())
+    assert bm.allclose(F1, F0)
+
+    # The plan is cached for the pattern and updates the values in place.
+    plan = dbc.plan(A)
+    assert isinstance(plan, DirichletBCPlan) and dbc.plan(A) is plan
+    B = bform.assembly(format=fmt)
+    values = B.values
+    B = plan.apply_matrix(B, inplace=True)
+    assert B.values is values
+    assert bm.allclose(B.toarray(), A0.toarray())
+    # Right-hand sides use the values saved from the matrix.
+    assert bm.allclose(plan.apply_vector(F), F0)
+    assert bm.allclose(plan.apply_vector(F, gd=gd), F0)
+    F2 = bm.stack([F, 2*F], axis=1)
+    uh = dbc.boundary_values(F)
+    out = plan.apply_vector(F2, uh=bm.stack([uh, uh], axis=1))
+    assert bm.allclose(out[:, 0], F0)
+
+    # Row-only elimination keeps the boundary columns.
+    plan = dbc.plan(A, symmetric=False)
+    A2 = plan.apply_matrix(A)
+    F2 = plan.apply_vector(F)
+    x0 = bm.to_numpy(A0.toarray())
+    import numpy as np
+    x = np.linalg.solve(x0, bm.to_numpy(F0))
+    np.testing.assert_allclose(np.linalg.solve(bm.to_numpy(A2.toarray()), bm.to_numpy(F2)), x)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import CellList, NeighborList
+from fealpy.mesh.neighbor_list import csr_to_pairs
+
+
+def brute_force(x, y, r, L, periodic, include_self=True):
+    d = y[:, None, :] - x[None, :, :]
+    d = d - periodic * L * np.round(d / L)
+    A = (d**2).sum(-1) <= r*r
+    if not include_self:
+        np.fill_diagonal(A, False)
+    return A
+
+
+def to_dense(crow, col, M, N):
+    A = np.zeros((M, N), dtype=bool)
+    i, j = csr_to_pairs(crow, col)
+    A[bm.to_numpy(i), bm.to_numpy(j)] = True
+    assert len(bm.to_numpy(col)) == A.sum()
+    return A
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("GD", [1, 2, 3])
+@pytest.mark.parametrize("periodic", ['none', 'all', 'mixed'])
+def test_query(GD, periodic, backend):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(0)
+    L = np.array([1.0, 0.7, 0.5])[:GD]
+    flags = {'none': [False]*3, 'all': [True]*3, 'mixed': [True, False, True]}[periodic]
+    P = np.array(flags[:GD])
+    x = rng.random((300, GD)) * L
+    x[:, ~P] -= 0.1   # the non periodic axes do not need the box
+    y = rng.random((50, GD)) * L
+    r = 0.13
+
+    cells = CellList(r, box_size=bm.tensor(L), periodic=flags).build(bm.tensor(x))
+    crow, col = cells.query()
+    np.testing.assert_array_equal(to_dense(crow, col, 300, 300), brute_force(x, x, r, L, P))
+    crow, col = cells.query(include_self=False, cutoff=0.1)
+    np.testing.assert_array_equal(to_dense(crow, col, 300, 300), brute_force(x, x, 0.1, L, P, False))
+    crow, col = cells.query(bm.tensor(y))
+    np.testing.assert_array_equal(to_dense(crow, col, 50, 300), brute_force(x, y, r, L, P))
+    bm.set_backend('numpy')
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_verlet_skin(backend):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(1)
+    L = np.array([1.0, 1.0])
+    P = np.array([True, False])
+    x = rng.random((400, 2))
+    nl = NeighborList(0.1, skin=0.04, box_size=bm.tensor(L), periodic=[True, False],
+                      include_self=False)
+    for step in range(20):
+        x = x + 0.002 * rng.normal(size=x.shape)
+        x[:, 0] %= 1.0
+        crow, col = nl.update(bm.tensor(x))
+        np.testing.assert_array_equal(to_dense(crow, col, 400, 400),
+                                      brute_force(x, x, 0.1, L, P, False))
+    assert 1 <= nl.num_builds < 20
+    bm.set_backend('numpy')
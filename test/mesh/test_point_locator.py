@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import (
+    TriangleMesh, QuadrangleMesh, TetrahedronMesh, HexahedronMesh, PointLocator
+)
+
+
+def perturbed_mesh(Mesh, n, GD, rng):
+    mesh = Mesh.from_box([0, 1]*GD, *([n]*GD))
+    node = bm.to_numpy(mesh.node).copy()
+    inner = np.all((node > 1e-10) & (node < 1 - 1e-10), axis=1)
+    node[inner] += 0.2/n * rng.uniform(-1, 1, (inner.sum(), GD))
+    mesh.node = bm.tensor(node, dtype=bm.float64)
+    return mesh
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("Mesh, n, GD", [
+    (TriangleMesh, 10, 2), (QuadrangleMesh, 10, 2),
+    (TetrahedronMesh, 4, 3), (HexahedronMesh, 4, 3)
+])
+def test_locate(Mesh, n, GD, backend):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(0)
+    mesh = perturbed_mesh(Mesh, n, GD, rng)
+    points = rng.uniform(-0.2, 1.2, (2000, GD))
+    inside = np.all((points >= 0) & (points <= 1), axis=1)
+    points = bm.tensor(points, dtype=bm.float64)
+
+    locator = PointLocator(mesh, chunk=512)
+    cidx, bc = locator.locate(points)
+    cidx, points_np = bm.to_numpy(cidx), bm.to_numpy(points)
+    np.testing.assert_array_equal(cidx >= 0, inside)
+    found = cidx >= 0
+    np.testing.assert_allclose(bm.to_numpy(locator.bc_to_point(cidx[found], bc[found])),
+                               points_np[found], atol=1e-12)
+    bc = bm.to_numpy(bc)[found]
+    assert np.all(bc >= -1e-10) and np.all(bc <= 1 + 1e-10)
+    np.testing.assert_allclose(bc.sum(axis=-1), 1.0)
+
+    # Same result through the mesh interface.
+    np.testing.assert_array_equal(bm.to_numpy(mesh.location(points)), cidx)
+
+    # Small movements are handled without rebuilding the buckets.
+    mesh.node = mesh.node + bm.tensor(0.001/n * rng.uniform(-1, 1, mesh.node.shape))
+    assert locator.update() is False
+    cidx, bc = mesh.location(points, return_bc=True)
+    found = bm.to_numpy(cidx) >= 0
+    np.testing.assert_allclose(bm.to_numpy(mesh.point_locator().bc_to_point(cidx[found], bc[found])),
+                               points_np[found], atol=1e-12)
+
+    # Large movements rebuild the buckets.
+    mesh.node = mesh.node * 2.0
+    assert locator.update() is True
+    cidx, bc = locator.locate(points * 2.0)
+    np.testing.assert_array_equal(bm.to_numpy(cidx) >= 0, inside)
+
+
+def test_point_to_bc():
+    bm.set_backend('numpy')
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=4, ny=4)
+    bc = np.array([[0.2, 0.3, 0.5], [0.6, 0.3, 0.1]])
+    points = mesh.bc_to_point(bc)[[3, 7], [0, 1]]
+    cidx, lam = mesh.point_to_bc(points)
+    np.testing.assert_array_equal(cidx, [3, 7])
+    np.testing.assert_allclose(lam, bc)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_is_crossed_cell(backend):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(1)
+    mesh = perturbed_mesh(TriangleMesh, 16, 2, rng)
+    point = np.array([(0.1, 0.6), (0.4, 0.4), (0.05, 0.05), (0.95, 0.95),
+                      (0.5, 0.5), (0.5, 0.9), (0.7, 0.2), (1.3, 0.2)])
+    segment = np.array([(0, 1), (2, 3), (4, 5), (6, 7)])
+    isCrossedCell = mesh.is_crossed_cell(bm.tensor(point), bm.tensor(segment))
+    isCrossedCell = bm.to_numpy(isCrossedCell)
+
+    # Every cell met by a segment is marked.
+    t = np.linspace(0, 1, 5001)[:, None]
+    samples = np.concatenate([point[i]*(1 - t) + point[j]*t for i, j in segment])
+    cidx = bm.to_numpy(mesh.location(bm.tensor(samples)))
+    assert np.all(isCrossedCell[cidx[cidx >= 0]])
+
+    # The marked cells stay close to the segments.
+    node = bm.to_numpy(mesh.node)
+    center = node[bm.to_numpy(mesh.cell)].mean(axis=1)[isCrossedCell]
+    p0, p1 = point[segment[:, 0]], point[segment[:, 1]]
+    d = p1 - p0
+    s = np.clip(np.einsum('csd, sd -> cs', center[:, None] - p0, d) / np.sum(d**2, axis=-1), 0, 1)
+    dist = np.linalg.norm(center[:, None] - p0 - s[..., None]*d, axis=-1).min(axis=1)
+    assert np.all(dist < 3/16)
@@ -349,6 +349,53 @@ class TestTetrahedronMeshInterfaces:
 
         # mesh.to_vtk(f"test_spherical_shell_{h}.vtu")
 
+    @pytest.mark.parametrize("backend", ["numpy", "pytorch"])
+    def test_update_topology(self, backend):
+        bm.set_backend(backend)
+        mesh = TetrahedronMesh.from_box(box=[0, 1, 0, 1, 0, 1], nx=2, ny=2, nz=2)
+        node = mesh.entity('node')
+        cell = mesh.entity('cell')
+        NN = mesh.number_of_nodes()
+        NC = mesh.number_of_cells()
+        edge = bm.to_numpy(mesh.edge)
+        face = bm.to_numpy(mesh.face)
+
+        # Split cell 0 at its barycenter into 4 cells.
+        c = bm.to_numpy(cell)
+        v0, v1, v2, v3 = c[0]
+        newCell = np.concatenate([c, [[v0, v1, v2, NN], [v0, v3, v1, NN], [v0, v2, v3, NN]]])
+        newCell[0] = [v1, v3, v2, NN]
+        oldCell = np.arange(NC + 3)
+        oldCell[0] = -1
+        oldCell[NC:] = -1
+        mesh.node = bm.concat([node, bm.mean(node[cell[0]], axis=0, keepdims=True)], axis=0)
+        maps = mesh.update_topology(bm.from_numpy(newCell), bm.from_numpy(oldCell))
+        ref = TetrahedronMesh(mesh.node, bm.from_numpy(newCell))
+
+        assert mesh.number_of_edges() == ref.number_of_edges() == edge.shape[0] + 4
+        assert mesh.number_of_faces() == ref.number_of_faces() == face.shape[0] + 6
+        np.testing.assert_array_equal(bm.to_numpy(maps['edge']), np.arange(edge.shape[0]))
+        np.testing.assert_array_equal(bm.to_numpy(maps['face']), np.arange(face.shape[0]))
+        # The untouched entities keep their indices; the touched faces may be
+        # reoriented to follow their first cell.
+        np.testing.assert_array_equal(np.sort(bm.to_numpy(mesh.edge)[:edge.shape[0]], axis=-1),
+                                      np.sort(edge, axis=-1))
+        np.testing.assert_array_equal(np.sort(bm.to_numpy(mesh.face)[:face.shape[0]], axis=-1),
+                                      np.sort(face, axis=-1))
+
+        for name, local in (('edge', mesh.localEdge), ('face', mesh.localFace)):
+            entity = bm.to_numpy(getattr(mesh, name))
+            c2e = bm.to_numpy(getattr(mesh, 'cell2' + name))
+            np.testing.assert_array_equal(np.sort(entity[c2e], axis=-1),
+                                          np.sort(newCell[:, bm.to_numpy(local)], axis=-1))
+        localFace = bm.to_numpy(mesh.localFace)
+        f2c = bm.to_numpy(mesh.face2cell)
+        np.testing.assert_array_equal(newCell[f2c[:, [0]], localFace[f2c[:, 2]]], bm.to_numpy(mesh.face))
+        face = bm.to_numpy(mesh.face)
+        key = {tuple(f): i for i, f in enumerate(np.sort(bm.to_numpy(ref.face), axis=-1))}
+        perm = np.array([key[tuple(f)] for f in np.sort(face, axis=-1)])
+        np.testing.assert_array_equal(bm.to_numpy(ref.face2cell)[perm], f2c)
+
 if __name__ == "__main__":
     #pytest.main(["./test_tetrahedron_mesh.py", "-k", "test_init"])
     pytest.main(["./test_tetrahedron_mesh.py", "-k", "test_from_one_tetrahedron"])
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh.triangle_mesh import TriangleMesh
+from fealpy.mesh.tetrahedron_mesh import TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_bisect_incremental(backend):
+    bm.set_backend(backend)
+    mesh = TriangleMesh.from_box(nx=8, ny=8)
+    rng = np.random.default_rng(0)
+
+    def check(mesh):
+        # Same edges and edge-to-cell relation as construct, up to numbering.
+        ref = TriangleMesh(mesh.node, mesh.cell)
+        edge = bm.to_numpy(mesh.edge)
+        cell = bm.to_numpy(mesh.cell)
+        e2c = bm.to_numpy(mesh.edge2cell)
+        c2e = bm.to_numpy(mesh.cell2edge)
+        localEdge = bm.to_numpy(mesh.localEdge)
+        assert mesh.number_of_edges() == ref.number_of_edges()
+        np.testing.assert_array_equal(np.sort(edge[c2e], axis=-1),
+                                      np.sort(cell[:, localEdge], axis=-1))
+        np.testing.assert_array_equal(cell[e2c[:, [0]], localEdge[e2c[:, 2]]], edge)
+        key = {tuple(e): i for i, e in enumerate(np.sort(bm.to_numpy(ref.edge), axis=-1))}
+        perm = np.array([key[tuple(e)] for e in np.sort(edge, axis=-1)])
+        np.testing.assert_array_equal(bm.to_numpy(ref.edge2cell)[perm], e2c)
+        np.testing.assert_array_equal(bm.to_numpy(ref.edge)[perm], edge)
+
+    for _ in range(4):
+        NN = mesh.number_of_nodes()
+        edge = bm.to_numpy(mesh.edge)
+        isMarkedCell = bm.tensor(rng.random(mesh.number_of_cells()) < 0.2)
+        mesh.bisect(isMarkedCell, options=mesh.bisect_options(disp=False, incremental=True))
+        check(mesh)
+        # The untouched edges keep their indices.
+        emap = bm.to_numpy(mesh.entity_maps['edge'])
+        flag = emap >= 0
+        assert np.sum(~flag) > 0
+        np.testing.assert_array_equal(np.sort(bm.to_numpy(mesh.edge)[emap[flag]], axis=-1),
+                                      np.sort(edge[flag], axis=-1))
+        np.testing.assert_array_equal(emap[flag], np.nonzero(flag)[0])
+        assert mesh.number_of_nodes() - NN == np.sum(~flag)
+
+    for _ in range(2):
+        isMarkedCell = bm.ones(mesh.number_of_cells(), dtype=bm.bool)
+        mesh.coarsen(isMarkedCell, options={'incremental': True})
+        check(mesh)
+
+
+def cubic(p):
+    x = p[..., 0]
+    y = p[..., 1]
+    z = p[..., -1]
+    return x**3 - 2*x*y*z + y**2 + 3*z
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_bisect_incremental_3d(backend):
+    bm.set_backend(backend)
+    mesh = TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=3, ny=3, nz=3)
+    rng = np.random.default_rng(0)
+
+    for _ in range(3):
+        NE = mesh.number_of_edges()
+        edge = bm.to_numpy(mesh.edge)
+        uh = LagrangeFESpace(mesh, p=4).interpolate(cubic)
+        isMarkedCell = bm.tensor(rng.random(mesh.number_of_cells()) < 0.1)
+        mesh.bisect(isMarkedCell, options=mesh.bisect_options(disp=False, incremental=True))
+
+        ref = TetrahedronMesh(mesh.node, mesh.cell)
+        assert mesh.number_of_edges() == ref.number_of_edges()
+        assert mesh.number_of_faces() == ref.number_of_faces()
+        np.testing.assert_allclose(bm.to_numpy(mesh.entity_measure('cell')).sum(), 1.0)
+        cell = bm.to_numpy(mesh.cell)
+        for etype in ['edge', 'face']:
+            entity = np.sort(bm.to_numpy(mesh.entity(etype)), axis=-1)
+            c2e = bm.to_numpy(mesh.cell_to_edge() if etype == 'edge' else mesh.cell_to_face())
+            local = bm.to_numpy(mesh.localEdge if etype == 'edge' else mesh.localFace)
+            np.testing.assert_array_equal(entity[c2e], np.sort(cell[:, local], axis=-1))
+        # The untouched edges keep their indices.
+        emap = bm.to_numpy(mesh.entity_maps['edge'])
+        flag = emap >= 0
+        assert emap.shape[0] == NE and np.sum(~flag) > 0
+        np.testing.assert_array_equal(bm.to_numpy(mesh.edge)[emap[flag]], edge[flag])
+
+        # Copy the DoFs on the kept entities.
+        space = LagrangeFESpace(mesh, p=4)
+        val, is_transferred = space.transfer(uh, mesh.entity_maps)
+        uI = space.interpolate(cubic)
+        is_transferred = bm.to_numpy(is_transferred)
+        assert 0 < np.sum(~is_transferred)
+        np.testing.assert_allclose(bm.to_numpy(val)[is_transferred],
+                                   bm.to_numpy(uI)[is_transferred], atol=1e-12)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_transfer_2d(backend):
+    bm.set_backend(backend)
+    mesh = TriangleMesh.from_box(nx=4, ny=4)
+    rng = np.random.default_rng(1)
+
+    def run(update):
+        uh = LagrangeFESpace(mesh, p=4).interpolate(cubic)
+        update()
+        space = LagrangeFESpace(mesh, p=4)
+        val, is_transferred = space.transfer(uh, mesh.entity_maps)
+        is_transferred = bm.to_numpy(is_transferred)
+        assert 0 < np.sum(is_transferred) < space.number_of_global_dofs()
+        np.testing.assert_allclose(bm.to_numpy(val)[is_transferred],
+                                   bm.to_numpy(space.interpolate(cubic))[is_transferred],
+                                   atol=1e-12)
+
+    for _ in range(2):
+        isMarkedCell = bm.tensor(rng.random(mesh.number_of_cells()) < 0.3)
+        run(lambda: mesh.bisect(isMarkedCell, options=mesh.bisect_options(disp=False, incremental=True)))
+    isMarkedCell = bm.ones(mesh.number_of_cells(), dtype=bm.bool)
+    run(lambda: mesh.coarsen(isMarkedCell, options={'incremental': True}))
+    assert 'node' in mesh.entity_maps
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_update_topology.py"])
@@ -3,7 +3,7 @@ import pytest
 
 import numpy as np
 from fealpy.backend import backend_manager as bm
-from fealpy.mesh.utils import inverse_relation
+from fealpy.mesh.utils import inverse_relation, flocc
 
 inverse_relation_with_index_data = [
     {
@@ -62,3 +62,22 @@ def test_inverse_relation_with_flag(data, backend):
     assert bm.all(bm.equal(row, bm.from_numpy(data['row'])))
     assert bm.all(bm.equal(col, bm.from_numpy(data['col'])))
     assert spshape == data['spshape']
+
+
+@pytest.mark.parametrize('size', [None, 2**40])
+@pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+def test_flocc(size, backend):
+    bm.set_backend(backend)
+    from fealpy.mesh import TetrahedronMesh
+    mesh = TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=3, ny=3, nz=3)
+
+    for total in (mesh.total_face(), mesh.total_edge()):
+        array = bm.sort(total, axis=1)
+        expected = flocc(array, method='lexsort')
+        # 2**40 needs more than one 64-bit key for each row
+        result = flocc(array, size)
+        for a, b in zip(expected, result):
+            assert bm.all(bm.equal(a, b))
+        i0, i1, j = result
+        assert bm.all(bm.equal(array[i0][j], array))
+        assert bm.all(bm.equal(array[i1][j], array))
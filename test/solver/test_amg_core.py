@@ -0,0 +1,117 @@
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import csr_matrix, CSRTensor
+from fealpy.solver.amg_core import (
+    classical_strength_of_connection, rs_cf_splitting, pmis_cf_splitting
+)
+from fealpy.solver.amg import amg_coarsen
+from fealpy.solver import GAMGSolver
+
+
+def laplace_matrix(n):
+    """Five-point finite difference Laplacian on an n x n grid."""
+    idx = bm.arange(n*n).reshape(n, n)
+    row = [idx.ravel()]
+    col = [idx.ravel()]
+    val = [bm.full(n*n, 4.0)]
+    for a, b in ((idx[1:, :], idx[:-1, :]), (idx[:, 1:], idx[:, :-1])):
+        row += [a.ravel(), b.ravel()]
+        col += [b.ravel(), a.ravel()]
+        val += [bm.full(a.size, -1.0)]*2
+    row, col, val = (bm.concatenate(x) for x in (row, col, val))
+    return csr_matrix((val, (row, col)), shape=(n*n, n*n))
+
+
+@pytest.mark.parametrize("method", ['rs', 'pmis', 'hmis'])
+def test_cf_splitting(method):
+    bm.set_backend('numpy')
+    A = laplace_matrix(20)
+    N = A.shape[0]
+    Sp, Sj, Sx = classical_strength_of_connection(A.indptr, A.indices, A.data, N, 0.25)
+    if method == 'rs':
+        T = csr_matrix((Sx, Sj, Sp), shape=(N, N)).T
+        splitting = rs_cf_splitting(Sp, Sj, T.indptr, T.indices, N)
+    else:
+        splitting = pmis_cf_splitting(Sp, Sj, N, method=method)
+
+    nc = int(bm.sum(splitting))
+    assert 0 < nc < N
+    # Every F point strongly depends on at least one C point.
+    row = bm.repeat(bm.arange(N), Sp[1:] - Sp[:-1])
+    offdiag = row != Sj
+    row, col = row[offdiag], Sj[offdiag]
+    has_c = bm.bincount(row, weights=splitting[col], minlength=N) > 0
+    assert bm.all(has_c[splitting == 0])
+    if method != 'rs':
+        # PMIS selects an independent set of the strong graph.
+        assert not bm.any((splitting[row] == 1) & (splitting[col] == 1))
+
+
+@pytest.mark.parametrize("ctype, itype, theta", [
+    ('rs', 'direct', 0.25), ('pmis', 'direct', 0.25), ('hmis', 'classical', 0.25), ('sa', 'direct', None)
+])
+def test_amg_coarsen(ctype, itype, theta):
+    bm.set_backend('numpy')
+    A = laplace_matrix(32)
+    timing = {}
+    p, r = amg_coarsen(A, theta, ctype, itype, timing=timing)
+    assert 0 < p.shape[1] < A.shape[0]
+    assert set(timing) == {'strength', 'splitting', 'interpolation'}
+    # The interpolation of an M-matrix is nonnegative.
+    e = p @ bm.ones(p.shape[1])
+    assert bm.all(e >= 0)
+
+    solver = GAMGSolver(theta=theta, ctype=ctype, itype=itype, isolver='CG', rtol=1e-8)
+    solver.setup(A)
+    assert len(solver.A) > 2
+    b = bm.ones(A.shape[0])
+    x, info = solver.solve(b)
+    assert bm.linalg.norm(b - A @ x) < 1e-6 * bm.linalg.norm(b)
+    assert info['niter'] < 40
+
+
+def test_sa_default_settings():
+    bm.set_backend('numpy')
+    A = laplace_matrix(64)
+    solver = GAMGSolver(ctype='sa', isolver='CG')
+    solver.setup(A)
+    assert len(solver.A) > 2
+    assert solver.A[1].shape[0] < A.shape[0] // 4
+    b = bm.ones(A.shape[0])
+    x, info = solver.solve(b)
+    assert bm.linalg.norm(b - A @ x) < 1e-6 * bm.linalg.norm(b)
+    assert info['niter'] < 20
+
+
+@pytest.mark.parametrize("ctype", ['rs', 'sa'])
+def test_gamg_update(ctype):
+    bm.set_backend('numpy')
+    A = laplace_matrix(32)
+    theta = None if ctype == 'sa' else 0.25
+    solver = GAMGSolver(theta=theta, ctype=ctype, isolver='CG', rtol=1e-8, max_reuse=2)
+    solver.setup(A)
+    P = list(solver.P)
+
+    # Same pattern, new values: the prolongations are kept.
+    rng = bm.random.default_rng(0)
+    scale = 1.0 + rng.random(A.shape[0])
+    B = CSRTensor(A.crow, A.col, A.values * scale[A.row], A.sparse_shape)
+    assert solver.update(B) is False
+    assert all(p0 is p1 for p0, p1 in zip(P, solver.P))
+    C = B
+    for l in range(len(solver.P)):
+        C = solver.R[l] @ C @ solver.P[l]
+        assert bm.allclose(C.toarray(), solver.A[l+1].toarray())
+        assert bm.allclose(solver.L[l].toarray(), bm.tril(solver.A[l].toarray()))
+        assert bm.allclose(solver.U[l].toarray(), bm.triu(solver.A[l].toarray()))
+
+    b = bm.ones(A.shape[0])
+    x, info = solver.solve(b)
+    assert bm.linalg.norm(b - B @ x) < 1e-6 * bm.linalg.norm(b)
+
+    # Reuse limit and pattern changes trigger a full setup.
+    assert solver.update(B) is False
+    assert solver.update(B) is True
+    assert solver.nupdate == 0
+    assert solver.update(laplace_matrix(30)) is True
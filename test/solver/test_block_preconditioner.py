@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.fem import (
+    BilinearForm, BlockForm, ScalarDiffusionIntegrator, ScalarMassIntegrator,
+    PressWorkIntegrator
+)
+from fealpy.sparse import csr_matrix
+from fealpy.solver import (
+    gmres, minres, BlockOperator, BlockDiagonalPreconditioner,
+    BlockTriangularPreconditioner, PressureMassSchur, LSCSchur, block_inverse
+)
+
+
+def saddle_point(n=60, m=20, seed=0):
+    """[[A, B^T], [B, 0]] with A SPD and B of full rank."""
+    rng = np.random.default_rng(seed)
+    A = 2*np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1) + 0.1*np.eye(n)
+    B = rng.random((m, n)) * (rng.random((m, n)) < 0.2)
+    B[np.arange(m), np.arange(m)] += 1.0
+    return A, B
+
+
+def test_block_operator():
+    bm.set_backend('numpy')
+    A, B = saddle_point()
+    K = np.block([[A, B.T], [B, np.zeros((20, 20))]])
+    op = BlockOperator([[csr_matrix(A), csr_matrix(B.T)], [csr_matrix(B), None]])
+    assert op.shape == (80, 80)
+    x = np.random.default_rng(1).random(80)
+    np.testing.assert_allclose(op @ x, K @ x)
+
+    op2 = BlockOperator.from_matrix(csr_matrix(K), [60, 20])
+    np.testing.assert_allclose(op2 @ x, K @ x)
+    np.testing.assert_allclose(op2.block(1, 0).toarray(), B)
+
+
+def test_exact_preconditioners():
+    bm.set_backend('numpy')
+    A, B = saddle_point()
+    K = np.block([[A, B.T], [B, np.zeros((20, 20))]])
+    op = BlockOperator([[csr_matrix(A), csr_matrix(B.T)], [csr_matrix(B), None]])
+    S = B @ np.linalg.solve(A, B.T)
+    b = np.random.default_rng(2).random(80)
+    x_ref = np.linalg.solve(K, b)
+
+    Ainv = block_inverse(op.block(0, 0), 'direct')
+    # With the exact Schur complement, the upper triangular preconditioner
+    # gives convergence in two GMRES iterations.
+    Sinv = block_inverse(csr_matrix(-S), 'direct')
+    P = BlockTriangularPreconditioner(op, [Ainv, Sinv])
+    x, info = gmres(op, b, M=P, rtol=1e-10, atol=1e-14)
+    np.testing.assert_allclose(x, x_ref, rtol=1e-8, atol=1e-10)
+    assert info['niter'] == 2
+
+    P = BlockTriangularPreconditioner(op, [Ainv, Sinv], lower=True)
+    x, info = gmres(op, b, M=P, rtol=1e-12, atol=1e-14)
+    np.testing.assert_allclose(x, x_ref, rtol=1e-8, atol=1e-10)
+
+    # The block diagonal one gives three distinct eigenvalues for MINRES.
+    P = BlockDiagonalPreconditioner(op, [Ainv, block_inverse(csr_matrix(S), 'direct')])
+    x, info = minres(op, b, M=P, rtol=1e-12, atol=1e-14)
+    np.testing.assert_allclose(x, x_ref, rtol=1e-6, atol=1e-8)
+
+
+def stokes_blocks(n):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    pspace = LagrangeFESpace(mesh, p=1)
+    space = LagrangeFESpace(mesh, p=2)
+    uspace = TensorFunctionSpace(space, (2, -1))
+
+    A00 = BilinearForm(uspace)
+    A00.add_integrator(ScalarDiffusionIntegrator())
+    A01 = BilinearForm((pspace, uspace))
+    A01.add_integrator(PressWorkIntegrator(coef=-1))
+    op = BlockOperator.from_blockform(BlockForm([[A00, A01], [A01.T, None]]))
+
+    # Homogeneous Dirichlet condition on the velocity, by removing the
+    # boundary rows and columns of the velocity.
+    isBdDof = bm.to_numpy(uspace.is_boundary_dof())
+    inner = np.nonzero(~isBdDof)[0]
+    F = op.block(0, 0).to_scipy()[inner][:, inner]
+    Bt = op.block(0, 1).to_scipy()[inner]
+    pm = BilinearForm(pspace)
+    pm.add_integrator(ScalarMassIntegrator())
+    Mp = pm.assembly(format='csr')
+    to_csr = lambda S: csr_matrix((S.data, S.indices, S.indptr), shape=S.shape)
+    return BlockOperator([[to_csr(F), to_csr(Bt)], [to_csr(Bt.T.tocsr()), None]]), Mp
+
+
+def test_stokes_block_preconditioners():
+    bm.set_backend('numpy')
+    op, Mp = stokes_blocks(8)
+    nu, npr = op.row_offsets[1], op.shape[0] - op.row_offsets[1]
+    rng = np.random.default_rng(3)
+    b = np.concatenate([rng.random(nu), np.zeros(npr)])
+
+    Ainv = block_inverse(op.block(0, 0), 'amg')
+    P = BlockDiagonalPreconditioner(op, [Ainv, PressureMassSchur(Mp)])
+    x, info = minres(op, b, M=P, rtol=1e-10, atol=1e-12, maxit=300)
+    assert np.linalg.norm(op @ x - b) < 1e-6 * np.linalg.norm(b)
+    assert info['niter'] < 60
+
+    P = BlockTriangularPreconditioner(op, [Ainv, PressureMassSchur(Mp, scale=-1.0)])
+    x, info = gmres(op, b, M=P, rtol=1e-8, atol=1e-12, restart=50, maxit=20)
+    assert np.linalg.norm(op @ x - b) < 1e-6 * np.linalg.norm(b)
+    assert info['niter'] < 40
+
+    P = BlockTriangularPreconditioner(op, [Ainv, LSCSchur(op.block(0, 0), op.block(1, 0))])
+    x, info = gmres(op, b, M=P, rtol=1e-8, atol=1e-12, restart=50, maxit=20)
+    assert np.linalg.norm(op @ x - b) < 1e-6 * np.linalg.norm(b)
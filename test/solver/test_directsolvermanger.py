@@ -72,6 +72,69 @@ class TestDirectSolverManager:
 
         x0 = mgr.solve(b)
 
+    @pytest.mark.parametrize("matrix_type", ['G', 'SP'])
+    def test_factorization_reuse(self, matrix_type):
+        bm.set_backend('numpy')
+        n = 400
+        A = sp.diags([-1.0, 4.0, -1.0], [-1, 0, 1], shape=(n, n)).tocsr()
+        A_t = CSRTensor.from_scipy(A)
+        B = np.random.rand(n, 3)
+
+        mgr = DirectSolverManager(solver_name='scipy', cache_size=2)
+        mgr.set_matrix(A_t, matrix_type=matrix_type)
+        factor = mgr.factorize()
+        # 多个右端项共用同一个分解
+        x = mgr.solve(B[:, 0])
+        X = mgr.solve(B)
+        assert mgr.factorize() is factor
+        assert np.allclose(A @ X, B)
+        assert np.allclose(x, X[:, 0])
+
+        # 只改变矩阵的值时重新分解，切换回原矩阵时复用缓存的分解
+        mgr.set_matrix(A_t * 2.0, matrix_type=matrix_type)
+        assert mgr.factorize() is not factor
+        assert np.allclose(2.0 * A @ mgr.solve(B), B)
+        mgr.set_matrix(A_t, matrix_type=matrix_type)
+        assert mgr.factorize() is factor
+
+        # LRU 淘汰最久未使用的分解
+        mgr.set_matrix(A_t * 3.0, matrix_type=matrix_type)
+        mgr.factorize()
+        mgr.set_matrix(A_t * 2.0, matrix_type=matrix_type)
+        mgr.factorize()
+        mgr.set_matrix(A_t, matrix_type=matrix_type)
+        assert mgr.factorize() is not factor
+        assert len(mgr._factors) == 2
+
+        mgr.clear()
+        assert len(mgr._factors) == 0
+
+    @pytest.mark.parametrize("solver_name,module", [
+        ("mumps", "mumps"), ("pardiso", "pypardiso"), ("cholmod", "sksparse.cholmod")])
+    def test_factorization_optional(self, solver_name, module):
+        pytest.importorskip(module)
+        bm.set_backend('numpy')
+        n = 300
+        A = sp.diags([-1.0, 4.0, -1.0], [-1, 0, 1], shape=(n, n)).tocsr()
+        A_t = CSRTensor.from_scipy(A)
+        B = np.random.rand(n, 4)
+
+        mgr = DirectSolverManager(solver_name=solver_name, cache_size=2)
+        mgr.set_matrix(A_t, matrix_type='SP')
+        factor = mgr.factorize()
+        x = mgr.solve(B[:, 0])
+        X = mgr.solve(B)
+        assert mgr.factorize() is factor
+        assert np.allclose(A @ X, B)
+        assert np.allclose(x, X[:, 0])
+
+        # 只改变矩阵的值, 复用符号分析重新分解
+        mgr.set_matrix(A_t * 2.0, matrix_type='SP')
+        assert np.allclose(2.0 * A @ mgr.solve(B), B)
+        mgr.set_matrix(A_t, matrix_type='SP')
+        assert np.allclose(A @ mgr.solve(B[:, 1]), B[:, 1])
+        mgr.clear()
+
     def test_missing_set_matrix(self):
         """未调用 set_matrix 时，调用 solve 应报 ValueError"""
         mgr = DirectSolverManager(solver_name="scipy")
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import csr_matrix
+from fealpy.solver import cg, bicgstab, minres, KrylovSolver
+
+
+def poisson_1d(n, shift=0.0):
+    """Tridiagonal matrix of the 1D Laplacian, made non-symmetric by `shift`."""
+    i = np.arange(n)
+    row = np.concatenate([i, i[1:], i[:-1]])
+    col = np.concatenate([i, i[:-1], i[1:]])
+    val = np.concatenate([np.full(n, 2.0), np.full(n-1, -1.0 - shift),
+                          np.full(n-1, -1.0 + shift)])
+    A = np.zeros((n, n))
+    A[row, col] = val
+    return A
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_cg_workspace(backend):
+    bm.set_backend(backend)
+    A0 = poisson_1d(50)
+    A = csr_matrix(bm.tensor(A0))
+    rng = np.random.default_rng(0)
+    B = rng.random((50, 3))
+
+    solver = KrylovSolver(A, 'cg', rtol=1e-12, atol=1e-14)
+    x = solver.solve(bm.tensor(B[:, 0]))
+    np.testing.assert_allclose(bm.to_numpy(x), np.linalg.solve(A0, B[:, 0]), rtol=1e-8)
+    assert len(solver.info['history']) == solver.info['niter']
+    assert all(type(h) is float for h in solver.info['history'])
+    r = solver.workspace._buffers['r']
+
+    # The buffers are reused for the next right-hand side.
+    x = solver(bm.tensor(B[:, 1]))
+    assert solver.workspace._buffers['r'] is r
+    np.testing.assert_allclose(bm.to_numpy(x), np.linalg.solve(A0, B[:, 1]), rtol=1e-8)
+
+    # Multiple right-hand sides, and the functional interface.
+    x0 = bm.zeros((50, 3), dtype=bm.float64)
+    X = cg(A, bm.tensor(B), x0, rtol=1e-12, atol=1e-14)
+    np.testing.assert_allclose(bm.to_numpy(X), np.linalg.solve(A0, B), rtol=1e-8)
+    assert bm.all(x0 == 0)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_bicgstab_workspace(backend):
+    bm.set_backend(backend)
+    A0 = poisson_1d(40, shift=0.3)
+    A = csr_matrix(bm.tensor(A0))
+    b = np.random.default_rng(1).random(40)
+
+    solver = KrylovSolver(A, 'bicgstab', rtol=1e-12, atol=1e-14)
+    for _ in range(2):
+        x = solver.solve(bm.tensor(b))
+        np.testing.assert_allclose(bm.to_numpy(x), np.linalg.solve(A0, b), rtol=1e-8)
+
+    x, info = bicgstab(A, bm.tensor(b), rtol=1e-12, atol=1e-14)
+    assert len(info['history']) == info['niter']
+    assert all(type(h) is float for h in info['history'])
+    np.testing.assert_allclose(bm.to_numpy(x), np.linalg.solve(A0, b), rtol=1e-8)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_minres_workspace(backend):
+    bm.set_backend(backend)
+    A0 = poisson_1d(30)
+    A = csr_matrix(bm.tensor(A0))
+    rng = np.random.default_rng(2)
+    B = rng.random((30, 2))
+
+    solver = KrylovSolver(A, 'minres', rtol=1e-14, atol=1e-14)
+    x = solver.solve(bm.tensor(B[:, 0]))
+    np.testing.assert_allclose(bm.to_numpy(x), np.linalg.solve(A0, B[:, 0]), rtol=1e-6)
+    v = solver.workspace._buffers['v']
+    x = solver(bm.tensor(B[:, 1]))
+    assert solver.workspace._buffers['v'] is v
+    np.testing.assert_allclose(bm.to_numpy(x), np.linalg.solve(A0, B[:, 1]), rtol=1e-6)
+
+    # The initial guess is not modified.
+    x0 = bm.tensor(rng.random(30))
+    x00 = bm.to_numpy(x0).copy()
+    x, info = minres(A, bm.tensor(B[:, 0]), x0, rtol=1e-14, atol=1e-14)
+    np.testing.assert_array_equal(bm.to_numpy(x0), x00)
+    np.testing.assert_allclose(bm.to_numpy(x), np.linalg.solve(A0, B[:, 0]), rtol=1e-6)
+    assert all(type(h) is float for h in info['history'])
+    assert info['history'][-1] < 1e-10
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import CSRTensor, SymmetricCSR, get_num_threads, set_num_threads
+from fealpy.sparse import _parallel_spmv
+from fealpy.sparse._parallel_spmv import nnz_balanced_partition, parallel_csr_spmm
+
+
+@pytest.fixture
+def threads():
+    old = get_num_threads()
+    set_num_threads(4)
+    yield 4
+    set_num_threads(old)
+
+
+def random_csr(m, n, density, seed=0):
+    A = sp.random(m, n, density, format='csr', random_state=seed)
+    A.sort_indices()
+    return A
+
+
+def test_nnz_balanced_partition():
+    A = random_csr(1000, 1000, 0.01)
+    bounds = nnz_balanced_partition(A.indptr, 4)
+    assert bounds[0] == 0 and bounds[-1] == 1000
+    assert np.all(np.diff(bounds) >= 0)
+    nnz = np.diff(A.indptr[bounds])
+    assert nnz.max() - nnz.min() <= 2 * np.diff(A.indptr).max()
+
+    # More blocks than rows gives empty blocks.
+    bounds = nnz_balanced_partition(np.array([0, 1, 3]), 5)
+    assert bounds[0] == 0 and bounds[-1] == 2 and np.all(np.diff(bounds) >= 0)
+
+
+@pytest.mark.parametrize("nvec", [0, 3])
+def test_parallel_csr_spmm(nvec, threads):
+    A = random_csr(500, 300, 0.02)
+    x = np.random.default_rng(0).random((300, nvec) if nvec else 300)
+    y = parallel_csr_spmm(A.indptr, A.indices, A.data, A.shape, x)
+    np.testing.assert_allclose(y, A @ x)
+
+
+@pytest.mark.parametrize("nvec", [0, 3])
+def test_symmetric_csr(nvec, threads):
+    B = random_csr(400, 400, 0.02)
+    A = (B + B.T + sp.eye(400)).tocsr()
+    S = SymmetricCSR.from_csr(A)
+    assert S.nnz == (A.nnz - 400) // 2 + 400
+    x = np.random.default_rng(0).random((400, nvec) if nvec else 400)
+    np.testing.assert_allclose(S @ x, A @ x)
+    np.testing.assert_allclose(SymmetricCSR.from_csr(A, nthreads=1) @ x, A @ x)
+
+
+def test_matmul_selects_parallel(threads, monkeypatch):
+    bm.set_backend('numpy')
+    monkeypatch.setattr(_parallel_spmv, 'PARALLEL_NNZ_THRESHOLD', 100)
+    B = random_csr(300, 300, 0.05)
+    A = CSRTensor(B.indptr, B.indices, B.data, B.shape)
+    x = np.random.default_rng(0).random(300)
+    np.testing.assert_allclose(A @ x, B @ x)
+    assert A._spmv_cache[1] == 4
+    np.testing.assert_allclose(A @ np.stack([x, 2*x], axis=1), B @ np.stack([x, 2*x], axis=1))
@@ -49,3 +49,74 @@ def test_spspmm_coo_valid_input(backend):
 
 # Additional tests can be added here to cover more edge cases, different shapes,
 # or to ensure consistency with other matrix multiplication methods under various conditions.
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_spspmm_csr_against_dense(backend):
+    bm.set_backend(backend)
+    from fealpy.sparse._spspmm import spspmm_csr
+    crow1 = bm.tensor([0, 2, 3, 4])
+    col1 = bm.tensor([0, 1, 1, 2])
+    values1 = bm.tensor([1., 3., 4., 2.], dtype=bm.float64)
+    crow2 = bm.tensor([0, 1, 2, 3])
+    col2 = bm.tensor([1, 0, 0])
+    values2 = bm.tensor([2., 9., 3.], dtype=bm.float64)
+
+    crow, col, values, spshape = spspmm_csr(crow1, col1, values1, (3, 3),
+                                            crow2, col2, values2, (3, 2))
+    expected = bm.tensor([[27., 2.],
+                          [36., 0.],
+                          [6., 0.]], dtype=bm.float64)
+
+    assert spshape == (3, 2)
+    assert bm.allclose(crow, bm.tensor([0, 2, 3, 4]))
+    assert bm.allclose(col, bm.tensor([0, 1, 0, 0]))
+    assert bm.allclose(values, bm.tensor([27., 2., 36., 6.], dtype=bm.float64))
+
+    batched = bm.stack([values1, 2*values1], axis=0)
+    values2b = bm.stack([values2, values2], axis=0)
+    _, _, bvalues, _ = spspmm_csr(crow1, col1, batched, (3, 3),
+                                  crow2, col2, values2b, (3, 2))
+    assert bvalues.shape == (2, 4)
+    assert bm.allclose(bvalues[1], 2*values)
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_spgemm_pattern_reuse(backend):
+    bm.set_backend(backend)
+    from fealpy.sparse._spspmm import spgemm_symbolic, spgemm_numeric
+    crow = bm.tensor([0, 2, 5, 7])
+    col = bm.tensor([0, 1, 0, 1, 2, 1, 2])
+    values = bm.tensor([2., -1., -1., 2., -1., -1., 2.], dtype=bm.float64)
+
+    pattern = spgemm_symbolic(crow, col, (3, 3), crow, col, (3, 3))
+    assert pattern.nnz == 9
+    v1 = spgemm_numeric(pattern, values, values)
+    v2 = spgemm_numeric(pattern, 3*values, values)
+    assert bm.allclose(v2, 3*v1)
+    expected = bm.tensor([5., -4., 1., -4., 6., -4., 1., -4., 5.], dtype=bm.float64)
+    assert bm.allclose(v1, expected)
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_spspmm_csr_large_int32(backend):
+    # N * N overflows int32 for N > 46340.
+    bm.set_backend(backend)
+    from fealpy.sparse._spspmm import spspmm_csr
+    N = 100000
+    # A = I + e_0 e_{N-1}^T + e_{N-1} e_0^T and B = I, with int32 indices.
+    crow = bm.concat([bm.tensor([0], dtype=bm.int32),
+                      bm.arange(2, N+1, dtype=bm.int32), bm.tensor([N+2], dtype=bm.int32)])
+    col = bm.concat([bm.tensor([0, N-1], dtype=bm.int32),
+                     bm.arange(1, N-1, dtype=bm.int32), bm.tensor([0, N-1], dtype=bm.int32)])
+    values = bm.ones(N+2, dtype=bm.float64)
+    eye_crow = bm.arange(N+1, dtype=bm.int32)
+    eye_col = bm.arange(N, dtype=bm.int32)
+
+    ccrow, ccol, cvalues, spshape = spspmm_csr(crow, col, values, (N, N),
+                                               eye_crow, eye_col, bm.ones(N, dtype=bm.float64), (N, N))
+    assert spshape == (N, N)
+    assert ccol.dtype == bm.int32
+    assert bm.all(ccrow == crow)
+    assert bm.all(ccol == col)
+    assert bm.allclose(cvalues, values)
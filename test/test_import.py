@@ -0,0 +1,57 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Generous budgets, far above the measured values, so that the test does not
+# depend on the machine. They catch a heavy module imported at the top level.
+TIME_BUDGET = 2.0   # seconds
+MEMORY_BUDGET = 80  # MB, on top of the interpreter
+
+HEAVY_MODULES = ('torch', 'jax', 'matplotlib', 'sympy', 'scipy.spatial',
+                 'vtk', 'mpi4py', 'tqdm')
+
+SCRIPT = """
+import json, resource, sys, time
+def rss():
+    r = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return r / 2**20 if sys.platform == 'darwin' else r / 2**10
+m0 = rss()
+t0 = time.perf_counter()
+{statement}
+t1 = time.perf_counter()
+print(json.dumps({{'time': t1 - t0, 'memory': rss() - m0, 'modules': list(sys.modules)}}))
+"""
+
+
+def run_import(statement: str):
+    pytest.importorskip('resource')
+    result = subprocess.run([sys.executable, '-c', SCRIPT.format(statement=statement)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("statement", [
+    "import fealpy",
+    "import fealpy.mesh, fealpy.functionspace, fealpy.fem",
+])
+def test_import_budget(statement):
+    data = run_import(statement)
+    assert data['time'] < TIME_BUDGET
+    assert data['memory'] < MEMORY_BUDGET
+    loaded = [m for m in HEAVY_MODULES if m in data['modules']]
+    assert loaded == []
+
+
+def test_lazy_attributes():
+    data = run_import("from fealpy.mesh import TriangleMesh")
+    assert 'fealpy.mesh.triangle_mesh' in data['modules']
+    assert 'fealpy.mesh.uniform_mesh_2d' not in data['modules']
+
+    import fealpy.fem
+    import fealpy.mesh
+    assert 'TriangleMesh' in dir(fealpy.mesh)
+    assert fealpy.fem.SourceIntegrator is fealpy.fem.CellSourceIntegrator
+    with pytest.raises(AttributeError):
+        fealpy.mesh.NotAMesh